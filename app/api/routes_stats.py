@@ -2,19 +2,28 @@
 """
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from collections import Counter
+import numpy as np
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import JSONResponse
 
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.repositories.reserva_repository import ReservaRepository
 from app.repositories.sala_repository import SalaRepository
 from app.repositories.articulo_repository import ArticuloRepository
 from app.repositories.persona_repository import PersonaRepository
+from app.repositories.snapshot_reservas import (
+    EPOCA,
+    SEGUNDOS_POR_DIA,
+    a_segundo,
+    snapshot_reservas,
+)
 from app.auth.jwt_handler import extract_email_from_token
-from app.models.reserva import Reserva
+from app.services.metricas_dashboard import (
+    agregar_columnas,
+    ocupacion_promedio,
+    top_usuarios,
+)
 
 
 # Constante para mensajes de error
@@ -23,7 +32,7 @@ NO_AUTORIZADO_MSG = "No autorizado"
 TZ_ARGENTINA = "America/Argentina/Buenos_Aires"
 router = APIRouter()
 
-def get_authenticated_user(request: Request, db: Session):
+async def get_authenticated_user(request: Request, db: AsyncSession):
     """Helper para obtener usuario autenticado desde token."""
     token = request.headers.get("Authorization")
     if token:
@@ -42,7 +51,7 @@ def get_authenticated_user(request: Request, db: Session):
     if not email:
         return None
 
-    user = PersonaRepository.get_by_email(db, email)
+    user = await PersonaRepository.get_by_email_async(db, email)
     if not user or not user.is_active:
         return None
 
@@ -50,81 +59,69 @@ def get_authenticated_user(request: Request, db: Session):
 
 
 @router.get("/api/v1/stats/reservas", tags=["Stats"])
-async def api_reservas_activas(request: Request, db: Session = Depends(get_db)):
+async def api_reservas_activas(request: Request, db: AsyncSession = Depends(get_async_db)):
     """DEPRECATED: Usar /api/v1/stats/reservas_activas en su lugar."""
-    user = get_authenticated_user(request, db)
+    user = await get_authenticated_user(request, db)
     if not user:
         return JSONResponse(status_code=401, content={"error": NO_AUTORIZADO_MSG})
 
     ahora_local = datetime.now(ZoneInfo(TZ_ARGENTINA))
-    reservas = ReservaRepository.get_all(db)
-    reservas_activas = []
-    for r in reservas:
-        fin = r.fecha_hora_fin
-        if fin.tzinfo is None:
-            if fin >= ahora_local.replace(tzinfo=None):
-                reservas_activas.append(r)
-        else:
-            if fin.astimezone(ZoneInfo(TZ_ARGENTINA)) >= ahora_local:
-                reservas_activas.append(r)
-    return {"reservasActivas": len(reservas_activas)}
+    reservas_activas = await ReservaRepository.count_vigentes_async(
+        db, ahora_local.replace(tzinfo=None)
+    )
+    return {"reservasActivas": reservas_activas}
 
 
 @router.get("/api/v1/stats/reservas_activas", tags=["Stats"])
-async def get_reservas_activas(request: Request, db: Session = Depends(get_db)):
+async def get_reservas_activas(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Obtiene el número de reservas activas (futuras o en curso)."""
-    user = get_authenticated_user(request, db)
+    user = await get_authenticated_user(request, db)
     if not user:
         return JSONResponse(status_code=401, content={"error": NO_AUTORIZADO_MSG})
 
     ahora_local = datetime.now(ZoneInfo(TZ_ARGENTINA))
-    reservas = ReservaRepository.get_all(db)
-
-    reservas_activas = []
-    for r in reservas:
-        fin = r.fecha_hora_fin
-        if fin.tzinfo is None:
-            if fin >= ahora_local.replace(tzinfo=None):
-                reservas_activas.append(r)
-        else:
-            if fin.astimezone(ZoneInfo(TZ_ARGENTINA)) >= ahora_local:
-                reservas_activas.append(r)
-
-    return {"reservasActivas": len(reservas_activas)}
+    reservas_activas = await ReservaRepository.count_vigentes_async(
+        db, ahora_local.replace(tzinfo=None)
+    )
+    return {"reservasActivas": reservas_activas}
 
 
 @router.get("/api/v1/stats/actividad_detallada", tags=["Stats"])
-async def get_actividad_detallada(request: Request, db: Session = Depends(get_db)):
+async def get_actividad_detallada(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Obtiene reservas activas y pasadas por día (últimos 7 días)."""
-    user = get_authenticated_user(request, db)
+    user = await get_authenticated_user(request, db)
     if not user:
         return JSONResponse(status_code=401, content={"error": NO_AUTORIZADO_MSG})
 
     ahora_local = datetime.now(ZoneInfo(TZ_ARGENTINA))
+    ahora = ahora_local.replace(tzinfo=None)
+
+    # Últimos 7 días, desde la foto de reservas en memoria
+    primer_dia = (ahora - timedelta(days=6)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    ultimo_dia = ahora.replace(hour=23, minute=59, second=59, microsecond=999999)
+    reservas = await db.run_sync(
+        lambda sesion: snapshot_reservas.columnas(sesion, primer_dia, ultimo_dia)
+    )
+    dia_inicio = reservas["inicio"] // SEGUNDOS_POR_DIA
+    vigente = reservas["fin"] >= a_segundo(ahora)
 
-    # Últimos 7 días
     dias_labels = []
     activas_data = []
     pasadas_data = []
 
     for i in range(6, -1, -1):
         dia = ahora_local - timedelta(days=i)
-        dia_inicio = dia.replace(hour=0, minute=0, second=0, microsecond=0)
-        dia_fin = dia.replace(hour=23, minute=59, second=59, microsecond=999999)
 
         # Formato de etiqueta: "Lun 1/11"
         dias_labels.append(dia.strftime("%a %d/%m"))
 
         # Contar reservas en este día
-        reservas_dia = db.query(Reserva).filter(
-            Reserva.fecha_hora_inicio >= dia_inicio.replace(tzinfo=None),
-            Reserva.fecha_hora_inicio <= dia_fin.replace(tzinfo=None)
-        ).all()
+        del_dia = dia_inicio == (dia.date() - EPOCA.date()).days
 
-        activas = sum(1 for r in reservas_dia
-                      if r.fecha_hora_fin.replace(
-                          tzinfo=None) >= ahora_local.replace(tzinfo=None))
-        pasadas = len(reservas_dia) - activas
+        activas = int(np.count_nonzero(del_dia & vigente))
+        pasadas = int(np.count_nonzero(del_dia)) - activas
 
         activas_data.append(activas)
         pasadas_data.append(pasadas)
@@ -137,116 +134,48 @@ async def get_actividad_detallada(request: Request, db: Session = Depends(get_db
 
 
 @router.get("/api/v1/analytics/dashboard-metrics", tags=["Stats", "Analytics"])
-async def get_dashboard_metrics(request: Request, days: int = 30, db: Session = Depends(get_db)):
+async def get_dashboard_metrics(request: Request, days: int = 30, db: AsyncSession = Depends(get_async_db)):
     """Obtiene métricas consolidadas para el dashboard."""
-    user = get_authenticated_user(request, db)
+    user = await get_authenticated_user(request, db)
     if not user:
         return JSONResponse(status_code=401, content={"error": NO_AUTORIZADO_MSG})
 
     ahora_local = datetime.now(ZoneInfo(TZ_ARGENTINA))
     fecha_inicio = ahora_local - timedelta(days=days)
 
-    # Reservas en el período
-    reservas = db.query(Reserva).filter(
-        Reserva.fecha_hora_inicio >= fecha_inicio.replace(tzinfo=None)
-    ).all()
-
-    # 1. Ocupación por sala
-    salas = SalaRepository.get_all(db)
-    ocupacion_salas = []
-
-    for sala in salas:
-        reservas_sala = [r for r in reservas if r.id_sala == sala.id]
-        if reservas_sala:
-            total_horas = sum(
-                (r.fecha_hora_fin - r.fecha_hora_inicio).total_seconds() / 3600
-                for r in reservas_sala
-            )
-            horas_promedio = total_horas / len(reservas_sala)
-        else:
-            horas_promedio = 0
-
-        ocupacion_salas.append({
-            "sala": sala.nombre,
-            "reservas": len(reservas_sala),
-            "horas_promedio": horas_promedio
-        })
-
-    # 2. Tendencia de reservas (últimos días)
-    tendencia_labels = []
-    tendencia_values = []
-
-    for i in range(min(days, 30), -1, -1):
-        dia = ahora_local - timedelta(days=i)
-        dia_inicio = dia.replace(hour=0, minute=0, second=0, microsecond=0)
-        dia_fin = dia.replace(hour=23, minute=59, second=59, microsecond=999999)
-
-        count = sum(
-            1 for r in reservas
-            if dia_inicio.replace(tzinfo=None) <= r.fecha_hora_inicio <= dia_fin.replace(
-                tzinfo=None)
-        )
-
-        tendencia_labels.append(dia.strftime("%d/%m"))
-        tendencia_values.append(count)
-
-    # 3. Top usuarios (más reservas)
-    persona_counts = Counter(r.id_persona for r in reservas if r.id_persona)
-    top_usuarios = []
-
-    for persona_id, count in persona_counts.most_common(5):
-        persona = PersonaRepository.get_by_id(db, persona_id)
-        if persona:
-            top_usuarios.append({
-                "nombre": f"{persona.nombre} {persona.apellido or ''}".strip(),
-                "reservas": count
-            })
-
-    # 4. Métricas generales
-    reservas_hoy = sum(
-        1 for r in reservas
-        if r.fecha_hora_inicio.date() == ahora_local.date()
+    # Reservas del período: columnas de la foto en memoria, agregadas con NumPy
+    desde = fecha_inicio.replace(tzinfo=None)
+    columnas = await db.run_sync(
+        lambda sesion: snapshot_reservas.columnas(sesion, desde)
+    )
+    salas = await SalaRepository.get_all_async(db)
+    agregado = agregar_columnas(
+        columnas, salas, ahora_local.replace(tzinfo=None), days
+    )
+    personas = await PersonaRepository.get_by_ids_async(
+        db, [persona_id for persona_id, _ in agregado["top_personas"]]
     )
 
     # Contar salas disponibles AHORA (sin reservas activas en este momento)
-    query_salas_ocupadas = text("""
-        SELECT COUNT(DISTINCT id_sala)
-        FROM reservas
-        WHERE id_sala IS NOT NULL
-        AND fecha_hora_inicio <= CURRENT_TIMESTAMP
-        AND fecha_hora_fin >= CURRENT_TIMESTAMP
-    """)
-    result_salas_ocupadas = db.execute(query_salas_ocupadas)
-    salas_ocupadas_ahora = result_salas_ocupadas.scalar() or 0
+    salas_ocupadas_ahora = await ReservaRepository.count_salas_ocupadas_async(
+        db, ahora_local.replace(tzinfo=None)
+    )
     total_salas = len(salas)
     salas_disponibles = max(0, total_salas - salas_ocupadas_ahora)
 
-    articulos = ArticuloRepository.get_all(db)
+    articulos = await ArticuloRepository.get_all_async(db)
     stock_critico = sum(1 for a in articulos if a.cantidad < 5 and a.disponible)
     articulos_disponibles = sum(1 for a in articulos if a.disponible)
 
-    # Calcular ocupación promedio
-    if reservas:
-        total_horas_reservadas = sum(
-            (r.fecha_hora_fin - r.fecha_hora_inicio).total_seconds() / 3600
-            for r in reservas
-        )
-        horas_disponibles = len(salas) * 24 * days
-        ocupacion_promedio = (
-            total_horas_reservadas / horas_disponibles * 100) if horas_disponibles > 0 else 0
-    else:
-        ocupacion_promedio = 0
-
     return {
-        "ocupacion_salas": ocupacion_salas,
-        "tendencia_reservas": {
-            "labels": tendencia_labels,
-            "values": tendencia_values
-        },
-        "top_usuarios": top_usuarios,
+        "ocupacion_salas": agregado["ocupacion_salas"],
+        "tendencia_reservas": agregado["tendencia_reservas"],
+        "top_usuarios": top_usuarios(agregado["top_personas"], personas),
         "metricas": {
-            "reservas_hoy": reservas_hoy,
-            "ocupacion_promedio": round(ocupacion_promedio, 1),
+            "reservas_hoy": agregado["reservas_hoy"],
+            "ocupacion_promedio": ocupacion_promedio(
+                agregado["horas_reservadas"], total_salas, days
+            ),
             "salas_disponibles": salas_disponibles,
             "articulos_disponibles": articulos_disponibles,
             "stock_critico": stock_critico
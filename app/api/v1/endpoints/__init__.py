@@ -7,10 +7,12 @@ para los diferentes modelos del sistema.
 
 from .articulos import router as articulos_router
 from .personas import router as personas_router
+from .reserva_series import router as reserva_series_router
 from .reservas import router as reservas_router
 from .salas import router as salas_router
 from .stats import router as stats_router
 
 __all__ = [
-    "personas_router", "articulos_router", "salas_router", "reservas_router", "stats_router"
+    "personas_router", "articulos_router", "salas_router", "reservas_router", "stats_router",
+    "reserva_series_router",
 ]
@@ -1,23 +1,68 @@
 """Módulo de endpoints de análisis y métricas del sistema de reservas."""
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from collections import Counter
-from io import BytesIO, StringIO
 from fastapi import APIRouter, Depends, Query, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-import pandas as pd
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_db
+from app.services.analytics_cache import analytics_cache
 from app.services.analytics_service import AnalyticsService
+from app.prediction.modelo_demanda import modelo_demanda
 from app.prediction.prediction_service import PredictionService
 from app.auth.dependencies import get_current_user
-from app.models.reserva import Reserva
+from app.repositories.snapshot_reservas import snapshot_reservas
 from app.repositories.sala_repository import SalaRepository
 from app.repositories.persona_repository import PersonaRepository
 from app.repositories.articulo_repository import ArticuloRepository
+from app.services.exportacion_reservas import (
+    generar_csv,
+    generar_excel,
+    generar_ndjson,
+    lotes_reporte,
+)
+from app.services.metricas_dashboard import (
+    agregar_columnas,
+    ocupacion_promedio,
+    top_usuarios,
+)
 
 router = APIRouter()
 
+def _calcular_dashboard_metrics(db: Session, days: int) -> dict:
+    """Calcular las métricas del dashboard de los últimos `days` días."""
+    ahora_local = datetime.now(ZoneInfo("America/Argentina/Buenos_Aires"))
+    fecha_inicio = ahora_local - timedelta(days=days)
+
+    # Reservas del período: columnas de la foto en memoria, agregadas con NumPy
+    columnas = snapshot_reservas.columnas(db, fecha_inicio.replace(tzinfo=None))
+    salas = SalaRepository.get_all(db)
+    agregado = agregar_columnas(
+        columnas, salas, ahora_local.replace(tzinfo=None), days
+    )
+    personas = PersonaRepository.get_by_ids(
+        db, [persona_id for persona_id, _ in agregado["top_personas"]]
+    )
+
+    salas_disponibles = sum(1 for s in salas if s.disponible)
+
+    # Contar artículos disponibles
+    articulos = ArticuloRepository.get_all(db)
+    articulos_disponibles = sum(1 for a in articulos if a.disponible)
+
+    return {
+        "ocupacion_salas": agregado["ocupacion_salas"],
+        "tendencia_reservas": agregado["tendencia_reservas"],
+        "top_usuarios": top_usuarios(agregado["top_personas"], personas),
+        "metricas": {
+            "reservas_hoy": agregado["reservas_hoy"],
+            "ocupacion_promedio": ocupacion_promedio(
+                agregado["horas_reservadas"], len(salas), days
+            ),
+            "salas_disponibles": salas_disponibles,
+            "articulos_disponibles": articulos_disponibles
+        }
+    }
+
 @router.get("/dashboard-metrics")
 def get_dashboard_metrics(
     days: int = Query(
@@ -28,112 +73,11 @@ def get_dashboard_metrics(
 ):
     """Obtener métricas principales para el dashboard"""
     try:
-        ahora_local = datetime.now(ZoneInfo("America/Argentina/Buenos_Aires"))
-        fecha_inicio = ahora_local - timedelta(days=days)
-
-        # Reservas en el período
-        reservas = db.query(Reserva).filter(
-            Reserva.fecha_hora_inicio >= fecha_inicio.replace(tzinfo=None)
-        ).all()
-
-        # 1. Ocupación por sala
-        salas = SalaRepository.get_all(db)
-        ocupacion_salas = []
-
-        for sala in salas:
-            reservas_sala = [r for r in reservas if r.id_sala == sala.id]
-            if reservas_sala:
-                total_horas = sum(
-                    (r.fecha_hora_fin - r.fecha_hora_inicio).total_seconds() / 3600
-                    for r in reservas_sala
-                )
-                horas_promedio = total_horas / len(reservas_sala)
-            else:
-                horas_promedio = 0
-
-            ocupacion_salas.append({
-                "sala": sala.nombre,
-                "reservas": len(reservas_sala),
-                "horas_promedio": round(horas_promedio, 1)
-            })
-
-        # 2. Tendencia de reservas (últimos días)
-        tendencia_labels = []
-        tendencia_values = []
-
-        for i in range(min(days, 30), -1, -1):
-            dia = ahora_local - timedelta(days=i)
-            dia_inicio = dia.replace(hour=0, minute=0, second=0, microsecond=0)
-            dia_fin = dia.replace(
-                hour=23, minute=59, second=59, microsecond=999999
-            )
-
-            count = 0
-            for r in reservas:
-                # Convertir fecha_hora_inicio a timezone aware
-                fecha_reserva = r.fecha_hora_inicio.replace(
-                    tzinfo=ZoneInfo("America/Argentina/Buenos_Aires")
-                ) if r.fecha_hora_inicio.tzinfo is None else r.fecha_hora_inicio
-                if dia_inicio <= fecha_reserva <= dia_fin:
-                    count += 1
-
-            tendencia_labels.append(dia.strftime("%d/%m"))
-            tendencia_values.append(count)
-
-        # 3. Top usuarios (más reservas)
-        persona_counts = Counter(r.id_persona for r in reservas if r.id_persona)
-        top_usuarios = []
-
-        for persona_id, count in persona_counts.most_common(5):
-            persona = PersonaRepository.get_by_id(db, persona_id)
-            if persona:
-                nombre_completo = (
-                    f"{persona.nombre} {persona.apellido or ''}".strip()
-                )
-                top_usuarios.append({
-                    "nombre": nombre_completo,
-                    "reservas": count
-                })
-
-        # 4. Métricas generales
-        reservas_hoy = sum(
-            1 for r in reservas
-            if r.fecha_hora_inicio.date() == ahora_local.date()
+        return analytics_cache.obtener(
+            "dashboard-metrics",
+            {"days": days},
+            lambda: _calcular_dashboard_metrics(db, days),
         )
-
-        salas_disponibles = sum(1 for s in salas if s.disponible)
-        
-        # Contar artículos disponibles
-        articulos = ArticuloRepository.get_all(db)
-        articulos_disponibles = sum(1 for a in articulos if a.disponible)
-
-        # Calcular ocupación promedio
-        if reservas:
-            total_horas_reservadas = sum(
-                (r.fecha_hora_fin - r.fecha_hora_inicio).total_seconds() / 3600
-                for r in reservas
-            )
-            horas_disponibles = len(salas) * 24 * days
-            ocupacion_promedio = (
-                total_horas_reservadas / horas_disponibles * 100
-            ) if horas_disponibles > 0 else 0
-        else:
-            ocupacion_promedio = 0
-
-        return {
-            "ocupacion_salas": ocupacion_salas,
-            "tendencia_reservas": {
-                "labels": tendencia_labels,
-                "values": tendencia_values
-            },
-            "top_usuarios": top_usuarios,
-            "metricas": {
-                "reservas_hoy": reservas_hoy,
-                "ocupacion_promedio": round(ocupacion_promedio, 1),
-                "salas_disponibles": salas_disponibles,
-                "articulos_disponibles": articulos_disponibles
-            }
-        }
     except (ValueError, KeyError, AttributeError) as e:
         raise HTTPException(
             status_code=500,
@@ -148,10 +92,9 @@ def get_prediccion_ocupacion(
     db: Session = Depends(get_db),
     _current_user = Depends(get_current_user)
 ):
-    """Predicción de ocupación de salas"""
+    """Predicción de ocupación de salas (del modelo de demanda vigente)"""
     try:
-        analytics_service = AnalyticsService(db)
-        return analytics_service.get_prediccion_ocupacion(dias)
+        return AnalyticsService(db).get_prediccion_ocupacion(dias)
     except (ValueError, KeyError, AttributeError, RuntimeError) as e:
         raise HTTPException(
             status_code=500,
@@ -173,138 +116,77 @@ def get_inventario_metrics(
             detail=f"Error al obtener métricas de inventario: {str(e)}"
         ) from e
 
+
+def _respuesta_streaming(generar, fecha_inicio, media_type, extension):
+    """
+    Responder el reporte de reservas con el contenido que arma `generar`.
+
+    El generador usa su propia sesión: la lectura con cursor dura lo que
+    dura el envío y no debe depender del ciclo de vida de get_db.
+    """
+    def _contenido():
+        db = SessionLocal()
+        try:
+            yield from generar(lotes_reporte(db, fecha_inicio))
+        finally:
+            db.close()
+
+    filename = f"reporte_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    return StreamingResponse(
+        _contenido(),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
 @router.get("/export-report")
 def export_report(
-    export_format: str = Query("json", pattern="^(json|csv|excel)$"),
+    export_format: str = Query("json", pattern="^(json|csv|ndjson|excel)$"),
     days: int = Query(30, ge=1, le=365),
     db: Session = Depends(get_db),
     _current_user = Depends(get_current_user)
 ):
-    """Exportar reportes en diferentes formatos (JSON, CSV, Excel)"""
+    """Exportar reportes en diferentes formatos (JSON, CSV, NDJSON, Excel)"""
     try:
-        analytics_service = AnalyticsService(db)
-        data = analytics_service.get_ocupacion_dashboard(days)
-
-        # Agregar más datos para el reporte completo
         ahora_local = datetime.now(ZoneInfo("America/Argentina/Buenos_Aires"))
         fecha_inicio = ahora_local - timedelta(days=days)
+        desde = fecha_inicio.replace(tzinfo=None)
 
-        # Obtener reservas del período
-        reservas = db.query(Reserva).filter(
-            Reserva.fecha_hora_inicio >= fecha_inicio.replace(tzinfo=None)
-        ).all()
-
-        # Preparar datos para el reporte
-        reporte_data = {
-            'metadata': {
-                'fecha_generacion': ahora_local.isoformat(),
-                'periodo_dias': days,
-                'fecha_inicio': fecha_inicio.isoformat(),
-                'fecha_fin': ahora_local.isoformat()
-            },
-            'metricas_generales': data,
-            'reservas': []
-        }
-
-        # Agregar datos de reservas
-        for reserva in reservas:
-            # Determinar si la reserva está activa basándose en las fechas
-            ahora = datetime.now()
-            es_activa = reserva.fecha_hora_inicio <= ahora <= reserva.fecha_hora_fin
-            es_pasada = ahora > reserva.fecha_hora_fin
-
-            estado_calculado = (
-                'activa' if es_activa else (
-                    'completada' if es_pasada else 'pendiente'
-                )
-            )
-
-            reporte_data['reservas'].append({
-                'id': reserva.id,
-                'fecha_inicio': (
-                    reserva.fecha_hora_inicio.isoformat()
-                    if reserva.fecha_hora_inicio else None
-                ),
-                'fecha_fin': (
-                    reserva.fecha_hora_fin.isoformat()
-                    if reserva.fecha_hora_fin else None
-                ),
-                'id_persona': reserva.id_persona,
-                'id_sala': reserva.id_sala,
-                'id_articulo': reserva.id_articulo,
-                'tipo': 'sala' if reserva.id_sala else 'articulo',
-                'estado': estado_calculado,
-                'duracion_horas': round(
-                    (reserva.fecha_hora_fin - reserva.fecha_hora_inicio
-                     ).total_seconds() / 3600, 2
-                )
-            })
-
-        # Exportar según el formato solicitado
+        # CSV y NDJSON solo listan reservas: se generan en streaming por lotes
         if export_format == "csv":
-            # Convertir a DataFrame
-            df = pd.DataFrame(reporte_data['reservas'])
-            if df.empty:
-                df = pd.DataFrame([{
-                    'mensaje': 'No hay reservas en el período seleccionado'
-                }])
-
-            # Crear CSV en memoria
-            output = StringIO()
-            df.to_csv(output, index=False, encoding='utf-8')
-            output.seek(0)
-
-            filename = (
-                f"reporte_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            return _respuesta_streaming(generar_csv, desde, "text/csv", "csv")
+        if export_format == "ndjson":
+            return _respuesta_streaming(
+                generar_ndjson, desde, "application/x-ndjson", "ndjson"
             )
-            return StreamingResponse(
-                iter([output.getvalue()]),
-                media_type="text/csv",
-                headers={
-                    "Content-Disposition": f"attachment; filename={filename}"
-                }
-            )
-
-        elif export_format == "excel":
-            # Crear Excel en memoria
-            output = BytesIO()
-
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                # Hoja de métricas generales
-                metricas_df = pd.DataFrame([reporte_data['metricas_generales']])
-                metricas_df.to_excel(writer, sheet_name='Métricas', index=False)
 
-                # Hoja de reservas
-                reservas_df = pd.DataFrame(reporte_data['reservas'])
-                if reservas_df.empty:
-                    reservas_df = pd.DataFrame([{
-                        'mensaje': 'No hay reservas en el período seleccionado'
-                    }])
-                reservas_df.to_excel(writer, sheet_name='Reservas', index=False)
-
-                # Hoja de metadata
-                metadata_df = pd.DataFrame([reporte_data['metadata']])
-                metadata_df.to_excel(writer, sheet_name='Info', index=False)
+        analytics_service = AnalyticsService(db)
+        data = analytics_service.get_ocupacion_dashboard(days)
 
-            output.seek(0)
+        metadata = {
+            'fecha_generacion': ahora_local.isoformat(),
+            'periodo_dias': days,
+            'fecha_inicio': fecha_inicio.isoformat(),
+            'fecha_fin': ahora_local.isoformat()
+        }
 
-            filename = (
-                f"reporte_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            )
-            media_type = (
-                "application/vnd.openxmlformats-officedocument."
-                "spreadsheetml.sheet"
-            )
-            return StreamingResponse(
-                iter([output.getvalue()]),
-                media_type=media_type,
-                headers={
-                    "Content-Disposition": f"attachment; filename={filename}"
-                }
+        # Excel: xlsxwriter en modo constant_memory, alimentado por el cursor
+        if export_format == "excel":
+            return _respuesta_streaming(
+                lambda lotes: generar_excel(lotes, data, metadata),
+                desde,
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                "xlsx",
             )
 
         # Formato JSON por defecto
-        return reporte_data
+        return {
+            'metadata': metadata,
+            'metricas_generales': data,
+            'reservas': [
+                fila for lote in lotes_reporte(db, desde) for fila in lote
+            ]
+        }
 
     except (ValueError, KeyError, AttributeError, RuntimeError) as e:
         raise HTTPException(
@@ -327,11 +209,12 @@ def get_weekly_demand_predictions(
     Predicción avanzada de demanda semanal.
 
     Utiliza análisis de patrones históricos, tendencias y estacionalidad
-    para predecir la demanda de reservas en los próximos días.
+    para predecir la demanda de reservas en los próximos días. El modelo
+    se ajusta una vez por día (o tras muchas escrituras de reservas), así
+    que cada consulta solo recorta el pronóstico ya calculado.
     """
     try:
-        prediction_service = PredictionService(db)
-        resultado = prediction_service.predict_weekly_demand(dias)
+        resultado = PredictionService(db).predict_weekly_demand(dias)
         # Transformar nombres de campos para compatibilidad con frontend
         predicciones_transformadas = []
         for pred in resultado.get("predicciones", []):
@@ -387,8 +270,11 @@ def get_peak_hours_predictions(
     tienen mayor demanda por cada día de la semana.
     """
     try:
-        prediction_service = PredictionService(db)
-        return prediction_service.predict_peak_hours(dias)
+        return analytics_cache.obtener(
+            "predictions/peak-hours",
+            {"dias": dias},
+            lambda: PredictionService(db).predict_peak_hours(dias),
+        )
     except (ValueError, KeyError, AttributeError, RuntimeError) as e:
         raise HTTPException(
             status_code=500,
@@ -409,8 +295,11 @@ def detect_demand_anomalies(
     usando análisis estadístico.
     """
     try:
-        prediction_service = PredictionService(db)
-        return prediction_service.detect_anomalies(dias)
+        return analytics_cache.obtener(
+            "predictions/anomalies",
+            {"dias": dias},
+            lambda: PredictionService(db).detect_anomalies(dias),
+        )
     except (ValueError, KeyError, AttributeError, RuntimeError) as e:
         raise HTTPException(
             status_code=500,
@@ -433,10 +322,27 @@ def get_capacity_recommendations(
     deberían estar disponibles cada día.
     """
     try:
-        prediction_service = PredictionService(db)
-        return prediction_service.recommend_capacity(dias)
+        return PredictionService(db).recommend_capacity(dias)
     except (ValueError, KeyError, AttributeError, RuntimeError) as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error al generar recomendaciones: {str(e)}"
         ) from e
+
+
+@router.get("/cache-stats")
+def get_analytics_cache_stats(_current_user = Depends(get_current_user)):
+    """
+    Estado de la caché de resultados de analítica y predicción.
+
+    Muestra aciertos, fallos y consultas coalescidas (total y por endpoint),
+    la tasa de aciertos, las entradas guardadas y la versión actual, que
+    aumenta con cada alta, cambio o baja de reservas. Incluye el estado de
+    la foto en memoria de reservas de la que se calculan y el del modelo de
+    demanda que sirve las predicciones de demanda, capacidad y ocupación.
+    """
+    return {
+        **analytics_cache.stats(),
+        "snapshot_reservas": snapshot_reservas.stats(),
+        "modelo_demanda": modelo_demanda.stats(),
+    }
@@ -14,7 +14,11 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.schemas.articulo import Articulo, ArticuloCreate, ArticuloUpdate
 from app.services.java_client import JavaServiceClient
-from app.services.articulo_service import ArticuloService
+from app.services.articulo_service import (
+    METODO_PICO,
+    METODO_SUMA,
+    ArticuloService,
+)
 
 router = APIRouter(prefix="/articulos", tags=["articulos"])
 
@@ -63,6 +67,14 @@ def get_disponibilidad_articulos(
     fecha_inicio: str,
     fecha_fin: str,
     reserva_id: Optional[int] = None,
+    metodo: str = Query(
+        METODO_SUMA,
+        pattern=f"^({METODO_SUMA}|{METODO_PICO})$",
+        description=(
+            "suma: todas las reservas que se solapan con el período; "
+            "pico: máximo de unidades reservadas a la vez dentro del período"
+        ),
+    ),
     db: Session = Depends(get_db),
 ):
     """Obtener disponibilidad de artículos para un período específico."""
@@ -76,96 +88,9 @@ def get_disponibilidad_articulos(
             detail="Formato de fecha inválido. Use formato ISO (YYYY-MM-DDTHH:MM:SS)",
         ) from exc
 
-    # Obtener todos los artículos disponibles
-    articulos = ArticuloService.get_articulos(db, skip=0, limit=1000)
-
-    resultado = []
-
-    for articulo in articulos:
-        if not articulo.disponible:
-            continue
-
-        # Calcular cantidad reservada en el período
-        query = text(
-            """
-            SELECT COALESCE(SUM(cantidad_usada), 0) as total_reservado
-            FROM (
-                -- Reservas directas del artículo
-                SELECT 1 as cantidad_usada
-                FROM reservas r
-                WHERE r.id_articulo = :articulo_id
-                AND (:reserva_id IS NULL OR r.id != :reserva_id)
-                AND r.fecha_hora_fin >= :fecha_inicio
-                AND r.fecha_hora_inicio <= :fecha_fin
-
-                UNION ALL
-
-                -- Artículos en reservas de sala
-                SELECT ra.cantidad as cantidad_usada
-                FROM reserva_articulos ra
-                JOIN reservas r ON ra.reserva_id = r.id
-                WHERE ra.articulo_id = :articulo_id
-                AND (:reserva_id IS NULL OR ra.reserva_id != :reserva_id)
-                AND r.fecha_hora_fin >= :fecha_inicio
-                AND r.fecha_hora_inicio <= :fecha_fin
-            ) as reservas_activas
-        """
-        )
-
-        result = db.execute(
-            query,
-            {
-                "articulo_id": articulo.id,
-                "reserva_id": reserva_id,
-                "fecha_inicio": fecha_inicio_dt,
-                "fecha_fin": fecha_fin_dt,
-            },
-        )
-
-        total_reservado_otras = result.scalar() or 0
-
-        # Calcular cuánto ya tiene asignado esta reserva (si aplica)
-        ya_asignada_en_reserva = 0
-        if reserva_id is not None:
-            result_mia = db.execute(
-                text(
-                    """
-                    SELECT COALESCE(SUM(ra.cantidad), 0) as total
-                    FROM reserva_articulos ra
-                    WHERE ra.articulo_id = :articulo_id
-                    AND ra.reserva_id = :reserva_id
-                    """
-                ),
-                {"articulo_id": articulo.id, "reserva_id": reserva_id},
-            )
-            ya_asignada_en_reserva = result_mia.scalar() or 0
-
-        # Disponible total ignorando esta reserva (para compatibilidad)
-        disponible = max(0, articulo.cantidad - total_reservado_otras)
-        # Disponible para agregar (ya descontando lo asignado en esta reserva)
-        disponible_para_agregar = max(
-            0, articulo.cantidad - total_reservado_otras - ya_asignada_en_reserva
-        )
-
-        resultado.append(
-            {
-                "id": articulo.id,
-                "nombre": articulo.nombre,
-                "descripcion": articulo.descripcion,
-                "categoria": articulo.categoria,
-                "cantidad_total": articulo.cantidad,
-                # Para compatibilidad: lo reservado por otros (excluye esta reserva)
-                "cantidad_reservada_otros": total_reservado_otras,
-                # Lo que ya tiene asignado esta reserva
-                "cantidad_asignada_en_reserva": ya_asignada_en_reserva,
-                # Disponible total ignorando esta reserva (mantener campo histórico)
-                "cantidad_disponible": disponible,
-                # NUEVO: lo que realmente puede agregar adicionalmente en esta reserva
-                "cantidad_disponible_para_agregar": disponible_para_agregar,
-            }
-        )
-
-    return resultado
+    return ArticuloService.get_disponibilidad_periodo(
+        db, fecha_inicio_dt, fecha_fin_dt, reserva_id, metodo
+    )
 
 
 @router.get("/estadisticas/inventario")
@@ -180,160 +105,19 @@ def get_estadisticas_inventario(db: Session = Depends(get_db)):
     - unidades_disponibles: Unidades que se pueden reservar ahora
     - articulos_disponibles: Artículos marcados como disponibles
     - articulos_no_disponibles: Artículos marcados como no disponibles
+    - articulos_sin_stock_ahora: Artículos que en algún momento de hoy tienen
+      todas sus unidades reservadas a la vez
 
     Nota: Las unidades reservadas solo incluyen las reservas que están activas EN ESTE MOMENTO
     (fecha_hora_inicio <= ahora <= fecha_hora_fin). Las reservas futuras no se cuentan.
     """
-
-    # Obtener todos los artículos usando el servicio
-    articulos = ArticuloService.get_articulos(db, 0, 1000)
-
-    total_articulos = len(articulos)
-    # Solo contar unidades de artículos marcados como disponibles
-    total_unidades = sum(art.cantidad for art in articulos)
-    total_unidades_disponibles = sum(art.cantidad for art in articulos if art.disponible)
-    articulos_disponibles = sum(1 for art in articulos if art.disponible)
-    articulos_no_disponibles = total_articulos - articulos_disponibles
-
-    # Calcular unidades reservadas actualmente (en curso ahora)
-    # Las fechas en la BD son "naive" (sin timezone), representan hora local ART (UTC-3)
-    # PostgreSQL está configurado en timezone America/Argentina/Buenos_Aires
-    query_reservadas = text(
-        """
-        SELECT COALESCE(SUM(cantidad_usada), 0) as total
-        FROM (
-            -- Reservas directas de artículos (activas ahora en hora local)
-            SELECT 1 as cantidad_usada
-            FROM reservas r
-            WHERE r.id_articulo IS NOT NULL
-            AND r.fecha_hora_fin >= CURRENT_TIMESTAMP
-            AND r.fecha_hora_inicio <= CURRENT_TIMESTAMP
-
-            UNION ALL
-
-            -- Artículos en reservas de sala (activas ahora en hora local)
-            SELECT ra.cantidad as cantidad_usada
-            FROM reserva_articulos ra
-            JOIN reservas r ON ra.reserva_id = r.id
-            WHERE r.fecha_hora_fin >= CURRENT_TIMESTAMP
-            AND r.fecha_hora_inicio <= CURRENT_TIMESTAMP
-        ) as reservas_activas
-    """
-    )
-
-    result = db.execute(query_reservadas)
-    unidades_reservadas = result.scalar() or 0
-    # Calcular unidades disponibles = unidades de artículos disponibles - unidades reservadas
-    unidades_disponibles = max(0, total_unidades_disponibles - unidades_reservadas)
-
-    # Calcular cuántos artículos tienen stock completamente agotado HOY
-    # Necesitamos encontrar artículos donde en ALGÚN MOMENTO del día,
-    # todas las unidades están reservadas simultáneamente
-    query_articulos_sin_stock = text(
-        """
-        WITH reservas_hoy AS (
-            -- Todas las reservas que tocan el día de hoy (hora local)
-            SELECT DISTINCT r.id, r.fecha_hora_inicio, r.fecha_hora_fin
-            FROM reservas r
-            WHERE r.fecha_hora_fin >= DATE_TRUNC('day', CURRENT_TIMESTAMP)
-            AND r.fecha_hora_inicio <= DATE_TRUNC('day', CURRENT_TIMESTAMP) + INTERVAL '1 day' - INTERVAL '1 second'
-        ),
-        articulos_en_reservas AS (
-            -- Para cada artículo, encontrar el máximo de unidades reservadas simultáneamente
-            SELECT 
-                a.id as articulo_id,
-                a.cantidad as stock_total,
-                (
-                    SELECT MAX(total_en_momento)
-                    FROM (
-                        -- Para cada reserva, contar cuántas unidades del artículo están reservadas
-                        -- en reservas que se solapan con esta
-                        SELECT r1.id as reserva_id, COALESCE(SUM(
-                            CASE 
-                                WHEN ra.articulo_id = a.id THEN ra.cantidad
-                                ELSE 0
-                            END
-                        ), 0) as total_en_momento
-                        FROM reservas_hoy r1
-                        LEFT JOIN reservas r2 ON (
-                            r2.fecha_hora_inicio <= r1.fecha_hora_fin
-                            AND r2.fecha_hora_fin >= r1.fecha_hora_inicio
-                        )
-                        LEFT JOIN reserva_articulos ra ON ra.reserva_id = r2.id
-                        GROUP BY r1.id
-                    ) as momentos
-                ) as max_reservado_simultaneo
-            FROM articulos a
-        )
-        SELECT COUNT(*) as total
-        FROM articulos_en_reservas
-        WHERE stock_total <= max_reservado_simultaneo
-    """
-    )
-
-    result_sin_stock = db.execute(query_articulos_sin_stock)
-    articulos_sin_stock_ahora = result_sin_stock.scalar() or 0
-
-    return {
-        "total_articulos": total_articulos,
-        "articulos_disponibles": articulos_disponibles,
-        "articulos_no_disponibles": articulos_no_disponibles,
-        "articulos_sin_stock_ahora": articulos_sin_stock_ahora,  # NUEVO: artículos con 0 unidades disponibles
-        "total_unidades": total_unidades,
-        "unidades_reservadas": unidades_reservadas,
-        "unidades_disponibles": unidades_disponibles,
-    }
+    return ArticuloService.get_estadisticas_inventario(db)
 
 
 @router.get("/disponibilidad/actual")
 def get_disponibilidad_actual_articulos(db: Session = Depends(get_db)):
     """Obtener disponibilidad actual de todos los artículos."""
-
-    # Obtener todos los artículos
-    articulos = ArticuloService.get_articulos(db, 0, 1000)
-
-    disponibilidad = {}
-
-    for articulo in articulos:
-        # Calcular unidades reservadas ahora para este artículo
-        # PostgreSQL está configurado en timezone America/Argentina/Buenos_Aires
-        query_reservadas = text(
-            """
-            SELECT COALESCE(SUM(cantidad_usada), 0) as total
-            FROM (
-                -- Reservas directas del artículo (activas ahora)
-                SELECT 1 as cantidad_usada
-                FROM reservas r
-                WHERE r.id_articulo = :articulo_id
-                AND r.fecha_hora_fin >= CURRENT_TIMESTAMP
-                AND r.fecha_hora_inicio <= CURRENT_TIMESTAMP
-
-                UNION ALL
-
-                -- Artículos en reservas de sala (activas ahora)
-                SELECT ra.cantidad as cantidad_usada
-                FROM reserva_articulos ra
-                JOIN reservas r ON ra.reserva_id = r.id
-                WHERE ra.articulo_id = :articulo_id
-                AND r.fecha_hora_fin >= CURRENT_TIMESTAMP
-                AND r.fecha_hora_inicio <= CURRENT_TIMESTAMP
-            ) as reservas_activas
-        """
-        )
-
-        result = db.execute(
-            query_reservadas, {"articulo_id": articulo.id}
-        )
-        unidades_reservadas = result.scalar() or 0
-        unidades_disponibles = max(0, articulo.cantidad - unidades_reservadas)
-
-        disponibilidad[articulo.id] = {
-            "total": articulo.cantidad,
-            "reservadas": unidades_reservadas,
-            "disponibles": unidades_disponibles,
-        }
-
-    return disponibilidad
+    return ArticuloService.get_disponibilidad_actual(db)
 
 
 @router.get("/{articulo_id}", response_model=Articulo)
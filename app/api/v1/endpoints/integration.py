@@ -8,7 +8,13 @@ Este endpoint muestra cómo Python puede consultar datos desde Java.
 import logging
 from fastapi import APIRouter, HTTPException
 
-from app.services.java_client import JavaServiceClient
+from app.services.java_client import (
+    JavaServiceClient,
+    articulos_cache,
+    java_circuit_breaker,
+    salas_cache,
+)
+from app.services.ocupacion_actual import ocupacion_actual
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -38,6 +44,50 @@ async def check_java_service_health():
         }
 
 
+@router.get("/integration/pool-stats")
+async def get_java_pool_stats():
+    """
+    🔗 ENDPOINT DE INTEGRACIÓN: Estado del pool de conexiones hacia Java Service.
+
+    Muestra los límites configurados, las conexiones activas y ociosas, las
+    solicitudes en espera y cuántas llamadas usaron el cliente compartido.
+    """
+    return {
+        "java_service_url": settings.java_service_url,
+        "pool": JavaServiceClient.pool_stats(),
+    }
+
+
+@router.get("/integration/circuit-breaker")
+async def get_java_circuit_breaker():
+    """
+    🔗 ENDPOINT DE INTEGRACIÓN: Estado del circuit breaker hacia Java Service.
+
+    Con el circuito abierto las llamadas a Java fallan de inmediato; pasado
+    el tiempo de apertura se deja pasar una llamada de prueba.
+    """
+    return {
+        "java_service_url": settings.java_service_url,
+        "health_path": settings.java_health_path,
+        "circuit_breaker": java_circuit_breaker.stats(),
+    }
+
+
+@router.get("/integration/cache-stats")
+async def get_java_cache_stats():
+    """
+    🔗 ENDPOINT DE INTEGRACIÓN: Estado de la caché de catálogos de Java Service.
+
+    Muestra aciertos, fallos, refrescos y antigüedad de las copias de los
+    catálogos de salas y artículos, y de la foto de ocupación actual.
+    """
+    return {
+        "salas": salas_cache.stats(),
+        "articulos": articulos_cache.stats(),
+        "ocupacion_actual": ocupacion_actual.stats(),
+    }
+
+
 @router.get("/integration/salas-desde-java")
 async def get_salas_from_java():
     """
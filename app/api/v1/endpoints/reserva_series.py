@@ -0,0 +1,146 @@
+"""
+Endpoints de la API para series de reservas recurrentes.
+
+Este módulo define los endpoints REST para crear, consultar, modificar
+y cancelar series de reservas de salas. Se registra antes del router de
+reservas para que /reservas/series no se interprete como un ID.
+"""
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from app.auth.dependencies import get_current_user
+from app.core.database import get_db
+from app.models.persona import Persona as PersonaModel
+from app.schemas.reserva import Reserva
+from app.schemas.reserva_serie import (
+    ReservaSerie,
+    ReservaSerieCreate,
+    ReservaSerieResult,
+    ReservaSerieUpdate,
+)
+from app.services.reserva_serie_service import ReservaSerieService
+
+MAX_LIMIT = 100
+
+router = APIRouter(prefix="/reservas/series", tags=["reservas"])
+
+
+def _obtener_serie_autorizada(db, serie_id, current_user):
+    serie = ReservaSerieService.get_serie_by_id(db, serie_id)
+    if not serie:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No se encontró una serie con ID {serie_id}",
+        )
+    if not current_user.is_admin and serie.id_persona != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes permisos para acceder a esta serie",
+        )
+    return serie
+
+
+@router.post(
+    "/",
+    response_model=ReservaSerieResult,
+    status_code=status.HTTP_201_CREATED,
+    summary="Crear serie de reservas",
+    description=(
+        "Crear una reserva de sala recurrente (diaria o semanal). Todas las "
+        "ocurrencias se validan contra las reservas existentes en una sola "
+        "operación y se insertan en una única transacción"
+    ),
+)
+def create_serie(
+    serie_data: ReservaSerieCreate,
+    db: Session = Depends(get_db),
+    current_user: PersonaModel = Depends(get_current_user),
+):
+    """Crear una serie de reservas recurrentes de sala."""
+    if not current_user.is_admin and serie_data.id_persona != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No puedes crear reservas para otra persona",
+        )
+    try:
+        return ReservaSerieService.create_serie(db, serie_data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+
+@router.get("/", response_model=List[ReservaSerie])
+def get_series(
+    skip: int = 0,
+    limit: int = MAX_LIMIT,
+    db: Session = Depends(get_db),
+    current_user: PersonaModel = Depends(get_current_user),
+):
+    """Obtener series de reservas (admin: todas, no admin: las propias)."""
+    if limit > MAX_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El límite máximo es {MAX_LIMIT} registros",
+        )
+    if current_user.is_admin:
+        return ReservaSerieService.get_series(db, skip, limit)
+    return ReservaSerieService.get_series_by_persona(db, current_user.id, skip, limit)
+
+
+@router.get("/{serie_id}", response_model=ReservaSerie)
+def get_serie(
+    serie_id: int,
+    db: Session = Depends(get_db),
+    current_user: PersonaModel = Depends(get_current_user),
+):
+    """Obtener una serie de reservas por ID."""
+    return _obtener_serie_autorizada(db, serie_id, current_user)
+
+
+@router.get("/{serie_id}/ocurrencias", response_model=List[Reserva])
+def get_ocurrencias(
+    serie_id: int,
+    db: Session = Depends(get_db),
+    current_user: PersonaModel = Depends(get_current_user),
+):
+    """Obtener las ocurrencias de una serie ordenadas por fecha."""
+    _obtener_serie_autorizada(db, serie_id, current_user)
+    return ReservaSerieService.get_ocurrencias(db, serie_id)
+
+
+@router.put("/{serie_id}", response_model=ReservaSerieResult)
+def update_serie(
+    serie_id: int,
+    serie_data: ReservaSerieUpdate,
+    db: Session = Depends(get_db),
+    current_user: PersonaModel = Depends(get_current_user),
+):
+    """Modificar el horario o la persona de todas las ocurrencias de una serie."""
+    _obtener_serie_autorizada(db, serie_id, current_user)
+    if (
+        not current_user.is_admin
+        and serie_data.id_persona is not None
+        and serie_data.id_persona != current_user.id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No puedes asignar reservas a otra persona",
+        )
+    try:
+        return ReservaSerieService.update_serie(db, serie_id, serie_data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+
+@router.delete("/{serie_id}", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_serie(
+    serie_id: int,
+    desde: Optional[datetime] = Query(
+        None, description="Cancelar solo las ocurrencias desde esta fecha"
+    ),
+    db: Session = Depends(get_db),
+    current_user: PersonaModel = Depends(get_current_user),
+):
+    """Cancelar una serie completa o sus ocurrencias a partir de una fecha."""
+    _obtener_serie_autorizada(db, serie_id, current_user)
+    ReservaSerieService.cancel_serie(db, serie_id, desde)
@@ -1,14 +1,21 @@
 """ Reservas API endpoints."""
 from datetime import datetime
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Callable, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.repositories.articulo_repository import ArticuloRepository
 from app.repositories.reserva_repository import ReservaRepository
-from app.schemas.reserva import Reserva, ReservaCreate, ReservaUpdate
-from app.services.reserva_service import ReservaService
+from app.schemas.reserva import (
+    Reserva,
+    ReservaBatchCreate,
+    ReservaBatchResult,
+    ReservaCreate,
+    ReservaUpdate,
+)
+from app.services.reserva_service import ReservaRechazadaError, ReservaService
 from app.auth.dependencies import (
     get_current_user,
 )
@@ -183,6 +190,45 @@ def _insertar_o_actualizar_articulo(db, reserva_id, articulo_id,
 
 MAX_LIMIT = 100
 
+# Paginación por cursor: la respuesta trae el cursor de la página siguiente
+# en el encabezado X-Next-Cursor; skip/limit se mantiene por compatibilidad
+ENCABEZADO_SIGUIENTE_CURSOR = "X-Next-Cursor"
+CURSOR_QUERY = Query(
+    None,
+    description=(
+        "Cursor de la página siguiente (encabezado X-Next-Cursor de la "
+        "respuesta anterior). No se combina con skip."
+    ),
+)
+
+
+def _validar_paginacion(skip: int, limit: int, cursor: Optional[str]) -> None:
+    if limit > MAX_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El límite máximo es {MAX_LIMIT} registros",
+        )
+    if cursor and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No se puede usar skip junto con cursor",
+        )
+
+
+def _pagina(response: Response, limit: int, listar: Callable[[], List]) -> List:
+    """Obtener la página e informar el cursor de la siguiente en el encabezado."""
+    try:
+        reservas = listar()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    siguiente = ReservaService.siguiente_cursor(reservas, limit)
+    if siguiente:
+        response.headers[ENCABEZADO_SIGUIENTE_CURSOR] = siguiente
+    return reservas
+
+
 router = APIRouter(prefix="/reservas", tags=["reservas"])
 
 
@@ -193,7 +239,7 @@ router = APIRouter(prefix="/reservas", tags=["reservas"])
     summary="Crear nueva reserva",
     description="Crear una reserva de sala o artículo con validación automática",
 )
-def create_reserva(
+async def create_reserva(
     reserva_data: ReservaCreate,
     db: Session = Depends(get_db),
     current_user: PersonaModel = Depends(get_current_user),
@@ -206,15 +252,63 @@ def create_reserva(
             detail="No puedes crear reservas para otra persona",
         )
     try:
-        return ReservaService.create_reserva(db, reserva_data)
+        return await ReservaService.create_reserva_async(db, reserva_data)
+    except ReservaRechazadaError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+            headers={"X-Reserva-Motivo": e.codigo},
+        ) from e
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+
+@router.post(
+    "/batch",
+    response_model=ReservaBatchResult,
+    summary="Crear lote de reservas",
+    description=(
+        "Crear varias reservas en una sola operación. El lote se valida en "
+        "conjunto contra las reservas existentes y contra sí mismo; las "
+        "reservas válidas se insertan en una única transacción y se informa "
+        "el resultado de cada una"
+    ),
+)
+async def create_reservas_batch(
+    batch: ReservaBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: PersonaModel = Depends(get_current_user),
+):
+    """Crear un lote de reservas con resultado individual por reserva."""
+    # Permitir que solo admin cree reservas para terceros
+    if not current_user.is_admin and any(
+        reserva.id_persona != current_user.id for reserva in batch.reservas
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No puedes crear reservas para otra persona",
+        )
+    try:
+        resultados = await ReservaService.create_reservas_bulk_async(db, batch.reservas)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    creadas = sum(1 for resultado in resultados if resultado["error"] is None)
+    return {
+        "total": len(resultados),
+        "creadas": creadas,
+        "rechazadas": len(resultados) - creadas,
+        "resultados": [
+            {**resultado, "ok": resultado["error"] is None} for resultado in resultados
+        ],
+    }
 
 
 @router.get("/", response_model=List[Reserva])
 def get_reservas(
+    response: Response,
     skip: int = 0,
     limit: int = MAX_LIMIT,
+    cursor: Optional[str] = CURSOR_QUERY,
     db: Session = Depends(get_db),
     current_user: PersonaModel = Depends(get_current_user),
 ):
@@ -223,18 +317,19 @@ def get_reservas(
     - Admin: ve todas las reservas
     - No admin: solo ve sus propias reservas
     """
-    if limit > MAX_LIMIT:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"El límite máximo es {MAX_LIMIT} registros",
-        )
+    _validar_paginacion(skip, limit, cursor)
 
     if current_user.is_admin:
-        return ReservaService.get_reservas(db, skip, limit)
-    else:
-        return ReservaService.get_reservas_by_persona(
-            db, current_user.id, skip, limit
+        return _pagina(
+            response, limit,
+            lambda: ReservaService.get_reservas(db, skip, limit, cursor),
         )
+    return _pagina(
+        response, limit,
+        lambda: ReservaService.get_reservas_by_persona(
+            db, current_user.id, skip, limit, cursor
+        ),
+    )
 
 
 @router.get("/{reserva_id}", response_model=Reserva)
@@ -264,62 +359,76 @@ def get_reserva(
 
 @router.get("/persona/{persona_id}", response_model=List[Reserva])
 def get_reservas_by_persona(
-    persona_id: int, skip: int = 0, limit: int = MAX_LIMIT, db: Session = Depends(get_db)
+    persona_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = MAX_LIMIT,
+    cursor: Optional[str] = CURSOR_QUERY,
+    db: Session = Depends(get_db),
 ):
     """Obtener reservas de una persona específica."""
-    if limit > MAX_LIMIT:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"El límite máximo es {MAX_LIMIT} registros",
-        )
+    _validar_paginacion(skip, limit, cursor)
 
-    return ReservaService.get_reservas_by_persona(db, persona_id, skip, limit)
+    return _pagina(
+        response, limit,
+        lambda: ReservaService.get_reservas_by_persona(
+            db, persona_id, skip, limit, cursor
+        ),
+    )
 
 
 @router.get("/sala/{sala_id}", response_model=List[Reserva])
 def get_reservas_by_sala(
-    sala_id: int, skip: int = 0, limit: int = MAX_LIMIT, db: Session = Depends(get_db)
+    sala_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = MAX_LIMIT,
+    cursor: Optional[str] = CURSOR_QUERY,
+    db: Session = Depends(get_db),
 ):
     """Obtener reservas de una sala específica."""
-    if limit > MAX_LIMIT:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"El límite máximo es {MAX_LIMIT} registros",
-        )
+    _validar_paginacion(skip, limit, cursor)
 
-    return ReservaService.get_reservas_by_sala(db, sala_id, skip, limit)
+    return _pagina(
+        response, limit,
+        lambda: ReservaService.get_reservas_by_sala(db, sala_id, skip, limit, cursor),
+    )
 
 
 @router.get("/articulo/{articulo_id}", response_model=List[Reserva])
 def get_reservas_by_articulo(
-    articulo_id: int, skip: int = 0, limit: int = MAX_LIMIT, db: Session = Depends(get_db)
+    articulo_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = MAX_LIMIT,
+    cursor: Optional[str] = CURSOR_QUERY,
+    db: Session = Depends(get_db),
 ):
     """Obtener reservas de un artículo específico."""
-    if limit > MAX_LIMIT:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"El límite máximo es {MAX_LIMIT} registros",
-        )
+    _validar_paginacion(skip, limit, cursor)
 
-    return ReservaService.get_reservas_by_articulo(db, articulo_id, skip, limit)
+    return _pagina(
+        response, limit,
+        lambda: ReservaService.get_reservas_by_articulo(
+            db, articulo_id, skip, limit, cursor
+        ),
+    )
 
 
 @router.get("/fechas/rango", response_model=List[Reserva])
 def get_reservas_by_fecha_range(
+    response: Response,
     fecha_inicio: datetime = Query(..., description="Fecha y hora de inicio del rango"),
     fecha_fin: Optional[datetime] = Query(
         None, description="Fecha y hora de fin del rango"
     ),
     skip: int = 0,
     limit: int = MAX_LIMIT,
+    cursor: Optional[str] = CURSOR_QUERY,
     db: Session = Depends(get_db),
 ):
     """Obtener reservas en un rango de fechas."""
-    if limit > MAX_LIMIT:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"El límite máximo es {MAX_LIMIT} registros",
-        )
+    _validar_paginacion(skip, limit, cursor)
 
     if fecha_fin and fecha_fin <= fecha_inicio:
         raise HTTPException(
@@ -327,8 +436,11 @@ def get_reservas_by_fecha_range(
             detail="La fecha de fin debe ser posterior a la fecha de inicio",
         )
 
-    return ReservaService.get_reservas_by_fecha_range(
-        db, fecha_inicio, fecha_fin, skip, limit
+    return _pagina(
+        response, limit,
+        lambda: ReservaService.get_reservas_by_fecha_range(
+            db, fecha_inicio, fecha_fin, skip, limit, cursor
+        ),
     )
 
 
@@ -359,7 +471,7 @@ def check_sala_availability(
 
 
 @router.put("/{reserva_id}", response_model=Reserva)
-def update_reserva(
+async def update_reserva(
     reserva_id: int,
     reserva_data: ReservaUpdate,
     db: Session = Depends(get_db),
@@ -371,7 +483,7 @@ def update_reserva(
     - No admin: solo puede modificar sus reservas
     """
     # Asegurar que el usuario tenga permisos sobre la reserva
-    existing = ReservaService.get_reserva_by_id(db, reserva_id)
+    existing = await run_in_threadpool(ReservaService.get_reserva_by_id, db, reserva_id)
     if not existing:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -383,7 +495,9 @@ def update_reserva(
             detail="No tienes permisos para modificar esta reserva",
         )
     try:
-        reserva = ReservaService.update_reserva(db, reserva_id, reserva_data)
+        reserva = await ReservaService.update_reserva_async(
+            db, reserva_id, reserva_data
+        )
         if not reserva:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -505,6 +619,7 @@ def add_articulo_to_reserva(
                                     cantidad, modo, cantidad_ya_asignada,
                                     articulo, total_reservado_otras)
     db.commit()
+    ReservaRepository.notificar_cambio()
     return {"message": "Artículo agregado a la reserva exitosamente"}
 
 
@@ -541,6 +656,7 @@ def remove_articulo_from_reserva(
         {"reserva_id": reserva_id, "articulo_id": articulo_id},
     )
     db.commit()
+    ReservaRepository.notificar_cambio()
 
     # Determinar si alguna fila fue afectada (compatibilidad con SQLAlchemy)
     rowcount = getattr(result, "rowcount", None)
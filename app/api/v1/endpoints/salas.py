@@ -9,12 +9,11 @@ from typing import List
 from fastapi import APIRouter, status, Depends
 from fastapi.responses import JSONResponse
 from httpx import HTTPError
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from datetime import datetime
-from zoneinfo import ZoneInfo
 from app.core.database import get_db
 from app.services.java_client import JavaServiceClient
+from app.services.ocupacion_actual import ocupacion_actual
 from app.schemas.sala import Sala, SalaCreate, SalaUpdate
 
 
@@ -127,20 +126,10 @@ async def get_disponibilidad_salas(db: Session = Depends(get_db)):
         if not salas:
             return {}
         
-        # Obtener reservas activas AHORA para salas
-        ahora_local = datetime.now(ZoneInfo("America/Argentina/Buenos_Aires"))
-        
-        query = text("""
-            SELECT DISTINCT id_sala
-            FROM reservas
-            WHERE id_sala IS NOT NULL
-            AND fecha_hora_inicio <= CURRENT_TIMESTAMP
-            AND fecha_hora_fin >= CURRENT_TIMESTAMP
-        """)
-        
-        result = db.execute(query)
-        salas_ocupadas = {row[0] for row in result}
-        
+        # Salas con reservas activas AHORA (foto compartida de ocupación actual)
+        ocupacion = await run_in_threadpool(ocupacion_actual.obtener, db)
+        salas_ocupadas = ocupacion["salas_ocupadas"]
+
         # Crear diccionario de disponibilidad
         disponibilidad = {}
         for sala in salas:
@@ -1,19 +1,36 @@
 """Stats endpoints for the API."""
 
-from collections import Counter
 from datetime import datetime, timedelta
+from typing import List
 from zoneinfo import ZoneInfo
+import numpy as np
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from fastapi import APIRouter, Depends
 from app.core.database import get_db
 from app.auth.dependencies import get_current_admin_user
 from app.models.reserva import Reserva
+from app.models.reserva_diaria import ReservaDiaria
 from app.models.sala import Sala
 from app.models.articulo import Articulo
 from app.models.persona import Persona
+from app.repositories.reserva_diaria_repository import ReservaDiariaRepository
+from app.repositories.snapshot_reservas import (
+    EPOCA,
+    SEGUNDOS_POR_DIA,
+    a_segundo,
+    snapshot_reservas,
+)
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
+
+def _mas_frecuentes(ids: np.ndarray, cantidad: int) -> List[int]:
+    """IDs más repetidos, de mayor a menor (a igual cantidad, menor ID primero)."""
+    valores, veces = np.unique(ids, return_counts=True)
+    return valores[np.argsort(-veces, kind="stable")][:cantidad].tolist()
+
+
 # Nuevo endpoint para actividad detallada (dashboard)
 @router.get("/actividad_detallada")
 def stats_actividad_detallada(
@@ -22,26 +39,20 @@ def stats_actividad_detallada(
 ):
     """Reservas activas y pasadas por día en los últimos 7 días."""
     hoy = datetime.now().date()
-    reservas = db.query(Reserva).all()
+    reservas = snapshot_reservas.columnas(db)
     dias = [(hoy - timedelta(days=i)) for i in range(6, -1, -1)]
-    activas = []
-    pasadas = []
-    for d in dias:
-        activas_dia = 0
-        pasadas_dia = 0
-        for r in reservas:
-            # Reserva activa: está en curso en ese día
-            if r.fecha_hora_inicio.date() <= d <= r.fecha_hora_fin.date():
-                activas_dia += 1
-            # Reserva pasada: terminó antes de ese día
-            elif r.fecha_hora_fin.date() < d:
-                pasadas_dia += 1
-        activas.append(activas_dia)
-        pasadas.append(pasadas_dia)
+    # Días desde EPOCA: una fila por día consultado contra todas las reservas
+    numeros = np.array([(d - EPOCA.date()).days for d in dias])[:, np.newaxis]
+    dia_inicio = reservas["inicio"] // SEGUNDOS_POR_DIA
+    dia_fin = reservas["fin"] // SEGUNDOS_POR_DIA
+    # Reserva activa: está en curso en ese día
+    activas = ((dia_inicio <= numeros) & (numeros <= dia_fin)).sum(axis=1)
+    # Reserva pasada: terminó antes de ese día
+    pasadas = (dia_fin < numeros).sum(axis=1)
     return {
         "dias": [str(d) for d in dias],
-        "activas": activas,
-        "pasadas": pasadas
+        "activas": activas.tolist(),
+        "pasadas": pasadas.tolist()
     }
 @router.get("/actividad")
 def stats_actividad(
@@ -50,13 +61,10 @@ def stats_actividad(
 ):
     """Reservas por día en los últimos 7 días."""
     hoy = datetime.now().date()
-    reservas = db.query(Reserva).all()
     dias = [(hoy - timedelta(days=i)) for i in range(6, -1, -1)]
     actividad = {str(d): 0 for d in dias}
-    for r in reservas:
-        dia = r.fecha_hora_inicio.date()
-        if dia in actividad:
-            actividad[str(dia)] += 1
+    for fila in ReservaDiariaRepository.get_por_dia(db, dias[0], hoy):
+        actividad[str(fila.fecha)] = int(fila.cantidad)
     return {"actividad": actividad}
 
 @router.get("/reservas")
@@ -65,47 +73,30 @@ def stats_reservas(
     _current_user=Depends(get_current_admin_user)
 ):
     """Estadísticas de reservas."""
-    reservas = db.query(Reserva).all()
-    now = datetime.now()
-    total = len(reservas)
-    reservas_activas = len([
-        r for r in reservas if r.fecha_hora_inicio <= now and r.fecha_hora_fin >= now
-    ])
-    reservas_futuras = len([
-        r for r in reservas if r.fecha_hora_inicio > now
-    ])
+    reservas = snapshot_reservas.columnas(db)
+    now = a_segundo(datetime.now())
+    inicio, fin = reservas["inicio"], reservas["fin"]
+    id_sala, id_articulo = reservas["id_sala"], reservas["id_articulo"]
+    activas = (inicio <= now) & (fin >= now)
+    futuras = inicio > now
+    de_sala = id_sala > 0
     # Salas más populares
-    sala_ids = [r.sala_id for r in reservas if r.sala_id is not None]
-    sala_counter = Counter(sala_ids)
-    sala_counts = sala_counter.most_common(3)
-    salas_populares = [f"Sala {sid}" for sid, _ in sala_counts if sid]
+    salas_populares = [
+        f"Sala {sid}" for sid in _mas_frecuentes(id_sala[de_sala], 3)
+    ]
 
-    # Total salas activas y futuras usando Python puro
-    salas_activas = len(
-        set(
-            r.sala_id
-            for r in reservas
-            if r.fecha_hora_inicio <= now
-            and r.fecha_hora_fin >= now
-            and r.sala_id is not None
-        )
-    )
-    salas_futuras = len(
-        set(
-            r.sala_id
-            for r in reservas
-            if r.fecha_hora_inicio > now and r.sala_id is not None
-        )
-    )
+    # Total salas activas y futuras
+    salas_activas = np.unique(id_sala[activas & de_sala]).size
+    salas_futuras = np.unique(id_sala[futuras & de_sala]).size
     # Artículos más populares
-    articulo_ids = [r.articulo_id for r in reservas if r.articulo_id is not None]
-    articulo_counter = Counter(articulo_ids)
-    articulo_counts = articulo_counter.most_common(2)
-    articulos_populares = [f"Artículo {aid}" for aid, _ in articulo_counts if aid]
+    articulos_populares = [
+        f"Artículo {aid}"
+        for aid in _mas_frecuentes(id_articulo[id_articulo > 0], 2)
+    ]
     return {
-        "totalReservas": total,
-        "reservasActivas": reservas_activas,
-        "reservasFuturas": reservas_futuras,
+        "totalReservas": len(inicio),
+        "reservasActivas": int(np.count_nonzero(activas)),
+        "reservasFuturas": int(np.count_nonzero(futuras)),
         "salasPopulares": salas_populares or ["Sin reservas de salas"],
         "articulosPopulares": articulos_populares or ["Sin reservas de artículos"],
         "salasActivas": salas_activas or 0,
@@ -123,14 +114,10 @@ def stats_uso(
     total_salas = db.query(Sala).count()
     total_reservas = db.query(Reserva).count()
     hoy = datetime.now().date()
-    reservas = db.query(Reserva).all()
-    reservas_hoy = len(
-        set(
-            r.id_sala
-            for r in reservas
-            if r.fecha_hora_inicio.date() == hoy and r.id_sala is not None
-        )
-    )
+    reservas_hoy = db.query(func.count(func.distinct(ReservaDiaria.id_sala))).filter(
+        ReservaDiaria.fecha == hoy,
+        ReservaDiaria.id_sala.isnot(None)
+    ).scalar() or 0
     salas_libres = max(0, total_salas - reservas_hoy)
     disponibilidad_promedio = (
         int((salas_libres / total_salas) * 100) if total_salas > 0 else 0
@@ -147,14 +134,7 @@ def stats_uso(
 def reservas_activas_endpoint(db: Session = Depends(get_db)):
     """Devuelve el número de reservas activas (para dashboard)."""
     ahora_local = datetime.now(ZoneInfo("America/Argentina/Buenos_Aires"))
-    reservas = db.query(Reserva).all()
-    reservas_activas = []
-    for r in reservas:
-        fin = r.fecha_hora_fin
-        if fin.tzinfo is None:
-            if fin >= ahora_local.replace(tzinfo=None):
-                reservas_activas.append(r)
-        else:
-            if fin.astimezone(ZoneInfo("America/Argentina/Buenos_Aires")) >= ahora_local:
-                reservas_activas.append(r)
-    return {"reservasActivas": len(reservas_activas)}
+    # Las fechas de la foto son naive y representan hora local ART
+    fines = snapshot_reservas.columnas(db)["fin"]
+    ahora = a_segundo(ahora_local.replace(tzinfo=None))
+    return {"reservasActivas": int(np.count_nonzero(fines >= ahora))}
@@ -8,6 +8,7 @@ from fastapi import APIRouter
 from app.api.v1.endpoints import (
     articulos_router,
     personas_router,
+    reserva_series_router,
     reservas_router,
     salas_router,
     stats_router,  # <-- Agregado
@@ -23,6 +24,8 @@ api_router.include_router(auth_router)
 api_router.include_router(personas_router)
 api_router.include_router(articulos_router)
 api_router.include_router(salas_router)
+# Las series van antes que reservas para que /reservas/series no se tome como ID
+api_router.include_router(reserva_series_router)
 api_router.include_router(reservas_router)
 api_router.include_router(stats_router)  # <-- Agregado
 api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
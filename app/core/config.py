@@ -40,6 +40,92 @@ class Settings:
     # Integración con Java Service
     java_service_url: str = os.getenv("JAVA_SERVICE_URL", "http://localhost:8080")
 
+    # Pool de conexiones del cliente HTTP compartido hacia el Java Service
+    java_http_max_connections: int = int(os.getenv("JAVA_HTTP_MAX_CONNECTIONS", "100"))
+    java_http_max_keepalive: int = int(os.getenv("JAVA_HTTP_MAX_KEEPALIVE", "20"))
+    java_http_keepalive_expiry: float = float(
+        os.getenv("JAVA_HTTP_KEEPALIVE_EXPIRY", "30")
+    )
+    java_http2: bool = os.getenv("JAVA_HTTP2", "False").lower() == "true"
+
+    # Caché de los catálogos de salas y artículos del Java Service (segundos).
+    # Vencido el TTL, la copia se sigue sirviendo durante STALE mientras se
+    # refresca en segundo plano. TTL=0 desactiva la caché.
+    java_catalog_ttl: float = float(os.getenv("JAVA_CATALOG_TTL", "30"))
+    java_catalog_stale: float = float(os.getenv("JAVA_CATALOG_STALE", "300"))
+
+    # Circuit breaker hacia el Java Service: fallas consecutivas que abren el
+    # circuito y segundos que permanece abierto antes de una llamada de prueba
+    java_cb_failure_threshold: int = int(os.getenv("JAVA_CB_FAILURE_THRESHOLD", "5"))
+    java_cb_open_seconds: float = float(os.getenv("JAVA_CB_OPEN_SECONDS", "30"))
+
+    # Chequeo de salud del Java Service: ruta consultada, intervalo de la
+    # sonda en segundo plano (0 la desactiva) y vigencia de un éxito reciente
+    java_health_path: str = os.getenv("JAVA_HEALTH_PATH", "/api/salas")
+    java_health_interval: float = float(os.getenv("JAVA_HEALTH_INTERVAL", "10"))
+    java_health_ttl: float = float(os.getenv("JAVA_HEALTH_TTL", "10"))
+
+    # Índice en memoria de conflictos de salas: off | index | verify
+    reserva_index_mode: str = os.getenv("RESERVA_INDEX_MODE", "index").lower()
+
+    # Segundos entre recargas del índice de salas desde la base, para ver lo
+    # escrito por otros workers o por fuera de la API (0 las desactiva)
+    sala_index_reconciliar: float = float(
+        os.getenv("SALA_INDEX_RECONCILIAR", "60")
+    )
+
+    # Delegar la detección de solapamientos de salas a la restricción de
+    # exclusión de PostgreSQL (migración 0002) en lugar de consultar antes:
+    # true | false | auto (al arrancar, se activa si la restricción existe)
+    sala_exclusion_constraint_modo: str = os.getenv(
+        "SALA_EXCLUSION_CONSTRAINT", "auto"
+    ).lower()
+    sala_exclusion_constraint: bool = sala_exclusion_constraint_modo == "true"
+
+    # Pool de conexiones de cada motor (síncrono y asíncrono), por worker:
+    # conexiones permanentes, extra bajo carga, segundos de espera máxima por
+    # una conexión, segundos tras los que se recicla y verificación previa
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+
+    # Aplicar las migraciones de Alembic (upgrade head) al arrancar la API
+    db_migrate_on_startup: bool = (
+        os.getenv("DB_MIGRATE_ON_STARTUP", "True").lower() == "true"
+    )
+
+    # Segundos en que la foto de ocupación actual (artículos y salas en uso
+    # ahora) se comparte entre las pantallas que la consultan (0 la desactiva)
+    ocupacion_actual_ttl: float = float(os.getenv("OCUPACION_ACTUAL_TTL", "5"))
+
+    # Caché de resultados de analítica y predicción por worker: segundos en
+    # que se reutiliza un resultado (0 la desactiva) y resultados guardados
+    analytics_cache_ttl: float = float(os.getenv("ANALYTICS_CACHE_TTL", "60"))
+    analytics_cache_max_entradas: int = int(
+        os.getenv("ANALYTICS_CACHE_MAX_ENTRADAS", "256")
+    )
+
+    # Segundos entre reconciliaciones de la foto en memoria de reservas con
+    # la base de datos (0 las desactiva; se sigue actualizando en cada escritura)
+    snapshot_reservas_reconciliar: float = float(
+        os.getenv("SNAPSHOT_RESERVAS_RECONCILIAR", "300")
+    )
+
+    # Modelo de pronóstico de demanda: archivo .npz donde se guarda ("" no lo
+    # guarda) y escrituras de reservas tras las que se reajusta (0 solo lo
+    # reajusta una vez por día)
+    modelo_demanda_ruta: str = os.getenv(
+        "MODELO_DEMANDA_RUTA", "data/modelo_demanda.npz"
+    )
+    modelo_demanda_reajuste_cambios: int = int(
+        os.getenv("MODELO_DEMANDA_REAJUSTE_CAMBIOS", "500")
+    )
+
+    # Reservas leídas por lote del cursor al exportar reportes CSV/NDJSON
+    exportacion_tamano_lote: int = int(os.getenv("EXPORTACION_TAMANO_LOTE", "1000"))
+
     @property
     def database_url(self) -> str:
         """Construir URL de base de datos"""
@@ -62,6 +148,11 @@ class Settings:
             f"{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    @property
+    def async_database_url(self) -> str:
+        """Construir URL de base de datos para el motor asíncrono (asyncpg)"""
+        return self.database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
     def validate_required_settings(self) -> None:
         """Validar que todas las configuraciones críticas estén presentes"""
         missing_vars = []
@@ -1,22 +1,63 @@
-
 """
 Configuración y conexión a la base de datos.
 
 Este módulo configura la conexión a PostgreSQL usando SQLAlchemy
 y proporciona la sesión de base de datos para toda la aplicación.
+
+Hay dos motores sobre la misma base: el síncrono (psycopg2), para los
+endpoints `def` que FastAPI ejecuta en su pool de hilos, y el asíncrono
+(asyncpg), para los endpoints `async def`. Un endpoint `async def` que usa
+la sesión síncrona bloquea el event loop mientras dura cada consulta y,
+con él, todas las demás peticiones en curso.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.core.config import settings
+from app.core.metricas_pool import (
+    AsyncQueuePoolConMetricas,
+    MetricasPool,
+    QueuePoolConMetricas,
+    instrumentar_pool,
+)
 
 # Base para los modelos
 Base = declarative_base()
 
+# Parámetros del pool, iguales para ambos motores (ver DB_POOL_* en .env)
+OPCIONES_POOL = {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_timeout": settings.db_pool_timeout,
+    "pool_recycle": settings.db_pool_recycle,
+    "pool_pre_ping": settings.db_pool_pre_ping,
+}
+
 # Crear motor de base de datos usando configuración segura
-engine = create_engine(settings.database_url, echo=settings.debug)
+engine = create_engine(
+    settings.database_url,
+    echo=settings.debug,
+    poolclass=QueuePoolConMetricas,
+    **OPCIONES_POOL,
+)
+metricas_pool = instrumentar_pool(engine, MetricasPool("sync"))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Motor asíncrono: no conecta hasta la primera consulta
+async_engine = create_async_engine(
+    settings.async_database_url,
+    echo=settings.debug,
+    poolclass=AsyncQueuePoolConMetricas,
+    **OPCIONES_POOL,
+)
+metricas_pool_async = instrumentar_pool(async_engine, MetricasPool("async"))
+
+# Sin expirar al confirmar: en async no hay carga diferida de atributos
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 # Dependency para obtener la sesión de base de datos
 def get_db():
@@ -26,3 +67,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Proveer una sesión asíncrona a los endpoints `async def`"""
+    async with AsyncSessionLocal() as db:
+        yield db
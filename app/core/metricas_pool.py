@@ -0,0 +1,148 @@
+"""
+Métricas del pool de conexiones a la base de datos.
+
+Cada motor usa un QueuePool que mide cuánto espera cada petición para
+obtener una conexión, y listeners de checkout/checkin que registran
+cuántas conexiones hay en uso y cuántas son de desborde (max_overflow).
+Con esto se ve si las peticiones hacen cola por conexiones y se puede
+dimensionar DB_POOL_SIZE según la cantidad de workers en lugar de adivinar.
+
+Las métricas son por proceso: con varios workers, cada uno informa su pool.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Esperas por conexión a partir de las cuales se considera que hubo cola
+UMBRAL_ESPERA_SEGUNDOS = 0.01
+
+
+class MetricasPool:
+    """Contadores de uso de un pool de conexiones (seguros entre hilos)."""
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self._lock = threading.Lock()
+        self._pool: Optional[QueuePool] = None
+        self.checkouts = 0
+        self.esperas_en_cola = 0
+        self.timeouts = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+        self.en_uso = 0
+        self.en_uso_maximo = 0
+        self.desborde_maximo = 0
+
+    def registrar_espera(self, segundos: float) -> None:
+        """Registrar lo que tardó en obtenerse una conexión del pool."""
+        with self._lock:
+            self.espera_total += segundos
+            self.espera_maxima = max(self.espera_maxima, segundos)
+            if segundos >= UMBRAL_ESPERA_SEGUNDOS:
+                self.esperas_en_cola += 1
+
+    def registrar_timeout(self) -> None:
+        """Registrar una petición que agotó DB_POOL_TIMEOUT sin conexión."""
+        with self._lock:
+            self.timeouts += 1
+
+    def registrar_checkout(self, desborde: int) -> None:
+        """Registrar una conexión entregada y el desborde actual del pool."""
+        with self._lock:
+            self.checkouts += 1
+            self.en_uso += 1
+            self.en_uso_maximo = max(self.en_uso_maximo, self.en_uso)
+            self.desborde_maximo = max(self.desborde_maximo, desborde)
+
+    def registrar_checkin(self) -> None:
+        """Registrar una conexión devuelta al pool."""
+        with self._lock:
+            self.en_uso = max(0, self.en_uso - 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Resumen de las métricas y del estado actual del pool."""
+        with self._lock:
+            resumen = {
+                "checkouts": self.checkouts,
+                "esperas_en_cola": self.esperas_en_cola,
+                "timeouts": self.timeouts,
+                "espera_promedio_ms": round(
+                    self.espera_total / self.checkouts * 1000, 3
+                ) if self.checkouts else 0.0,
+                "espera_maxima_ms": round(self.espera_maxima * 1000, 3),
+                "en_uso": self.en_uso,
+                "en_uso_maximo": self.en_uso_maximo,
+                "desborde_maximo": self.desborde_maximo,
+            }
+        pool = self._pool
+        if pool is not None:
+            resumen.update(
+                {
+                    "tamano": pool.size(),
+                    "conexiones_libres": pool.checkedin(),
+                    "desborde": max(0, pool.overflow()),
+                    "max_overflow": pool._max_overflow,
+                    "timeout_segundos": pool.timeout(),
+                }
+            )
+        return resumen
+
+
+class _EsperaMedida:
+    """Mide en _do_get la espera por conexión y la informa a sus métricas."""
+
+    metricas: Optional[MetricasPool] = None
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexion = super()._do_get()
+        except exc.TimeoutError:
+            if self.metricas is not None:
+                self.metricas.registrar_timeout()
+            raise
+        if self.metricas is not None:
+            self.metricas.registrar_espera(time.perf_counter() - inicio)
+        return conexion
+
+    def recreate(self):
+        # dispose() crea un pool nuevo: conservar las métricas
+        nuevo = super().recreate()
+        nuevo.metricas = self.metricas
+        if self.metricas is not None:
+            self.metricas._pool = nuevo
+        return nuevo
+
+
+class QueuePoolConMetricas(_EsperaMedida, QueuePool):
+    """QueuePool del motor síncrono con espera por conexión medida."""
+
+
+class AsyncQueuePoolConMetricas(_EsperaMedida, AsyncAdaptedQueuePool):
+    """QueuePool del motor asíncrono con espera por conexión medida."""
+
+
+def instrumentar_pool(motor: Any, metricas: MetricasPool) -> MetricasPool:
+    """
+    Asociar las métricas al pool de un motor y escuchar sus eventos.
+
+    Args:
+        motor: Engine o AsyncEngine creado con uno de los pools de este módulo
+        metricas: Contadores donde registrar el uso del pool
+    """
+    motor = getattr(motor, "sync_engine", motor)
+    pool = motor.pool
+    pool.metricas = metricas
+    metricas._pool = pool
+
+    @event.listens_for(pool, "checkout")
+    def _al_entregar(*_args):
+        metricas.registrar_checkout(max(0, motor.pool.overflow()))
+
+    @event.listens_for(pool, "checkin")
+    def _al_devolver(*_args):
+        metricas.registrar_checkin()
+
+    return metricas
@@ -0,0 +1,44 @@
+"""
+Aplicación de las migraciones de Alembic desde la aplicación.
+
+Al arrancar, la API lleva la base a la última revisión (`alembic upgrade
+head`) en lugar de crear las tablas con Base.metadata.create_all, de modo
+que los índices y restricciones de las migraciones existan también en las
+instalaciones que nunca ejecutaron Alembic a mano. Con varios workers,
+migrations/env.py toma un pg_advisory_lock: uno aplica las migraciones y
+los demás esperan y encuentran la base ya en head.
+"""
+from pathlib import Path
+from typing import Optional
+from alembic import command
+from alembic.config import Config
+from app.core.config import settings
+
+DIRECTORIO_MIGRACIONES = Path(__file__).resolve().parents[2] / "migrations"
+
+
+def configuracion_alembic(url: Optional[str] = None) -> Config:
+    """
+    Armar la configuración de Alembic sin leer alembic.ini.
+
+    Sin archivo .ini, env.py no reconfigura el logging de la aplicación.
+
+    Args:
+        url: URL de la base (por defecto la de la configuración)
+    """
+    config = Config()
+    config.set_main_option("script_location", str(DIRECTORIO_MIGRACIONES))
+    # configparser interpola "%": escaparlo por si la clave viene codificada
+    url = (url or settings.database_url).replace("%", "%%")
+    config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def aplicar_migraciones(url: Optional[str] = None) -> None:
+    """
+    Aplicar todas las migraciones pendientes (alembic upgrade head).
+
+    Args:
+        url: URL de la base (por defecto la de la configuración)
+    """
+    command.upgrade(configuracion_alembic(url), "head")
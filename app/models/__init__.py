@@ -3,10 +3,13 @@
 Modelos de datos del Sistema de Reservas.
 
 Este paquete contiene todos los modelos SQLAlchemy que representan
-las entidades del sistema: Persona, Articulo, Sala y Reserva.
+las entidades del sistema: Persona, Articulo, Sala, Reserva y ReservaSerie,
+y la tabla de hechos ReservaDiaria.
 """
 from .articulo import Articulo
 from .persona import Persona
 from .reserva import Reserva
+from .reserva_diaria import ReservaDiaria
+from .reserva_serie import ReservaSerie
 from .sala import Sala
-__all__ = ["Persona", "Articulo", "Sala", "Reserva"]
+__all__ = ["Persona", "Articulo", "Sala", "Reserva", "ReservaSerie", "ReservaDiaria"]
@@ -8,12 +8,13 @@ realizadas por personas para artículos o salas específicas.
 from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
-from sqlalchemy import DateTime, ForeignKey, Integer
+from sqlalchemy import DateTime, ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base
 if TYPE_CHECKING:
     from app.models.articulo import Articulo
     from app.models.persona import Persona
+    from app.models.reserva_serie import ReservaSerie
     from app.models.sala import Sala
 
 
@@ -27,6 +28,18 @@ class Reserva(Base):
     """
 
     __tablename__ = "reservas"
+    __table_args__ = (
+        # Paginación por cursor (migración 0003)
+        Index("ix_reservas_inicio_id", "fecha_hora_inicio", "id"),
+        Index("ix_reservas_persona_inicio_id", "id_persona", "fecha_hora_inicio", "id"),
+        Index("ix_reservas_sala_inicio_id", "id_sala", "fecha_hora_inicio", "id"),
+        Index(
+            "ix_reservas_articulo_inicio_id", "id_articulo", "fecha_hora_inicio", "id"
+        ),
+        # Ocupación por rango horario (migración 0004); los conflictos de sala
+        # y el stock de artículos usan los índices de sala y artículo de arriba
+        Index("ix_reservas_fin_inicio", "fecha_hora_fin", "fecha_hora_inicio"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     id_articulo: Mapped[Optional[int]] = mapped_column(
@@ -40,11 +53,18 @@ class Reserva(Base):
     )
     fecha_hora_inicio: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     fecha_hora_fin: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    id_serie: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        ForeignKey("reserva_series.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
 
     # Relaciones
     persona: Mapped[Persona] = relationship(back_populates="reservas")
     articulo: Mapped[Optional[Articulo]] = relationship(back_populates="reservas")
     sala: Mapped[Optional[Sala]] = relationship(back_populates="reservas")
+    serie: Mapped[Optional[ReservaSerie]] = relationship(back_populates="reservas")
 
     def __repr__(self):
         return (
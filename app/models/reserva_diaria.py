@@ -0,0 +1,56 @@
+"""
+Modelo de datos para la tabla de hechos diarios de reservas.
+
+Este módulo define el modelo ReservaDiaria: las reservas agregadas por día
+de inicio, sala, artículo y persona, que leen los servicios de analítica
+en lugar de recorrer la tabla reservas en cada consulta.
+"""
+from datetime import date
+from typing import Optional
+from sqlalchemy import Date, Float, Index, Integer, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+
+
+class ReservaDiaria(Base):
+    """
+    Modelo de hecho diario de reservas.
+
+    Cada fila cuenta las reservas que empiezan en `fecha` para una
+    combinación de sala, artículo y persona, y suma sus horas reservadas.
+    La mantiene ReservaDiariaRepository en la misma transacción que cada
+    alta, cambio o baja de reservas; no tiene claves foráneas porque es
+    una tabla derivada que se puede reconstruir en cualquier momento.
+
+    La combinación es única (con COALESCE, porque id_sala o id_articulo
+    siempre es NULL y los NULL no chocan en un índice único): un hecho
+    duplicado falla en lugar de inflar los totales.
+    """
+
+    __tablename__ = "reservas_diarias"
+    __table_args__ = (
+        Index("ix_reservas_diarias_fecha", "fecha"),
+        Index(
+            "uq_reservas_diarias_clave",
+            "fecha",
+            func.coalesce(text("id_sala"), 0),
+            func.coalesce(text("id_articulo"), 0),
+            "id_persona",
+            unique=True,
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    fecha: Mapped[date] = mapped_column(Date, nullable=False)
+    id_sala: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    id_articulo: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    id_persona: Mapped[int] = mapped_column(Integer, nullable=False)
+    cantidad: Mapped[int] = mapped_column(Integer, nullable=False)
+    horas: Mapped[float] = mapped_column(Float, nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<ReservaDiaria(fecha='{self.fecha}', id_sala={self.id_sala}, "
+            f"id_articulo={self.id_articulo}, id_persona={self.id_persona}, "
+            f"cantidad={self.cantidad})>"
+        )
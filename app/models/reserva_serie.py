@@ -0,0 +1,50 @@
+"""
+Modelo de datos para series de reservas recurrentes.
+
+Este módulo define el modelo ReservaSerie que agrupa las ocurrencias
+de una reserva de sala que se repite diaria o semanalmente.
+"""
+from __future__ import annotations
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
+from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.core.database import Base
+if TYPE_CHECKING:
+    from app.models.reserva import Reserva
+
+
+class ReservaSerie(Base):
+    """
+    Modelo de serie de reservas recurrentes.
+
+    Guarda la regla de recurrencia (frecuencia, intervalo, repeticiones o
+    fecha límite y fechas excluidas) a partir de la primera ocurrencia.
+    Cada ocurrencia es una Reserva común con id_serie apuntando a la serie.
+    """
+
+    __tablename__ = "reserva_series"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id_persona: Mapped[int] = mapped_column(
+        Integer, ForeignKey("personas.id"), nullable=False
+    )
+    id_sala: Mapped[int] = mapped_column(
+        Integer, ForeignKey("salas.id"), nullable=False
+    )
+    frecuencia: Mapped[str] = mapped_column(String(10), nullable=False)
+    intervalo: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    fecha_hora_inicio: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    fecha_hora_fin: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    repeticiones: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    hasta: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    excepciones: Mapped[List[str]] = mapped_column(JSON, nullable=False, default=list)
+
+    # Relación con las ocurrencias
+    reservas: Mapped[List[Reserva]] = relationship(back_populates="serie")
+
+    def __repr__(self):
+        return (
+            f"<ReservaSerie(id={self.id}, id_sala={self.id_sala}, "
+            f"frecuencia='{self.frecuencia}', intervalo={self.intervalo})>"
+        )
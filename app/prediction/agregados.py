@@ -0,0 +1,100 @@
+"""
+Agregados vectorizados sobre los que trabaja PredictionService.
+
+Las reservas llegan como arrays de inicios (segundos desde EPOCA, de la
+foto snapshot_reservas) y se agregan con NumPy: conteos por día e
+histograma día de semana × hora con np.bincount, promedios móviles con
+sumas acumuladas y puntaje z de los conteos diarios, en lugar de recorrer
+objetos Reserva con defaultdicts y varianzas calculadas a mano.
+"""
+from typing import Dict, Tuple
+import numpy as np
+from app.repositories.snapshot_reservas import (
+    SEGUNDOS_POR_DIA,
+    dias_semana,
+    horas_del_dia,
+)
+
+HORAS_POR_DIA = 24
+
+
+def conteos_por_dia(
+    inicios: np.ndarray, primer_dia: int, cantidad_dias: int
+) -> np.ndarray:
+    """
+    Contar reservas por día de inicio.
+
+    Args:
+        inicios: Inicios en segundos desde EPOCA
+        primer_dia: Primer día contado (días desde EPOCA)
+        cantidad_dias: Días contados a partir de primer_dia
+
+    Returns:
+        Array de cantidad_dias conteos; las reservas fuera del rango se ignoran
+    """
+    dia = inicios.astype(np.int64) // SEGUNDOS_POR_DIA - primer_dia
+    en_rango = (dia >= 0) & (dia < cantidad_dias)
+    return np.bincount(dia[en_rango], minlength=cantidad_dias)
+
+
+def patron_semanal(conteos: np.ndarray, primer_dia: int) -> Dict[int, float]:
+    """
+    Promedio de reservas por día de la semana (lunes = 0).
+
+    Cada día de la semana se promedia sobre las veces que aparece en el
+    período, tenga o no reservas.
+    """
+    dia_semana = dias_semana(
+        (primer_dia + np.arange(len(conteos))) * float(SEGUNDOS_POR_DIA)
+    )
+    apariciones = np.bincount(dia_semana, minlength=7)
+    totales = np.bincount(dia_semana, weights=conteos, minlength=7)
+    promedios = np.divide(
+        totales, apariciones, out=np.zeros(7), where=apariciones > 0
+    )
+    return {dia: float(promedio) for dia, promedio in enumerate(promedios)}
+
+
+def promedio_movil(serie: np.ndarray, ventana: int) -> np.ndarray:
+    """Promedios de cada `ventana` valores consecutivos (len(serie) - ventana + 1)."""
+    if ventana < 1 or len(serie) < ventana:
+        return np.zeros(0)
+    acumulada = np.concatenate(([0.0], np.cumsum(serie, dtype=np.float64)))
+    return (acumulada[ventana:] - acumulada[:-ventana]) / ventana
+
+
+def tendencia(conteos: np.ndarray) -> float:
+    """
+    Cambio relativo entre la primera y la segunda mitad del período.
+
+    Compara el promedio móvil de la primera mitad de los días con el de
+    la última (división por fecha, no por cantidad de reservas).
+    """
+    moviles = promedio_movil(conteos, len(conteos) // 2)
+    if len(moviles) < 2 or moviles[0] <= 0:
+        return 0.0
+    return float((moviles[-1] - moviles[0]) / moviles[0])
+
+
+def histograma_semana_hora(inicios: np.ndarray) -> np.ndarray:
+    """Reservas por día de la semana (filas, lunes = 0) y hora de inicio (columnas)."""
+    celda = dias_semana(inicios) * HORAS_POR_DIA + horas_del_dia(inicios)
+    return np.bincount(celda, minlength=7 * HORAS_POR_DIA).reshape(7, HORAS_POR_DIA)
+
+
+def puntaje_z(valores: np.ndarray) -> Tuple[np.ndarray, float, float]:
+    """
+    Puntaje z de cada valor respecto del promedio y la desviación poblacional.
+
+    Returns:
+        Tupla (puntajes, promedio, desviación); con desviación 0 los
+        puntajes son 0
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    if not len(valores):
+        return np.zeros(0), 0.0, 0.0
+    promedio = float(valores.mean())
+    desviacion = float(valores.std())
+    if desviacion == 0:
+        return np.zeros(len(valores)), promedio, desviacion
+    return (valores - promedio) / desviacion, promedio, desviacion
@@ -0,0 +1,283 @@
+"""
+Modelo de pronóstico de demanda ajustado una vez por día.
+
+Las predicciones de demanda semanal, capacidad y ocupación se calculan
+de los mismos parámetros: el patrón por día de la semana y la tendencia
+de los últimos 60 días (foto snapshot_reservas) y el total histórico de
+reservas por día de la semana (tabla de hechos reservas_diarias). El
+modelo los ajusta una vez, precalcula el pronóstico de los próximos 30
+días y se guarda en un .npz, de modo que los endpoints solo recortan y
+formatean arrays ya calculados.
+
+GestorModeloDemanda mantiene el modelo vigente por worker: lo carga del
+disco al iniciar (si es del día) y lo reajusta al cambiar el día o tras
+cierta cantidad de escrituras de reservas.
+"""
+import logging
+import os
+import threading
+import time as reloj
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.prediction.agregados import conteos_por_dia, patron_semanal, tendencia
+from app.repositories.reserva_diaria_repository import ReservaDiariaRepository
+from app.repositories.reserva_repository import ReservaRepository
+from app.repositories.snapshot_reservas import EPOCA, snapshot_reservas
+
+logger = logging.getLogger(__name__)
+
+# Días completos (hasta ayer) sobre los que se ajusta la demanda semanal
+DIAS_HISTORICOS = 60
+# Días pronosticados (máximo de los endpoints de predicción)
+DIAS_PRONOSTICO = 30
+# Versión del formato del archivo .npz
+FORMATO = 1
+
+
+class ModeloDemanda:
+    """Parámetros ajustados y pronóstico precalculado desde `fecha` + 1."""
+
+    def __init__(
+        self,
+        fecha: date,
+        patron: np.ndarray,
+        factor_tendencia: float,
+        total_historicas: int,
+        totales_dia_semana: np.ndarray,
+    ):
+        """
+        Args:
+            fecha: Día para el que se ajustó (los datos llegan hasta el anterior)
+            patron: Promedio de reservas por día de la semana (lunes = 0)
+            factor_tendencia: Cambio relativo de la demanda en el período
+            total_historicas: Reservas de los DIAS_HISTORICOS días
+            totales_dia_semana: Reservas históricas totales por día de la semana
+        """
+        self.fecha = fecha
+        self.patron = np.asarray(patron, dtype=np.float64)
+        self.tendencia = float(factor_tendencia)
+        self.total_historicas = int(total_historicas)
+        self.totales_dia_semana = np.asarray(totales_dia_semana, dtype=np.int64)
+
+        # Pronóstico de los días 1..DIAS_PRONOSTICO
+        adelante = np.arange(1, DIAS_PRONOSTICO + 1)
+        self.fechas: List[date] = [
+            fecha + timedelta(days=i) for i in adelante.tolist()
+        ]
+        self.dias_semana = (fecha.weekday() + adelante) % 7
+        base = self.patron[self.dias_semana]
+        # Ajuste gradual por tendencia
+        self.reservas = (base * (1 + self.tendencia * adelante / 30)).astype(np.int64)
+        # Confianza según cantidad de datos, a la mitad sin datos para ese día
+        confianza = min(0.5 + self.total_historicas / 200, 0.95)
+        self.confianza = np.where(base == 0, confianza * 0.5, confianza)
+
+    @classmethod
+    def ajustar(cls, db: Session, fecha: date) -> "ModeloDemanda":
+        """
+        Ajustar el modelo con las reservas anteriores a `fecha`.
+
+        Args:
+            db: Sesión de base de datos
+            fecha: Día para el que se ajusta (normalmente hoy, UTC)
+        """
+        primer_dia = fecha - timedelta(days=DIAS_HISTORICOS)
+        inicios = snapshot_reservas.columnas(
+            db,
+            datetime.combine(primer_dia, time.min),
+            datetime.combine(fecha, time.min),
+        )["inicio"]
+        primer_dia_epoca = (primer_dia - EPOCA.date()).days
+        conteos = conteos_por_dia(inicios, primer_dia_epoca, DIAS_HISTORICOS)
+        patron = patron_semanal(conteos, primer_dia_epoca)
+
+        hechos = ReservaDiariaRepository.get_por_dia(db)
+        totales_dia_semana = np.bincount(
+            np.fromiter((h.fecha.weekday() for h in hechos), np.int64, len(hechos)),
+            weights=np.fromiter((h.cantidad for h in hechos), np.float64, len(hechos)),
+            minlength=7,
+        )
+        return cls(
+            fecha,
+            np.array([patron[dia] for dia in range(7)]),
+            tendencia(conteos),
+            int(conteos.sum()),
+            np.rint(totales_dia_semana),
+        )
+
+    def guardar(self, ruta: str) -> None:
+        """Guardar los parámetros en un .npz (reemplazo atómico del archivo)."""
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        temporal = f"{ruta}.tmp"
+        with open(temporal, "wb") as archivo:
+            np.savez(
+                archivo,
+                formato=FORMATO,
+                fecha=self.fecha.toordinal(),
+                patron=self.patron,
+                tendencia=self.tendencia,
+                total_historicas=self.total_historicas,
+                totales_dia_semana=self.totales_dia_semana,
+            )
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def cargar(cls, ruta: str) -> Optional["ModeloDemanda"]:
+        """
+        Cargar un modelo guardado con `guardar`.
+
+        Returns:
+            El modelo, o None si el archivo no existe, está dañado o es de
+            otro formato
+        """
+        try:
+            with np.load(ruta) as datos:
+                if int(datos["formato"]) != FORMATO:
+                    return None
+                return cls(
+                    date.fromordinal(int(datos["fecha"])),
+                    datos["patron"],
+                    float(datos["tendencia"]),
+                    int(datos["total_historicas"]),
+                    datos["totales_dia_semana"],
+                )
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning("⚠️ Modelo de demanda en %s ilegible: %s", ruta, e)
+            return None
+
+
+class GestorModeloDemanda:
+    """Modelo de demanda vigente del worker, con reajuste diario y por escrituras."""
+
+    def __init__(self, ruta: str, reajuste_cambios: int):
+        """
+        Args:
+            ruta: Archivo .npz del modelo ("" no lo guarda en disco)
+            reajuste_cambios: Escrituras de reservas tras las que se reajusta
+                (0 solo reajusta al cambiar el día)
+        """
+        self.ruta = ruta
+        self.reajuste_cambios = reajuste_cambios
+        self._modelo: Optional[ModeloDemanda] = None
+        self._lock = threading.Lock()
+        self._lock_cambios = threading.Lock()
+        self.cambios = 0
+        self.ajustes = 0
+        self.origen: Optional[str] = None
+        self._ajustado_en: Optional[float] = None
+        self._duracion_ajuste: Optional[float] = None
+
+    def obtener(self, db: Session) -> ModeloDemanda:
+        """
+        Obtener el modelo vigente, reajustándolo si está vencido.
+
+        Vence al cambiar el día (UTC) o al acumular reajuste_cambios
+        escrituras de reservas desde el último ajuste.
+        """
+        modelo = self._modelo
+        if modelo is not None and not self._vencido(modelo):
+            return modelo
+        with self._lock:
+            modelo = self._modelo
+            if modelo is not None and not self._vencido(modelo):
+                return modelo
+            return self._ajustar(db)
+
+    def cargar(self, db: Session) -> ModeloDemanda:
+        """
+        Cargar el modelo del disco al iniciar, o ajustarlo si no es del día.
+
+        Returns:
+            Modelo vigente (`origen` indica si vino del disco o de un ajuste)
+        """
+        with self._lock:
+            modelo = ModeloDemanda.cargar(self.ruta) if self.ruta else None
+            if modelo is None or modelo.fecha != _hoy():
+                return self._ajustar(db)
+            self._modelo = modelo
+            self.origen = "disco"
+            return modelo
+
+    def reajustar(self, db: Session) -> ModeloDemanda:
+        """Ajustar el modelo con los datos actuales y guardarlo."""
+        with self._lock:
+            return self._ajustar(db)
+
+    def registrar_cambio(self) -> None:
+        """Contar una escritura de reservas confirmada (observador del repositorio)."""
+        with self._lock_cambios:
+            self.cambios += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Obtener fecha, origen y antigüedad del modelo vigente."""
+        modelo = self._modelo
+        return {
+            "listo": modelo is not None,
+            "fecha": modelo.fecha.isoformat() if modelo is not None else None,
+            "origen": self.origen,
+            "ajustes": self.ajustes,
+            "cambios_desde_ajuste": self.cambios,
+            "reajuste_cambios": self.reajuste_cambios,
+            "duracion_ajuste_ms": (
+                round(self._duracion_ajuste * 1000, 3)
+                if self._duracion_ajuste is not None
+                else None
+            ),
+            "edad_segundos": (
+                round(reloj.monotonic() - self._ajustado_en, 3)
+                if self._ajustado_en is not None
+                else None
+            ),
+        }
+
+    def limpiar(self) -> None:
+        """Descartar el modelo en memoria (el archivo se conserva)."""
+        with self._lock:
+            self._modelo = None
+            self.origen = None
+
+    def _vencido(self, modelo: ModeloDemanda) -> bool:
+        """Indicar si el modelo es de otro día o acumuló demasiadas escrituras."""
+        return modelo.fecha != _hoy() or (
+            0 < self.reajuste_cambios <= self.cambios
+        )
+
+    def _ajustar(self, db: Session) -> ModeloDemanda:
+        """Ajustar, guardar y publicar el modelo (con _lock tomado)."""
+        # Las escrituras confirmadas durante el ajuste cuentan para el próximo
+        with self._lock_cambios:
+            self.cambios = 0
+        inicio = reloj.perf_counter()
+        modelo = ModeloDemanda.ajustar(db, _hoy())
+        self._duracion_ajuste = reloj.perf_counter() - inicio
+        if self.ruta:
+            try:
+                modelo.guardar(self.ruta)
+            except OSError as e:
+                logger.warning(
+                    "⚠️ No se pudo guardar el modelo de demanda en %s: %s",
+                    self.ruta, e,
+                )
+        self._modelo = modelo
+        self._ajustado_en = reloj.monotonic()
+        self.ajustes += 1
+        self.origen = "ajuste"
+        return modelo
+
+
+def _hoy() -> date:
+    """Día actual en UTC (el de las predicciones)."""
+    return datetime.utcnow().date()
+
+
+modelo_demanda = GestorModeloDemanda(
+    settings.modelo_demanda_ruta, settings.modelo_demanda_reajuste_cambios
+)
+ReservaRepository.suscribir_cambios(modelo_demanda.registrar_cambio)
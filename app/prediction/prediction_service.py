@@ -2,15 +2,25 @@
 Servicio de predicciones para el sistema de reservas.
 
 Este módulo implementa predicciones basadas en patrones históricos
-usando técnicas de análisis de series temporales simples.
+usando técnicas de análisis de series temporales simples. Las reservas
+históricas se leen de la foto columnar en memoria (snapshot_reservas) y
+se agregan con NumPy (app.prediction.agregados). La demanda semanal y la
+capacidad salen del modelo ajustado una vez por día (modelo_demanda).
 """
 from datetime import datetime, timedelta
-from typing import Dict, List
-from collections import defaultdict
+from typing import Dict
+import numpy as np
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from app.models.reserva import Reserva
 from app.models.sala import Sala
+from app.prediction.agregados import histograma_semana_hora, puntaje_z
+from app.prediction.modelo_demanda import DIAS_HISTORICOS, modelo_demanda
+from app.repositories.reserva_diaria_repository import ReservaDiariaRepository
+from app.repositories.snapshot_reservas import snapshot_reservas
+
+DIAS_ABREVIADOS = ['Lun', 'Mar', 'Mié', 'Jue', 'Vie', 'Sáb', 'Dom']
+# Puntaje z a partir del cual un día es anómalo
+UMBRAL_Z = 2
 
 
 class PredictionService:
@@ -23,10 +33,10 @@ class PredictionService:
         """
         Predice la demanda de reservas para los próximos días.
 
-        Utiliza:
-        - Patrones por día de la semana
-        - Tendencia mensual
-        - Promedio móvil de los últimos 30 días
+        Utiliza el modelo de demanda vigente (ajustado una vez por día):
+        - Patrones por día de la semana (promedio de cada día de la semana)
+        - Tendencia: promedio móvil de los últimos 30 días contra el de
+          los 30 anteriores
 
         Args:
             dias_adelante: Número de días a predecir (1-30)
@@ -34,51 +44,20 @@ class PredictionService:
         Returns:
             Dict con predicciones detalladas por día
         """
-        # 1. Obtener datos históricos (últimos 60 días)
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=60)
-
-        reservas_historicas = self.db.query(Reserva).filter(
-            Reserva.fecha_hora_inicio >= start_date,
-            Reserva.fecha_hora_inicio <= end_date
-        ).all()
-
-        # 2. Calcular patrones por día de semana
-        patron_semanal = self._calculate_weekly_pattern(reservas_historicas)
-
-        # 3. Calcular tendencia
-        tendencia = self._calculate_trend(reservas_historicas)
+        modelo = modelo_demanda.obtener(self.db)
 
-        # 4. Generar predicciones
         predicciones = []
-        today = datetime.utcnow().date()
-
-        for i in range(1, dias_adelante + 1):
-            fecha_pred = today + timedelta(days=i)
-            dia_semana = fecha_pred.weekday()
-
-            # Obtener predicción base del patrón semanal
-            prediccion_base = patron_semanal.get(dia_semana, 0)
-
-            # Ajustar por tendencia
-            factor_tendencia = 1 + (tendencia * i / 30)  # Ajuste gradual
-            prediccion_ajustada = int(prediccion_base * factor_tendencia)
-
-            # Calcular nivel de confianza
-            confianza = self._calculate_confidence(
-                patron_semanal,
-                dia_semana,
-                len(reservas_historicas)
-            )
+        for i in range(dias_adelante):
+            prediccion_ajustada = int(modelo.reservas[i])
 
             # Determinar nivel de demanda
             nivel_demanda = self._classify_demand_level(prediccion_ajustada)
 
             predicciones.append({
-                'fecha': fecha_pred.strftime('%Y-%m-%d'),
-                'dia_semana': ['Lun', 'Mar', 'Mié', 'Jue', 'Vie', 'Sáb', 'Dom'][dia_semana],
+                'fecha': modelo.fechas[i].strftime('%Y-%m-%d'),
+                'dia_semana': DIAS_ABREVIADOS[modelo.dias_semana[i]],
                 'prediccion_reservas': prediccion_ajustada,
-                'confianza': round(confianza, 2),
+                'confianza': round(float(modelo.confianza[i]), 2),
                 'nivel_demanda': nivel_demanda,
                 'recomendacion': self._generate_recommendation(
                     prediccion_ajustada,
@@ -89,10 +68,10 @@ class PredictionService:
         return {
             'predicciones': predicciones,
             'metadata': {
-                'dias_historicos': 60,
-                'total_reservas_historicas': len(reservas_historicas),
-                'tendencia': 'creciente' if tendencia > 0 else 'decreciente',
-                'factor_tendencia': round(tendencia, 3)
+                'dias_historicos': DIAS_HISTORICOS,
+                'total_reservas_historicas': modelo.total_historicas,
+                'tendencia': 'creciente' if modelo.tendencia > 0 else 'decreciente',
+                'factor_tendencia': round(modelo.tendencia, 3)
             }
         }
 
@@ -109,44 +88,28 @@ class PredictionService:
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=dias_analizar)
 
-        reservas = self.db.query(Reserva).filter(
-            Reserva.fecha_hora_inicio >= start_date,
-            Reserva.fecha_hora_inicio <= end_date
-        ).all()
-
-        # Agrupar por día de semana y hora
-        horarios = defaultdict(lambda: defaultdict(int))
+        inicios = snapshot_reservas.columnas(self.db, start_date, end_date)["inicio"]
 
-        for reserva in reservas:
-            dia_semana = reserva.fecha_hora_inicio.weekday()
-            hora = reserva.fecha_hora_inicio.hour
-            horarios[dia_semana][hora] += 1
+        # Agrupar por día de semana (filas) y hora (columnas)
+        horarios = histograma_semana_hora(inicios)
+        totales = horarios.sum(axis=1)
+        # Top 3 horas más ocupadas por día (a igual cantidad, la más temprana)
+        top_horas = np.argsort(-horarios, axis=1, kind='stable')[:, :3]
 
         # Identificar horas pico por día
         picos_por_dia = {}
         dias_nombres = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
 
         for dia in range(7):
-            horas_dia = horarios.get(dia, {})
-            if horas_dia:
-                # Top 3 horas más ocupadas
-                top_horas = sorted(
-                    horas_dia.items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:3]
-
-                picos_por_dia[dias_nombres[dia]] = [
-                    {
-                        'hora': f"{hora:02d}:00",
-                        'reservas': count,
-                        'porcentaje': round(
-                            count / sum(horas_dia.values()) * 100, 1
-                        )
-                    } for hora, count in top_horas
-                ]
-            else:
-                picos_por_dia[dias_nombres[dia]] = []
+            picos_por_dia[dias_nombres[dia]] = [
+                {
+                    'hora': f"{hora:02d}:00",
+                    'reservas': int(horarios[dia, hora]),
+                    'porcentaje': round(
+                        float(horarios[dia, hora] / totales[dia] * 100), 1
+                    )
+                } for hora in top_horas[dia].tolist() if horarios[dia, hora]
+            ]
 
         return {
             'horarios_pico': picos_por_dia,
@@ -166,47 +129,36 @@ class PredictionService:
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=dias_analizar)
 
-        # Contar reservas por día
-        reservas_por_dia = self.db.query(
-            func.date(Reserva.fecha_hora_inicio).label('fecha'),
-            func.count(Reserva.id).label('cantidad')  # type: ignore
-        ).filter(
-            Reserva.fecha_hora_inicio >= start_date,
-            Reserva.fecha_hora_inicio <= end_date
-        ).group_by(func.date(Reserva.fecha_hora_inicio)).all()
+        # Reservas por día, desde la tabla de hechos diarios
+        reservas_por_dia = ReservaDiariaRepository.get_por_dia(
+            self.db, start_date.date(), end_date.date()
+        )
 
         if not reservas_por_dia:
             return {'anomalias': [], 'estadisticas': {}}
 
-        # Calcular estadísticas
-        cantidades = [r.cantidad for r in reservas_por_dia]
-        promedio = sum(cantidades) / len(cantidades)
-        desviacion = (
-            sum((x - promedio) ** 2 for x in cantidades) / len(cantidades)
-        ) ** 0.5
+        # Calcular estadísticas y puntaje z de cada día
+        cantidades = np.fromiter(
+            (int(r.cantidad) for r in reservas_por_dia), np.int64,
+            count=len(reservas_por_dia)
+        )
+        puntajes, promedio, desviacion = puntaje_z(cantidades)
 
         # Detectar anomalías (±2 desviaciones estándar)
         anomalias = []
-        umbral_alto = promedio + (2 * desviacion)
-        umbral_bajo = max(0, promedio - (2 * desviacion))
-
-        for reserva in reservas_por_dia:
-            if reserva.cantidad > umbral_alto:
-                anomalias.append({
-                    'fecha': reserva.fecha.strftime('%Y-%m-%d'),
-                    'tipo': 'alta',
-                    'reservas': reserva.cantidad,
-                    'diferencia_promedio': round(reserva.cantidad - promedio, 1),
-                    'severidad': 'alta' if reserva.cantidad > umbral_alto * 1.5 else 'media'
-                })
-            elif reserva.cantidad < umbral_bajo:
-                anomalias.append({
-                    'fecha': reserva.fecha.strftime('%Y-%m-%d'),
-                    'tipo': 'baja',
-                    'reservas': reserva.cantidad,
-                    'diferencia_promedio': round(reserva.cantidad - promedio, 1),
-                    'severidad': 'media'
-                })
+        umbral_alto = promedio + (UMBRAL_Z * desviacion)
+        umbral_bajo = max(0, promedio - (UMBRAL_Z * desviacion))
+
+        for i in np.flatnonzero(np.abs(puntajes) > UMBRAL_Z).tolist():
+            cantidad = int(cantidades[i])
+            alta = puntajes[i] > 0
+            anomalias.append({
+                'fecha': reservas_por_dia[i].fecha.strftime('%Y-%m-%d'),
+                'tipo': 'alta' if alta else 'baja',
+                'reservas': cantidad,
+                'diferencia_promedio': round(cantidad - promedio, 1),
+                'severidad': 'alta' if alta and cantidad > umbral_alto * 1.5 else 'media'
+            })
 
         return {
             'anomalias': sorted(anomalias, key=lambda x: x['fecha'], reverse=True),
@@ -229,8 +181,8 @@ class PredictionService:
         Returns:
             Dict con recomendaciones de capacidad
         """
-        # Obtener predicciones
-        predicciones = self.predict_weekly_demand(dias_adelante)
+        # Pronóstico del modelo vigente (sin volver a predecir la demanda)
+        modelo = modelo_demanda.obtener(self.db)
 
         # Obtener total de salas
         total_salas = self.db.query(func.count(Sala.id)).scalar() or 1  # type: ignore
@@ -238,8 +190,8 @@ class PredictionService:
         # Calcular ocupación esperada por día
         recomendaciones = []
 
-        for pred in predicciones['predicciones']:
-            reservas_pred = pred['prediccion_reservas']
+        for i in range(dias_adelante):
+            reservas_pred = int(modelo.reservas[i])
 
             # Asumir promedio de 2 horas por reserva
             salas_necesarias = min(
@@ -250,8 +202,8 @@ class PredictionService:
             nivel_utilizacion = (salas_necesarias / total_salas) * 100
 
             recomendaciones.append({
-                'fecha': pred['fecha'],
-                'dia_semana': pred['dia_semana'],
+                'fecha': modelo.fechas[i].strftime('%Y-%m-%d'),
+                'dia_semana': DIAS_ABREVIADOS[modelo.dias_semana[i]],
                 'salas_recomendadas': salas_necesarias,
                 'utilizacion_esperada': round(nivel_utilizacion, 1),
                 'estado': self._classify_capacity_status(nivel_utilizacion),
@@ -265,54 +217,6 @@ class PredictionService:
 
     # --- Métodos privados auxiliares ---
 
-    def _calculate_weekly_pattern(self, reservas: List[Reserva]) -> Dict[int, float]:
-        """Calcula el promedio de reservas por día de la semana."""
-        patron = defaultdict(list)
-
-        for reserva in reservas:
-            dia_semana = reserva.fecha_hora_inicio.weekday()
-            patron[dia_semana].append(1)
-
-        # Calcular promedio
-        return {
-            dia: sum(counts) / len(counts) if counts else 0
-            for dia, counts in patron.items()
-        }
-
-    def _calculate_trend(self, reservas: List[Reserva]) -> float:
-        """Calcula la tendencia de crecimiento/decrecimiento."""
-        if len(reservas) < 2:
-            return 0.0
-
-        # Dividir en dos mitades
-        mitad = len(reservas) // 2
-        primera_mitad = reservas[:mitad]
-        segunda_mitad = reservas[mitad:]
-
-        avg_primera = len(primera_mitad) / 30 if primera_mitad else 0
-        avg_segunda = len(segunda_mitad) / 30 if segunda_mitad else 0
-
-        # Calcular cambio porcentual
-        if avg_primera > 0:
-            return (avg_segunda - avg_primera) / avg_primera
-        return 0.0
-
-    def _calculate_confidence(
-        self,
-        patron: Dict[int, float],
-        dia_semana: int,
-        total_datos: int
-    ) -> float:
-        """Calcula el nivel de confianza de la predicción."""
-        # Confianza base según cantidad de datos
-        confianza_base = min(0.5 + (total_datos / 200), 0.95)
-
-        # Reducir confianza si no hay datos para ese día
-        if patron.get(dia_semana, 0) == 0:
-            confianza_base *= 0.5
-
-        return confianza_base
-
     def _classify_demand_level(self, prediccion: int) -> str:
         """Clasifica el nivel de demanda."""
         if prediccion >= 20:
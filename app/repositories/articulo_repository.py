@@ -5,7 +5,9 @@ Repositorio para operaciones CRUD de Articulo.
 Este módulo contiene las operaciones de base de datos para el modelo Articulo,
 incluyendo crear, leer, actualizar y eliminar registros.
 """
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.articulo import Articulo
 from app.schemas.articulo import ArticuloCreate, ArticuloUpdate
@@ -34,6 +36,15 @@ class ArticuloRepository:
         """Obtener un artículo por su ID."""
         return db.query(Articulo).filter(Articulo.id == articulo_id).first()
 
+    @staticmethod
+    def get_by_ids(db: Session, articulo_ids: Iterable[int]) -> Dict[int, Articulo]:
+        """Obtener varios artículos por ID en una sola consulta."""
+        ids = set(articulo_ids)
+        if not ids:
+            return {}
+        articulos = db.query(Articulo).filter(Articulo.id.in_(ids)).all()
+        return {articulo.id: articulo for articulo in articulos}
+
     @staticmethod
     def get_all(
         db: Session, skip: int = 0, limit: int = 100, disponible: Optional[bool] = None
@@ -120,3 +131,19 @@ class ArticuloRepository:
         if disponible is not None:
             query = query.filter(Articulo.disponible == disponible)
         return query.count()
+
+    @staticmethod
+    async def get_all_async(db: AsyncSession) -> List[Articulo]:
+        """Obtener todos los artículos (sesión asíncrona)."""
+        result = await db.execute(select(Articulo).order_by(Articulo.id))
+        return list(result.scalars())
+
+    @staticmethod
+    async def count_async(
+        db: AsyncSession, disponible: Optional[bool] = None
+    ) -> int:
+        """Contar artículos con filtro opcional (sesión asíncrona)."""
+        query = select(func.count()).select_from(Articulo)
+        if disponible is not None:
+            query = query.where(Articulo.disponible == disponible)
+        return await db.scalar(query)
@@ -0,0 +1,72 @@
+"""
+Paginación por cursor (keyset) de los listados de reservas.
+
+Los listados se ordenan por (fecha_hora_inicio, id) descendente. En lugar
+de saltear `skip` filas con OFFSET (que la base recorre igual y se vuelve
+lento en páginas profundas), la página siguiente se pide a partir de la
+última reserva recibida: WHERE (fecha_hora_inicio, id) < (cursor), que
+resuelven directamente los índices compuestos de la migración 0003.
+
+El cursor que viaja al cliente es opaco: base64 de la fecha e id de la
+última reserva de la página.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+from app.models.reserva import Reserva
+
+# (fecha_hora_inicio, id) de la última reserva de la página anterior
+CursorReserva = Tuple[datetime, int]
+
+
+def codificar_cursor(reserva: Reserva) -> str:
+    """Generar el cursor opaco que apunta a continuación de `reserva`."""
+    datos = json.dumps([reserva.fecha_hora_inicio.isoformat(), reserva.id])
+    return base64.urlsafe_b64encode(datos.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> CursorReserva:
+    """
+    Obtener la posición (fecha_hora_inicio, id) codificada en un cursor.
+
+    Raises:
+        ValueError: Si el cursor no fue generado por codificar_cursor
+    """
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        fecha, reserva_id = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        return datetime.fromisoformat(fecha), int(reserva_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError("Cursor de paginación inválido") from e
+
+
+def paginar(
+    query: Query,
+    skip: int,
+    limit: int,
+    despues_de: Optional[CursorReserva] = None,
+) -> List[Reserva]:
+    """
+    Ordenar y paginar una consulta de reservas.
+
+    Args:
+        query: Consulta de Reserva con los filtros del listado
+        skip: Registros a omitir (modo compatible, solo sin cursor)
+        limit: Máximo número de registros
+        despues_de: Posición de la última reserva de la página anterior
+
+    Returns:
+        Reservas de la página, de la más reciente a la más antigua
+    """
+    query = query.order_by(Reserva.fecha_hora_inicio.desc(), Reserva.id.desc())
+    if despues_de is not None:
+        query = query.filter(
+            tuple_(Reserva.fecha_hora_inicio, Reserva.id) < tuple_(*despues_de)
+        )
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit).all()
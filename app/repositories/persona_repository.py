@@ -5,7 +5,9 @@ Repositorio para operaciones CRUD de Persona.
 Este módulo contiene las operaciones de base de datos para el modelo Persona,
 incluyendo crear, leer, actualizar y eliminar registros.
 """
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.persona import Persona
 from app.schemas.persona import PersonaCreate, PersonaUpdate
@@ -41,6 +43,15 @@ class PersonaRepository:
         """Obtener una persona por su ID."""
         return db.query(Persona).filter(Persona.id == persona_id).first()
 
+    @staticmethod
+    def get_existing_ids(db: Session, persona_ids: Iterable[int]) -> Set[int]:
+        """Obtener cuáles de los IDs indicados existen, en una sola consulta."""
+        ids = set(persona_ids)
+        if not ids:
+            return set()
+        filas = db.query(Persona.id).filter(Persona.id.in_(ids)).all()
+        return {fila[0] for fila in filas}
+
     @staticmethod
     def get_by_email(db: Session, email: str) -> Optional[Persona]:
         """Obtener una persona por su email."""
@@ -93,3 +104,43 @@ class PersonaRepository:
     def count(db: Session) -> int:
         """Contar el total de personas."""
         return db.query(Persona).count()
+
+    @staticmethod
+    def get_by_ids(db: Session, persona_ids: Iterable[int]) -> Dict[int, Persona]:
+        """Obtener varias personas por ID en una sola consulta."""
+        ids = set(persona_ids)
+        if not ids:
+            return {}
+        personas = db.execute(select(Persona).where(Persona.id.in_(ids))).scalars()
+        return {persona.id: persona for persona in personas}
+
+    @staticmethod
+    async def get_by_email_async(db: AsyncSession, email: str) -> Optional[Persona]:
+        """Obtener una persona por su email (sesión asíncrona)."""
+        return await db.scalar(select(Persona).where(Persona.email == email))
+
+    @staticmethod
+    async def get_by_ids_async(
+        db: AsyncSession, persona_ids: Iterable[int]
+    ) -> Dict[int, Persona]:
+        """Obtener varias personas por ID en una sola consulta (sesión asíncrona)."""
+        ids = set(persona_ids)
+        if not ids:
+            return {}
+        result = await db.execute(select(Persona).where(Persona.id.in_(ids)))
+        return {persona.id: persona for persona in result.scalars()}
+
+    @staticmethod
+    async def get_all_async(
+        db: AsyncSession, skip: int = 0, limit: int = 100
+    ) -> List[Persona]:
+        """Obtener todas las personas con paginación (sesión asíncrona)."""
+        result = await db.execute(
+            select(Persona).order_by(Persona.id).offset(skip).limit(limit)
+        )
+        return list(result.scalars())
+
+    @staticmethod
+    async def count_async(db: AsyncSession) -> int:
+        """Contar el total de personas (sesión asíncrona)."""
+        return await db.scalar(select(func.count()).select_from(Persona))
@@ -0,0 +1,327 @@
+"""
+Repositorio de la tabla de hechos diarios de reservas.
+
+Mantiene reservas_diarias de forma incremental: cada alta, cambio o baja
+de reservas suma o resta su aporte (cantidad y horas) en la misma
+transacción, con un INSERT ... ON CONFLICT DO UPDATE sobre la clave única
+uq_reservas_diarias_clave. El trabajo depende de las reservas modificadas
+y no de cuántas tenga el día, y el bloqueo por fila del upsert ordena las
+escrituras concurrentes sobre un mismo hecho. El recálculo de días
+completos queda para reconstruir la tabla (backfill o corrección).
+"""
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import and_, delete, func, insert, or_, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.reserva import Reserva
+from app.models.reserva_diaria import ReservaDiaria
+
+# Clave de agregación: (fecha, id_sala, id_articulo, id_persona)
+ClaveDiaria = Tuple[date, Optional[int], Optional[int], int]
+
+# Aporte de una reserva: (inicio, fin, id_sala, id_articulo, id_persona)
+FilaReserva = Tuple[datetime, datetime, Optional[int], Optional[int], int]
+
+# Columnas de reservas que forman una FilaReserva (para RETURNING)
+COLUMNAS_FILA = (
+    Reserva.fecha_hora_inicio,
+    Reserva.fecha_hora_fin,
+    Reserva.id_sala,
+    Reserva.id_articulo,
+    Reserva.id_persona,
+)
+
+# Expresiones del índice único uq_reservas_diarias_clave, destino del ON
+# CONFLICT (el 0 va literal: como parámetro no coincide con el índice)
+_CLAVE_CONFLICTO = (
+    ReservaDiaria.fecha,
+    text("COALESCE(id_sala, 0)"),
+    text("COALESCE(id_articulo, 0)"),
+    ReservaDiaria.id_persona,
+)
+
+
+def fila_de(reserva: Any) -> FilaReserva:
+    """Aporte de una reserva (modelo o esquema con los mismos atributos)."""
+    return (
+        reserva.fecha_hora_inicio,
+        reserva.fecha_hora_fin,
+        reserva.id_sala,
+        reserva.id_articulo,
+        reserva.id_persona,
+    )
+
+
+def horas_de(inicio: datetime, fin: datetime) -> float:
+    """Horas reservadas entre inicio y fin."""
+    return (fin - inicio).total_seconds() / 3600
+
+
+def _rangos(dias: Iterable[date]) -> List[Tuple[datetime, datetime]]:
+    """Agrupar días consecutivos en rangos [desde, hasta) de fecha y hora."""
+    rangos: List[Tuple[datetime, datetime]] = []
+    for dia in sorted(set(dias)):
+        inicio = datetime.combine(dia, time.min)
+        if rangos and rangos[-1][1] == inicio:
+            rangos[-1] = (rangos[-1][0], inicio + timedelta(days=1))
+        else:
+            rangos.append((inicio, inicio + timedelta(days=1)))
+    return rangos
+
+
+def _orden(clave: ClaveDiaria) -> Tuple[date, int, int, int]:
+    """Orden total de las claves (id_sala o id_articulo pueden ser None)."""
+    fecha, id_sala, id_articulo, id_persona = clave
+    return fecha, id_sala or 0, id_articulo or 0, id_persona
+
+
+def _upsert(db: Session):
+    """INSERT con ON CONFLICT del motor de la sesión (PostgreSQL o SQLite)."""
+    dialecto = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialecto.insert(ReservaDiaria)
+
+
+def _acumular(sentencia):
+    """Sumar cantidad y horas al hecho existente en lugar de fallar."""
+    return sentencia.on_conflict_do_update(
+        index_elements=_CLAVE_CONFLICTO,
+        set_={
+            "cantidad": ReservaDiaria.cantidad + sentencia.excluded.cantidad,
+            "horas": ReservaDiaria.horas + sentencia.excluded.horas,
+        },
+    ).returning(ReservaDiaria.id, ReservaDiaria.cantidad)
+
+
+def _horas_sql(db: Session):
+    """Expresión SQL de las horas de cada reserva según el motor."""
+    if db.get_bind().dialect.name == "postgresql":
+        return (
+            func.extract("epoch", Reserva.fecha_hora_fin - Reserva.fecha_hora_inicio)
+            / 3600
+        )
+    return (
+        func.strftime("%s", Reserva.fecha_hora_fin)
+        - func.strftime("%s", Reserva.fecha_hora_inicio)
+    ) / 3600.0
+
+
+class ReservaDiariaRepository:
+    """Repositorio de la tabla de hechos reservas_diarias."""
+
+    @staticmethod
+    def sumar(
+        db: Session,
+        altas: Iterable[FilaReserva] = (),
+        bajas: Iterable[FilaReserva] = (),
+    ) -> None:
+        """
+        Sumar el aporte de las altas y restar el de las bajas.
+
+        Un cambio es la baja de la reserva anterior más el alta de la
+        nueva. Los aportes se agregan por clave y se aplican con un único
+        upsert. No confirma la transacción: se llama antes del commit de
+        la escritura de reservas para que ambas tablas cambien juntas.
+
+        Args:
+            db: Sesión de base de datos
+            altas: Reservas creadas o valores nuevos de las modificadas
+            bajas: Reservas eliminadas o valores anteriores de las modificadas
+        """
+        deltas: Dict[ClaveDiaria, List[float]] = defaultdict(lambda: [0, 0.0])
+        for signo, filas in ((1, altas), (-1, bajas)):
+            for inicio, fin, id_sala, id_articulo, id_persona in filas:
+                delta = deltas[(inicio.date(), id_sala, id_articulo, id_persona)]
+                delta[0] += signo
+                delta[1] += signo * horas_de(inicio, fin)
+
+        # En orden de clave, para que dos upserts no se bloqueen mutuamente
+        valores = [
+            {
+                "fecha": fecha,
+                "id_sala": id_sala,
+                "id_articulo": id_articulo,
+                "id_persona": id_persona,
+                "cantidad": cantidad,
+                "horas": horas,
+            }
+            for (fecha, id_sala, id_articulo, id_persona), (cantidad, horas) in sorted(
+                deltas.items(), key=lambda item: _orden(item[0])
+            )
+            if cantidad or horas
+        ]
+        if not valores:
+            return
+        filas = db.execute(_acumular(_upsert(db).values(valores))).all()
+        ReservaDiariaRepository._quitar_vacios(db, filas)
+
+    @staticmethod
+    def restar_reservas(db: Session, *condiciones) -> None:
+        """
+        Restar el aporte de las reservas que cumplen las condiciones.
+
+        Se agrega y aplica en la base con un único INSERT ... SELECT, sin
+        traer las reservas; se llama antes de un UPDATE o DELETE masivo.
+        """
+        fecha = func.date(Reserva.fecha_hora_inicio)
+        claves = (fecha, Reserva.id_sala, Reserva.id_articulo, Reserva.id_persona)
+        aportes = (
+            select(*claves, -func.count(), -func.sum(_horas_sql(db)))
+            .where(*condiciones)
+            .group_by(*claves)
+            .order_by(*claves)
+        )
+        filas = db.execute(
+            _acumular(
+                _upsert(db).from_select(
+                    ["fecha", "id_sala", "id_articulo", "id_persona",
+                     "cantidad", "horas"],
+                    aportes,
+                )
+            )
+        ).all()
+        ReservaDiariaRepository._quitar_vacios(db, filas)
+
+    @staticmethod
+    def _quitar_vacios(db: Session, filas: List[Tuple[int, int]]) -> None:
+        """Eliminar los hechos (id, cantidad) que quedaron sin reservas."""
+        vacios = [id_hecho for id_hecho, cantidad in filas if cantidad <= 0]
+        if vacios:
+            db.execute(
+                delete(ReservaDiaria)
+                .where(ReservaDiaria.id.in_(vacios), ReservaDiaria.cantidad <= 0)
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def recalcular_dias(db: Session, dias: Iterable[date]) -> None:
+        """
+        Recalcular los hechos de los días indicados a partir de reservas.
+
+        Lo usa reconstruir; las escrituras de reservas aplican deltas con
+        sumar y restar_reservas. No confirma la transacción.
+
+        Args:
+            db: Sesión de base de datos
+            dias: Fechas a recalcular
+        """
+        rangos = _rangos(dias)
+        if not rangos:
+            return
+
+        condiciones = [
+            and_(Reserva.fecha_hora_inicio >= desde, Reserva.fecha_hora_inicio < hasta)
+            for desde, hasta in rangos
+        ]
+        filas = db.execute(select(*COLUMNAS_FILA).where(or_(*condiciones)))
+        hechos: Dict[ClaveDiaria, List[float]] = defaultdict(lambda: [0, 0.0])
+        for inicio, fin, id_sala, id_articulo, id_persona in filas:
+            hecho = hechos[(inicio.date(), id_sala, id_articulo, id_persona)]
+            hecho[0] += 1
+            hecho[1] += horas_de(inicio, fin)
+
+        db.execute(
+            delete(ReservaDiaria)
+            .where(
+                or_(
+                    *(
+                        and_(
+                            ReservaDiaria.fecha >= desde.date(),
+                            ReservaDiaria.fecha < hasta.date(),
+                        )
+                        for desde, hasta in rangos
+                    )
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if hechos:
+            db.execute(
+                insert(ReservaDiaria),
+                [
+                    {
+                        "fecha": fecha,
+                        "id_sala": id_sala,
+                        "id_articulo": id_articulo,
+                        "id_persona": id_persona,
+                        "cantidad": cantidad,
+                        "horas": horas,
+                    }
+                    for (fecha, id_sala, id_articulo, id_persona), (cantidad, horas)
+                    in hechos.items()
+                ],
+            )
+
+    @staticmethod
+    def reconstruir(db: Session, dias_por_lote: int = 31) -> int:
+        """
+        Reconstruir toda la tabla a partir de las reservas existentes.
+
+        Procesa el historial en lotes de días consecutivos, confirmando
+        cada lote, y elimina los hechos de días fuera del rango con reservas.
+
+        Args:
+            db: Sesión de base de datos
+            dias_por_lote: Días recalculados por transacción
+
+        Returns:
+            Cantidad de días recalculados
+        """
+        if dias_por_lote < 1:
+            raise ValueError("dias_por_lote debe ser al menos 1")
+
+        primera, ultima = db.execute(
+            select(
+                func.min(Reserva.fecha_hora_inicio), func.max(Reserva.fecha_hora_inicio)
+            )
+        ).one()
+        if primera is None:
+            db.execute(delete(ReservaDiaria))
+            db.commit()
+            return 0
+
+        desde, hasta = primera.date(), ultima.date()
+        dia = desde
+        while dia <= hasta:
+            fin_lote = min(
+                dia + timedelta(days=dias_por_lote), hasta + timedelta(days=1)
+            )
+            ReservaDiariaRepository.recalcular_dias(
+                db, (dia + timedelta(days=i) for i in range((fin_lote - dia).days))
+            )
+            db.commit()
+            dia = fin_lote
+
+        db.execute(
+            delete(ReservaDiaria).where(
+                or_(ReservaDiaria.fecha < desde, ReservaDiaria.fecha > hasta)
+            )
+        )
+        db.commit()
+        return (hasta - desde).days + 1
+
+    @staticmethod
+    def get_por_dia(
+        db: Session, desde: Optional[date] = None, hasta: Optional[date] = None
+    ) -> List:
+        """
+        Obtener la cantidad de reservas por día de inicio, en orden.
+
+        Args:
+            db: Sesión de base de datos
+            desde: Primer día incluido (sin límite si es None)
+            hasta: Último día incluido (sin límite si es None)
+
+        Returns:
+            Filas con los atributos fecha y cantidad
+        """
+        query = db.query(
+            ReservaDiaria.fecha.label("fecha"),
+            func.sum(ReservaDiaria.cantidad).label("cantidad"),
+        )
+        if desde is not None:
+            query = query.filter(ReservaDiaria.fecha >= desde)
+        if hasta is not None:
+            query = query.filter(ReservaDiaria.fecha <= hasta)
+        return query.group_by(ReservaDiaria.fecha).order_by(ReservaDiaria.fecha).all()
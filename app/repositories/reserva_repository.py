@@ -5,12 +5,133 @@ Repositorio para operaciones CRUD de Reserva.
 Este módulo contiene las operaciones de base de datos para el modelo Reserva,
 incluyendo crear, leer, actualizar y eliminar registros con relaciones.
 """
+import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+)
+from sqlalchemy import bindparam, func, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
+from app.core.config import settings
 from app.models.reserva import Reserva
+from app.repositories.paginacion import CursorReserva, paginar
+from app.repositories.reserva_diaria_repository import (
+    ReservaDiariaRepository,
+    fila_de,
+    horas_de,
+)
+from app.repositories.sala_interval_index import (
+    MODO_DESACTIVADO,
+    MODO_VERIFICACION,
+    sala_interval_index,
+)
+from app.repositories.snapshot_reservas import snapshot_reservas
 from app.schemas.reserva import ReservaCreate, ReservaUpdate
 
+logger = logging.getLogger(__name__)
+
+# Restricción de exclusión que impide reservas de sala solapadas (migración 0002)
+RESTRICCION_SOLAPAMIENTO_SALA = "reservas_sala_sin_solapamiento"
+
+# Motivos de rechazo devueltos por create_validada
+MOTIVO_PERSONA_INEXISTENTE = "persona_inexistente"
+MOTIVO_FECHA_PASADA = "fecha_pasada"
+MOTIVO_ARTICULO_INEXISTENTE = "articulo_inexistente"
+MOTIVO_SIN_STOCK = "sin_stock"
+MOTIVO_CONFLICTO_SALA = "conflicto_sala"
+
+# Funciones avisadas tras confirmar altas, cambios o bajas de reservas
+_observadores_cambios: List[Callable[[], None]] = []
+
+# Valida persona, margen de tiempo, stock y solapamiento, e inserta la
+# reserva (y suma su hecho diario) solo si no hay motivo de rechazo, todo
+# en una sentencia
+_SQL_CREAR_VALIDADA = text(
+    """
+    WITH ahora AS (
+        SELECT CURRENT_TIMESTAMP::timestamp AS ts
+    ),
+    articulo AS (
+        SELECT a.cantidad, a.nombre FROM articulos a WHERE a.id = :id_articulo
+    ),
+    uso AS (
+        SELECT COALESCE(SUM(cantidad_usada), 0) AS total_reservado
+        FROM (
+            SELECT 1 AS cantidad_usada
+            FROM reservas r
+            WHERE r.id_articulo = :id_articulo
+            AND r.fecha_hora_fin >= :fecha_inicio
+            AND r.fecha_hora_inicio <= :fecha_fin
+            UNION ALL
+            SELECT ra.cantidad AS cantidad_usada
+            FROM reserva_articulos ra
+            JOIN reservas r ON ra.reserva_id = r.id
+            WHERE ra.articulo_id = :id_articulo
+            AND r.fecha_hora_fin >= :fecha_inicio
+            AND r.fecha_hora_inicio <= :fecha_fin
+        ) AS reservas_activas
+    ),
+    motivo AS (
+        SELECT CASE
+            WHEN NOT EXISTS (SELECT 1 FROM personas p WHERE p.id = :id_persona)
+                THEN 'persona_inexistente'
+            WHEN :fecha_inicio < (SELECT ts FROM ahora) - make_interval(mins => :margen)
+                THEN 'fecha_pasada'
+            WHEN :id_articulo IS NOT NULL AND NOT EXISTS (SELECT 1 FROM articulo)
+                THEN 'articulo_inexistente'
+            WHEN :id_articulo IS NOT NULL
+                AND (SELECT cantidad FROM articulo)
+                    - (SELECT total_reservado FROM uso) < 1
+                THEN 'sin_stock'
+            WHEN :verificar_sala AND :id_sala IS NOT NULL AND EXISTS (
+                SELECT 1 FROM reservas r
+                WHERE r.id_sala = :id_sala
+                AND r.fecha_hora_inicio < :fecha_fin
+                AND r.fecha_hora_fin > :fecha_inicio
+            )
+                THEN 'conflicto_sala'
+        END AS codigo
+    ),
+    insertada AS (
+        INSERT INTO reservas
+            (id_persona, id_sala, id_articulo, fecha_hora_inicio, fecha_hora_fin)
+        SELECT :id_persona, :id_sala, :id_articulo, :fecha_inicio, :fecha_fin
+        FROM motivo
+        WHERE codigo IS NULL
+        RETURNING id
+    ),
+    hecho AS (
+        INSERT INTO reservas_diarias
+            (fecha, id_sala, id_articulo, id_persona, cantidad, horas)
+        SELECT :fecha, :id_sala, :id_articulo, :id_persona, 1, :horas
+        FROM insertada
+        ON CONFLICT (fecha, COALESCE(id_sala, 0), COALESCE(id_articulo, 0), id_persona)
+        DO UPDATE SET
+            cantidad = reservas_diarias.cantidad + EXCLUDED.cantidad,
+            horas = reservas_diarias.horas + EXCLUDED.horas
+    )
+    SELECT
+        (SELECT codigo FROM motivo) AS codigo,
+        (SELECT id FROM insertada) AS id,
+        (SELECT ts FROM ahora) AS ahora,
+        (SELECT cantidad FROM articulo) AS articulo_cantidad,
+        (SELECT nombre FROM articulo) AS articulo_nombre,
+        (SELECT total_reservado FROM uso) AS total_reservado
+    """
+)
+
+
+def _select_columnas_dashboard(fecha_inicio: datetime):
+    """Consulta de las columnas de reservas que usa metricas_dashboard."""
+    return select(
+        func.coalesce(Reserva.id_sala, 0),
+        Reserva.id_persona,
+        Reserva.fecha_hora_inicio,
+        Reserva.fecha_hora_fin,
+    ).where(Reserva.fecha_hora_inicio >= fecha_inicio)
+
 
 class ReservaRepository:
     """Repositorio para operaciones CRUD de Reserva."""
@@ -26,10 +147,115 @@ class ReservaRepository:
             fecha_hora_fin=reserva_data.fecha_hora_fin,
         )
         db.add(db_reserva)
-        db.commit()
+        try:
+            db.flush()
+            ReservaDiariaRepository.sumar(db, altas=[fila_de(db_reserva)])
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise
         db.refresh(db_reserva)
+        sala_interval_index.registrar(db_reserva)
+        snapshot_reservas.registrar(db_reserva)
+        ReservaRepository.notificar_cambio()
         return db_reserva
 
+    @staticmethod
+    def create_validada(
+        db: Session,
+        reserva_data: ReservaCreate,
+        margen_minutos: int,
+        verificar_sala: bool = True,
+    ) -> Tuple[Optional[Reserva], Dict[str, Any]]:
+        """
+        Validar e insertar una reserva en un único viaje a la base de datos.
+
+        Args:
+            db: Sesión de base de datos
+            reserva_data: Datos de la reserva
+            margen_minutos: Minutos en el pasado permitidos para el inicio
+            verificar_sala: Consultar solapamientos de sala (no hace falta si
+                la restricción de exclusión está activa)
+
+        Returns:
+            Tupla (reserva creada o None, detalle) donde el detalle incluye
+            codigo (motivo de rechazo o None), ahora, articulo_cantidad,
+            articulo_nombre y total_reservado
+        """
+        try:
+            fila = db.execute(
+                _SQL_CREAR_VALIDADA,
+                {
+                    "id_persona": reserva_data.id_persona,
+                    "id_sala": reserva_data.id_sala,
+                    "id_articulo": reserva_data.id_articulo,
+                    "fecha_inicio": reserva_data.fecha_hora_inicio,
+                    "fecha_fin": reserva_data.fecha_hora_fin,
+                    "margen": margen_minutos,
+                    "verificar_sala": verificar_sala,
+                    "fecha": reserva_data.fecha_hora_inicio.date(),
+                    "horas": horas_de(
+                        reserva_data.fecha_hora_inicio, reserva_data.fecha_hora_fin
+                    ),
+                },
+            ).mappings().one()
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        detalle = dict(fila)
+        if detalle["id"] is None:
+            return None, detalle
+
+        db_reserva = Reserva(
+            id=detalle["id"],
+            id_persona=reserva_data.id_persona,
+            id_sala=reserva_data.id_sala,
+            id_articulo=reserva_data.id_articulo,
+            fecha_hora_inicio=reserva_data.fecha_hora_inicio,
+            fecha_hora_fin=reserva_data.fecha_hora_fin,
+        )
+        sala_interval_index.registrar(db_reserva)
+        snapshot_reservas.registrar(db_reserva)
+        ReservaRepository.notificar_cambio()
+        return db_reserva, detalle
+
+    @staticmethod
+    def create_many(db: Session, reservas_data: List[ReservaCreate]) -> List[Reserva]:
+        """Crear varias reservas en una única transacción."""
+        db_reservas = [
+            Reserva(
+                id_persona=reserva_data.id_persona,
+                id_sala=reserva_data.id_sala,
+                id_articulo=reserva_data.id_articulo,
+                fecha_hora_inicio=reserva_data.fecha_hora_inicio,
+                fecha_hora_fin=reserva_data.fecha_hora_fin,
+            )
+            for reserva_data in reservas_data
+        ]
+        db.add_all(db_reservas)
+        try:
+            db.flush()
+            ReservaDiariaRepository.sumar(
+                db, altas=(fila_de(r) for r in reservas_data)
+            )
+        except Exception:
+            db.rollback()
+            raise
+
+        # Desvincular de la sesión para conservar los valores cargados
+        # tras el commit sin un refresh por cada reserva
+        for db_reserva in db_reservas:
+            db.expunge(db_reserva)
+        db.commit()
+
+        for db_reserva in db_reservas:
+            sala_interval_index.registrar(db_reserva)
+            snapshot_reservas.registrar(db_reserva)
+        ReservaRepository.notificar_cambio()
+        return db_reservas
+
     @staticmethod
     def get_by_id(db: Session, reserva_id: int) -> Optional[Reserva]:
         """Obtener una reserva por su ID con relaciones cargadas."""
@@ -45,75 +271,66 @@ class ReservaRepository:
         )
 
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Reserva]:
+    def _query_con_relaciones(db: Session):
+        return db.query(Reserva).options(
+            joinedload(Reserva.persona),
+            joinedload(Reserva.sala),
+            joinedload(Reserva.articulo),
+        )
+
+    @staticmethod
+    def get_all(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        despues_de: Optional[CursorReserva] = None,
+    ) -> List[Reserva]:
         """Obtener todas las reservas con relaciones cargadas."""
-        return (
-            db.query(Reserva)
-            .options(
-                joinedload(Reserva.persona),
-                joinedload(Reserva.sala),
-                joinedload(Reserva.articulo),
-            )
-            .order_by(Reserva.fecha_hora_inicio.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        return paginar(
+            ReservaRepository._query_con_relaciones(db), skip, limit, despues_de
         )
 
     @staticmethod
     def get_by_persona(
-        db: Session, persona_id: int, skip: int = 0, limit: int = 100
+        db: Session,
+        persona_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        despues_de: Optional[CursorReserva] = None,
     ) -> List[Reserva]:
         """Obtener reservas por persona."""
-        return (
-            db.query(Reserva)
-            .options(
-                joinedload(Reserva.persona),
-                joinedload(Reserva.sala),
-                joinedload(Reserva.articulo),
-            )
-            .filter(Reserva.id_persona == persona_id)
-            .order_by(Reserva.fecha_hora_inicio.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = ReservaRepository._query_con_relaciones(db).filter(
+            Reserva.id_persona == persona_id
         )
+        return paginar(query, skip, limit, despues_de)
 
     @staticmethod
     def get_by_sala(
-        db: Session, sala_id: int, skip: int = 0, limit: int = 100
+        db: Session,
+        sala_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        despues_de: Optional[CursorReserva] = None,
     ) -> List[Reserva]:
         """Obtener reservas por sala."""
-        return (
-            db.query(Reserva)
-            .options(
-                joinedload(Reserva.persona),
-                joinedload(Reserva.sala),
-                joinedload(Reserva.articulo),
-            )
-            .filter(Reserva.id_sala == sala_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = ReservaRepository._query_con_relaciones(db).filter(
+            Reserva.id_sala == sala_id
         )
+        return paginar(query, skip, limit, despues_de)
 
     @staticmethod
     def get_by_articulo(
-        db: Session, articulo_id: int, skip: int = 0, limit: int = 100
+        db: Session,
+        articulo_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        despues_de: Optional[CursorReserva] = None,
     ) -> List[Reserva]:
         """Obtener reservas por artículo."""
-        return (
-            db.query(Reserva)
-            .options(
-                joinedload(Reserva.persona),
-                joinedload(Reserva.sala),
-                joinedload(Reserva.articulo),
-            )
-            .filter(Reserva.id_articulo == articulo_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = ReservaRepository._query_con_relaciones(db).filter(
+            Reserva.id_articulo == articulo_id
         )
+        return paginar(query, skip, limit, despues_de)
 
     @staticmethod
     def get_by_fecha_range(
@@ -122,22 +339,48 @@ class ReservaRepository:
         fecha_fin: Optional[datetime] = None,
         skip: int = 0,
         limit: int = 100,
+        despues_de: Optional[CursorReserva] = None,
     ) -> List[Reserva]:
         """Obtener reservas por rango de fechas."""
-        query = (
-            db.query(Reserva)
-            .options(
-                joinedload(Reserva.persona),
-                joinedload(Reserva.sala),
-                joinedload(Reserva.articulo),
-            )
-            .filter(Reserva.fecha_hora_inicio >= fecha_inicio)
+        query = ReservaRepository._query_con_relaciones(db).filter(
+            Reserva.fecha_hora_inicio >= fecha_inicio
         )
 
         if fecha_fin:
             query = query.filter(Reserva.fecha_hora_fin <= fecha_fin)
 
-        return query.offset(skip).limit(limit).all()
+        return paginar(query, skip, limit, despues_de)
+
+    @staticmethod
+    def iterar_desde(
+        db: Session, fecha_inicio: datetime, tamano_lote: int
+    ) -> Iterator[Sequence[Tuple]]:
+        """
+        Recorrer en lotes las reservas que empiezan desde una fecha.
+
+        Usa un cursor del lado del servidor (yield_per): la base entrega
+        las filas de a `tamano_lote` y en memoria solo hay un lote a la vez,
+        sin importar cuántas reservas tenga el período. Se leen columnas
+        sueltas en lugar de objetos Reserva para no poblar la sesión.
+
+        Yields:
+            Lotes de tuplas (id, fecha_hora_inicio, fecha_hora_fin,
+            id_persona, id_sala, id_articulo), en orden de inicio
+        """
+        consulta = (
+            select(
+                Reserva.id,
+                Reserva.fecha_hora_inicio,
+                Reserva.fecha_hora_fin,
+                Reserva.id_persona,
+                Reserva.id_sala,
+                Reserva.id_articulo,
+            )
+            .where(Reserva.fecha_hora_inicio >= fecha_inicio)
+            .order_by(Reserva.fecha_hora_inicio, Reserva.id)
+            .execution_options(yield_per=tamano_lote)
+        )
+        yield from db.execute(consulta).partitions()
 
     @staticmethod
     def check_conflicts(
@@ -147,7 +390,72 @@ class ReservaRepository:
         fecha_fin: datetime,
         exclude_reserva_id: Optional[int] = None,
     ) -> List[Reserva]:
-        """Verificar conflictos de reservas en una sala."""
+        """
+        Verificar conflictos de reservas en una sala.
+
+        Según RESERVA_INDEX_MODE se consulta primero el índice en memoria:
+        si no hay candidatos se evita la consulta a la base; si los hay, se
+        confirman en la base de datos. En modo "verify" siempre se consulta
+        la base y se reportan diferencias con el índice.
+        """
+        modo = settings.reserva_index_mode
+        if modo == MODO_DESACTIVADO or not sala_interval_index.listo:
+            return ReservaRepository._query_conflicts(
+                db, sala_id, fecha_inicio, fecha_fin, exclude_reserva_id
+            )
+
+        candidatos = sala_interval_index.buscar_conflictos(
+            sala_id, fecha_inicio, fecha_fin, exclude_reserva_id
+        )
+
+        if modo == MODO_VERIFICACION:
+            conflicts = ReservaRepository._query_conflicts(
+                db, sala_id, fecha_inicio, fecha_fin, exclude_reserva_id
+            )
+            if sorted(candidatos) != sorted(r.id for r in conflicts):
+                logger.warning(
+                    "⚠️ Índice de sala %s desincronizado: índice=%s, base=%s",
+                    sala_id, sorted(candidatos), sorted(r.id for r in conflicts),
+                )
+                sala_interval_index.recargar_sala(db, sala_id)
+            return conflicts
+
+        if not candidatos:
+            return []
+
+        # Confirmar los candidatos en la base de datos
+        return ReservaRepository._query_conflicts(
+            db, sala_id, fecha_inicio, fecha_fin, exclude_reserva_id
+        )
+
+    @staticmethod
+    def existe_restriccion_de_sala(db: Session) -> bool:
+        """Indicar si la base tiene la restricción de solapamiento de salas (0002)."""
+        if db.get_bind().dialect.name != "postgresql":
+            return False
+        return db.execute(
+            text("SELECT 1 FROM pg_constraint WHERE conname = :nombre"),
+            {"nombre": RESTRICCION_SOLAPAMIENTO_SALA},
+        ).first() is not None
+
+    @staticmethod
+    def es_conflicto_de_sala(error: IntegrityError) -> bool:
+        """Indicar si el error proviene de la restricción de solapamiento de salas."""
+        diag = getattr(error.orig, "diag", None)
+        nombre = getattr(diag, "constraint_name", None)
+        if nombre is not None:
+            return nombre == RESTRICCION_SOLAPAMIENTO_SALA
+        return RESTRICCION_SOLAPAMIENTO_SALA in str(error.orig)
+
+    @staticmethod
+    def _query_conflicts(
+        db: Session,
+        sala_id: int,
+        fecha_inicio: datetime,
+        fecha_fin: datetime,
+        exclude_reserva_id: Optional[int] = None,
+    ) -> List[Reserva]:
+        """Consultar en la base de datos las reservas que se solapan."""
         query = db.query(Reserva).filter(
             Reserva.id_sala == sala_id,
             Reserva.fecha_hora_inicio < fecha_fin,
@@ -159,6 +467,205 @@ class ReservaRepository:
 
         return query.all()
 
+    @staticmethod
+    def get_intervalos_salas(
+        db: Session,
+        sala_ids: Iterable[int],
+        fecha_inicio: datetime,
+        fecha_fin: datetime,
+    ) -> List[Tuple[int, int, datetime, datetime]]:
+        """
+        Obtener los intervalos reservados de varias salas en un período.
+
+        Returns:
+            Lista de tuplas (id, id_sala, fecha_hora_inicio, fecha_hora_fin)
+        """
+        ids = set(sala_ids)
+        if not ids:
+            return []
+        return db.query(
+            Reserva.id,
+            Reserva.id_sala,
+            Reserva.fecha_hora_inicio,
+            Reserva.fecha_hora_fin,
+        ).filter(
+            Reserva.id_sala.in_(ids),
+            Reserva.fecha_hora_inicio < fecha_fin,
+            Reserva.fecha_hora_fin > fecha_inicio,
+        ).all()
+
+    @staticmethod
+    def get_uso_articulos(
+        db: Session,
+        articulo_ids: Iterable[int],
+        fecha_inicio: datetime,
+        fecha_fin: datetime,
+    ) -> List[Tuple[int, datetime, datetime, int]]:
+        """
+        Obtener el uso de varios artículos en un período.
+
+        Incluye reservas directas (1 unidad) y artículos asignados a
+        reservas de sala, con la misma semántica de solapamiento que la
+        validación individual.
+
+        Returns:
+            Lista de tuplas (articulo_id, fecha_hora_inicio, fecha_hora_fin, cantidad)
+        """
+        ids = list(set(articulo_ids))
+        if not ids:
+            return []
+        query = text(
+            """
+            SELECT r.id_articulo AS articulo_id, r.fecha_hora_inicio,
+                   r.fecha_hora_fin, 1 AS cantidad
+            FROM reservas r
+            WHERE r.id_articulo IN :articulo_ids
+            AND r.fecha_hora_fin >= :fecha_inicio
+            AND r.fecha_hora_inicio <= :fecha_fin
+
+            UNION ALL
+
+            SELECT ra.articulo_id, r.fecha_hora_inicio,
+                   r.fecha_hora_fin, ra.cantidad
+            FROM reserva_articulos ra
+            JOIN reservas r ON ra.reserva_id = r.id
+            WHERE ra.articulo_id IN :articulo_ids
+            AND r.fecha_hora_fin >= :fecha_inicio
+            AND r.fecha_hora_inicio <= :fecha_fin
+            """
+        ).bindparams(bindparam("articulo_ids", expanding=True))
+        result = db.execute(
+            query,
+            {
+                "articulo_ids": ids,
+                "fecha_inicio": fecha_inicio,
+                "fecha_fin": fecha_fin,
+            },
+        )
+        return [tuple(row) for row in result]
+
+    @staticmethod
+    def get_reservado_por_articulo(
+        db: Session,
+        fecha_inicio: datetime,
+        fecha_fin: datetime,
+        excluir_reserva_id: Optional[int] = None,
+    ) -> Dict[int, int]:
+        """
+        Obtener las unidades reservadas de cada artículo en un período.
+
+        Una sola consulta agrupada para todos los artículos: reservas
+        directas (1 unidad) más artículos asignados a reservas de sala, con
+        el mismo solapamiento inclusivo que la validación individual.
+
+        Args:
+            db: Sesión de base de datos
+            fecha_inicio: Inicio del período
+            fecha_fin: Fin del período
+            excluir_reserva_id: Reserva a no contar (la que se está editando)
+
+        Returns:
+            Diccionario articulo_id -> unidades reservadas (solo artículos con uso)
+        """
+        result = db.execute(
+            text(
+                """
+                SELECT articulo_id, SUM(cantidad_usada) AS total_reservado
+                FROM (
+                    SELECT r.id_articulo AS articulo_id, 1 AS cantidad_usada
+                    FROM reservas r
+                    WHERE r.id_articulo IS NOT NULL
+                    AND (:reserva_id IS NULL OR r.id != :reserva_id)
+                    AND r.fecha_hora_fin >= :fecha_inicio
+                    AND r.fecha_hora_inicio <= :fecha_fin
+
+                    UNION ALL
+
+                    SELECT ra.articulo_id, ra.cantidad AS cantidad_usada
+                    FROM reserva_articulos ra
+                    JOIN reservas r ON ra.reserva_id = r.id
+                    WHERE (:reserva_id IS NULL OR ra.reserva_id != :reserva_id)
+                    AND r.fecha_hora_fin >= :fecha_inicio
+                    AND r.fecha_hora_inicio <= :fecha_fin
+                ) AS reservas_activas
+                GROUP BY articulo_id
+                """
+            ),
+            {
+                "reserva_id": excluir_reserva_id,
+                "fecha_inicio": fecha_inicio,
+                "fecha_fin": fecha_fin,
+            },
+        )
+        return {articulo_id: int(total) for articulo_id, total in result}
+
+    @staticmethod
+    def get_uso_en_periodo(
+        db: Session,
+        fecha_inicio: datetime,
+        fecha_fin: datetime,
+        excluir_reserva_id: Optional[int] = None,
+    ) -> List[Tuple[int, datetime, datetime, int]]:
+        """
+        Obtener el uso de todos los artículos que se solapa con un período.
+
+        Igual que get_uso_articulos pero sin filtrar por artículo, para
+        calcular ocupación simultánea de todo el inventario.
+
+        Returns:
+            Lista de tuplas (articulo_id, fecha_hora_inicio, fecha_hora_fin, cantidad)
+        """
+        result = db.execute(
+            text(
+                """
+                SELECT r.id_articulo AS articulo_id, r.fecha_hora_inicio,
+                       r.fecha_hora_fin, 1 AS cantidad
+                FROM reservas r
+                WHERE r.id_articulo IS NOT NULL
+                AND (:reserva_id IS NULL OR r.id != :reserva_id)
+                AND r.fecha_hora_fin >= :fecha_inicio
+                AND r.fecha_hora_inicio <= :fecha_fin
+
+                UNION ALL
+
+                SELECT ra.articulo_id, r.fecha_hora_inicio,
+                       r.fecha_hora_fin, ra.cantidad
+                FROM reserva_articulos ra
+                JOIN reservas r ON ra.reserva_id = r.id
+                WHERE (:reserva_id IS NULL OR ra.reserva_id != :reserva_id)
+                AND r.fecha_hora_fin >= :fecha_inicio
+                AND r.fecha_hora_inicio <= :fecha_fin
+                """
+            ),
+            {
+                "reserva_id": excluir_reserva_id,
+                "fecha_inicio": fecha_inicio,
+                "fecha_fin": fecha_fin,
+            },
+        )
+        return [tuple(row) for row in result]
+
+    @staticmethod
+    def get_articulos_asignados(db: Session, reserva_id: int) -> Dict[int, int]:
+        """
+        Obtener las unidades de cada artículo asignadas a una reserva.
+
+        Returns:
+            Diccionario articulo_id -> cantidad asignada
+        """
+        result = db.execute(
+            text(
+                """
+                SELECT articulo_id, SUM(cantidad) AS total
+                FROM reserva_articulos
+                WHERE reserva_id = :reserva_id
+                GROUP BY articulo_id
+                """
+            ),
+            {"reserva_id": reserva_id},
+        )
+        return {articulo_id: int(total) for articulo_id, total in result}
+
     @staticmethod
     def update(
         db: Session, reserva_id: int, reserva_data: ReservaUpdate
@@ -168,12 +675,24 @@ class ReservaRepository:
         if not db_reserva:
             return None
 
+        anterior = fila_de(db_reserva)
         update_data = reserva_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_reserva, field, value)
 
-        db.commit()
+        try:
+            db.flush()
+            ReservaDiariaRepository.sumar(
+                db, altas=[fila_de(db_reserva)], bajas=[anterior]
+            )
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise
         db.refresh(db_reserva)
+        sala_interval_index.registrar(db_reserva)
+        snapshot_reservas.registrar(db_reserva)
+        ReservaRepository.notificar_cambio()
         return db_reserva
 
     @staticmethod
@@ -184,10 +703,159 @@ class ReservaRepository:
             return False
 
         db.delete(db_reserva)
-        db.commit()
+        try:
+            db.flush()
+            ReservaDiariaRepository.sumar(db, bajas=[fila_de(db_reserva)])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        sala_interval_index.quitar(reserva_id)
+        snapshot_reservas.quitar(reserva_id)
+        ReservaRepository.notificar_cambio()
         return True
 
     @staticmethod
     def count(db: Session) -> int:
         """Contar total de reservas."""
         return db.query(Reserva).count()
+
+    @staticmethod
+    async def count_async(db: AsyncSession) -> int:
+        """Contar total de reservas (sesión asíncrona)."""
+        return await db.scalar(select(func.count()).select_from(Reserva))
+
+    @staticmethod
+    async def count_vigentes_async(db: AsyncSession, momento: datetime) -> int:
+        """Contar reservas en curso o futuras: terminan en `momento` o después."""
+        return await db.scalar(
+            select(func.count())
+            .select_from(Reserva)
+            .where(Reserva.fecha_hora_fin >= momento)
+        )
+
+    @staticmethod
+    async def count_salas_ocupadas_async(db: AsyncSession, momento: datetime) -> int:
+        """Contar las salas con una reserva en curso en `momento`."""
+        return await db.scalar(
+            select(func.count(func.distinct(Reserva.id_sala))).where(
+                Reserva.id_sala.isnot(None),
+                Reserva.fecha_hora_inicio <= momento,
+                Reserva.fecha_hora_fin >= momento,
+            )
+        )
+
+    @staticmethod
+    async def get_en_rango_async(
+        db: AsyncSession, fecha_inicio: datetime, fecha_fin: Optional[datetime] = None
+    ) -> List[Reserva]:
+        """
+        Obtener las reservas que empiezan dentro de un rango (sesión asíncrona).
+
+        Devuelve las reservas sin relaciones: en una sesión asíncrona no hay
+        carga diferida, así que solo deben usarse sus columnas.
+        """
+        query = select(Reserva).where(Reserva.fecha_hora_inicio >= fecha_inicio)
+        if fecha_fin is not None:
+            query = query.where(Reserva.fecha_hora_inicio <= fecha_fin)
+        result = await db.execute(query.order_by(Reserva.fecha_hora_inicio))
+        return list(result.scalars())
+
+    @staticmethod
+    def get_columnas_dashboard(
+        db: Session, fecha_inicio: datetime
+    ) -> List[Tuple[int, int, datetime, datetime]]:
+        """
+        Obtener las columnas que agrega el dashboard, sin objetos ORM.
+
+        Returns:
+            Filas (id_sala o 0 si es de artículo, id_persona, inicio, fin) de
+            las reservas que empiezan desde `fecha_inicio`
+        """
+        return db.execute(_select_columnas_dashboard(fecha_inicio)).all()
+
+    @staticmethod
+    async def get_columnas_dashboard_async(
+        db: AsyncSession, fecha_inicio: datetime
+    ) -> List[Tuple[int, int, datetime, datetime]]:
+        """Obtener las columnas que agrega el dashboard (sesión asíncrona)."""
+        result = await db.execute(_select_columnas_dashboard(fecha_inicio))
+        return result.all()
+
+    @staticmethod
+    def get_ocupacion(
+        db: Session, momento: datetime
+    ) -> Tuple[Dict[int, int], Set[int]]:
+        """
+        Obtener en una sola consulta la ocupación de artículos y salas.
+
+        Args:
+            db: Sesión de base de datos
+            momento: Instante a consultar (hora local naive)
+
+        Returns:
+            Tupla (unidades reservadas por artículo, IDs de salas ocupadas)
+        """
+        result = db.execute(
+            text(
+                """
+                SELECT 'articulo' AS tipo, articulo_id AS recurso_id,
+                       SUM(cantidad_usada) AS total
+                FROM (
+                    SELECT r.id_articulo AS articulo_id, 1 AS cantidad_usada
+                    FROM reservas r
+                    WHERE r.id_articulo IS NOT NULL
+                    AND r.fecha_hora_fin >= :momento
+                    AND r.fecha_hora_inicio <= :momento
+
+                    UNION ALL
+
+                    SELECT ra.articulo_id, ra.cantidad AS cantidad_usada
+                    FROM reserva_articulos ra
+                    JOIN reservas r ON ra.reserva_id = r.id
+                    WHERE r.fecha_hora_fin >= :momento
+                    AND r.fecha_hora_inicio <= :momento
+                ) AS reservas_activas
+                GROUP BY articulo_id
+
+                UNION ALL
+
+                SELECT 'sala' AS tipo, r.id_sala AS recurso_id, COUNT(*) AS total
+                FROM reservas r
+                WHERE r.id_sala IS NOT NULL
+                AND r.fecha_hora_fin >= :momento
+                AND r.fecha_hora_inicio <= :momento
+                GROUP BY r.id_sala
+                """
+            ),
+            {"momento": momento},
+        )
+        articulos: Dict[int, int] = {}
+        salas: Set[int] = set()
+        for tipo, recurso_id, total in result:
+            if tipo == "sala":
+                salas.add(recurso_id)
+            else:
+                articulos[recurso_id] = int(total)
+        return articulos, salas
+
+    @staticmethod
+    def suscribir_cambios(observador: Callable[[], None]) -> None:
+        """Registrar una función a llamar tras cada cambio de reservas confirmado."""
+        if observador not in _observadores_cambios:
+            _observadores_cambios.append(observador)
+
+    @staticmethod
+    def notificar_cambio() -> None:
+        """
+        Avisar a los observadores que cambiaron las reservas.
+
+        Lo llaman los métodos de escritura de este repositorio después del
+        commit; quien modifique reservas o sus artículos por otra vía debe
+        llamarlo también.
+        """
+        for observador in list(_observadores_cambios):
+            try:
+                observador()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("❌ Error al notificar un cambio de reservas")
@@ -0,0 +1,236 @@
+"""
+Repositorio para operaciones CRUD de ReservaSerie.
+
+Este módulo contiene las operaciones de base de datos para las series de
+reservas recurrentes. Las ocurrencias se insertan, modifican y eliminan
+con una sola sentencia por operación, no una por ocurrencia.
+"""
+import logging
+from datetime import date, datetime, time
+from typing import List, Optional
+from sqlalchemy import (
+    Date, String, Time, cast, delete, func, insert, literal, type_coerce, update
+)
+from sqlalchemy.orm import Session
+from app.models.reserva import Reserva
+from app.models.reserva_serie import ReservaSerie
+from app.repositories.reserva_diaria_repository import (
+    COLUMNAS_FILA,
+    ReservaDiariaRepository,
+)
+from app.repositories.reserva_repository import ReservaRepository
+from app.repositories.sala_interval_index import sala_interval_index
+from app.repositories.snapshot_reservas import snapshot_reservas
+from app.schemas.reserva_serie import ReservaSerieCreate
+
+logger = logging.getLogger(__name__)
+
+
+def _en_el_dia(db: Session, hora: time):
+    """Expresión SQL del día de inicio de cada ocurrencia a la hora indicada."""
+    if db.get_bind().dialect.name == "postgresql":
+        return cast(Reserva.fecha_hora_inicio, Date) + literal(hora, Time)
+    # SQLite guarda las fechas como texto 'AAAA-MM-DD HH:MM:SS.ffffff'
+    return type_coerce(func.date(Reserva.fecha_hora_inicio), String) + (
+        f" {hora.isoformat(timespec='microseconds')}"
+    )
+
+
+class ReservaSerieRepository:
+    """Repositorio para operaciones CRUD de ReservaSerie."""
+
+    @staticmethod
+    def create(
+        db: Session,
+        serie_data: ReservaSerieCreate,
+        inicios: List[datetime],
+        fines: List[datetime],
+        excepciones: List[date],
+    ) -> ReservaSerie:
+        """
+        Crear una serie junto con todas sus ocurrencias.
+
+        Las ocurrencias se insertan con un único INSERT multi-fila en la
+        misma transacción que la serie.
+        """
+        db_serie = ReservaSerie(
+            id_persona=serie_data.id_persona,
+            id_sala=serie_data.id_sala,
+            frecuencia=serie_data.frecuencia,
+            intervalo=serie_data.intervalo,
+            fecha_hora_inicio=serie_data.fecha_hora_inicio,
+            fecha_hora_fin=serie_data.fecha_hora_fin,
+            repeticiones=serie_data.repeticiones,
+            hasta=serie_data.hasta,
+            excepciones=sorted({fecha.isoformat() for fecha in excepciones}),
+        )
+        db.add(db_serie)
+        try:
+            db.flush()
+            db.execute(
+                insert(Reserva),
+                [
+                    {
+                        "id_persona": serie_data.id_persona,
+                        "id_sala": serie_data.id_sala,
+                        "fecha_hora_inicio": inicio,
+                        "fecha_hora_fin": fin,
+                        "id_serie": db_serie.id,
+                    }
+                    for inicio, fin in zip(inicios, fines)
+                ],
+            )
+            ReservaDiariaRepository.sumar(
+                db,
+                altas=(
+                    (inicio, fin, serie_data.id_sala, None, serie_data.id_persona)
+                    for inicio, fin in zip(inicios, fines)
+                ),
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        db.refresh(db_serie)
+        sala_interval_index.recargar_sala(db, db_serie.id_sala)
+        snapshot_reservas.recargar_serie(db, db_serie.id)
+        ReservaRepository.notificar_cambio()
+        return db_serie
+
+    @staticmethod
+    def get_by_id(db: Session, serie_id: int) -> Optional[ReservaSerie]:
+        """Obtener una serie por su ID."""
+        return db.query(ReservaSerie).filter(ReservaSerie.id == serie_id).first()
+
+    @staticmethod
+    def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[ReservaSerie]:
+        """Obtener todas las series con paginación."""
+        return (
+            db.query(ReservaSerie)
+            .order_by(ReservaSerie.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def get_by_persona(
+        db: Session, persona_id: int, skip: int = 0, limit: int = 100
+    ) -> List[ReservaSerie]:
+        """Obtener las series de una persona."""
+        return (
+            db.query(ReservaSerie)
+            .filter(ReservaSerie.id_persona == persona_id)
+            .order_by(ReservaSerie.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def get_ocurrencias(
+        db: Session, serie_id: int, desde: Optional[datetime] = None
+    ) -> List[Reserva]:
+        """Obtener las ocurrencias de una serie ordenadas por fecha."""
+        query = db.query(Reserva).filter(Reserva.id_serie == serie_id)
+        if desde is not None:
+            query = query.filter(Reserva.fecha_hora_inicio >= desde)
+        return query.order_by(Reserva.fecha_hora_inicio).all()
+
+    @staticmethod
+    def update_ocurrencias(
+        db: Session,
+        serie: ReservaSerie,
+        id_persona: Optional[int] = None,
+        hora_inicio: Optional[time] = None,
+        hora_fin: Optional[time] = None,
+        desde: Optional[datetime] = None,
+    ) -> int:
+        """
+        Modificar las ocurrencias de una serie con un único UPDATE.
+
+        El nuevo horario se aplica en SQL sobre la fecha de cada ocurrencia,
+        y el UPDATE devuelve (RETURNING) las filas nuevas para sumar su
+        aporte a los hechos diarios. Si no se indica `desde`, también se
+        actualiza la regla de la serie.
+
+        Returns:
+            Cantidad de ocurrencias modificadas
+        """
+        if id_persona is None and hora_inicio is None:
+            return 0
+
+        condiciones = [Reserva.id_serie == serie.id]
+        if desde is not None:
+            condiciones.append(Reserva.fecha_hora_inicio >= desde)
+        valores = {}
+        if id_persona is not None:
+            valores["id_persona"] = id_persona
+        if hora_inicio is not None:
+            # Ambas expresiones leen el inicio anterior (el UPDATE ve la fila vieja)
+            valores["fecha_hora_inicio"] = _en_el_dia(db, hora_inicio)
+            valores["fecha_hora_fin"] = _en_el_dia(db, hora_fin)
+        try:
+            # Restar el aporte anterior a los hechos diarios y sumar el nuevo
+            ReservaDiariaRepository.restar_reservas(db, *condiciones)
+            nuevas = db.execute(
+                update(Reserva)
+                .where(*condiciones)
+                .values(**valores)
+                .returning(*COLUMNAS_FILA)
+                .execution_options(synchronize_session=False)
+            ).all()
+            ReservaDiariaRepository.sumar(db, altas=nuevas)
+            if desde is None:
+                if id_persona is not None:
+                    serie.id_persona = id_persona
+                if hora_inicio is not None:
+                    dia = serie.fecha_hora_inicio.date()
+                    serie.fecha_hora_inicio = datetime.combine(dia, hora_inicio)
+                    serie.fecha_hora_fin = datetime.combine(dia, hora_fin)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        db.refresh(serie)
+        sala_interval_index.recargar_sala(db, serie.id_sala)
+        snapshot_reservas.recargar_serie(db, serie.id)
+        ReservaRepository.notificar_cambio()
+        return len(nuevas)
+
+    @staticmethod
+    def delete(
+        db: Session, serie: ReservaSerie, desde: Optional[datetime] = None
+    ) -> int:
+        """
+        Cancelar las ocurrencias de una serie con un único DELETE.
+
+        Sin `desde` se elimina también la serie.
+
+        Returns:
+            Cantidad de ocurrencias eliminadas
+        """
+        condiciones = [Reserva.id_serie == serie.id]
+        if desde is not None:
+            condiciones.append(Reserva.fecha_hora_inicio >= desde)
+        sentencia = delete(Reserva).where(*condiciones).returning(*COLUMNAS_FILA)
+        sala_id, serie_id = serie.id_sala, serie.id
+        try:
+            bajas = db.execute(
+                sentencia.execution_options(synchronize_session=False)
+            ).all()
+            eliminadas = len(bajas)
+            if desde is None:
+                db.delete(serie)
+            ReservaDiariaRepository.sumar(db, bajas=bajas)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        sala_interval_index.recargar_sala(db, sala_id)
+        snapshot_reservas.quitar_serie(serie_id, desde)
+        ReservaRepository.notificar_cambio()
+        return eliminadas
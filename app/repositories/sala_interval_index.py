@@ -0,0 +1,265 @@
+"""
+Índice en memoria de intervalos ocupados por sala.
+
+Este módulo mantiene, por cada sala, la lista ordenada de intervalos
+reservados para detectar solapamientos sin ir a la base de datos.
+El índice se precarga al iniciar la aplicación, se actualiza desde
+ReservaRepository en cada alta, modificación o baja y se recarga
+periódicamente desde la base (SALA_INDEX_RECONCILIAR) para incorporar lo
+escrito por otros workers o por fuera de la API.
+"""
+import bisect
+import logging
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+from sqlalchemy.orm import Session
+from app.models.reserva import Reserva
+
+logger = logging.getLogger(__name__)
+
+# Modos de operación de check_conflicts
+MODO_DESACTIVADO = "off"
+MODO_INDICE = "index"
+MODO_VERIFICACION = "verify"
+MODOS_VALIDOS = (MODO_DESACTIVADO, MODO_INDICE, MODO_VERIFICACION)
+
+# Zona de las columnas de reservas (timestamp sin zona, hora de Argentina)
+ZONA_LOCAL = ZoneInfo("America/Argentina/Buenos_Aires")
+
+
+def a_hora_local(fecha: datetime) -> datetime:
+    """
+    Llevar una fecha a hora local sin zona, como las guarda la base.
+
+    Las fechas con zona (p. ej. "...Z" en la URL) se convierten igual que
+    lo hace PostgreSQL al compararlas con las columnas sin zona; compararlas
+    directamente con las del índice fallaría con TypeError.
+    """
+    if fecha.tzinfo is None:
+        return fecha
+    return fecha.astimezone(ZONA_LOCAL).replace(tzinfo=None)
+
+
+class IntervalosSala:
+    """Intervalos de una sala ordenados por fecha de inicio."""
+
+    def __init__(self):
+        # Entradas (inicio, reserva_id) ordenadas; el fin se guarda aparte
+        self.entradas: List[Tuple[datetime, int]] = []
+        self.fines: Dict[int, datetime] = {}
+        # Duración máxima vista: acota el rango de candidatos a revisar
+        self.max_duracion = timedelta(0)
+
+    def agregar(self, reserva_id: int, inicio: datetime, fin: datetime) -> None:
+        """Insertar un intervalo manteniendo el orden."""
+        bisect.insort(self.entradas, (inicio, reserva_id))
+        self.fines[reserva_id] = fin
+        self.max_duracion = max(self.max_duracion, fin - inicio)
+
+    def quitar(self, reserva_id: int, inicio: datetime) -> None:
+        """Eliminar un intervalo existente."""
+        posicion = bisect.bisect_left(self.entradas, (inicio, reserva_id))
+        if (
+            posicion < len(self.entradas)
+            and self.entradas[posicion] == (inicio, reserva_id)
+        ):
+            self.entradas.pop(posicion)
+        self.fines.pop(reserva_id, None)
+
+    def solapados(
+        self,
+        fecha_inicio: datetime,
+        fecha_fin: datetime,
+        exclude_reserva_id: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Obtener los IDs de reservas que se solapan con [fecha_inicio, fecha_fin).
+
+        Solo se revisan las entradas con inicio en
+        (fecha_inicio - max_duracion, fecha_fin), que se ubican por búsqueda
+        binaria; el resto no puede solaparse.
+        """
+        hasta = bisect.bisect_left(self.entradas, (fecha_fin, -math.inf))
+        desde = bisect.bisect_left(
+            self.entradas, (fecha_inicio - self.max_duracion, math.inf)
+        )
+        return [
+            reserva_id
+            for _, reserva_id in self.entradas[desde:hasta]
+            if reserva_id != exclude_reserva_id
+            and self.fines[reserva_id] > fecha_inicio
+        ]
+
+
+class SalaIntervalIndex:
+    """
+    Índice de intervalos reservados por sala, compartido por el proceso.
+
+    Las búsquedas usan la misma semántica que la consulta SQL original
+    (inicio < fecha_fin y fin > fecha_inicio). El índice es local a cada
+    proceso: con varios workers, las altas hechas por otro proceso no se
+    ven hasta la próxima recarga periódica, por eso check_conflicts
+    verifica en base de datos cualquier candidato encontrado, ofrece un
+    modo de verificación y la restricción de exclusión de la base es la
+    que rechaza en última instancia las altas solapadas.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._lock_carga = threading.Lock()
+        self._salas: Dict[int, IntervalosSala] = {}
+        self._reservas: Dict[int, Tuple[int, datetime]] = {}
+        self._listo = False
+        # Escrituras recibidas mientras se lee la base en una recarga: se
+        # reaplican sobre el índice nuevo
+        self._cargando = False
+        self._pendientes: List[Tuple[Callable[..., None], Tuple[Any, ...]]] = []
+        self.reconciliaciones = 0
+
+    @property
+    def listo(self) -> bool:
+        """Indica si el índice fue precargado y puede usarse."""
+        return self._listo
+
+    def cargar(self, db: Session) -> int:
+        """
+        Precargar el índice con todas las reservas de salas.
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Cantidad de reservas indexadas
+        """
+        with self._lock_carga:
+            with self._lock:
+                self._cargando = True
+                self._pendientes = []
+            try:
+                filas = db.query(
+                    Reserva.id,
+                    Reserva.id_sala,
+                    Reserva.fecha_hora_inicio,
+                    Reserva.fecha_hora_fin,
+                ).filter(Reserva.id_sala.isnot(None)).all()
+            except Exception:
+                with self._lock:
+                    self._cargando = False
+                    self._pendientes = []
+                raise
+
+            with self._lock:
+                if self._listo:
+                    self.reconciliaciones += 1
+                pendientes, self._pendientes = self._pendientes, []
+                self._cargando = False
+                self._salas = {}
+                self._reservas = {}
+                for reserva_id, sala_id, inicio, fin in filas:
+                    self._agregar(reserva_id, sala_id, inicio, fin)
+                self._listo = True
+                # Confirmadas mientras se leía la base: pueden faltar en `filas`
+                for operacion, argumentos in pendientes:
+                    operacion(*argumentos)
+
+        logger.info("✅ Índice de salas precargado con %d reservas", len(filas))
+        return len(filas)
+
+    def recargar_sala(self, db: Session, sala_id: int) -> None:
+        """Reconstruir desde la base de datos los intervalos de una sala."""
+        filas = db.query(
+            Reserva.id, Reserva.fecha_hora_inicio, Reserva.fecha_hora_fin
+        ).filter(Reserva.id_sala == sala_id).all()
+        self._aplicar(self._reemplazar_sala, sala_id, filas)
+
+    def registrar(self, reserva: Reserva) -> None:
+        """Agregar o actualizar una reserva en el índice."""
+        self._aplicar(
+            self._registrar,
+            reserva.id,
+            reserva.id_sala,
+            reserva.fecha_hora_inicio,
+            reserva.fecha_hora_fin,
+        )
+
+    def quitar(self, reserva_id: int) -> None:
+        """Eliminar una reserva del índice."""
+        self._aplicar(self._quitar, reserva_id)
+
+    def buscar_conflictos(
+        self,
+        sala_id: int,
+        fecha_inicio: datetime,
+        fecha_fin: datetime,
+        exclude_reserva_id: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Buscar reservas de la sala que se solapan con el período indicado.
+
+        Returns:
+            Lista de IDs de reservas en conflicto según el índice
+        """
+        fecha_inicio, fecha_fin = a_hora_local(fecha_inicio), a_hora_local(fecha_fin)
+        with self._lock:
+            intervalos = self._salas.get(sala_id)
+            if intervalos is None:
+                return []
+            return intervalos.solapados(fecha_inicio, fecha_fin, exclude_reserva_id)
+
+    def limpiar(self) -> None:
+        """Vaciar el índice y marcarlo como no disponible."""
+        with self._lock:
+            self._salas = {}
+            self._reservas = {}
+            self._listo = False
+
+    def _aplicar(self, operacion: Callable[..., None], *argumentos: Any) -> None:
+        """Aplicar una escritura y guardarla si hay una recarga en curso."""
+        with self._lock:
+            operacion(*argumentos)
+            if self._cargando:
+                self._pendientes.append((operacion, argumentos))
+
+    def _registrar(
+        self,
+        reserva_id: int,
+        sala_id: Optional[int],
+        inicio: datetime,
+        fin: datetime,
+    ) -> None:
+        self._quitar(reserva_id)
+        if sala_id is not None:
+            self._agregar(reserva_id, sala_id, inicio, fin)
+
+    def _reemplazar_sala(self, sala_id: int, filas: List[Tuple]) -> None:
+        anteriores = self._salas.pop(sala_id, None)
+        if anteriores:
+            for reserva_id in anteriores.fines:
+                self._reservas.pop(reserva_id, None)
+        for reserva_id, inicio, fin in filas:
+            self._agregar(reserva_id, sala_id, inicio, fin)
+
+    def _agregar(
+        self, reserva_id: int, sala_id: int, inicio: datetime, fin: datetime
+    ) -> None:
+        inicio, fin = a_hora_local(inicio), a_hora_local(fin)
+        self._salas.setdefault(sala_id, IntervalosSala()).agregar(
+            reserva_id, inicio, fin
+        )
+        self._reservas[reserva_id] = (sala_id, inicio)
+
+    def _quitar(self, reserva_id: int) -> None:
+        ubicacion = self._reservas.pop(reserva_id, None)
+        if ubicacion is None:
+            return
+        sala_id, inicio = ubicacion
+        intervalos = self._salas.get(sala_id)
+        if intervalos is not None:
+            intervalos.quitar(reserva_id, inicio)
+
+
+# Instancia global del índice
+sala_interval_index = SalaIntervalIndex()
@@ -6,6 +6,8 @@ Este módulo contiene las operaciones de base de datos para el modelo Sala,
 incluyendo crear, leer, actualizar y eliminar registros.
 """
 from typing import List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.sala import Sala
 from app.schemas.sala import SalaCreate, SalaUpdate
@@ -98,3 +100,17 @@ class SalaRepository:
         if min_capacidad is not None:
             query = query.filter(Sala.capacidad >= min_capacidad)
         return query.count()
+
+    @staticmethod
+    async def get_all_async(db: AsyncSession) -> List[Sala]:
+        """Obtener todas las salas (sesión asíncrona)."""
+        result = await db.execute(select(Sala).order_by(Sala.id))
+        return list(result.scalars())
+
+    @staticmethod
+    async def count_async(db: AsyncSession, min_capacidad: Optional[int] = None) -> int:
+        """Contar salas con filtro opcional (sesión asíncrona)."""
+        query = select(func.count()).select_from(Sala)
+        if min_capacidad is not None:
+            query = query.where(Sala.capacidad >= min_capacidad)
+        return await db.scalar(query)
@@ -0,0 +1,375 @@
+"""
+Foto columnar en memoria de las reservas para analítica.
+
+La analítica, las predicciones y las estadísticas solo leen sala,
+artículo, persona e intervalo de cada reserva. Esta foto los guarda en
+arrays de NumPy (una columna por campo; inicio y fin en segundos desde
+EPOCA, hora local naive como en la base) para filtrarlos y agregarlos de
+forma vectorizada sin hidratar objetos Reserva en cada consulta.
+
+Se carga una vez (al iniciar la aplicación o en la primera lectura), se
+actualiza desde ReservaRepository y ReservaSerieRepository en cada alta,
+modificación o baja, y se reconcilia periódicamente con la base de datos
+para recoger los cambios hechos por otros workers o por fuera de la API.
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.reserva import Reserva
+
+logger = logging.getLogger(__name__)
+
+EPOCA = datetime(1970, 1, 1)
+SEGUNDOS_POR_DIA = 86400
+# El 1/1/1970 fue jueves (lunes = 0)
+_DIA_SEMANA_EPOCA = 3
+# Las funciones de calendario pasan los segundos a int64 antes de dividir:
+# la división entera y el módulo de float64 son varias veces más lentos
+
+# Columnas de la foto; las referencias nulas se guardan como 0
+COLUMNAS = (
+    "id", "id_sala", "id_articulo", "id_persona", "id_serie", "inicio", "fin"
+)
+_TIPOS = {columna: np.int64 for columna in COLUMNAS}
+_TIPOS.update(inicio=np.float64, fin=np.float64)
+CAPACIDAD_MINIMA = 1024
+
+# (id, id_sala, id_articulo, id_persona, id_serie, inicio, fin) ya convertida
+FilaSnapshot = Tuple[int, int, int, int, int, float, float]
+
+
+def a_segundos(fechas: Iterable[datetime], cantidad: int) -> np.ndarray:
+    """
+    Convertir fechas naive a segundos desde EPOCA.
+
+    Restar datetimes en Python es un orden de magnitud más rápido que
+    convertir la lista con np.array(..., dtype="datetime64[s]").
+    """
+    return np.fromiter(
+        ((fecha - EPOCA).total_seconds() for fecha in fechas),
+        np.float64,
+        count=cantidad,
+    )
+
+
+def a_segundo(fecha: datetime) -> float:
+    """Convertir una fecha naive a segundos desde EPOCA."""
+    return (fecha - EPOCA).total_seconds()
+
+
+def dias_semana(segundos: np.ndarray) -> np.ndarray:
+    """Día de la semana (lunes = 0) de cada instante."""
+    return (segundos.astype(np.int64) // SEGUNDOS_POR_DIA + _DIA_SEMANA_EPOCA) % 7
+
+
+def horas_del_dia(segundos: np.ndarray) -> np.ndarray:
+    """Hora (0 a 23) de cada instante."""
+    return segundos.astype(np.int64) % SEGUNDOS_POR_DIA // 3600
+
+
+def _a_fila(
+    reserva_id: int,
+    id_sala: Optional[int],
+    id_articulo: Optional[int],
+    id_persona: int,
+    id_serie: Optional[int],
+    inicio: datetime,
+    fin: datetime,
+) -> FilaSnapshot:
+    return (
+        reserva_id,
+        id_sala or 0,
+        id_articulo or 0,
+        id_persona,
+        id_serie or 0,
+        a_segundo(inicio),
+        a_segundo(fin),
+    )
+
+
+def _select_columnas():
+    return select(
+        Reserva.id,
+        Reserva.id_sala,
+        Reserva.id_articulo,
+        Reserva.id_persona,
+        Reserva.id_serie,
+        Reserva.fecha_hora_inicio,
+        Reserva.fecha_hora_fin,
+    )
+
+
+def _columnas_de(
+    filas: Sequence[Sequence[Any]], capacidad: int
+) -> Dict[str, np.ndarray]:
+    """Armar las columnas a partir de filas leídas de la base."""
+    cantidad = len(filas)
+    columnas = {
+        columna: np.zeros(capacidad, dtype=_TIPOS[columna]) for columna in COLUMNAS
+    }
+    for i, columna in enumerate(COLUMNAS[:5]):
+        columnas[columna][:cantidad] = np.fromiter(
+            (fila[i] or 0 for fila in filas), np.int64, count=cantidad
+        )
+    columnas["inicio"][:cantidad] = a_segundos((fila[5] for fila in filas), cantidad)
+    columnas["fin"][:cantidad] = a_segundos((fila[6] for fila in filas), cantidad)
+    return columnas
+
+
+class SnapshotReservas:
+    """
+    Columnas de todas las reservas, compartidas por el proceso.
+
+    Las filas dadas de baja quedan marcadas con id 0 hasta que superan la
+    mitad de la foto y se compactan. La foto es local a cada proceso: con
+    varios workers, las escrituras de otro proceso se ven al reconciliar.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        # Una sola carga a la vez
+        self._lock_carga = threading.Lock()
+        self._columnas = _columnas_de([], CAPACIDAD_MINIMA)
+        # Filas usadas (incluye bajas) y fila de cada reserva vigente
+        self._usadas = 0
+        self._posicion: Dict[int, int] = {}
+        self._listo = False
+        # Escrituras ocurridas durante una carga: se reaplican sobre la foto nueva
+        self._cargando = False
+        self._pendientes: List[Tuple[str, Tuple[Any, ...]]] = []
+        self._cargada_en: Optional[float] = None
+        self.registradas = 0
+        self.quitadas = 0
+        self.reconciliaciones = 0
+
+    @property
+    def listo(self) -> bool:
+        """Indica si la foto fue cargada y puede usarse."""
+        return self._listo
+
+    def cargar(self, db: Session) -> int:
+        """
+        Cargar (o reconciliar) la foto con todas las reservas de la base.
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Cantidad de reservas cargadas
+        """
+        with self._lock_carga:
+            return self._cargar(db)
+
+    def columnas(
+        self,
+        db: Session,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Obtener las columnas de las reservas que empiezan en [desde, hasta].
+
+        Si la foto todavía no se cargó, la carga con `db`.
+
+        Returns:
+            Diccionario columna -> array (copias alineadas por posición) con
+            id, id_sala, id_articulo, id_persona, id_serie (0 si no tiene),
+            inicio y fin (segundos desde EPOCA)
+        """
+        if not self._listo:
+            with self._lock_carga:
+                if not self._listo:
+                    self._cargar(db)
+
+        with self._lock:
+            usadas = slice(0, self._usadas)
+            seleccion = self._columnas["id"][usadas] > 0
+            inicios = self._columnas["inicio"][usadas]
+            if desde is not None:
+                seleccion &= inicios >= a_segundo(desde)
+            if hasta is not None:
+                seleccion &= inicios <= a_segundo(hasta)
+            return {
+                columna: valores[usadas][seleccion]
+                for columna, valores in self._columnas.items()
+            }
+
+    def registrar(self, reserva: Reserva) -> None:
+        """Agregar o actualizar una reserva en la foto."""
+        self._registrar_fila(
+            _a_fila(
+                reserva.id,
+                reserva.id_sala,
+                reserva.id_articulo,
+                reserva.id_persona,
+                reserva.id_serie,
+                reserva.fecha_hora_inicio,
+                reserva.fecha_hora_fin,
+            )
+        )
+
+    def quitar(self, reserva_id: int) -> None:
+        """Eliminar una reserva de la foto."""
+        with self._lock:
+            if not self._en_uso():
+                return
+            if self._cargando:
+                self._pendientes.append(("quitar", (reserva_id,)))
+            posicion = self._posicion.pop(reserva_id, None)
+            if posicion is not None:
+                self._columnas["id"][posicion] = 0
+                self.quitadas += 1
+                self._compactar_si_hace_falta()
+
+    def quitar_serie(self, serie_id: int, desde: Optional[datetime] = None) -> None:
+        """Eliminar las ocurrencias de una serie (desde una fecha, si se indica)."""
+        with self._lock:
+            if not self._en_uso():
+                return
+            if self._cargando:
+                self._pendientes.append(("quitar_serie", (serie_id, desde)))
+            usadas = slice(0, self._usadas)
+            seleccion = (self._columnas["id_serie"][usadas] == serie_id) & (
+                self._columnas["id"][usadas] > 0
+            )
+            if desde is not None:
+                seleccion &= self._columnas["inicio"][usadas] >= a_segundo(desde)
+            filas = np.flatnonzero(seleccion)
+            for reserva_id in self._columnas["id"][filas].tolist():
+                del self._posicion[reserva_id]
+            self._columnas["id"][filas] = 0
+            self.quitadas += len(filas)
+            self._compactar_si_hace_falta()
+
+    def recargar_serie(self, db: Session, serie_id: int) -> None:
+        """Reemplazar las ocurrencias de una serie por las de la base."""
+        if not self._en_uso():
+            return
+        filas = db.execute(
+            _select_columnas().where(Reserva.id_serie == serie_id)
+        ).all()
+        with self._lock:
+            self.quitar_serie(serie_id)
+            for fila in filas:
+                self._registrar_fila(_a_fila(*fila))
+
+    def stats(self) -> Dict[str, Any]:
+        """Obtener tamaño, escrituras aplicadas y antigüedad de la foto."""
+        with self._lock:
+            return {
+                "listo": self._listo,
+                "reservas": len(self._posicion),
+                "filas": self._usadas,
+                "capacidad": len(self._columnas["id"]),
+                "bytes": sum(valores.nbytes for valores in self._columnas.values()),
+                "registradas": self.registradas,
+                "quitadas": self.quitadas,
+                "reconciliaciones": self.reconciliaciones,
+                "edad_segundos": (
+                    round(time.monotonic() - self._cargada_en, 3)
+                    if self._cargada_en is not None
+                    else None
+                ),
+            }
+
+    def limpiar(self) -> None:
+        """Vaciar la foto y marcarla como no disponible."""
+        with self._lock:
+            self._columnas = _columnas_de([], CAPACIDAD_MINIMA)
+            self._usadas = 0
+            self._posicion = {}
+            self._listo = False
+            self._cargada_en = None
+
+    def _cargar(self, db: Session) -> int:
+        """Cargar la foto desde la base (con _lock_carga tomado)."""
+        with self._lock:
+            self._cargando = True
+            self._pendientes = []
+        try:
+            filas = db.execute(_select_columnas()).all()
+        except Exception:
+            with self._lock:
+                self._cargando = False
+                self._pendientes = []
+            raise
+
+        columnas = _columnas_de(filas, max(CAPACIDAD_MINIMA, 2 * len(filas)))
+        with self._lock:
+            anteriores = len(self._posicion) if self._listo else None
+            pendientes, self._pendientes = self._pendientes, []
+            self._cargando = False
+            self._columnas = columnas
+            self._usadas = len(filas)
+            self._posicion = dict(
+                zip(columnas["id"][: len(filas)].tolist(), range(len(filas)))
+            )
+            self._listo = True
+            # Escrituras confirmadas mientras se leía la base: pueden faltar
+            # en las filas leídas, y reaplicarlas no cambia las que ya están
+            for operacion, argumentos in pendientes:
+                getattr(self, operacion)(*argumentos)
+            self._cargada_en = time.monotonic()
+            vigentes = len(self._posicion)
+            if anteriores is not None:
+                self.reconciliaciones += 1
+
+        if anteriores is None:
+            logger.info("✅ Foto de reservas cargada con %d reservas", vigentes)
+        elif anteriores != vigentes:
+            logger.info(
+                "🔄 Foto de reservas reconciliada: %d reservas (tenía %d)",
+                vigentes,
+                anteriores,
+            )
+        return vigentes
+
+    def _en_uso(self) -> bool:
+        # Sin foto cargada no hay nada que mantener: la carga leerá la base
+        return self._listo or self._cargando
+
+    def _registrar_fila(self, fila: FilaSnapshot) -> None:
+        with self._lock:
+            if not self._en_uso():
+                return
+            if self._cargando:
+                self._pendientes.append(("_registrar_fila", (fila,)))
+            posicion = self._posicion.get(fila[0])
+            if posicion is None:
+                if self._usadas == len(self._columnas["id"]):
+                    self._crecer()
+                posicion = self._usadas
+                self._usadas += 1
+                self._posicion[fila[0]] = posicion
+            for columna, valor in zip(COLUMNAS, fila):
+                self._columnas[columna][posicion] = valor
+            self.registradas += 1
+
+    def _crecer(self) -> None:
+        capacidad = 2 * len(self._columnas["id"])
+        for columna, valores in self._columnas.items():
+            nuevos = np.zeros(capacidad, dtype=valores.dtype)
+            nuevos[: self._usadas] = valores[: self._usadas]
+            self._columnas[columna] = nuevos
+
+    def _compactar_si_hace_falta(self) -> None:
+        dadas_de_baja = self._usadas - len(self._posicion)
+        if dadas_de_baja <= CAPACIDAD_MINIMA or dadas_de_baja * 2 <= self._usadas:
+            return
+        vigentes = np.flatnonzero(self._columnas["id"][: self._usadas] > 0)
+        for columna, valores in self._columnas.items():
+            valores[: len(vigentes)] = valores[vigentes]
+            valores[len(vigentes): self._usadas] = 0
+        self._usadas = len(vigentes)
+        self._posicion = dict(
+            zip(self._columnas["id"][: self._usadas].tolist(), range(self._usadas))
+        )
+
+
+# Instancia global de la foto
+snapshot_reservas = SnapshotReservas()
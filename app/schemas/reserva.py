@@ -1,12 +1,14 @@
 """reserva"""
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 # Constantes para ejemplos de fechas
 EXAMPLE_FECHA_INICIO = "2025-10-16T09:00:00"
 EXAMPLE_FECHA_FIN = "2025-10-16T17:00:00"
 EXAMPLE_FECHA_INICIO_2 = "2025-10-17T14:00:00"
 EXAMPLE_FECHA_FIN_2 = "2025-10-17T16:00:00"
+# Máximo de reservas aceptadas en un lote
+MAX_RESERVAS_POR_LOTE = 500
 """
 Esquemas Pydantic para el modelo Reserva.
 
@@ -190,3 +192,44 @@ class Reserva(ReservaBase):
         description="Identificador único de la reserva",
         examples=[1, 2, 3, 42, 100],
     )
+    id_serie: Optional[int] = Field(
+        None,
+        description="ID de la serie recurrente a la que pertenece la reserva",
+        examples=[None, 1],
+    )
+
+
+class ReservaBatchCreate(BaseModel):
+    """
+    Esquema para crear un lote de reservas en una sola operación.
+
+    Cada reserva se valida con las mismas reglas que una alta individual,
+    contra las reservas existentes y contra las anteriores del mismo lote.
+    """
+
+    reservas: List[ReservaCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_RESERVAS_POR_LOTE,
+        description=f"Reservas a crear (máximo {MAX_RESERVAS_POR_LOTE})",
+    )
+
+
+class ReservaBatchItemResult(BaseModel):
+    """Resultado de una reserva dentro de un lote."""
+
+    indice: int = Field(..., description="Posición de la reserva en el lote")
+    ok: bool = Field(..., description="Indica si la reserva fue creada")
+    reserva: Optional[Reserva] = Field(None, description="Reserva creada")
+    error: Optional[str] = Field(None, description="Motivo del rechazo")
+
+
+class ReservaBatchResult(BaseModel):
+    """Resumen del procesamiento de un lote de reservas."""
+
+    total: int = Field(..., description="Cantidad de reservas recibidas")
+    creadas: int = Field(..., description="Cantidad de reservas creadas")
+    rechazadas: int = Field(..., description="Cantidad de reservas rechazadas")
+    resultados: List[ReservaBatchItemResult] = Field(
+        ..., description="Resultado por reserva, en el orden recibido"
+    )
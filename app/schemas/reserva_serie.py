@@ -0,0 +1,141 @@
+"""
+Esquemas Pydantic para series de reservas recurrentes.
+
+Este módulo define los esquemas de validación y serialización
+para crear, modificar y consultar series de reservas de salas.
+"""
+from datetime import date, datetime, time
+from typing import List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from app.schemas.reserva import Reserva
+from app.services.recurrence import MAX_OCURRENCIAS
+
+
+class ReservaSerieBase(BaseModel):
+    """Esquema base con la regla de recurrencia de una serie."""
+
+    id_persona: int = Field(
+        ..., gt=0, description="ID de la persona que realiza la reserva", examples=[1]
+    )
+    id_sala: int = Field(
+        ..., gt=0, description="ID de la sala a reservar", examples=[1]
+    )
+    fecha_hora_inicio: datetime = Field(
+        ...,
+        description="Inicio de la primera ocurrencia (formato ISO 8601)",
+        examples=["2025-10-20T09:00:00"],
+    )
+    fecha_hora_fin: datetime = Field(
+        ...,
+        description="Fin de la primera ocurrencia (formato ISO 8601)",
+        examples=["2025-10-20T11:00:00"],
+    )
+    frecuencia: Literal["diaria", "semanal"] = Field(
+        ..., description="Frecuencia de repetición", examples=["semanal"]
+    )
+    intervalo: int = Field(
+        1,
+        ge=1,
+        le=52,
+        description="Cada cuántos días o semanas se repite",
+        examples=[1, 2],
+    )
+    repeticiones: Optional[int] = Field(
+        None,
+        ge=1,
+        le=MAX_OCURRENCIAS,
+        description="Cantidad de ocurrencias (excluyente con hasta)",
+        examples=[16],
+    )
+    hasta: Optional[datetime] = Field(
+        None,
+        description="Fecha límite de la serie (excluyente con repeticiones)",
+        examples=["2025-12-15T23:59:59"],
+    )
+    excepciones: List[date] = Field(
+        default_factory=list,
+        description="Fechas en las que no se genera ocurrencia",
+        examples=[["2025-11-24"]],
+    )
+
+
+class ReservaSerieCreate(ReservaSerieBase):
+    """
+    Esquema para crear una serie de reservas recurrentes de sala.
+
+    ### 🚨 Reglas Importantes
+    - Se debe indicar `repeticiones` o `hasta` (solo uno de los dos)
+    - La duración de cada ocurrencia no puede superar el intervalo
+    - Si alguna ocurrencia choca con reservas existentes la serie se rechaza,
+      salvo que `omitir_conflictos` sea verdadero
+    """
+
+    omitir_conflictos: bool = Field(
+        False,
+        description="Crear la serie omitiendo las ocurrencias en conflicto",
+    )
+
+    @model_validator(mode="after")
+    def validate_regla(self) -> "ReservaSerieCreate":
+        """Validar fechas y que se indique repeticiones o fecha límite."""
+        if self.fecha_hora_fin <= self.fecha_hora_inicio:
+            raise ValueError("La fecha de fin debe ser posterior a la fecha de inicio")
+        if (self.repeticiones is None) == (self.hasta is None):
+            raise ValueError(
+                "Se debe indicar repeticiones o hasta (solo uno de los dos)"
+            )
+        return self
+
+
+class ReservaSerieUpdate(BaseModel):
+    """
+    Esquema para modificar todas las ocurrencias de una serie.
+
+    Los cambios se aplican a las ocurrencias que comienzan a partir de
+    `desde` (o a todas si no se indica) en una sola operación.
+    """
+
+    id_persona: Optional[int] = Field(
+        None, gt=0, description="Nuevo ID de la persona responsable", examples=[2]
+    )
+    hora_inicio: Optional[time] = Field(
+        None,
+        description="Nueva hora de inicio de cada ocurrencia",
+        examples=["10:00:00"],
+    )
+    hora_fin: Optional[time] = Field(
+        None, description="Nueva hora de fin de cada ocurrencia", examples=["12:00:00"]
+    )
+    desde: Optional[datetime] = Field(
+        None,
+        description="Aplicar solo a ocurrencias que comienzan desde esta fecha",
+        examples=["2025-11-01T00:00:00"],
+    )
+
+    @model_validator(mode="after")
+    def validate_horario(self) -> "ReservaSerieUpdate":
+        """Validar que el nuevo horario se indique completo."""
+        if (self.hora_inicio is None) != (self.hora_fin is None):
+            raise ValueError("Se deben indicar hora_inicio y hora_fin juntas")
+        if self.hora_inicio is not None and self.hora_fin <= self.hora_inicio:
+            raise ValueError("La hora de fin debe ser posterior a la hora de inicio")
+        return self
+
+
+class ReservaSerie(ReservaSerieBase):
+    """Esquema completo de una serie de reservas para respuestas de la API."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int = Field(..., description="Identificador único de la serie", examples=[1])
+
+
+class ReservaSerieResult(BaseModel):
+    """Serie junto con sus ocurrencias creadas o modificadas."""
+
+    serie: ReservaSerie = Field(..., description="Serie de reservas")
+    ocurrencias: List[Reserva] = Field(..., description="Ocurrencias de la serie")
+    omitidas: List[datetime] = Field(
+        default_factory=list,
+        description="Inicios de las ocurrencias omitidas por conflictos",
+    )
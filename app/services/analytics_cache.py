@@ -0,0 +1,166 @@
+"""
+Caché de resultados de los endpoints de analítica y predicción.
+
+El dashboard de reportes consulta métricas y predicciones cada pocos
+segundos desde cada pestaña abierta. Esta caché guarda el resultado de
+cada endpoint por combinación de parámetros durante un TTL, con un máximo
+de entradas (se descarta la menos usada), y lo comparte entre todas esas
+consultas. Cada alta, cambio o baja de reservas avisada por
+ReservaRepository incrementa la versión y descarta todo lo guardado, de
+modo que el costo de la analítica depende de las escrituras y no de
+cuántos dashboards estén abiertos.
+
+Las consultas idénticas concurrentes sin resultado guardado se coalescen:
+la primera calcula y las demás esperan ese mismo resultado. La caché es
+por proceso; con varios workers, cada uno ve sus propios cambios al
+instante y los de los demás al vencer el TTL.
+"""
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Mapping, Tuple, TypeVar
+from app.core.config import settings
+from app.repositories.reserva_repository import ReservaRepository
+
+T = TypeVar("T")
+
+# (endpoint, parámetros ordenados)
+ClaveAnalytics = Tuple[str, Tuple[Tuple[str, Hashable], ...]]
+
+
+class AnalyticsCache:
+    """Resultados por endpoint y parámetros con TTL, LRU y versión por escrituras."""
+
+    def __init__(self, ttl: float, max_entradas: int):
+        """
+        Args:
+            ttl: Segundos en que un resultado se reutiliza (0 desactiva la caché)
+            max_entradas: Resultados guardados como máximo
+        """
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self._lock = threading.Lock()
+        # Clave -> (guardado_en, resultado), de la menos a la más usada
+        self._entradas: "OrderedDict[ClaveAnalytics, Tuple[float, Any]]" = (
+            OrderedDict()
+        )
+        # Cálculos en curso por clave: los llamadores concurrentes los esperan
+        self._en_curso: Dict[ClaveAnalytics, Future] = {}
+        # Se incrementa con cada escritura de reservas
+        self.version = 0
+        self.expulsiones = 0
+        self._contadores: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0, "coalescidas": 0}
+        )
+
+    def obtener(
+        self,
+        endpoint: str,
+        parametros: Mapping[str, Hashable],
+        calcular: Callable[[], T],
+    ) -> T:
+        """
+        Obtener el resultado guardado o calcularlo una sola vez.
+
+        Args:
+            endpoint: Nombre del endpoint (parte de la clave y de las estadísticas)
+            parametros: Parámetros que cambian el resultado
+            calcular: Función que calcula el resultado si no está guardado
+
+        Returns:
+            Resultado (compartido entre llamadores: no modificarlo). Si el
+            cálculo falla, la excepción se propaga a todos los que lo esperaban.
+        """
+        if self.ttl <= 0:
+            with self._lock:
+                self._contadores[endpoint]["misses"] += 1
+            return calcular()
+
+        clave: ClaveAnalytics = (endpoint, tuple(sorted(parametros.items())))
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and time.monotonic() - entrada[0] < self.ttl:
+                self._entradas.move_to_end(clave)
+                self._contadores[endpoint]["hits"] += 1
+                return entrada[1]
+
+            futuro = self._en_curso.get(clave)
+            calcula = futuro is None
+            if calcula:
+                self._contadores[endpoint]["misses"] += 1
+                futuro = Future()
+                self._en_curso[clave] = futuro
+                version = self.version
+            else:
+                self._contadores[endpoint]["coalescidas"] += 1
+        if not calcula:
+            return futuro.result()
+
+        try:
+            resultado = calcular()
+        except BaseException as e:
+            with self._lock:
+                del self._en_curso[clave]
+            futuro.set_exception(e)
+            raise
+        with self._lock:
+            del self._en_curso[clave]
+            # Un resultado calculado antes de una escritura no se guarda
+            if version == self.version:
+                self._guardar(clave, resultado)
+        futuro.set_result(resultado)
+        return resultado
+
+    def invalidar(self) -> None:
+        """Incrementar la versión y descartar los resultados guardados."""
+        with self._lock:
+            self.version += 1
+            self._entradas.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Obtener la tasa de aciertos total y por endpoint."""
+        with self._lock:
+            por_endpoint = {
+                endpoint: {
+                    **contadores,
+                    "tasa_aciertos": _tasa(contadores),
+                }
+                for endpoint, contadores in sorted(self._contadores.items())
+            }
+            totales = {
+                campo: sum(c[campo] for c in self._contadores.values())
+                for campo in ("hits", "misses", "coalescidas")
+            }
+            return {
+                "ttl": self.ttl,
+                "max_entradas": self.max_entradas,
+                "entradas": len(self._entradas),
+                "en_curso": len(self._en_curso),
+                "version": self.version,
+                "expulsiones": self.expulsiones,
+                **totales,
+                "tasa_aciertos": _tasa(totales),
+                "endpoints": por_endpoint,
+            }
+
+    def _guardar(self, clave: ClaveAnalytics, resultado: Any) -> None:
+        """Guardar un resultado y expulsar los menos usados (con el lock tomado)."""
+        self._entradas[clave] = (time.monotonic(), resultado)
+        self._entradas.move_to_end(clave)
+        while len(self._entradas) > self.max_entradas:
+            self._entradas.popitem(last=False)
+            self.expulsiones += 1
+
+
+def _tasa(contadores: Mapping[str, int]) -> float:
+    """Lecturas servidas sin calcular (guardadas o coalescidas) sobre el total."""
+    aciertos = contadores["hits"] + contadores["coalescidas"]
+    lecturas = aciertos + contadores["misses"]
+    return round(aciertos / lecturas, 3) if lecturas else 0.0
+
+
+analytics_cache = AnalyticsCache(
+    settings.analytics_cache_ttl, settings.analytics_cache_max_entradas
+)
+ReservaRepository.suscribir_cambios(analytics_cache.invalidar)
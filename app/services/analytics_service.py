@@ -1,11 +1,15 @@
 from datetime import datetime, timedelta
 from typing import Dict
+import numpy as np
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, desc
-from app.models.reserva import Reserva
+from app.models.reserva_diaria import ReservaDiaria
 from app.models.sala import Sala
 from app.models.articulo import Articulo
 from app.models.persona import Persona
+from app.prediction.modelo_demanda import modelo_demanda
+from app.repositories.reserva_diaria_repository import ReservaDiariaRepository
+from app.repositories.snapshot_reservas import a_segundo, snapshot_reservas
 
 class AnalyticsService:
     """Servicio para análisis y métricas del sistema de reservas."""
@@ -13,62 +17,56 @@ class AnalyticsService:
         self.db = db
 
     def get_ocupacion_dashboard(self, days: int = 30) -> Dict:
-        """Métricas principales para el dashboard"""
+        """Métricas principales para el dashboard (desde reservas_diarias)"""
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days)
+        en_periodo = and_(
+            ReservaDiaria.fecha >= start_date.date(),
+            ReservaDiaria.fecha <= end_date.date()
+        )
         # Total de reservas en el periodo
-        total_reservas = self.db.query(func.count(Reserva.id)).filter(
-            Reserva.fecha_hora_inicio >= start_date,
-            Reserva.fecha_hora_inicio <= end_date
+        total_reservas = self.db.query(func.sum(ReservaDiaria.cantidad)).filter(
+            en_periodo
         ).scalar() or 0
         # Ocupación por sala
         ocupacion_salas = self.db.query(
             Sala.nombre,
-            func.count(Reserva.id).label('total_reservas'),
-            func.avg(
-                func.extract('epoch', Reserva.fecha_hora_fin - Reserva.fecha_hora_inicio) / 3600
-            ).label('horas_promedio')
-        ).outerjoin(Reserva, and_(
-            Reserva.id_sala == Sala.id,
-            Reserva.fecha_hora_inicio >= start_date,
-            Reserva.fecha_hora_inicio <= end_date
+            func.sum(ReservaDiaria.cantidad).label('total_reservas'),
+            func.sum(ReservaDiaria.horas).label('total_horas')
+        ).outerjoin(ReservaDiaria, and_(
+            ReservaDiaria.id_sala == Sala.id,
+            en_periodo
         )).group_by(Sala.id, Sala.nombre).all()
         # Tendencia de reservas por día
-        reservas_por_dia = self.db.query(
-            func.date(Reserva.fecha_hora_inicio).label('fecha'),
-            func.count(Reserva.id).label('cantidad')
-        ).filter(
-            Reserva.fecha_hora_inicio >= start_date,
-            Reserva.fecha_hora_inicio <= end_date
-        ).group_by(func.date(Reserva.fecha_hora_inicio)).order_by('fecha').all()
+        reservas_por_dia = ReservaDiariaRepository.get_por_dia(
+            self.db, start_date.date(), end_date.date()
+        )
         # Top usuarios
         top_usuarios = self.db.query(
             Persona.nombre,
             Persona.email,
-            func.count(Reserva.id).label('total_reservas')
-        ).join(Reserva).filter(
-            Reserva.fecha_hora_inicio >= start_date,
-            Reserva.fecha_hora_inicio <= end_date
+            func.sum(ReservaDiaria.cantidad).label('total_reservas')
+        ).join(ReservaDiaria, ReservaDiaria.id_persona == Persona.id).filter(
+            en_periodo
         ).group_by(Persona.id, Persona.nombre, Persona.email).order_by(
             desc('total_reservas')
         ).limit(5).all()
         # Reservas de hoy
         today = datetime.utcnow().date()
-        reservas_hoy = self.db.query(func.count(Reserva.id)).filter(
-            func.date(Reserva.fecha_hora_inicio) == today
+        reservas_hoy = self.db.query(func.sum(ReservaDiaria.cantidad)).filter(
+            ReservaDiaria.fecha == today
         ).scalar() or 0
         # Salas disponibles ahora
         now = datetime.utcnow()
-        salas_ocupadas = self.db.query(func.count(func.distinct(Reserva.id_sala))).filter(
-            Reserva.fecha_hora_inicio <= now,
-            Reserva.fecha_hora_fin >= now
-        ).scalar() or 0
+        iniciadas = snapshot_reservas.columnas(self.db, hasta=now)
+        en_curso = (iniciadas['fin'] >= a_segundo(now)) & (iniciadas['id_sala'] > 0)
+        salas_ocupadas = np.unique(iniciadas['id_sala'][en_curso]).size
         total_salas = self.db.query(func.count(Sala.id)).scalar() or 0
         salas_disponibles = total_salas - salas_ocupadas
         return {
             'metricas_principales': {
-               'total_reservas': total_reservas,
-               'reservas_hoy': reservas_hoy,
+               'total_reservas': int(total_reservas),
+               'reservas_hoy': int(reservas_hoy),
                'salas_disponibles': salas_disponibles,
                'total_salas': total_salas,
                'ocupacion_porcentaje': round((salas_ocupadas / total_salas * 100) 
@@ -77,53 +75,42 @@ class AnalyticsService:
             'ocupacion_salas': [
                 {
                     'sala': sala.nombre,
-                    'reservas': sala.total_reservas or 0,
-                    'horas_promedio': round(float(sala.horas_promedio or 0), 1)
+                    'reservas': int(sala.total_reservas or 0),
+                    'horas_promedio': round(
+                        float(sala.total_horas) / sala.total_reservas, 1
+                    ) if sala.total_reservas else 0.0
                 } for sala in ocupacion_salas
             ],
             'tendencia_reservas': [
                 {
                     'fecha': reserva.fecha.strftime('%Y-%m-%d') 
                     if hasattr(reserva.fecha, 'strftime') else str(reserva.fecha),
-                    'cantidad': reserva.cantidad
+                    'cantidad': int(reserva.cantidad)
                 } for reserva in reservas_por_dia
             ],
             'top_usuarios': [
                 {
                     'nombre': usuario.nombre,
                     'email': usuario.email,
-                    'reservas': usuario.total_reservas
+                    'reservas': int(usuario.total_reservas)
                 } for usuario in top_usuarios
             ]
         }
     def get_prediccion_ocupacion(self, dias_adelante: int = 7) -> Dict:
         """Predicción de ocupación basada en patrones históricos"""
-        # Calcular promedio de reservas por día de la semana
-        patron_semanal = self.db.query(
-            func.extract('dow', Reserva.fecha_hora_inicio).label('dia_semana'),
-            func.count(Reserva.id).label('total_reservas')
-        ).group_by(
-            func.extract('dow', Reserva.fecha_hora_inicio)
-        ).all()
-
-        # Crear diccionario de patrones
-        patrones = {int(p.dia_semana): p.total_reservas for p in patron_semanal}
+        # Total de reservas por día de la semana, del modelo de demanda vigente
+        modelo = modelo_demanda.obtener(self.db)
 
         # Generar predicciones
         predicciones = []
-        today = datetime.utcnow().date()
-
-        for i in range(1, dias_adelante + 1):
-            fecha_pred = today + timedelta(days=i)
-            dia_semana = fecha_pred.weekday()
 
-            # Domingo = 6 en Python, pero PostgreSQL usa 0
-            dia_semana_pg = (dia_semana + 1) % 7
+        for i in range(dias_adelante):
+            dia_semana = int(modelo.dias_semana[i])
 
-            prediccion = patrones.get(dia_semana_pg, 0)
+            prediccion = int(modelo.totales_dia_semana[dia_semana])
 
             predicciones.append({
-                'fecha': fecha_pred.strftime('%Y-%m-%d'),
+                'fecha': modelo.fechas[i].strftime('%Y-%m-%d'),
                 'dia_semana': ['Lun', 'Mar', 'Mié', 'Jue', 'Vie', 'Sáb', 'Dom'][dia_semana],
                 'prediccion_reservas': prediccion,
                 'confianza': 0.75 if prediccion > 0 else 0.3
@@ -6,12 +6,20 @@ Este módulo contiene la lógica de negocio para el modelo Articulo,
 incluyendo validaciones y operaciones complejas.
 """
 import asyncio
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 from app.models.articulo import Articulo
 from app.repositories.articulo_repository import ArticuloRepository
+from app.repositories.reserva_repository import ReservaRepository
 from app.schemas.articulo import ArticuloCreate, ArticuloUpdate
 from app.services.java_client import JavaServiceClient
+from app.services.ocupacion_actual import ocupacion_actual
+from app.services.ocupacion_pico import articulos_agotados, pico_por_articulo
+
+# Cómo se cuenta lo reservado de un artículo en un período
+METODO_SUMA = "suma"  # todas las reservas que se solapan con el período
+METODO_PICO = "pico"  # máximo de unidades reservadas a la vez dentro del período
 class ArticuloService:
     """Servicio para operaciones de negocio de Articulo."""
     @staticmethod
@@ -216,3 +224,152 @@ class ArticuloService:
         """
         articulo = ArticuloRepository.get_by_id(db, articulo_id)
         return articulo is not None and getattr(articulo, "disponible", False)
+
+    @staticmethod
+    def get_disponibilidad_periodo(
+        db: Session,
+        fecha_inicio: datetime,
+        fecha_fin: datetime,
+        reserva_id: Optional[int] = None,
+        metodo: str = METODO_SUMA,
+    ) -> List[Dict[str, Any]]:
+        """
+        Calcular la disponibilidad de los artículos disponibles en un período.
+
+        Lo reservado se obtiene con una sola consulta agrupada por artículo
+        (y otra para lo asignado a `reserva_id`), en lugar de una consulta
+        por artículo.
+
+        Args:
+            db: Sesión de base de datos
+            fecha_inicio: Inicio del período
+            fecha_fin: Fin del período
+            reserva_id: Reserva que se está editando (no cuenta como ocupación)
+            metodo: METODO_SUMA (criterio de la validación de reservas) o
+                METODO_PICO (máximo simultáneo dentro del período)
+
+        Returns:
+            Lista con la disponibilidad de cada artículo
+
+        Raises:
+            ValueError: Si el método no es válido
+        """
+        if metodo == METODO_SUMA:
+            reservado = ReservaRepository.get_reservado_por_articulo(
+                db, fecha_inicio, fecha_fin, reserva_id
+            )
+        elif metodo == METODO_PICO:
+            reservado = pico_por_articulo(
+                ReservaRepository.get_uso_en_periodo(
+                    db, fecha_inicio, fecha_fin, reserva_id
+                ),
+                fecha_inicio,
+                fecha_fin,
+            )
+        else:
+            raise ValueError(f"Método de cálculo inválido: {metodo}")
+        articulos = ArticuloRepository.get_all(db, skip=0, limit=1000)
+        asignado = (
+            ReservaRepository.get_articulos_asignados(db, reserva_id)
+            if reserva_id is not None
+            else {}
+        )
+
+        resultado = []
+        for articulo in articulos:
+            if not articulo.disponible:
+                continue
+            reservado_otros = reservado.get(articulo.id, 0)
+            asignado_en_reserva = asignado.get(articulo.id, 0)
+            resultado.append(
+                {
+                    "id": articulo.id,
+                    "nombre": articulo.nombre,
+                    "descripcion": articulo.descripcion,
+                    "categoria": articulo.categoria,
+                    "cantidad_total": articulo.cantidad,
+                    # Lo reservado por otros (excluye esta reserva)
+                    "cantidad_reservada_otros": reservado_otros,
+                    # Lo que ya tiene asignado esta reserva
+                    "cantidad_asignada_en_reserva": asignado_en_reserva,
+                    # Disponible total ignorando esta reserva (campo histórico)
+                    "cantidad_disponible": max(0, articulo.cantidad - reservado_otros),
+                    # Lo que realmente puede agregar adicionalmente en esta reserva
+                    "cantidad_disponible_para_agregar": max(
+                        0, articulo.cantidad - reservado_otros - asignado_en_reserva
+                    ),
+                }
+            )
+        return resultado
+
+    @staticmethod
+    def get_disponibilidad_actual(db: Session) -> Dict[int, Dict[str, int]]:
+        """
+        Calcular las unidades reservadas y disponibles de cada artículo ahora.
+
+        Usa la foto compartida de ocupación actual (una consulta cada pocos
+        segundos para todos los artículos).
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Diccionario articulo_id -> {total, reservadas, disponibles}
+        """
+        articulos = ArticuloRepository.get_all(db, skip=0, limit=1000)
+        reservado = ocupacion_actual.obtener(db)["articulos"]
+        disponibilidad = {}
+        for articulo in articulos:
+            reservadas = reservado.get(articulo.id, 0)
+            disponibilidad[articulo.id] = {
+                "total": articulo.cantidad,
+                "reservadas": reservadas,
+                "disponibles": max(0, articulo.cantidad - reservadas),
+            }
+        return disponibilidad
+
+    @staticmethod
+    def get_estadisticas_inventario(db: Session) -> Dict[str, int]:
+        """
+        Calcular las estadísticas generales del inventario.
+
+        Las unidades reservadas son las de reservas en curso ahora (foto
+        compartida de ocupación actual); los artículos sin stock son los que
+        en algún momento del día tienen todas sus unidades reservadas a la vez.
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Diccionario con los totales del inventario
+        """
+        foto = ocupacion_actual.obtener(db)
+        ahora = foto["hora"]
+        articulos = ArticuloRepository.get_all(db, skip=0, limit=1000)
+        total_articulos = len(articulos)
+        articulos_disponibles = sum(1 for art in articulos if art.disponible)
+        # Solo las unidades de artículos marcados como disponibles se pueden reservar
+        unidades_reservables = sum(art.cantidad for art in articulos if art.disponible)
+
+        unidades_reservadas = sum(foto["articulos"].values())
+
+        inicio_dia = ahora.replace(hour=0, minute=0, second=0, microsecond=0)
+        fin_dia = inicio_dia + timedelta(days=1) - timedelta(seconds=1)
+        picos = pico_por_articulo(
+            ReservaRepository.get_uso_en_periodo(db, inicio_dia, fin_dia),
+            inicio_dia,
+            fin_dia,
+        )
+        agotados = articulos_agotados(
+            {art.id: art.cantidad for art in articulos}, picos
+        )
+
+        return {
+            "total_articulos": total_articulos,
+            "articulos_disponibles": articulos_disponibles,
+            "articulos_no_disponibles": total_articulos - articulos_disponibles,
+            "articulos_sin_stock_ahora": len(agotados),
+            "total_unidades": sum(art.cantidad for art in articulos),
+            "unidades_reservadas": unidades_reservadas,
+            "unidades_disponibles": max(0, unidades_reservables - unidades_reservadas),
+        }
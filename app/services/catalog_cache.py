@@ -0,0 +1,141 @@
+"""
+Caché en memoria de los catálogos del servicio Java.
+
+Este módulo guarda la última lista completa de salas o artículos obtenida
+del microservicio Java. Mientras la copia es reciente se devuelve sin
+consultar a Java; vencido el TTL se sigue devolviendo la copia anterior y
+se refresca en segundo plano (stale-while-revalidate). Las altas, cambios
+y bajas hechas a través de JavaServiceClient invalidan la copia.
+"""
+import asyncio
+import copy
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Carga el catálogo completo; devuelve None si el servicio Java falla
+CargadorCatalogo = Callable[[], Awaitable[Optional[List[Dict[str, Any]]]]]
+
+
+class CatalogCache:
+    """Copia de un catálogo con TTL, refresco en segundo plano e invalidación."""
+
+    def __init__(
+        self,
+        nombre: str,
+        cargar: CargadorCatalogo,
+        ttl: float,
+        stale: float,
+    ):
+        """
+        Args:
+            nombre: Nombre del catálogo (para logs y estadísticas)
+            cargar: Función que consulta el catálogo completo al servicio Java
+            ttl: Segundos en que la copia se considera vigente (0 desactiva la caché)
+            stale: Segundos adicionales en que la copia vencida se sigue
+                sirviendo mientras se refresca en segundo plano
+        """
+        self.nombre = nombre
+        self.ttl = ttl
+        self.stale = stale
+        self._cargar = cargar
+        self._datos: Optional[List[Dict[str, Any]]] = None
+        self._cargado_en = 0.0
+        # Se incrementa al invalidar: descarta cargas iniciadas antes
+        self._generacion = 0
+        self._carga: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.hits_vencidos = 0
+        self.misses = 0
+        self.refrescos = 0
+        self.errores = 0
+
+    async def obtener(self) -> List[Dict[str, Any]]:
+        """
+        Obtener el catálogo, consultando a Java solo si hace falta.
+
+        Returns:
+            Copia profunda de los elementos del catálogo (vacía si Java no
+            responde y no hay una copia utilizable); modificarla no altera
+            la caché
+        """
+        if self.ttl <= 0:
+            self.misses += 1
+            return await self._cargar() or []
+
+        edad = time.monotonic() - self._cargado_en
+        if self._datos is not None and edad < self.ttl:
+            self.hits += 1
+            return copy.deepcopy(self._datos)
+
+        if self._datos is not None and edad < self.ttl + self.stale:
+            self.hits_vencidos += 1
+            self._iniciar_carga()
+            return copy.deepcopy(self._datos)
+
+        self.misses += 1
+        datos = await self._iniciar_carga()
+        return copy.deepcopy(datos if datos is not None else self._datos or [])
+
+    def invalidar(self) -> None:
+        """Descartar la copia actual; la próxima lectura consulta a Java."""
+        self._datos = None
+        self._cargado_en = 0.0
+        self._generacion += 1
+        self._carga = None
+        logger.info("🗑️ Caché del catálogo de %s invalidada", self.nombre)
+
+    def stats(self) -> Dict[str, Any]:
+        """Obtener contadores y estado de la copia."""
+        aciertos = self.hits + self.hits_vencidos
+        lecturas = aciertos + self.misses
+        return {
+            "ttl": self.ttl,
+            "stale": self.stale,
+            "elementos": len(self._datos) if self._datos is not None else None,
+            "edad_segundos": (
+                round(time.monotonic() - self._cargado_en, 3)
+                if self._datos is not None
+                else None
+            ),
+            "hits": self.hits,
+            "hits_vencidos": self.hits_vencidos,
+            "misses": self.misses,
+            "refrescos": self.refrescos,
+            "errores": self.errores,
+            "tasa_aciertos": (
+                round(aciertos / lecturas, 3) if lecturas else 0.0
+            ),
+        }
+
+    def _iniciar_carga(self) -> asyncio.Task:
+        """
+        Lanzar una carga del catálogo o reutilizar la que ya está en curso.
+
+        Las lecturas concurrentes del mismo event loop comparten una sola
+        consulta a Java; una carga de otro loop (asyncio.run) no se comparte.
+        """
+        carga = self._carga
+        loop = asyncio.get_running_loop()
+        if carga is not None and not carga.done() and carga.get_loop() is loop:
+            return carga
+        self._carga = loop.create_task(self._refrescar(self._generacion))
+        return self._carga
+
+    async def _refrescar(self, generacion: int) -> Optional[List[Dict[str, Any]]]:
+        """Consultar el catálogo y guardarlo si no se invalidó mientras tanto."""
+        try:
+            datos = await self._cargar()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("❌ Error al refrescar el catálogo de %s: %s", self.nombre, e)
+            datos = None
+        if datos is None:
+            self.errores += 1
+            return None
+        if generacion == self._generacion:
+            self._datos = datos
+            self._cargado_en = time.monotonic()
+            self.refrescos += 1
+        return datos
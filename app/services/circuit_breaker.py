@@ -0,0 +1,174 @@
+"""
+Circuit breaker para las llamadas al servicio Java.
+
+Este módulo lleva el estado de salud del microservicio Java a partir del
+resultado de las llamadas reales y de una sonda periódica. Tras varias
+fallas consecutivas el circuito se abre y las llamadas fallan de inmediato
+en lugar de esperar el timeout; pasado el tiempo de apertura se deja pasar
+una llamada de prueba (semiabierto) y su resultado cierra o reabre el
+circuito.
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Estados del circuito
+CERRADO = "cerrado"
+ABIERTO = "abierto"
+SEMIABIERTO = "semiabierto"
+
+
+class CircuitBreaker:
+    """Circuito cerrado/abierto/semiabierto compartido por todas las llamadas."""
+
+    def __init__(self, nombre: str, umbral_fallos: int, tiempo_apertura: float):
+        """
+        Args:
+            nombre: Nombre del servicio protegido (para logs)
+            umbral_fallos: Fallas consecutivas que abren el circuito
+            tiempo_apertura: Segundos que el circuito permanece abierto antes
+                de permitir una llamada de prueba
+        """
+        self.nombre = nombre
+        self.umbral_fallos = umbral_fallos
+        self.tiempo_apertura = tiempo_apertura
+        self._lock = threading.Lock()
+        self._estado = CERRADO
+        self._fallos_consecutivos = 0
+        self._abierto_desde = 0.0
+        self._prueba_desde: Optional[float] = None
+        self._ultimo_exito: Optional[float] = None
+        self._ultimo_fallo: Optional[float] = None
+        self.rechazadas = 0
+        self.aperturas = 0
+
+    @property
+    def estado(self) -> str:
+        """Estado actual, pasando a semiabierto si venció la apertura."""
+        with self._lock:
+            self._actualizar_estado(time.monotonic())
+            return self._estado
+
+    def permitir(self) -> bool:
+        """
+        Indicar si una llamada puede salir hacia el servicio.
+
+        Con el circuito semiabierto solo se permite una llamada de prueba a
+        la vez; si no informa resultado, se permite otra tras tiempo_apertura.
+        """
+        with self._lock:
+            ahora = time.monotonic()
+            self._actualizar_estado(ahora)
+            if self._estado == CERRADO:
+                return True
+            if self._estado == SEMIABIERTO and (
+                self._prueba_desde is None
+                or ahora - self._prueba_desde >= self.tiempo_apertura
+            ):
+                self._prueba_desde = ahora
+                return True
+            self.rechazadas += 1
+            return False
+
+    def registrar_exito(self) -> None:
+        """Registrar una respuesta del servicio: cierra el circuito."""
+        with self._lock:
+            self._ultimo_exito = time.monotonic()
+            self._fallos_consecutivos = 0
+            self._prueba_desde = None
+            if self._estado != CERRADO:
+                logger.info(
+                    "✅ Circuito de %s cerrado: el servicio respondió", self.nombre
+                )
+            self._estado = CERRADO
+
+    def registrar_fallo(self) -> None:
+        """Registrar una falla; abre el circuito al alcanzar el umbral."""
+        with self._lock:
+            ahora = time.monotonic()
+            self._ultimo_fallo = ahora
+            self._fallos_consecutivos += 1
+            self._prueba_desde = None
+            if self._estado == SEMIABIERTO or (
+                self._estado == CERRADO
+                and self._fallos_consecutivos >= self.umbral_fallos
+            ):
+                self._estado = ABIERTO
+                self._abierto_desde = ahora
+                self.aperturas += 1
+                logger.warning(
+                    "🔴 Circuito de %s abierto tras %s fallas; "
+                    "se reintenta en %s s",
+                    self.nombre,
+                    self._fallos_consecutivos,
+                    self.tiempo_apertura,
+                )
+            elif self._estado == ABIERTO:
+                self._abierto_desde = ahora
+
+    def salud_reciente(self, vigencia: float) -> Optional[bool]:
+        """
+        Estado de salud conocido sin consultar al servicio.
+
+        Args:
+            vigencia: Segundos durante los que un éxito se considera vigente
+
+        Returns:
+            False si el circuito está abierto, True si está cerrado y hubo un
+            éxito en los últimos `vigencia` segundos, None si hay que consultar
+        """
+        with self._lock:
+            ahora = time.monotonic()
+            self._actualizar_estado(ahora)
+            if self._estado == ABIERTO:
+                return False
+            if (
+                self._estado == CERRADO
+                and self._ultimo_exito is not None
+                and ahora - self._ultimo_exito < vigencia
+            ):
+                return True
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Obtener el estado y los contadores del circuito."""
+        with self._lock:
+            ahora = time.monotonic()
+            self._actualizar_estado(ahora)
+            return {
+                "estado": self._estado,
+                "fallos_consecutivos": self._fallos_consecutivos,
+                "umbral_fallos": self.umbral_fallos,
+                "tiempo_apertura": self.tiempo_apertura,
+                "segundos_desde_ultimo_exito": _antiguedad(self._ultimo_exito, ahora),
+                "segundos_desde_ultimo_fallo": _antiguedad(self._ultimo_fallo, ahora),
+                "aperturas": self.aperturas,
+                "rechazadas": self.rechazadas,
+            }
+
+    def reiniciar(self) -> None:
+        """Volver al estado inicial (cerrado y sin historial)."""
+        with self._lock:
+            self._estado = CERRADO
+            self._fallos_consecutivos = 0
+            self._prueba_desde = None
+            self._ultimo_exito = None
+            self._ultimo_fallo = None
+            self.rechazadas = 0
+            self.aperturas = 0
+
+    def _actualizar_estado(self, ahora: float) -> None:
+        """Pasar de abierto a semiabierto cuando vence el tiempo de apertura."""
+        if (
+            self._estado == ABIERTO
+            and ahora - self._abierto_desde >= self.tiempo_apertura
+        ):
+            self._estado = SEMIABIERTO
+            self._prueba_desde = None
+
+
+def _antiguedad(momento: Optional[float], ahora: float) -> Optional[float]:
+    return round(ahora - momento, 3) if momento is not None else None
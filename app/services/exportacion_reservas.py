@@ -0,0 +1,226 @@
+"""
+Exportación en streaming de las reservas de un período.
+
+Las reservas se leen en lotes con un cursor del lado del servidor y cada
+lote se convierte en texto CSV o NDJSON apenas llega, de modo que la
+memoria usada no depende de la longitud del período y el primer lote sale
+hacia el cliente sin esperar al resto.
+
+El Excel no puede enviarse a medida que se escribe (un .xlsx es un zip que
+se cierra al final), pero se arma con xlsxwriter en modo constant_memory:
+cada fila se vuelca a un archivo temporal apenas se escribe, y el archivo
+terminado se envía por partes.
+"""
+import csv
+import json
+import tempfile
+from datetime import datetime
+from io import StringIO
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import xlsxwriter
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.repositories.reserva_repository import ReservaRepository
+
+COLUMNAS_REPORTE = [
+    "id",
+    "fecha_inicio",
+    "fecha_fin",
+    "id_persona",
+    "id_sala",
+    "id_articulo",
+    "tipo",
+    "estado",
+    "duracion_horas",
+]
+
+MENSAJE_SIN_RESERVAS = "No hay reservas en el período seleccionado"
+
+# Bytes por fragmento al enviar el Excel terminado
+TAMANO_FRAGMENTO_EXCEL = 64 * 1024
+
+LoteReporte = List[Dict[str, Any]]
+
+
+def fila_reporte(fila: Sequence[Any], ahora: datetime) -> Dict[str, Any]:
+    """
+    Armar la fila del reporte de una reserva.
+
+    Args:
+        fila: (id, fecha_hora_inicio, fecha_hora_fin, id_persona, id_sala,
+            id_articulo), como la entrega ReservaRepository.iterar_desde
+        ahora: Momento contra el que se calcula el estado
+    """
+    reserva_id, inicio, fin, id_persona, id_sala, id_articulo = fila
+    if inicio <= ahora <= fin:
+        estado = "activa"
+    elif ahora > fin:
+        estado = "completada"
+    else:
+        estado = "pendiente"
+
+    return {
+        "id": reserva_id,
+        "fecha_inicio": inicio.isoformat(),
+        "fecha_fin": fin.isoformat(),
+        "id_persona": id_persona,
+        "id_sala": id_sala,
+        "id_articulo": id_articulo,
+        "tipo": "sala" if id_sala else "articulo",
+        "estado": estado,
+        "duracion_horas": round((fin - inicio).total_seconds() / 3600, 2),
+    }
+
+
+def lotes_reporte(
+    db: Session,
+    fecha_inicio: datetime,
+    ahora: Optional[datetime] = None,
+    tamano_lote: Optional[int] = None,
+) -> Iterator[LoteReporte]:
+    """
+    Recorrer en lotes las filas del reporte de reservas desde una fecha.
+
+    Args:
+        db: Sesión de base de datos (debe seguir abierta mientras se recorre)
+        fecha_inicio: Inicio del período (hora local, naive)
+        ahora: Momento para calcular el estado (por defecto, el actual)
+        tamano_lote: Filas por lote (por defecto EXPORTACION_TAMANO_LOTE)
+    """
+    ahora = ahora or datetime.now()
+    tamano_lote = tamano_lote or settings.exportacion_tamano_lote
+    for lote in ReservaRepository.iterar_desde(db, fecha_inicio, tamano_lote):
+        yield [fila_reporte(fila, ahora) for fila in lote]
+
+
+def _con_primer_lote(
+    lotes: Iterable[LoteReporte],
+) -> Tuple[Optional[LoteReporte], Iterator[LoteReporte]]:
+    """Separar el primer lote no vacío (None si no hay filas) del resto."""
+    lotes = iter(lotes)
+    for lote in lotes:
+        if lote:
+            return lote, lotes
+    return None, lotes
+
+
+def generar_csv(lotes: Iterable[LoteReporte]) -> Iterator[str]:
+    """
+    Generar el reporte CSV de a un fragmento por lote.
+
+    Sin reservas, el CSV tiene una sola columna "mensaje" que lo indica.
+    """
+    primero, resto = _con_primer_lote(lotes)
+    buffer = StringIO()
+    if primero is None:
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerows([["mensaje"], [MENSAJE_SIN_RESERVAS]])
+        yield buffer.getvalue()
+        return
+
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNAS_REPORTE, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(primero)
+    yield buffer.getvalue()
+    for lote in resto:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(lote)
+        yield buffer.getvalue()
+
+
+def generar_ndjson(lotes: Iterable[LoteReporte]) -> Iterator[str]:
+    """Generar el reporte NDJSON (una reserva JSON por línea) de a un lote."""
+    for lote in lotes:
+        if lote:
+            yield "".join(
+                json.dumps(fila, ensure_ascii=False) + "\n" for fila in lote
+            )
+
+
+def _campos_valores(datos: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+    """
+    Aplanar un diccionario en pares (campo, valor) para una hoja de Excel.
+
+    Los diccionarios anidados se expanden como "padre.hijo"; las listas se
+    escriben como JSON en una sola celda.
+    """
+    for campo, valor in datos.items():
+        if isinstance(valor, dict):
+            for subcampo, subvalor in _campos_valores(valor):
+                yield f"{campo}.{subcampo}", subvalor
+        elif isinstance(valor, (list, tuple)):
+            yield campo, json.dumps(valor, ensure_ascii=False, default=str)
+        else:
+            yield campo, valor
+
+
+def _hoja_campos(libro, nombre: str, datos: Dict[str, Any], negrita) -> None:
+    """Escribir una hoja de dos columnas Campo / Valor."""
+    hoja = libro.add_worksheet(nombre)
+    hoja.write_row(0, 0, ["Campo", "Valor"], negrita)
+    for numero, par in enumerate(_campos_valores(datos), start=1):
+        hoja.write_row(numero, 0, par)
+
+
+def escribir_excel(
+    destino: Any,
+    lotes: Iterable[LoteReporte],
+    metricas: Dict[str, Any],
+    metadata: Dict[str, Any],
+) -> None:
+    """
+    Escribir el reporte Excel (hojas Métricas, Reservas e Info).
+
+    Con constant_memory, xlsxwriter solo retiene la fila en curso de cada
+    hoja: las reservas pueden venir de un cursor sin acumularse en memoria.
+    Por eso cada hoja se escribe de arriba hacia abajo y de a una.
+
+    Args:
+        destino: Ruta o archivo binario abierto donde escribir el .xlsx
+        lotes: Lotes de filas del reporte (ver lotes_reporte)
+        metricas: Métricas generales del período
+        metadata: Datos de generación del reporte
+    """
+    libro = xlsxwriter.Workbook(destino, {"constant_memory": True})
+    try:
+        negrita = libro.add_format({"bold": True})
+        _hoja_campos(libro, "Métricas", metricas, negrita)
+
+        hoja = libro.add_worksheet("Reservas")
+        primero, resto = _con_primer_lote(lotes)
+        if primero is None:
+            hoja.write_column(0, 0, ["mensaje", MENSAJE_SIN_RESERVAS])
+        else:
+            hoja.write_row(0, 0, COLUMNAS_REPORTE, negrita)
+            numero = 1
+            for lote in chain([primero], resto):
+                for fila in lote:
+                    hoja.write_row(
+                        numero, 0, [fila[columna] for columna in COLUMNAS_REPORTE]
+                    )
+                    numero += 1
+
+        _hoja_campos(libro, "Info", metadata, negrita)
+    finally:
+        libro.close()
+
+
+def generar_excel(
+    lotes: Iterable[LoteReporte],
+    metricas: Dict[str, Any],
+    metadata: Dict[str, Any],
+) -> Iterator[bytes]:
+    """
+    Generar el reporte Excel y entregarlo en fragmentos de bytes.
+
+    El libro se escribe en un archivo temporal (que se borra al terminar)
+    y se lee de a TAMANO_FRAGMENTO_EXCEL bytes, así ni el libro ni el
+    archivo resultante quedan completos en memoria.
+    """
+    with tempfile.TemporaryFile() as archivo:
+        escribir_excel(archivo, lotes, metricas, metadata)
+        archivo.seek(0)
+        while fragmento := archivo.read(TAMANO_FRAGMENTO_EXCEL):
+            yield fragmento
@@ -5,13 +5,42 @@ Cliente HTTP para comunicación con el servicio Java.
 Este módulo maneja todas las llamadas HTTP al microservicio Java
 que gestiona Salas y Artículos.
 """
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
 import httpx
 from app.core.config import settings
+from app.services.catalog_cache import CatalogCache
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Estado de salud del servicio Java compartido por todas las llamadas
+java_circuit_breaker = CircuitBreaker(
+    "Java Service",
+    umbral_fallos=settings.java_cb_failure_threshold,
+    tiempo_apertura=settings.java_cb_open_seconds,
+)
+
+
+# Consultas GET por recurso en curso, compartidas entre llamadores concurrentes
+java_single_flight = SingleFlight()
+
+
+class CircuitoAbiertoError(httpx.RequestError):
+    """La llamada no se hizo porque el circuito hacia Java está abierto."""
+
+
+async def _registrar_respuesta(response: httpx.Response) -> None:
+    """Actualizar el circuito con el resultado de cada respuesta de Java."""
+    if response.status_code >= 500:
+        java_circuit_breaker.registrar_fallo()
+    else:
+        java_circuit_breaker.registrar_exito()
+
+
 class JavaServiceClient:
     """Cliente para interactuar con el microservicio Java que gestiona Salas y Artículos."""
     @staticmethod
@@ -26,20 +55,19 @@ class JavaServiceClient:
             True si el artículo existe, False en caso contrario
         """
         try:
-            async with httpx.AsyncClient(timeout=JavaServiceClient.TIMEOUT) as client:
-                response = await client.get(
-                    f"{JavaServiceClient.JAVA_SERVICE_URL}/api/articulos/{articulo_id}"
-                )
-                if response.status_code == 200:
-                    logger.info("✅ Artículo %s validado exitosamente.", articulo_id)
-                    return True
-                elif response.status_code == 404:
-                    logger.warning("⚠️ Artículo %s no encontrado en Java Service", articulo_id)
-                    return False
-                else:
-                    logger.error("❌ Error al validar artículo %s: Status %s",
-                                 articulo_id, response.status_code)
-                    return False
+            response = await JavaServiceClient._get_recurso(
+                f"/api/articulos/{articulo_id}"
+            )
+            if response.status_code == 200:
+                logger.info("✅ Artículo %s validado exitosamente.", articulo_id)
+                return True
+            elif response.status_code == 404:
+                logger.warning("⚠️ Artículo %s no encontrado en Java Service", articulo_id)
+                return False
+            else:
+                logger.error("❌ Error al validar artículo %s: Status %s",
+                             articulo_id, response.status_code)
+                return False
         except httpx.TimeoutException:
             logger.error("⏱️ Timeout al conectar con Java Service para artículo %s", articulo_id)
             return False
@@ -54,28 +82,205 @@ class JavaServiceClient:
     # Proporciona métodos asíncronos para operaciones CRUD y validaciones.
     # """
     TIMEOUT = 5.0
+    HEALTH_TIMEOUT = 2.0
     JAVA_SERVICE_URL = settings.java_service_url
 
+    # Cliente compartido creado en el lifespan de la aplicación y el event
+    # loop al que pertenecen sus conexiones
+    _http_client: Optional[httpx.AsyncClient] = None
+    _http_loop: Optional[asyncio.AbstractEventLoop] = None
+    _solicitudes_compartidas = 0
+    _solicitudes_efimeras = 0
+    _sonda: Optional[asyncio.Task] = None
+
+    # Cliente HTTP compartido
+    @staticmethod
+    async def iniciar() -> None:
+        """
+        Crear el cliente HTTP compartido con pool de conexiones.
+
+        Se llama desde el lifespan de FastAPI; las conexiones quedan ligadas
+        al event loop del servidor y se reutilizan entre solicitudes.
+        """
+        if JavaServiceClient._http_client is not None:
+            return
+        http2 = settings.java_http2
+        if http2:
+            try:
+                import h2  # noqa: F401  # pylint: disable=import-outside-toplevel
+            except ImportError:
+                logger.warning(
+                    "⚠️ JAVA_HTTP2 activo pero falta el paquete h2 "
+                    "(pip install httpx[http2]); se usa HTTP/1.1"
+                )
+                http2 = False
+        JavaServiceClient._http_client = httpx.AsyncClient(
+            timeout=JavaServiceClient.TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.java_http_max_connections,
+                max_keepalive_connections=settings.java_http_max_keepalive,
+                keepalive_expiry=settings.java_http_keepalive_expiry,
+            ),
+            http2=http2,
+            event_hooks={"response": [_registrar_respuesta]},
+        )
+        JavaServiceClient._http_loop = asyncio.get_running_loop()
+        if settings.java_health_interval > 0:
+            JavaServiceClient._sonda = asyncio.create_task(JavaServiceClient._sondear())
+        logger.info(
+            "🔗 Cliente HTTP de Java Service iniciado "
+            "(max %s conexiones, %s keep-alive)",
+            settings.java_http_max_connections,
+            settings.java_http_max_keepalive,
+        )
+
+    @staticmethod
+    async def cerrar() -> None:
+        """Detener la sonda de salud y cerrar el cliente HTTP compartido."""
+        sonda = JavaServiceClient._sonda
+        JavaServiceClient._sonda = None
+        if sonda is not None:
+            sonda.cancel()
+            try:
+                await sonda
+            except asyncio.CancelledError:
+                pass
+        client = JavaServiceClient._http_client
+        JavaServiceClient._http_client = None
+        JavaServiceClient._http_loop = None
+        if client is not None:
+            await client.aclose()
+            logger.info("🔌 Cliente HTTP de Java Service cerrado")
+
+    @staticmethod
+    @asynccontextmanager
+    async def _cliente(sonda: bool = False) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Obtener el cliente para una llamada al servicio Java.
+
+        Usa el cliente compartido cuando la llamada corre en el event loop
+        del servidor. Desde código sincrónico (asyncio.run crea otro loop)
+        o antes del arranque se usa un cliente temporal, como antes.
+
+        Con el circuito abierto lanza CircuitoAbiertoError sin conectar
+        (salvo para la sonda de salud); los errores de red y las respuestas
+        5xx cuentan como fallas del servicio.
+        """
+        if not sonda and not java_circuit_breaker.permitir():
+            raise CircuitoAbiertoError(
+                "Circuito abierto: Java Service no disponible, llamada omitida"
+            )
+        try:
+            client = JavaServiceClient._http_client
+            mismo_loop = JavaServiceClient._http_loop is asyncio.get_running_loop()
+            if client is not None and mismo_loop:
+                JavaServiceClient._solicitudes_compartidas += 1
+                yield client
+                return
+            JavaServiceClient._solicitudes_efimeras += 1
+            async with httpx.AsyncClient(
+                timeout=JavaServiceClient.TIMEOUT,
+                event_hooks={"response": [_registrar_respuesta]},
+            ) as client:
+                yield client
+        except httpx.TransportError:
+            java_circuit_breaker.registrar_fallo()
+            raise
+
+    @staticmethod
+    async def _get_recurso(ruta: str) -> httpx.Response:
+        """
+        Consultar un recurso individual (GET) del servicio Java.
+
+        Las llamadas concurrentes con la misma ruta comparten una única
+        solicitud HTTP y reciben la misma respuesta (ya leída).
+
+        Args:
+            ruta: Ruta del recurso, por ejemplo /api/salas/3
+
+        Returns:
+            Respuesta HTTP del servicio Java
+        """
+
+        async def _consultar() -> httpx.Response:
+            async with JavaServiceClient._cliente() as client:
+                return await client.get(f"{JavaServiceClient.JAVA_SERVICE_URL}{ruta}")
+
+        return await java_single_flight.ejecutar(ruta, _consultar)
+
+    @staticmethod
+    def pool_stats() -> Dict[str, Any]:
+        """
+        Obtener el estado del pool de conexiones del cliente compartido.
+
+        Returns:
+            Diccionario con límites, conexiones activas/ociosas, solicitudes
+            en espera y cantidad de llamadas por tipo de cliente
+        """
+        stats: Dict[str, Any] = {
+            "activo": JavaServiceClient._http_client is not None,
+            "limites": {
+                "max_connections": settings.java_http_max_connections,
+                "max_keepalive_connections": settings.java_http_max_keepalive,
+                "keepalive_expiry": settings.java_http_keepalive_expiry,
+            },
+            "solicitudes_cliente_compartido": (
+                JavaServiceClient._solicitudes_compartidas
+            ),
+            "solicitudes_cliente_temporal": JavaServiceClient._solicitudes_efimeras,
+        }
+        # httpx no expone el pool; se lee el de httpcore si está disponible
+        pool = getattr(
+            getattr(JavaServiceClient._http_client, "_transport", None), "_pool", None
+        )
+        conexiones = list(getattr(pool, "connections", []))
+        ociosas = sum(1 for conexion in conexiones if conexion.is_idle())
+        stats.update(
+            {
+                "conexiones": len(conexiones),
+                "conexiones_activas": len(conexiones) - ociosas,
+                "conexiones_ociosas": ociosas,
+                "solicitudes_en_espera": len(getattr(pool, "_requests", [])),
+                "http2": bool(getattr(pool, "_http2", False)),
+            }
+        )
+        stats["single_flight"] = java_single_flight.stats()
+        limite = settings.java_http_max_connections
+        stats["utilizacion"] = (
+            round(stats["conexiones_activas"] / limite, 3) if limite else 0.0
+        )
+        return stats
+
     # Métodos de Artículos
     @staticmethod
     async def get_articulos() -> list:
         """
         Obtener lista de artículos desde el microservicio Java.
+        Se sirve desde la caché del catálogo (ver catalog_cache).
         Returns:
             list: Lista de artículos (dicts) o lista vacía si falla
         """
+        return await articulos_cache.obtener()
+
+    @staticmethod
+    async def _cargar_articulos() -> Optional[list]:
+        """
+        Consultar la lista completa de artículos al microservicio Java.
+        Returns:
+            Optional[list]: Lista de artículos (dicts) o None si falla
+        """
         try:
-            async with httpx.AsyncClient(timeout=JavaServiceClient.TIMEOUT) as client:
+            async with JavaServiceClient._cliente() as client:
                 response = await client.get(f"{JavaServiceClient.JAVA_SERVICE_URL}/api/articulos")
                 if response.status_code == 200:
                     return response.json()
                 else:
                     logger.error(
                         "❌ Error al obtener artículos de Java: Status %s", response.status_code)
-                    return []
+                    return None
         except httpx.RequestError as e:
             logger.error("❌ Error al obtener artículos de Java: %s", e)
-            return []
+            return None
 
     @staticmethod
     async def get_articulo(articulo_id: int) -> Optional[Dict[str, Any]]:
@@ -87,17 +292,17 @@ class JavaServiceClient:
             Optional[Dict[str, Any]]: Diccionario con el artículo o None si no existe
         """
         try:
-            async with httpx.AsyncClient(timeout=JavaServiceClient.TIMEOUT) as client:
-                response = await client.get(
-                    f"{JavaServiceClient.JAVA_SERVICE_URL}/api/articulos/{articulo_id}")
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
-                    return None
-                else:
-                    logger.error(
-                        "❌ Error al obtener artículo de Java: Status %s", response.status_code)
-                    return None
+            response = await JavaServiceClient._get_recurso(
+                f"/api/articulos/{articulo_id}"
+            )
+            if response.status_code == 200:
+                return response.json()
+            elif response.status_code == 404:
+                return None
+            else:
+                logger.error(
+                    "❌ Error al obtener artículo de Java: Status %s", response.status_code)
+                return None
         except httpx.RequestError as e:
             logger.error("❌ Error al obtener artículo de Java: %s", e)
             return None
@@ -112,12 +317,13 @@ class JavaServiceClient:
             Optional[Dict[str, Any]]: Diccionario con el artículo creado o None si falla
         """
         try:
-            async with httpx.AsyncClient(timeout=JavaServiceClient.TIMEOUT) as client:
+            async with JavaServiceClient._cliente() as client:
                 response = await client.post(
                     f"{JavaServiceClient.JAVA_SERVICE_URL}/api/articulos",
                     json=articulo_data
                 )
                 if response.status_code == 201:
+                    articulos_cache.invalidar()
                     return response.json()
                 else:
                     logger.error(
@@ -138,12 +344,13 @@ class JavaServiceClient:
             Optional[Dict[str, Any]]: Diccionario con el artículo actualizado o None si falla
         """
         try:
-            async with httpx.AsyncClient(timeout=JavaServiceClient.TIMEOUT) as client:
+            async with JavaServiceClient._cliente() as client:
                 response = await client.put(
                     f"{JavaServiceClient.JAVA_SERVICE_URL}/api/articulos/{articulo_id}",
                     json=articulo_data
                 )
                 if response.status_code == 200:
+                    articulos_cache.invalidar()
                     return response.json()
                 else:
                     logger.error(
@@ -163,11 +370,12 @@ class JavaServiceClient:
             bool: True si se eliminó correctamente, False si no existe o falla
         """
         try:
-            async with httpx.AsyncClient(timeout=JavaServiceClient.TIMEOUT) as client:
+            async with JavaServiceClient._cliente() as client:
                 response = await client.delete(
                     f"{JavaServiceClient.JAVA_SERVICE_URL}/api/articulos/{articulo_id}"
                 )
                 if response.status_code == 204:
+                    articulos_cache.invalidar()
                     logger.info("✅ Artículo %s eliminado en Java Service", articulo_id)
                     return True
                 elif response.status_code == 404:
@@ -193,15 +401,14 @@ class JavaServiceClient:
             Optional[Dict[str, Any]]: Diccionario con datos del artículo o None si no existe
         """
         try:
-            async with httpx.AsyncClient(timeout=JavaServiceClient.TIMEOUT) as client:
-                response = await client.get(
-                    f"{JavaServiceClient.JAVA_SERVICE_URL}/api/articulos/{articulo_id}"
-                )
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    logger.warning("⚠️ No se pudieron obtener detalles de artículo %s", articulo_id)
-                    return None
+            response = await JavaServiceClient._get_recurso(
+                f"/api/articulos/{articulo_id}"
+            )
+            if response.status_code == 200:
+                return response.json()
+            else:
+                logger.warning("⚠️ No se pudieron obtener detalles de artículo %s", articulo_id)
+                return None
         except httpx.RequestError as e:
             logger.error("❌ Error al obtener detalles de artículo %s: %s", articulo_id, e)
             return None
@@ -211,21 +418,31 @@ class JavaServiceClient:
     async def get_salas() -> list:
         """
         Obtener lista de salas desde el microservicio Java.
+        Se sirve desde la caché del catálogo (ver catalog_cache).
         Returns:
             list: Lista de salas (dicts) o lista vacía si falla
         """
+        return await salas_cache.obtener()
+
+    @staticmethod
+    async def _cargar_salas() -> Optional[list]:
+        """
+        Consultar la lista completa de salas al microservicio Java.
+        Returns:
+            Optional[list]: Lista de salas (dicts) o None si falla
+        """
         try:
-            async with httpx.AsyncClient(timeout=JavaServiceClient.TIMEOUT) as client:
+            async with JavaServiceClient._cliente() as client:
                 response = await client.get(f"{JavaServiceClient.JAVA_SERVICE_URL}/api/salas")
                 if response.status_code == 200:
                     return response.json()
                 else:
                     logger.error(
                         "❌ Error al obtener salas de Java: Status %s", response.status_code)
-                    return []
+                    return None
         except httpx.RequestError as e:
             logger.error("❌ Error al obtener salas de Java: %s", e)
-            return []
+            return None
 
     @staticmethod
     async def get_sala(sala_id: int) -> Optional[Dict[str, Any]]:
@@ -237,17 +454,14 @@ class JavaServiceClient:
             Optional[Dict[str, Any]]: Diccionario con la sala o None si no existe
         """
         try:
-            async with httpx.AsyncClient(timeout=JavaServiceClient.TIMEOUT) as client:
-                response = await client.get(
-                    f"{JavaServiceClient.JAVA_SERVICE_URL}/api/salas/{sala_id}"
-                )
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
-                    return None
-                else:
-                    logger.error("❌ Error al obtener sala de Java: Status %s", response.status_code)
-                    return None
+            response = await JavaServiceClient._get_recurso(f"/api/salas/{sala_id}")
+            if response.status_code == 200:
+                return response.json()
+            elif response.status_code == 404:
+                return None
+            else:
+                logger.error("❌ Error al obtener sala de Java: Status %s", response.status_code)
+                return None
         except httpx.RequestError as e:
             logger.error("❌ Error al obtener sala de Java: %s", e)
             return None
@@ -262,12 +476,13 @@ class JavaServiceClient:
             Optional[Dict[str, Any]]: Diccionario con la sala creada o None si falla
         """
         try:
-            async with httpx.AsyncClient(timeout=JavaServiceClient.TIMEOUT) as client:
+            async with JavaServiceClient._cliente() as client:
                 response = await client.post(
                     f"{JavaServiceClient.JAVA_SERVICE_URL}/api/salas",
                     json=sala_data
                 )
                 if response.status_code == 201:
+                    salas_cache.invalidar()
                     return response.json()
                 else:
                     logger.error("❌ Error al crear sala en Java: Status %s", response.status_code)
@@ -287,12 +502,13 @@ class JavaServiceClient:
             Optional[Dict[str, Any]]: Diccionario con la sala actualizada o None si falla
         """
         try:
-            async with httpx.AsyncClient(timeout=JavaServiceClient.TIMEOUT) as client:
+            async with JavaServiceClient._cliente() as client:
                 response = await client.put(
                     f"{JavaServiceClient.JAVA_SERVICE_URL}/api/salas/{sala_id}",
                     json=sala_data
                 )
                 if response.status_code == 200:
+                    salas_cache.invalidar()
                     return response.json()
                 else:
                     logger.error(
@@ -314,12 +530,12 @@ class JavaServiceClient:
             True si se eliminó correctamente, False si no existe o falla
         """
         try:
-            async with httpx.AsyncClient(
-                timeout=JavaServiceClient.TIMEOUT) as client:
+            async with JavaServiceClient._cliente() as client:
                 response = await client.delete(
                     f"{JavaServiceClient.JAVA_SERVICE_URL}/api/salas/{sala_id}"
                 )
                 if response.status_code == 204:
+                    salas_cache.invalidar()
                     logger.info("✅ Sala %s eliminada en Java Service", sala_id)
                     return True
                 elif response.status_code == 404:
@@ -347,21 +563,17 @@ class JavaServiceClient:
             True si la sala existe, False en caso contrario
         """
         try:
-            async with httpx.AsyncClient(timeout=JavaServiceClient.TIMEOUT) as client:
-                response = await client.get(
-                    f"{JavaServiceClient.JAVA_SERVICE_URL}/api/salas/{sala_id}"
-                )
-
-                if response.status_code == 200:
-                    logger.info("✅ Sala %s validada exitosamente desde Java Service", sala_id)
-                    return True
-                elif response.status_code == 404:
-                    logger.warning("⚠️ Sala %s no encontrada en Java Service", sala_id)
-                    return False
-                else:
-                    logger.error("❌ Error al validar sala %s: Status %s",
-                                  sala_id, response.status_code)
-                    return False
+            response = await JavaServiceClient._get_recurso(f"/api/salas/{sala_id}")
+            if response.status_code == 200:
+                logger.info("✅ Sala %s validada exitosamente desde Java Service", sala_id)
+                return True
+            elif response.status_code == 404:
+                logger.warning("⚠️ Sala %s no encontrada en Java Service", sala_id)
+                return False
+            else:
+                logger.error("❌ Error al validar sala %s: Status %s",
+                              sala_id, response.status_code)
+                return False
 
         except httpx.TimeoutException:
             logger.error("⏱️ Timeout al conectar con Java Service para sala %s", sala_id)
@@ -387,18 +599,14 @@ class JavaServiceClient:
             Diccionario con datos de la sala o None si no existe
         """
         try:
-            async with httpx.AsyncClient(timeout=JavaServiceClient.TIMEOUT) as client:
-                response = await client.get(
-                    f"{JavaServiceClient.JAVA_SERVICE_URL}/api/salas/{sala_id}"
-                )
-
-                if response.status_code == 200:
-                    sala_data = response.json()
-                    logger.info("✅ Detalles de sala %s obtenidos desde Java Service", sala_id)
-                    return sala_data
-                else:
-                    logger.warning("⚠️ No se pudieron obtener detalles de sala %s", sala_id)
-                    return None
+            response = await JavaServiceClient._get_recurso(f"/api/salas/{sala_id}")
+            if response.status_code == 200:
+                sala_data = response.json()
+                logger.info("✅ Detalles de sala %s obtenidos desde Java Service", sala_id)
+                return sala_data
+            else:
+                logger.warning("⚠️ No se pudieron obtener detalles de sala %s", sala_id)
+                return None
 
         except httpx.RequestError as e:
             logger.error("❌ Error al obtener detalles de sala %s: %s", sala_id, str(e))
@@ -430,6 +638,25 @@ class JavaServiceClient:
 
         return is_disponible
 
+    @staticmethod
+    async def get_sala_snapshot(sala_id: int) -> Dict[str, Any]:
+        """
+        Obtener en una sola consulta la existencia y disponibilidad de una sala.
+
+        Args:
+            sala_id: ID de la sala
+
+        Returns:
+            Diccionario con existe, disponible y sala (datos o None). Si Java
+            no responde, existe y disponible son False.
+        """
+        sala_data = await JavaServiceClient.get_sala_details(sala_id)
+        return {
+            "existe": sala_data is not None,
+            "disponible": bool(sala_data and sala_data.get("disponible", False)),
+            "sala": sala_data,
+        }
+
     @staticmethod
     async def get_salas_disponibles() -> list:
         """
@@ -439,7 +666,7 @@ class JavaServiceClient:
             Lista de salas disponibles
         """
         try:
-            async with httpx.AsyncClient(timeout=JavaServiceClient.TIMEOUT) as client:
+            async with JavaServiceClient._cliente() as client:
                 response = await client.get(
                     f"{JavaServiceClient.JAVA_SERVICE_URL}/api/salas/disponibles"
                 )
@@ -460,13 +687,41 @@ class JavaServiceClient:
         """
         Verificar si el servicio Java está disponible.
 
+        Responde con el estado del circuito sin consultar a Java si el
+        circuito está abierto o hubo una respuesta exitosa reciente (de una
+        llamada real o de la sonda); en otro caso consulta JAVA_HEALTH_PATH.
+
         Returns:
             True si el servicio responde, False en caso contrario
         """
+        salud = java_circuit_breaker.salud_reciente(settings.java_health_ttl)
+        if salud is not None:
+            return salud
+        return await JavaServiceClient._consultar_salud()
+
+    @staticmethod
+    async def _sondear() -> None:
+        """
+        Consultar la salud de Java periódicamente mientras corre el servidor.
+
+        Un error inesperado en una consulta se registra y la sonda sigue: si
+        la tarea muriera, el circuito dejaría de actualizarse en silencio.
+        """
+        while True:
+            try:
+                await JavaServiceClient._consultar_salud(sonda=True)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("⚠️ Error inesperado en la sonda de salud de Java")
+            await asyncio.sleep(settings.java_health_interval)
+
+    @staticmethod
+    async def _consultar_salud(sonda: bool = False) -> bool:
+        """Consultar JAVA_HEALTH_PATH; el resultado actualiza el circuito."""
         try:
-            async with httpx.AsyncClient(timeout=2.0) as client:
+            async with JavaServiceClient._cliente(sonda=sonda) as client:
                 response = await client.get(
-                    f"{JavaServiceClient.JAVA_SERVICE_URL}/api/salas"
+                    f"{JavaServiceClient.JAVA_SERVICE_URL}{settings.java_health_path}",
+                    timeout=JavaServiceClient.HEALTH_TIMEOUT,
                 )
                 is_healthy = response.status_code == 200
                 if is_healthy:
@@ -477,3 +732,18 @@ class JavaServiceClient:
         except httpx.RequestError as e:
             logger.error("❌ Error al chequear salud de Java Service: %s", e)
             return False
+
+
+# Cachés de los catálogos completos de salas y artículos
+salas_cache = CatalogCache(
+    "salas",
+    JavaServiceClient._cargar_salas,
+    ttl=settings.java_catalog_ttl,
+    stale=settings.java_catalog_stale,
+)
+articulos_cache = CatalogCache(
+    "articulos",
+    JavaServiceClient._cargar_articulos,
+    ttl=settings.java_catalog_ttl,
+    stale=settings.java_catalog_stale,
+)
@@ -0,0 +1,169 @@
+"""
+Agregación de las métricas de GET /analytics/dashboard-metrics.
+
+Las reservas del período se toman de la foto columnar en memoria
+(snapshot_reservas) o de una consulta de cuatro columnas, sin objetos ORM,
+y se agregan con NumPy: reservas y horas por sala, tendencia diaria y
+personas con más reservas salen de np.bincount y np.unique en una pasada,
+en lugar de recorrer todas las reservas una vez por sala y una vez por
+día. La comparten la ruta síncrona (endpoints/analytics.py) y la
+asíncrona (routes_stats.py); cada una lee las personas con su propia
+sesión.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+import numpy as np
+from app.models.persona import Persona
+from app.models.sala import Sala
+from app.repositories.snapshot_reservas import EPOCA, SEGUNDOS_POR_DIA, a_segundos
+
+# Días de la tendencia como máximo (más el día de hoy)
+DIAS_TENDENCIA_MAX = 30
+# Personas informadas en top_usuarios
+CANTIDAD_TOP_USUARIOS = 5
+
+# (id_sala o 0 si es de artículo, id_persona, fecha_hora_inicio, fecha_hora_fin)
+FilaDashboard = Tuple[int, int, datetime, datetime]
+
+
+def _por_sala(
+    id_sala: np.ndarray, horas: np.ndarray, salas: Sequence[Sala]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Reservas y horas de cada sala de `salas` (ignora las de otras salas)."""
+    ids = np.array([sala.id for sala in salas], dtype=np.int64)
+    if not len(ids):
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    orden = np.argsort(ids)
+    indice = orden[np.searchsorted(ids, id_sala, sorter=orden).clip(max=len(ids) - 1)]
+    es_de_sala = ids[indice] == id_sala
+    return (
+        np.bincount(indice[es_de_sala], minlength=len(ids)),
+        np.bincount(indice[es_de_sala], weights=horas[es_de_sala], minlength=len(ids)),
+    )
+
+
+def agregar_reservas(
+    filas: Sequence[FilaDashboard],
+    salas: Sequence[Sala],
+    ahora: datetime,
+    days: int,
+) -> Dict[str, Any]:
+    """
+    Agregar las reservas del período para el dashboard.
+
+    Args:
+        filas: Reservas que empiezan desde el inicio del período
+        salas: Salas a informar, en el orden en que se muestran
+        ahora: Momento actual (hora local naive)
+        days: Días del período consultado
+
+    Returns:
+        Diccionario con ocupacion_salas, tendencia_reservas (labels y
+        values), top_personas [(id_persona, reservas)], reservas_hoy y
+        horas_reservadas
+    """
+    cantidad = len(filas)
+    return agregar_columnas(
+        {
+            "id_sala": np.fromiter((f[0] for f in filas), np.int64, count=cantidad),
+            "id_persona": np.fromiter((f[1] for f in filas), np.int64, count=cantidad),
+            "inicio": a_segundos((fila[2] for fila in filas), cantidad),
+            "fin": a_segundos((fila[3] for fila in filas), cantidad),
+        },
+        salas,
+        ahora,
+        days,
+    )
+
+
+def agregar_columnas(
+    columnas: Mapping[str, np.ndarray],
+    salas: Sequence[Sala],
+    ahora: datetime,
+    days: int,
+) -> Dict[str, Any]:
+    """
+    Agregar para el dashboard las reservas del período ya en columnas.
+
+    Args:
+        columnas: id_sala (0 si es de artículo), id_persona, inicio y fin
+            (segundos desde EPOCA) de las reservas que empiezan desde el
+            inicio del período, como las devuelve snapshot_reservas
+        salas, ahora, days: Como en agregar_reservas
+
+    Returns:
+        El mismo diccionario que agregar_reservas
+    """
+    id_sala = columnas["id_sala"]
+    id_persona = columnas["id_persona"]
+    inicios = columnas["inicio"]
+    horas = (columnas["fin"] - inicios) / 3600
+    dias = (inicios // SEGUNDOS_POR_DIA).astype(np.int64)
+    hoy = (ahora - EPOCA).days
+
+    # 1. Reservas y horas por sala
+    reservas_sala, horas_sala = _por_sala(id_sala, horas, salas)
+    ocupacion_salas = [
+        {
+            "sala": sala.nombre,
+            "reservas": int(reservas_sala[i]),
+            "horas_promedio": round(
+                float(horas_sala[i] / reservas_sala[i]), 1
+            ) if reservas_sala[i] else 0,
+        }
+        for i, sala in enumerate(salas)
+    ]
+
+    # 2. Tendencia: reservas por día de inicio en los últimos días
+    cantidad_dias = min(days, DIAS_TENDENCIA_MAX) + 1
+    dia_relativo = dias - (hoy - cantidad_dias + 1)
+    en_tendencia = (dia_relativo >= 0) & (dia_relativo < cantidad_dias)
+    tendencia = np.bincount(dia_relativo[en_tendencia], minlength=cantidad_dias)
+
+    # 3. Personas con más reservas (a igual cantidad, menor ID primero)
+    personas, por_persona = np.unique(id_persona, return_counts=True)
+    mas_activas = np.lexsort((personas, -por_persona))[:CANTIDAD_TOP_USUARIOS]
+
+    return {
+        "ocupacion_salas": ocupacion_salas,
+        "tendencia_reservas": {
+            "labels": [
+                (ahora - timedelta(days=cantidad_dias - 1 - i)).strftime("%d/%m")
+                for i in range(cantidad_dias)
+            ],
+            "values": tendencia.tolist(),
+        },
+        "top_personas": [
+            (int(personas[i]), int(por_persona[i])) for i in mas_activas
+        ],
+        "reservas_hoy": int(np.count_nonzero(dias == hoy)),
+        "horas_reservadas": float(horas.sum()),
+    }
+
+
+def top_usuarios(
+    top_personas: Sequence[Tuple[int, int]], personas: Mapping[int, Persona]
+) -> List[Dict[str, Any]]:
+    """
+    Armar top_usuarios con los nombres de las personas más activas.
+
+    Args:
+        top_personas: Pares (id_persona, reservas) de agregar_reservas
+        personas: Personas por ID, cargadas en una sola consulta
+    """
+    return [
+        {
+            "nombre": f"{persona.nombre} {persona.apellido or ''}".strip(),
+            "reservas": cantidad,
+        }
+        for persona_id, cantidad in top_personas
+        if (persona := personas.get(persona_id)) is not None
+    ]
+
+
+def ocupacion_promedio(horas_reservadas: float, total_salas: int, days: int) -> float:
+    """Porcentaje de horas reservadas sobre las horas de sala del período."""
+    horas_disponibles = total_salas * 24 * days
+    if not horas_disponibles:
+        return 0
+    return round(horas_reservadas / horas_disponibles * 100, 1)
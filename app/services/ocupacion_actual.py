@@ -0,0 +1,114 @@
+"""
+Foto compartida de la ocupación actual de artículos y salas.
+
+El dashboard, la página de inventario y la de reservas consultan cada
+pocos segundos qué está en uso ahora. Esta foto se arma con una sola
+consulta (unidades reservadas por artículo y salas ocupadas), se reutiliza
+durante unos segundos entre todas esas consultas y se descarta en cuanto
+ReservaRepository avisa un alta, cambio o baja de reservas.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.repositories.reserva_repository import ReservaRepository
+from app.services.reserva_service import ReservaService
+
+
+class OcupacionActual:
+    """Foto de la ocupación actual con TTL corto e invalidación por cambios."""
+
+    def __init__(self, ttl: float):
+        """
+        Args:
+            ttl: Segundos en que la foto se reutiliza (0 desactiva la caché)
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # Una sola consulta a la vez: quien espera reutiliza la foto nueva
+        self._lock_consulta = threading.Lock()
+        self._foto: Optional[Dict[str, Any]] = None
+        self._tomada_en = 0.0
+        # Se incrementa al invalidar: descarta fotos tomadas antes del cambio
+        self._generacion = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidaciones = 0
+
+    def obtener(self, db: Session) -> Dict[str, Any]:
+        """
+        Obtener la ocupación actual, consultando la base solo si hace falta.
+
+        Returns:
+            Diccionario con hora (hora local de la foto), articulos
+            (articulo_id -> unidades reservadas) y salas_ocupadas (IDs).
+            La foto se comparte entre llamadores: no modificarla.
+        """
+        foto = self._vigente()
+        if foto is not None:
+            return foto
+
+        with self._lock_consulta:
+            foto = self._vigente()
+            if foto is not None:
+                return foto
+            with self._lock:
+                self.misses += 1
+                generacion = self._generacion
+
+            foto = self._consultar(db)
+
+            with self._lock:
+                if self.ttl > 0 and generacion == self._generacion:
+                    self._foto = foto
+                    self._tomada_en = time.monotonic()
+        return foto
+
+    def invalidar(self) -> None:
+        """Descartar la foto actual; la próxima lectura consulta la base."""
+        with self._lock:
+            self._foto = None
+            self._generacion += 1
+            self.invalidaciones += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Obtener contadores y antigüedad de la foto."""
+        with self._lock:
+            lecturas = self.hits + self.misses
+            return {
+                "ttl": self.ttl,
+                "edad_segundos": (
+                    round(time.monotonic() - self._tomada_en, 3)
+                    if self._foto is not None
+                    else None
+                ),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidaciones": self.invalidaciones,
+                "tasa_aciertos": round(self.hits / lecturas, 3) if lecturas else 0.0,
+            }
+
+    def _vigente(self) -> Optional[Dict[str, Any]]:
+        """Foto guardada si todavía está dentro del TTL (cuenta el acierto)."""
+        with self._lock:
+            if (
+                self._foto is not None
+                and time.monotonic() - self._tomada_en < self.ttl
+            ):
+                self.hits += 1
+                return self._foto
+            return None
+
+    @staticmethod
+    def _consultar(db: Session) -> Dict[str, Any]:
+        # Las fechas en la BD son naive y representan hora local ART
+        ahora: datetime = ReservaService.obtener_hora_actual(db)
+        articulos, salas = ReservaRepository.get_ocupacion(db, ahora)
+        salas_ocupadas: FrozenSet[int] = frozenset(salas)
+        return {"hora": ahora, "articulos": articulos, "salas_ocupadas": salas_ocupadas}
+
+
+ocupacion_actual = OcupacionActual(settings.ocupacion_actual_ttl)
+ReservaRepository.suscribir_cambios(ocupacion_actual.invalidar)
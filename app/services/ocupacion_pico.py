@@ -0,0 +1,101 @@
+"""
+Ocupación simultánea máxima de artículos (barrido de eventos).
+
+Cada uso de un artículo (reserva directa o artículo asignado a una reserva
+de sala) se convierte en dos eventos: +cantidad al inicio y −cantidad al
+fin. Recorriendo un único flujo ordenado de eventos se obtiene, para todos
+los artículos a la vez, el máximo de unidades reservadas simultáneamente
+en O(n log n), en lugar de comparar cada reserva con todas las demás.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# (articulo_id, fecha_hora_inicio, fecha_hora_fin, cantidad)
+UsoArticulo = Tuple[int, datetime, datetime, int]
+# (instante, tipo, articulo_id, delta)
+Evento = Tuple[datetime, int, int, int]
+
+# El solapamiento de artículos es inclusivo: una reserva que termina justo
+# cuando empieza otra cuenta como simultánea. Por eso, en un mismo instante,
+# los inicios se procesan antes que los fines.
+EVENTO_INICIO = 0
+EVENTO_FIN = 1
+
+
+def eventos_uso(
+    usos: Iterable[UsoArticulo],
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+) -> List[Evento]:
+    """
+    Convertir usos de artículos en un flujo de eventos ordenado.
+
+    Args:
+        usos: Usos (articulo_id, inicio, fin, cantidad)
+        desde: Inicio de la ventana (opcional); los usos se recortan a ella
+        hasta: Fin de la ventana (opcional)
+
+    Returns:
+        Eventos (instante, tipo, articulo_id, delta) ordenados por instante,
+        con los inicios antes que los fines del mismo instante
+    """
+    eventos: List[Evento] = []
+    for articulo_id, inicio, fin, cantidad in usos:
+        if desde is not None:
+            if fin < desde:
+                continue
+            inicio = max(inicio, desde)
+        if hasta is not None:
+            if inicio > hasta:
+                continue
+            fin = min(fin, hasta)
+        eventos.append((inicio, EVENTO_INICIO, articulo_id, cantidad))
+        eventos.append((fin, EVENTO_FIN, articulo_id, -cantidad))
+    eventos.sort()
+    return eventos
+
+
+def pico_por_articulo(
+    usos: Iterable[UsoArticulo],
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+) -> Dict[int, int]:
+    """
+    Calcular el máximo de unidades reservadas a la vez de cada artículo.
+
+    Args:
+        usos: Usos (articulo_id, inicio, fin, cantidad)
+        desde: Inicio de la ventana a considerar (opcional)
+        hasta: Fin de la ventana a considerar (opcional)
+
+    Returns:
+        Diccionario articulo_id -> pico de unidades (solo artículos con uso)
+    """
+    en_uso: Dict[int, int] = defaultdict(int)
+    pico: Dict[int, int] = {}
+    for _instante, _tipo, articulo_id, delta in eventos_uso(usos, desde, hasta):
+        en_uso[articulo_id] += delta
+        if delta > 0 and en_uso[articulo_id] > pico.get(articulo_id, 0):
+            pico[articulo_id] = en_uso[articulo_id]
+    return pico
+
+
+def articulos_agotados(
+    stock: Mapping[int, int], picos: Mapping[int, int]
+) -> List[int]:
+    """
+    Obtener los artículos cuyo stock se agota en algún momento.
+
+    Args:
+        stock: Diccionario articulo_id -> cantidad total
+        picos: Resultado de pico_por_articulo
+
+    Returns:
+        IDs de los artículos con pico mayor o igual al stock
+    """
+    return sorted(
+        articulo_id
+        for articulo_id, pico in picos.items()
+        if articulo_id in stock and pico >= stock[articulo_id]
+    )
@@ -0,0 +1,129 @@
+"""
+Expansión de reglas de recurrencia y detección vectorizada de conflictos.
+
+Este módulo convierte una regla de recurrencia (diaria o semanal, con
+intervalo, repeticiones o fecha límite y fechas excluidas) en arreglos
+NumPy de inicios y fines, y detecta solapamientos contra reservas
+existentes en una sola operación sobre arreglos.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+FRECUENCIA_DIARIA = "diaria"
+FRECUENCIA_SEMANAL = "semanal"
+DIAS_POR_FRECUENCIA = {FRECUENCIA_DIARIA: 1, FRECUENCIA_SEMANAL: 7}
+
+# Límite de ocurrencias por serie (un año de reservas diarias)
+MAX_OCURRENCIAS = 366
+
+
+def a_arreglo(fechas: Iterable[datetime]) -> np.ndarray:
+    """Convertir fechas a un arreglo datetime64 con resolución de segundos."""
+    return np.array(list(fechas), dtype="datetime64[s]")
+
+
+def a_datetimes(arreglo: np.ndarray) -> List[datetime]:
+    """Convertir un arreglo datetime64 a una lista de datetime."""
+    return arreglo.astype("datetime64[s]").tolist()
+
+
+def desde_medianoche(hora: time) -> timedelta:
+    """Convertir una hora del día en el tiempo transcurrido desde medianoche."""
+    return timedelta(hours=hora.hour, minutes=hora.minute, seconds=hora.second)
+
+
+def expandir_ocurrencias(
+    fecha_hora_inicio: datetime,
+    fecha_hora_fin: datetime,
+    frecuencia: str,
+    intervalo: int = 1,
+    repeticiones: Optional[int] = None,
+    hasta: Optional[datetime] = None,
+    excepciones: Sequence[date] = (),
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Expandir una regla de recurrencia en arreglos de inicios y fines.
+
+    Las fechas son naive en hora local, por lo que cada ocurrencia conserva
+    la hora de la primera. Las repeticiones cuentan ocurrencias antes de
+    aplicar las excepciones.
+
+    Args:
+        fecha_hora_inicio: Inicio de la primera ocurrencia
+        fecha_hora_fin: Fin de la primera ocurrencia
+        frecuencia: "diaria" o "semanal"
+        intervalo: Cada cuántos días o semanas se repite
+        repeticiones: Cantidad de ocurrencias (excluyente con hasta)
+        hasta: Fecha límite para el inicio de la última ocurrencia
+        excepciones: Fechas en las que no se genera ocurrencia
+
+    Returns:
+        Tupla (inicios, fines) de arreglos datetime64[s]
+
+    Raises:
+        ValueError: Si la regla es inválida o genera demasiadas ocurrencias
+    """
+    if frecuencia not in DIAS_POR_FRECUENCIA:
+        raise ValueError(f"Frecuencia no soportada: {frecuencia}")
+    if intervalo < 1:
+        raise ValueError("El intervalo debe ser mayor o igual a 1")
+    if (repeticiones is None) == (hasta is None):
+        raise ValueError("La serie debe indicar repeticiones o fecha límite (solo una)")
+
+    paso = np.timedelta64(DIAS_POR_FRECUENCIA[frecuencia] * intervalo, "D")
+    primer_inicio = np.datetime64(fecha_hora_inicio, "s")
+    duracion = np.datetime64(fecha_hora_fin, "s") - primer_inicio
+    if duracion <= np.timedelta64(0, "s"):
+        raise ValueError("La fecha de fin debe ser posterior a la fecha de inicio")
+    if duracion > paso:
+        raise ValueError(
+            "La duración de cada ocurrencia no puede superar el intervalo de la serie"
+        )
+
+    if repeticiones is not None:
+        cantidad = repeticiones
+    else:
+        if hasta < fecha_hora_inicio:
+            raise ValueError("La fecha límite debe ser posterior al inicio de la serie")
+        cantidad = int((np.datetime64(hasta, "s") - primer_inicio) // paso) + 1
+    if cantidad > MAX_OCURRENCIAS:
+        raise ValueError(
+            f"La serie genera {cantidad} ocurrencias; el máximo es {MAX_OCURRENCIAS}"
+        )
+
+    inicios = primer_inicio + np.arange(cantidad) * paso
+    if len(excepciones):
+        excluidas = np.array(list(excepciones), dtype="datetime64[D]")
+        inicios = inicios[~np.isin(inicios.astype("datetime64[D]"), excluidas)]
+    return inicios, inicios + duracion
+
+
+def detectar_conflictos(
+    inicios: np.ndarray,
+    fines: np.ndarray,
+    existentes_inicio: np.ndarray,
+    existentes_fin: np.ndarray,
+) -> np.ndarray:
+    """
+    Detectar qué ocurrencias se solapan con algún intervalo existente.
+
+    Usa la misma semántica que la validación individual de salas
+    (inicio < fin_existente y fin > inicio_existente). Los intervalos
+    existentes se ordenan por inicio; para cada ocurrencia, searchsorted
+    ubica los que comienzan antes de su fin y el máximo acumulado de los
+    fines indica si alguno de ellos termina después de su inicio.
+
+    Returns:
+        Arreglo booleano con True en las ocurrencias en conflicto
+    """
+    if len(existentes_inicio) == 0:
+        return np.zeros(len(inicios), dtype=bool)
+
+    orden = np.argsort(existentes_inicio, kind="stable")
+    inicios_ordenados = existentes_inicio[orden]
+    max_fin = np.maximum.accumulate(existentes_fin[orden])
+
+    anteriores = np.searchsorted(inicios_ordenados, fines, side="left")
+    max_fin_anteriores = max_fin[np.maximum(anteriores - 1, 0)]
+    return (anteriores > 0) & (max_fin_anteriores > inicios)
@@ -0,0 +1,296 @@
+"""
+Servicio para operaciones de negocio de series de reservas recurrentes.
+
+La expansión de la regla y la detección de conflictos se resuelven sobre
+arreglos NumPy con una única consulta de intervalos existentes por serie,
+en lugar de validar cada ocurrencia por separado.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+import asyncio
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models.reserva import Reserva
+from app.models.reserva_serie import ReservaSerie
+from app.repositories.reserva_repository import ReservaRepository
+from app.repositories.reserva_serie_repository import ReservaSerieRepository
+from app.schemas.reserva_serie import ReservaSerieCreate, ReservaSerieUpdate
+from app.services.java_client import JavaServiceClient
+from app.services.persona_service import PersonaService
+from app.services.recurrence import (
+    a_arreglo,
+    a_datetimes,
+    desde_medianoche,
+    detectar_conflictos,
+    expandir_ocurrencias,
+)
+from app.services.reserva_service import (
+    MARGEN_PASADO_MINUTOS,
+    MSG_CONFLICTO_SALA,
+    MSG_SALAS_NO_DISPONIBLE,
+    ReservaService,
+    conflicto_sala_como_error,
+)
+
+logger = logging.getLogger(__name__)
+
+# Cantidad de fechas en conflicto listadas en los mensajes de error
+MAX_CONFLICTOS_INFORMADOS = 5
+
+
+class ReservaSerieService:
+    """Servicio para operaciones de negocio de series de reservas."""
+
+    @staticmethod
+    def create_serie(db: Session, serie_data: ReservaSerieCreate) -> Dict[str, Any]:
+        """
+        Crear una serie de reservas recurrentes de sala.
+
+        Args:
+            db: Sesión de base de datos
+            serie_data: Regla de recurrencia y datos de la reserva
+
+        Returns:
+            Diccionario con la serie, sus ocurrencias y los inicios omitidos
+
+        Raises:
+            ValueError: Si hay errores de validación o conflictos
+        """
+        if not PersonaService.validate_persona_exists(db, serie_data.id_persona):
+            raise ValueError(f"No existe una persona con ID {serie_data.id_persona}")
+
+        now = ReservaService.obtener_hora_actual(db)
+        cutoff_time = now - timedelta(minutes=MARGEN_PASADO_MINUTOS)
+        if serie_data.fecha_hora_inicio < cutoff_time:
+            raise ValueError(
+                f"No se pueden crear reservas con más de {MARGEN_PASADO_MINUTOS} "
+                f"minutos en el pasado. Hora actual: {now}, Cutoff: {cutoff_time}, "
+                f"Inicio reserva: {serie_data.fecha_hora_inicio}"
+            )
+
+        inicios, fines = expandir_ocurrencias(
+            serie_data.fecha_hora_inicio,
+            serie_data.fecha_hora_fin,
+            serie_data.frecuencia,
+            serie_data.intervalo,
+            serie_data.repeticiones,
+            serie_data.hasta,
+            serie_data.excepciones,
+        )
+        if len(inicios) == 0:
+            raise ValueError("La serie no genera ninguna ocurrencia")
+
+        error_java = asyncio.run(
+            ReservaSerieService._validar_sala_java(serie_data.id_sala)
+        )
+        if error_java:
+            raise ValueError(error_java)
+
+        conflictos = ReservaSerieService._detectar_conflictos(
+            db, serie_data.id_sala, inicios, fines
+        )
+        excepciones = list(serie_data.excepciones)
+        omitidas: List[datetime] = []
+        if conflictos.any():
+            if not serie_data.omitir_conflictos:
+                raise ValueError(
+                    ReservaSerieService._mensaje_conflictos(inicios[conflictos])
+                )
+            omitidas = a_datetimes(inicios[conflictos])
+            excepciones.extend(inicio.date() for inicio in omitidas)
+            inicios, fines = inicios[~conflictos], fines[~conflictos]
+            if len(inicios) == 0:
+                raise ValueError("Todas las ocurrencias de la serie están en conflicto")
+
+        with conflicto_sala_como_error():
+            serie = ReservaSerieRepository.create(
+                db, serie_data, a_datetimes(inicios), a_datetimes(fines), excepciones
+            )
+        logger.info(
+            "✅ Serie %s creada con %d ocurrencias (%d omitidas)",
+            serie.id, len(inicios), len(omitidas),
+        )
+        return {
+            "serie": serie,
+            "ocurrencias": ReservaSerieRepository.get_ocurrencias(db, serie.id),
+            "omitidas": omitidas,
+        }
+
+    @staticmethod
+    def update_serie(
+        db: Session, serie_id: int, serie_data: ReservaSerieUpdate
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Modificar todas las ocurrencias de una serie (o las posteriores a `desde`).
+
+        Como al crear la serie, un cambio de horario no puede tocar el pasado:
+        sin `desde`, las ocurrencias que ya empezaron conservan su horario.
+
+        Returns:
+            Diccionario con la serie y sus ocurrencias, o None si no existe
+
+        Raises:
+            ValueError: Si el nuevo horario genera conflictos, `desde` es
+                pasado o alguna ocurrencia reprogramada quedaría en el pasado
+        """
+        serie = ReservaSerieRepository.get_by_id(db, serie_id)
+        if not serie:
+            return None
+
+        nueva_persona = serie_data.id_persona
+        if nueva_persona is not None and not PersonaService.validate_persona_exists(
+            db, nueva_persona
+        ):
+            raise ValueError(f"No existe una persona con ID {serie_data.id_persona}")
+
+        desde = serie_data.desde
+        if serie_data.hora_inicio is not None:
+            now = ReservaService.obtener_hora_actual(db)
+            cutoff_time = now - timedelta(minutes=MARGEN_PASADO_MINUTOS)
+            if desde is not None and desde < cutoff_time:
+                raise ValueError(
+                    "No se pueden reprogramar ocurrencias pasadas. "
+                    f"Hora actual: {now}, Cutoff: {cutoff_time}, Desde: {desde}"
+                )
+            if desde is None and serie.fecha_hora_inicio < cutoff_time:
+                desde = cutoff_time
+
+            ocurrencias = ReservaSerieRepository.get_ocurrencias(db, serie_id, desde)
+            if ocurrencias:
+                dias = a_arreglo(o.fecha_hora_inicio for o in ocurrencias).astype(
+                    "datetime64[D]"
+                )
+                inicio = desde_medianoche(serie_data.hora_inicio)
+                fin = desde_medianoche(serie_data.hora_fin)
+                inicios = dias + np.timedelta64(inicio, "s")
+                fines = dias + np.timedelta64(fin, "s")
+                # Una ocurrencia de hoy no puede pasar a un horario ya transcurrido
+                pasadas = inicios[inicios < np.datetime64(cutoff_time, "s")]
+                if len(pasadas):
+                    raise ValueError(
+                        f"No se pueden reprogramar ocurrencias con más de "
+                        f"{MARGEN_PASADO_MINUTOS} minutos en el pasado. Hora "
+                        f"actual: {now}, Cutoff: {cutoff_time}, Inicio: "
+                        f"{a_datetimes(pasadas[:1])[0]}"
+                    )
+                conflictos = ReservaSerieService._detectar_conflictos(
+                    db,
+                    serie.id_sala,
+                    inicios,
+                    fines,
+                    excluir_ids=(o.id for o in ocurrencias),
+                )
+                if conflictos.any():
+                    raise ValueError(
+                        ReservaSerieService._mensaje_conflictos(inicios[conflictos])
+                    )
+
+        with conflicto_sala_como_error():
+            ReservaSerieRepository.update_ocurrencias(
+                db,
+                serie,
+                id_persona=serie_data.id_persona,
+                hora_inicio=serie_data.hora_inicio,
+                hora_fin=serie_data.hora_fin,
+                desde=desde,
+            )
+        return {
+            "serie": serie,
+            "ocurrencias": ReservaSerieRepository.get_ocurrencias(db, serie_id),
+            "omitidas": [],
+        }
+
+    @staticmethod
+    def cancel_serie(
+        db: Session, serie_id: int, desde: Optional[datetime] = None
+    ) -> Optional[int]:
+        """
+        Cancelar una serie completa o sus ocurrencias desde una fecha.
+
+        Returns:
+            Cantidad de ocurrencias eliminadas, o None si la serie no existe
+        """
+        serie = ReservaSerieRepository.get_by_id(db, serie_id)
+        if not serie:
+            return None
+        return ReservaSerieRepository.delete(db, serie, desde)
+
+    @staticmethod
+    def get_serie_by_id(db: Session, serie_id: int) -> Optional[ReservaSerie]:
+        """Obtener una serie por su ID."""
+        return ReservaSerieRepository.get_by_id(db, serie_id)
+
+    @staticmethod
+    def get_series(db: Session, skip: int = 0, limit: int = 100) -> List[ReservaSerie]:
+        """Obtener lista de series."""
+        return ReservaSerieRepository.get_all(db, skip, limit)
+
+    @staticmethod
+    def get_series_by_persona(
+        db: Session, persona_id: int, skip: int = 0, limit: int = 100
+    ) -> List[ReservaSerie]:
+        """Obtener las series de una persona."""
+        return ReservaSerieRepository.get_by_persona(db, persona_id, skip, limit)
+
+    @staticmethod
+    def get_ocurrencias(db: Session, serie_id: int) -> List[Reserva]:
+        """Obtener las ocurrencias de una serie."""
+        return ReservaSerieRepository.get_ocurrencias(db, serie_id)
+
+    @staticmethod
+    def _detectar_conflictos(
+        db: Session,
+        sala_id: int,
+        inicios: np.ndarray,
+        fines: np.ndarray,
+        excluir_ids: Iterable[int] = (),
+    ) -> np.ndarray:
+        """Cargar en una consulta los intervalos de la sala y detectar conflictos."""
+        existentes = ReservaRepository.get_intervalos_salas(
+            db,
+            [sala_id],
+            inicios.min().astype("datetime64[s]").item(),
+            fines.max().astype("datetime64[s]").item(),
+        )
+        excluidos = set(excluir_ids)
+        if excluidos:
+            existentes = [fila for fila in existentes if fila[0] not in excluidos]
+        return detectar_conflictos(
+            inicios,
+            fines,
+            a_arreglo(fila[2] for fila in existentes),
+            a_arreglo(fila[3] for fila in existentes),
+        )
+
+    @staticmethod
+    def _mensaje_conflictos(inicios: np.ndarray) -> str:
+        fechas = ", ".join(
+            inicio.strftime("%Y-%m-%d %H:%M")
+            for inicio in a_datetimes(inicios[:MAX_CONFLICTOS_INFORMADOS])
+        )
+        restantes = len(inicios) - MAX_CONFLICTOS_INFORMADOS
+        if restantes > 0:
+            fechas += f" y {restantes} más"
+        return f"{MSG_CONFLICTO_SALA}: {fechas}"
+
+    @staticmethod
+    async def _validar_sala_java(sala_id: int) -> Optional[str]:
+        """Validar la sala en el servicio Java; devuelve el motivo de rechazo."""
+        is_java_up, snapshot = await asyncio.gather(
+            JavaServiceClient.check_service_health(),
+            JavaServiceClient.get_sala_snapshot(sala_id),
+        )
+        if not is_java_up:
+            return MSG_SALAS_NO_DISPONIBLE
+        if not snapshot["existe"]:
+            return (
+                f"La sala con ID {sala_id}"
+                f" no existe en el sistema de gestión de salas."
+            )
+        if not snapshot["disponible"]:
+            return (
+                f"La sala con ID {sala_id} "
+                f"no está disponible según el sistema de gestión de salas."
+            )
+        return None
@@ -7,20 +7,97 @@ Este módulo contiene la lógica de negocio para el modelo Reserva,
 incluyendo validaciones complejas y operaciones de reservas.
 """
 import logging
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import asyncio
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.reserva import Reserva
-from app.repositories.reserva_repository import ReservaRepository
+from app.repositories.paginacion import (
+    CursorReserva,
+    codificar_cursor,
+    decodificar_cursor,
+)
+from app.repositories.persona_repository import PersonaRepository
+from app.repositories.reserva_repository import (
+    MOTIVO_ARTICULO_INEXISTENTE,
+    MOTIVO_CONFLICTO_SALA,
+    MOTIVO_FECHA_PASADA,
+    MOTIVO_PERSONA_INEXISTENTE,
+    MOTIVO_SIN_STOCK,
+    ReservaRepository,
+)
+from app.repositories.sala_interval_index import IntervalosSala
 from app.schemas.reserva import ReservaCreate, ReservaUpdate
 from app.services.java_client import JavaServiceClient
-from app.services.persona_service import PersonaService
 from app.repositories.articulo_repository import ArticuloRepository
 
 logger = logging.getLogger(__name__)
 
+# Margen permitido para reservas que comienzan en el pasado
+MARGEN_PASADO_MINUTOS = 30
+
+MSG_SALAS_NO_DISPONIBLE = (
+    "El sistema de gestión de salas no está disponible en este momento. "
+    "Por favor, intente más tarde."
+)
+MSG_ARTICULOS_NO_DISPONIBLE = (
+    "El sistema de gestión de artículos no está disponible en este momento. "
+    "Por favor, intente más tarde."
+)
+MSG_CONFLICTO_SALA = "Ya existe una reserva en la sala para el horario especificado"
+
+# Uso de un artículo en un período: (inicio, fin, cantidad)
+UsoArticulo = Tuple[datetime, datetime, int]
+
+# Resultado de consultar un lote al servicio Java:
+# (servicio disponible, detalles por sala, existencia por artículo)
+ValidacionJavaLote = Tuple[bool, Dict[int, Optional[Dict[str, Any]]], Dict[int, bool]]
+
+# Motivos de rechazo que se resuelven antes de ir a la base de datos
+MOTIVO_DATOS_INVALIDOS = "datos_invalidos"
+MOTIVO_SERVICIO_NO_DISPONIBLE = "servicio_no_disponible"
+MOTIVO_SALA_INEXISTENTE = "sala_inexistente"
+MOTIVO_SALA_NO_DISPONIBLE = "sala_no_disponible"
+
+
+class ReservaRechazadaError(ValueError):
+    """
+    Reserva rechazada por una regla de negocio.
+
+    Es un ValueError (los endpoints lo siguen tratando como 400) que además
+    indica en `codigo` el motivo del rechazo en forma estructurada.
+    """
+
+    def __init__(self, codigo: str, mensaje: str):
+        super().__init__(mensaje)
+        self.codigo = codigo
+
+
+@contextmanager
+def conflicto_sala_como_error():
+    """
+    Traducir la violación de la restricción de solapamiento de salas
+    al mismo error que produce la validación previa.
+    """
+    try:
+        yield
+    except IntegrityError as e:
+        if ReservaRepository.es_conflicto_de_sala(e):
+            raise ReservaRechazadaError(
+                MOTIVO_CONFLICTO_SALA, MSG_CONFLICTO_SALA
+            ) from e
+        raise
+
+
+def _posicion(cursor: Optional[str]) -> Optional[CursorReserva]:
+    """Decodificar el cursor recibido (ValueError si es inválido)."""
+    return decodificar_cursor(cursor) if cursor else None
+
 
 class ReservaService:
     """Servicio para operaciones de negocio de Reserva."""
@@ -30,6 +107,11 @@ class ReservaService:
         """
         Crear una nueva reserva con validaciones completas.
 
+        Las validaciones contra el servicio Java se hacen primero; la
+        existencia de la persona, el margen de tiempo, el stock del artículo
+        y el solapamiento de la sala se validan junto con el insert en una
+        sola sentencia (ReservaRepository.create_validada).
+
         Args:
             db: Sesión de base de datos
             reserva_data: Datos para crear la reserva
@@ -38,33 +120,45 @@ class ReservaService:
             Reserva creada
 
         Raises:
-            ValueError: Si hay errores de validación o conflictos
+            ReservaRechazadaError: Si hay errores de validación o conflictos
         """
-        # Validar que la persona existe
-        if not PersonaService.validate_persona_exists(db, reserva_data.id_persona):
-            raise ValueError(f"No existe una persona con ID "
-                             f"{reserva_data.id_persona}")
+        ReservaService._validar_datos_basicos(reserva_data)
+        asyncio.run(ReservaService._validar_en_java_async(reserva_data))
+        return ReservaService._insertar_validada(db, reserva_data)
 
-        # Validar fechas
-        if reserva_data.fecha_hora_fin <= reserva_data.fecha_hora_inicio:
-            raise ValueError("La fecha de fin debe ser posterior a la fecha de inicio")
+    @staticmethod
+    async def create_reserva_async(db: Session, reserva_data: ReservaCreate) -> Reserva:
+        """
+        Variante asíncrona de create_reserva para endpoints async.
 
-        # Validar que no se está reservando demasiado en el pasado
-        # Permitir un margen de 30 minutos para compensar desfases de tiempo y casos de uso reales
-        # IMPORTANTE: Las fechas en la BD son naive (sin timezone) y representan hora local ART (UTC-3)
-        # PostgreSQL está configurado en timezone America/Argentina/Buenos_Aires
-        result_now = db.execute(text("SELECT CURRENT_TIMESTAMP::timestamp"))
-        now = result_now.scalar()
-        if now is None:
-            now = datetime.now()  # fallback
-        
-        margin_minutes = 30
-        cutoff_time = now - timedelta(minutes=margin_minutes)
+        Las consultas al servicio Java se hacen en paralelo sobre el event
+        loop del servidor y el trabajo con la base de datos se ejecuta en un
+        hilo, sin bloquear el loop.
 
-        if reserva_data.fecha_hora_inicio < cutoff_time:
-            raise ValueError(
-                f"No se pueden crear reservas con más de {margin_minutes} minutos en el pasado. "
-                f"Hora actual: {now}, Cutoff: {cutoff_time}, Inicio reserva: {reserva_data.fecha_hora_inicio}"
+        Args:
+            db: Sesión de base de datos
+            reserva_data: Datos para crear la reserva
+
+        Returns:
+            Reserva creada
+
+        Raises:
+            ReservaRechazadaError: Si hay errores de validación o conflictos
+        """
+        ReservaService._validar_datos_basicos(reserva_data)
+        await ReservaService._validar_en_java_async(reserva_data)
+        return await asyncio.to_thread(
+            ReservaService._insertar_validada, db, reserva_data
+        )
+
+    @staticmethod
+    def _validar_datos_basicos(reserva_data: ReservaCreate) -> None:
+        """Validar las fechas y que la reserva sea para un artículo o una sala."""
+        # Validar fechas
+        if reserva_data.fecha_hora_fin <= reserva_data.fecha_hora_inicio:
+            raise ReservaRechazadaError(
+                MOTIVO_DATOS_INVALIDOS,
+                "La fecha de fin debe ser posterior a la fecha de inicio",
             )
 
         # Una reserva debe ser para un artículo O una sala, no ambos ni ninguno
@@ -72,47 +166,339 @@ class ReservaService:
         has_sala = reserva_data.id_sala is not None
 
         if not has_articulo and not has_sala:
-            raise ValueError("La reserva debe ser para un artículo o una sala")
+            raise ReservaRechazadaError(
+                MOTIVO_DATOS_INVALIDOS,
+                "La reserva debe ser para un artículo o una sala",
+            )
 
         if has_articulo and has_sala:
-            raise ValueError(
-                "La reserva no puede ser para un artículo y una sala al mismo tiempo"
+            raise ReservaRechazadaError(
+                MOTIVO_DATOS_INVALIDOS,
+                "La reserva no puede ser para un artículo y una sala al mismo tiempo",
             )
 
-        # Validaciones específicas según el tipo de reserva
-        if has_articulo:
-            ReservaService._validate_articulo_reservation(db, reserva_data)
+    @staticmethod
+    async def _validar_en_java_async(reserva_data: ReservaCreate) -> None:
+        """Validar en el servicio Java el artículo o la sala de la reserva."""
+        if reserva_data.id_articulo is not None:
+            await ReservaService._validar_articulo_en_java_async(
+                reserva_data.id_articulo
+            )
+        if reserva_data.id_sala is not None:
+            await ReservaService._validar_sala_en_java_async(reserva_data.id_sala)
+
+    @staticmethod
+    def _insertar_validada(db: Session, reserva_data: ReservaCreate) -> Reserva:
+        """Validar en la base de datos e insertar la reserva en una sentencia."""
+        # Con la restricción de exclusión activa, la base rechaza el
+        # conflicto de sala al insertar y no hace falta consultarlo
+        with conflicto_sala_como_error():
+            reserva, detalle = ReservaRepository.create_validada(
+                db,
+                reserva_data,
+                MARGEN_PASADO_MINUTOS,
+                verificar_sala=not settings.sala_exclusion_constraint,
+            )
+        if reserva is None:
+            raise ReservaRechazadaError(
+                detalle["codigo"],
+                ReservaService._mensaje_rechazo(reserva_data, detalle),
+            )
+        return reserva
+
+    @staticmethod
+    def _mensaje_rechazo(reserva_data: ReservaCreate, detalle: Dict[str, Any]) -> str:
+        """Construir el mensaje de un rechazo informado por create_validada."""
+        codigo = detalle["codigo"]
+        if codigo == MOTIVO_PERSONA_INEXISTENTE:
+            return f"No existe una persona con ID {reserva_data.id_persona}"
+        if codigo == MOTIVO_FECHA_PASADA:
+            now = detalle["ahora"]
+            cutoff_time = now - timedelta(minutes=MARGEN_PASADO_MINUTOS)
+            return (
+                f"No se pueden crear reservas con más de {MARGEN_PASADO_MINUTOS} "
+                f"minutos en el pasado. Hora actual: {now}, Cutoff: {cutoff_time}, "
+                f"Inicio reserva: {reserva_data.fecha_hora_inicio}"
+            )
+        if codigo == MOTIVO_ARTICULO_INEXISTENTE:
+            return f"El artículo con ID {reserva_data.id_articulo} no existe"
+        if codigo == MOTIVO_SIN_STOCK:
+            return (
+                f"No hay unidades disponibles del artículo "
+                f"'{detalle['articulo_nombre']}' en el período solicitado. "
+                f"Total: {detalle['articulo_cantidad']}, "
+                f"Ya reservado: {detalle['total_reservado']}"
+            )
+        return MSG_CONFLICTO_SALA
+
+    @staticmethod
+    def create_reservas_bulk(
+        db: Session,
+        reservas_data: List[ReservaCreate],
+        java_lote: Optional[ValidacionJavaLote] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Crear un lote de reservas validándolas en conjunto.
+
+        Las validaciones se resuelven con una consulta por tipo de dato
+        (personas, artículos, uso de artículos e intervalos de salas) y una
+        sola ronda de llamadas al servicio Java por recurso distinto. Cada
+        reserva se valida también contra las aceptadas antes en el mismo
+        lote. Las reservas válidas se insertan en una única transacción.
+
+        Args:
+            db: Sesión de base de datos
+            reservas_data: Reservas a crear, en orden
+            java_lote: Resultado de _validar_java_lote si el llamador ya
+                consultó al servicio Java (create_reservas_bulk_async)
+
+        Returns:
+            Lista de resultados por ítem con claves indice, reserva y error
+
+        Raises:
+            ValueError: Si la base rechaza el lote por un conflicto concurrente
+        """
+        errores = ReservaService._errores_basicos_lote(reservas_data)
+        pendientes = [i for i, error in enumerate(errores) if error is None]
+        if pendientes:
+            ReservaService._validar_lote(
+                db, reservas_data, pendientes, errores, java_lote
+            )
+
+        aceptadas = [i for i, error in enumerate(errores) if error is None]
+        creadas = []
+        if aceptadas:
+            # Un conflicto concurrente detectado por la base rechaza el lote
+            with conflicto_sala_como_error():
+                creadas = ReservaRepository.create_many(
+                    db, [reservas_data[i] for i in aceptadas]
+                )
+        reservas_por_indice = dict(zip(aceptadas, creadas))
+
+        return [
+            {
+                "indice": i,
+                "reserva": reservas_por_indice.get(i),
+                "error": errores[i],
+            }
+            for i in range(len(reservas_data))
+        ]
+
+    @staticmethod
+    async def create_reservas_bulk_async(
+        db: Session, reservas_data: List[ReservaCreate]
+    ) -> List[Dict[str, Any]]:
+        """
+        Variante asíncrona de create_reservas_bulk para endpoints async.
+
+        Consulta al servicio Java sobre el event loop y ejecuta la validación
+        y el insert del lote en un hilo.
+        """
+        errores = ReservaService._errores_basicos_lote(reservas_data)
+        items = [d for d, error in zip(reservas_data, errores) if error is None]
+        java_lote = await ReservaService._validar_java_lote(
+            *ReservaService._recursos_lote(items)
+        )
+        return await asyncio.to_thread(
+            ReservaService.create_reservas_bulk, db, reservas_data, java_lote
+        )
+
+    @staticmethod
+    def _errores_basicos_lote(
+        reservas_data: List[ReservaCreate],
+    ) -> List[Optional[str]]:
+        """Validaciones del lote que no requieren consultas."""
+        errores: List[Optional[str]] = [None] * len(reservas_data)
+        for i, data in enumerate(reservas_data):
+            if data.fecha_hora_fin <= data.fecha_hora_inicio:
+                errores[i] = "La fecha de fin debe ser posterior a la fecha de inicio"
+            elif data.id_articulo is None and data.id_sala is None:
+                errores[i] = "La reserva debe ser para un artículo o una sala"
+            elif data.id_articulo is not None and data.id_sala is not None:
+                errores[i] = (
+                    "La reserva no puede ser para un artículo y una sala al mismo tiempo"
+                )
+        return errores
+
+    @staticmethod
+    def _recursos_lote(
+        items: List[ReservaCreate],
+    ) -> Tuple[List[int], List[int]]:
+        """Salas y artículos distintos referenciados por las reservas."""
+        sala_ids = sorted({d.id_sala for d in items if d.id_sala is not None})
+        articulo_ids = sorted(
+            {d.id_articulo for d in items if d.id_articulo is not None}
+        )
+        return sala_ids, articulo_ids
+
+    @staticmethod
+    def _validar_lote(
+        db: Session,
+        reservas_data: List[ReservaCreate],
+        pendientes: List[int],
+        errores: List[Optional[str]],
+        java_lote: Optional[ValidacionJavaLote] = None,
+    ) -> None:
+        """Validar en conjunto las reservas pendientes de un lote."""
+        items = [reservas_data[i] for i in pendientes]
+        sala_ids, articulo_ids = ReservaService._recursos_lote(items)
+        desde = min(d.fecha_hora_inicio for d in items)
+        hasta = max(d.fecha_hora_fin for d in items)
+
+        personas = PersonaRepository.get_existing_ids(db, (d.id_persona for d in items))
+        now = ReservaService.obtener_hora_actual(db)
+        cutoff_time = now - timedelta(minutes=MARGEN_PASADO_MINUTOS)
+        if java_lote is None:
+            java_lote = asyncio.run(
+                ReservaService._validar_java_lote(sala_ids, articulo_ids)
+            )
+        java_up, salas_java, articulos_java = java_lote
+        articulos = ArticuloRepository.get_by_ids(db, articulo_ids)
+
+        # Intervalos existentes por sala y uso existente por artículo
+        intervalos: Dict[int, IntervalosSala] = defaultdict(IntervalosSala)
+        for reserva_id, sala_id, inicio, fin in ReservaRepository.get_intervalos_salas(
+            db, sala_ids, desde, hasta
+        ):
+            intervalos[sala_id].agregar(reserva_id, inicio, fin)
+        uso_articulos: Dict[int, List[UsoArticulo]] = defaultdict(list)
+        for articulo_id, inicio, fin, cantidad in ReservaRepository.get_uso_articulos(
+            db, articulo_ids, desde, hasta
+        ):
+            uso_articulos[articulo_id].append((inicio, fin, cantidad))
+
+        for i in pendientes:
+            data = reservas_data[i]
+            if data.id_persona not in personas:
+                errores[i] = f"No existe una persona con ID {data.id_persona}"
+            elif data.fecha_hora_inicio < cutoff_time:
+                errores[i] = (
+                    f"No se pueden crear reservas con más de {MARGEN_PASADO_MINUTOS} "
+                    f"minutos en el pasado. Hora actual: {now}, Cutoff: {cutoff_time}, "
+                    f"Inicio reserva: {data.fecha_hora_inicio}"
+                )
+            elif data.id_sala is not None:
+                errores[i] = ReservaService._validar_sala_en_lote(
+                    data, java_up, salas_java, intervalos[data.id_sala], -(i + 1)
+                )
+            else:
+                errores[i] = ReservaService._validar_articulo_en_lote(
+                    data, java_up, articulos_java, articulos.get(data.id_articulo),
+                    uso_articulos[data.id_articulo],
+                )
+
+    @staticmethod
+    def _validar_sala_en_lote(
+        data: ReservaCreate,
+        java_up: bool,
+        salas_java: Dict[int, Optional[Dict[str, Any]]],
+        intervalos: IntervalosSala,
+        id_temporal: int,
+    ) -> Optional[str]:
+        """Validar una reserva de sala del lote y registrarla si es válida."""
+        if not java_up:
+            return MSG_SALAS_NO_DISPONIBLE
+        sala = salas_java.get(data.id_sala)
+        if sala is None:
+            return (
+                f"La sala con ID {data.id_sala}"
+                f" no existe en el sistema de gestión de salas."
+            )
+        if not sala.get("disponible", False):
+            return (
+                f"La sala con ID {data.id_sala} "
+                f"no está disponible según el sistema de gestión de salas."
+            )
+        if intervalos.solapados(data.fecha_hora_inicio, data.fecha_hora_fin):
+            return MSG_CONFLICTO_SALA
+        intervalos.agregar(id_temporal, data.fecha_hora_inicio, data.fecha_hora_fin)
+        return None
+
+    @staticmethod
+    def _validar_articulo_en_lote(
+        data: ReservaCreate,
+        java_up: bool,
+        articulos_java: Dict[int, bool],
+        articulo,
+        uso: List[UsoArticulo],
+    ) -> Optional[str]:
+        """Validar una reserva de artículo del lote y registrarla si es válida."""
+        if not java_up:
+            return MSG_ARTICULOS_NO_DISPONIBLE
+        if not articulos_java.get(data.id_articulo):
+            return (
+                f"El artículo con ID {data.id_articulo} "
+                f"no existe en el sistema de gestión de artículos."
+            )
+        if articulo is None:
+            return f"El artículo con ID {data.id_articulo} no existe"
+        total_reservado = sum(
+            cantidad
+            for inicio, fin, cantidad in uso
+            if fin >= data.fecha_hora_inicio and inicio <= data.fecha_hora_fin
+        )
+        if articulo.cantidad - total_reservado < 1:
+            return (
+                f"No hay unidades disponibles del artículo '{articulo.nombre}' "
+                f"en el período solicitado. "
+                f"Total: {articulo.cantidad}, "
+                f"Ya reservado: {total_reservado}"
+            )
+        uso.append((data.fecha_hora_inicio, data.fecha_hora_fin, 1))
+        return None
+
+    @staticmethod
+    async def _validar_java_lote(
+        sala_ids: List[int], articulo_ids: List[int]
+    ) -> ValidacionJavaLote:
+        """
+        Consultar al servicio Java una vez por cada sala y artículo distintos.
+
+        Returns:
+            Tupla (servicio disponible, detalles por sala, existencia por artículo)
+        """
+        if not sala_ids and not articulo_ids:
+            return True, {}, {}
+        if not await JavaServiceClient.check_service_health():
+            return False, {}, {}
+        # Salas y artículos en un solo gather: las consultas se solapan
+        resultados = await asyncio.gather(
+            *(JavaServiceClient.get_sala_details(sala_id) for sala_id in sala_ids),
+            *(
+                JavaServiceClient.validate_articulo_exists(articulo_id)
+                for articulo_id in articulo_ids
+            ),
+        )
+        salas, articulos = resultados[:len(sala_ids)], resultados[len(sala_ids):]
+        return True, dict(zip(sala_ids, salas)), dict(zip(articulo_ids, articulos))
 
-        if has_sala:
-            ReservaService._validate_sala_reservation(db, reserva_data)
+    @staticmethod
+    def obtener_hora_actual(db: Session) -> datetime:
+        """
+        Obtener la hora local actual desde PostgreSQL.
 
-        return ReservaRepository.create(db, reserva_data)
+        Las fechas en la BD son naive (sin timezone) y representan hora local
+        ART (UTC-3); PostgreSQL está configurado en ese timezone.
+        """
+        now = db.execute(text("SELECT CURRENT_TIMESTAMP::timestamp")).scalar()
+        if now is None:
+            now = datetime.now()  # fallback
+        return now
 
     @staticmethod
-    def _validate_articulo_reservation(db: Session, reserva_data: ReservaCreate) -> None:
+    def _validate_articulo_reservation(
+        db: Session, reserva_data: ReservaCreate, validar_java: bool = True
+    ) -> None:
         """
         Validar reserva de artículo SOLO si el servicio Java está disponible.
         Si el servicio Java no responde, se muestra un error claro y no se permite la reserva.
+        Con validar_java=False se asume que el llamador ya consultó al servicio Java.
         """
         if reserva_data.id_articulo is None:
             return
 
-    # ...existing code...
-        # Verificar disponibilidad del servicio Java
-        is_java_up = asyncio.run(JavaServiceClient.check_service_health())
-        if not is_java_up:
-            raise ValueError(
-                "El sistema de gestión de artículos no está disponible en este momento. "
-                "Por favor, intente más tarde."
-            )
-        # Validar existencia y disponibilidad del artículo en Java
-        java_validation = asyncio.run(
-            JavaServiceClient.validate_articulo_exists(reserva_data.id_articulo))
-        if not java_validation:
-            raise ValueError(
-                f"El artículo con ID {reserva_data.id_articulo} "
-                f"no existe en el sistema de gestión de artículos."
-            )
+        if validar_java:
+            ReservaService._validar_articulo_en_java(reserva_data.id_articulo)
         # Obtener el artículo para verificar la cantidad total (local)
         articulo = ArticuloRepository.get_by_id(db, reserva_data.id_articulo)
         if not articulo:
@@ -157,35 +543,23 @@ class ReservaService:
             )
 
     @staticmethod
-    def _validate_sala_reservation(db: Session, reserva_data: ReservaCreate) -> None:
+    def _validate_sala_reservation(
+        db: Session, reserva_data: ReservaCreate, validar_java: bool = True
+    ) -> None:
         """
         Validar reserva de sala SOLO si el servicio Java está disponible.
         Si el servicio Java no responde, se muestra un error claro y no se permite la reserva.
+        Con validar_java=False se asume que el llamador ya consultó al servicio Java.
         """
         if reserva_data.id_sala is None:
             return
 
-    # ...existing code...
-        # Verificar disponibilidad del servicio Java
-        is_java_up = asyncio.run(JavaServiceClient.check_service_health())
-        if not is_java_up:
-            raise ValueError(
-                "El sistema de gestión de salas no está disponible en este momento. "
-                "Por favor, intente más tarde."
-            )
-        # Validar existencia y disponibilidad de la sala en Java
-        java_validation = asyncio.run(JavaServiceClient.validate_sala_exists(reserva_data.id_sala))
-        if not java_validation:
-            raise ValueError(
-                f"La sala con ID {reserva_data.id_sala}"
-                f" no existe en el sistema de gestión de salas."
-            )
-        is_disponible = asyncio.run(JavaServiceClient.check_sala_disponible(reserva_data.id_sala))
-        if not is_disponible:
-            raise ValueError(
-                f"La sala con ID {reserva_data.id_sala} "
-                f"no está disponible según el sistema de gestión de salas."
-            )
+        if validar_java:
+            ReservaService._validar_sala_en_java(reserva_data.id_sala)
+        # Con la restricción de exclusión activa, la base rechaza el conflicto
+        # al guardar y conflicto_sala_como_error lo traduce al mismo mensaje
+        if settings.sala_exclusion_constraint:
+            return
         # Verificar conflictos de horario en la sala (siempre se hace localmente)
         conflicts = ReservaRepository.check_conflicts(
             db,
@@ -194,8 +568,67 @@ class ReservaService:
             reserva_data.fecha_hora_fin,
         )
         if conflicts:
-            raise ValueError(
-                "Ya existe una reserva en la sala para el horario especificado"
+            raise ReservaRechazadaError(MOTIVO_CONFLICTO_SALA, MSG_CONFLICTO_SALA)
+
+    @staticmethod
+    def _validar_articulo_en_java(articulo_id: int) -> None:
+        """Validar el artículo en el servicio Java desde código sincrónico."""
+        asyncio.run(ReservaService._validar_articulo_en_java_async(articulo_id))
+
+    @staticmethod
+    def _validar_sala_en_java(sala_id: int) -> None:
+        """Validar la sala en el servicio Java desde código sincrónico."""
+        asyncio.run(ReservaService._validar_sala_en_java_async(sala_id))
+
+    @staticmethod
+    async def _validar_articulo_en_java_async(articulo_id: int) -> None:
+        """
+        Validar que el servicio Java responde y que el artículo existe.
+
+        El chequeo de salud y la consulta del artículo se hacen en paralelo.
+        """
+        is_java_up, java_validation = await asyncio.gather(
+            JavaServiceClient.check_service_health(),
+            JavaServiceClient.validate_articulo_exists(articulo_id),
+        )
+        if not is_java_up:
+            raise ReservaRechazadaError(
+                MOTIVO_SERVICIO_NO_DISPONIBLE, MSG_ARTICULOS_NO_DISPONIBLE
+            )
+        if not java_validation:
+            raise ReservaRechazadaError(
+                MOTIVO_ARTICULO_INEXISTENTE,
+                f"El artículo con ID {articulo_id} "
+                f"no existe en el sistema de gestión de artículos.",
+            )
+
+    @staticmethod
+    async def _validar_sala_en_java_async(sala_id: int) -> None:
+        """
+        Validar que el servicio Java responde y que la sala existe y está disponible.
+
+        El chequeo de salud y la consulta de la sala se hacen en paralelo; el
+        snapshot de la sala resuelve a la vez su existencia y su disponibilidad.
+        """
+        is_java_up, snapshot = await asyncio.gather(
+            JavaServiceClient.check_service_health(),
+            JavaServiceClient.get_sala_snapshot(sala_id),
+        )
+        if not is_java_up:
+            raise ReservaRechazadaError(
+                MOTIVO_SERVICIO_NO_DISPONIBLE, MSG_SALAS_NO_DISPONIBLE
+            )
+        if not snapshot["existe"]:
+            raise ReservaRechazadaError(
+                MOTIVO_SALA_INEXISTENTE,
+                f"La sala con ID {sala_id} "
+                f"no existe en el sistema de gestión de salas.",
+            )
+        if not snapshot["disponible"]:
+            raise ReservaRechazadaError(
+                MOTIVO_SALA_NO_DISPONIBLE,
+                f"La sala con ID {sala_id} "
+                f"no está disponible según el sistema de gestión de salas.",
             )
 
     @staticmethod
@@ -213,23 +646,33 @@ class ReservaService:
         return ReservaRepository.get_by_id(db, reserva_id)
 
     @staticmethod
-    def get_reservas(db: Session, skip: int = 0, limit: int = 100) -> List[Reserva]:
+    def get_reservas(
+        db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[Reserva]:
         """
         Obtener lista de reservas.
 
         Args:
             db: Sesión de base de datos
-            skip: Registros a omitir (paginación)
+            skip: Registros a omitir (paginación por desplazamiento)
             limit: Máximo número de registros
+            cursor: Cursor de la página anterior (paginación por cursor)
 
         Returns:
             Lista de reservas
+
+        Raises:
+            ValueError: Si el cursor es inválido
         """
-        return ReservaRepository.get_all(db, skip, limit)
+        return ReservaRepository.get_all(db, skip, limit, _posicion(cursor))
 
     @staticmethod
     def get_reservas_by_persona(
-        db: Session, persona_id: int, skip: int = 0, limit: int = 100
+        db: Session,
+        persona_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Reserva]:
         """
         Obtener reservas de una persona específica.
@@ -237,17 +680,24 @@ class ReservaService:
         Args:
             db: Sesión de base de datos
             persona_id: ID de la persona
-            skip: Registros a omitir (paginación)
+            skip: Registros a omitir (paginación por desplazamiento)
             limit: Máximo número de registros
+            cursor: Cursor de la página anterior (paginación por cursor)
 
         Returns:
             Lista de reservas de la persona
         """
-        return ReservaRepository.get_by_persona(db, persona_id, skip, limit)
+        return ReservaRepository.get_by_persona(
+            db, persona_id, skip, limit, _posicion(cursor)
+        )
 
     @staticmethod
     def get_reservas_by_sala(
-        db: Session, sala_id: int, skip: int = 0, limit: int = 100
+        db: Session,
+        sala_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Reserva]:
         """
         Obtener reservas de una sala específica.
@@ -255,17 +705,24 @@ class ReservaService:
         Args:
             db: Sesión de base de datos
             sala_id: ID de la sala
-            skip: Registros a omitir (paginación)
+            skip: Registros a omitir (paginación por desplazamiento)
             limit: Máximo número de registros
+            cursor: Cursor de la página anterior (paginación por cursor)
 
         Returns:
             Lista de reservas de la sala
         """
-        return ReservaRepository.get_by_sala(db, sala_id, skip, limit)
+        return ReservaRepository.get_by_sala(
+            db, sala_id, skip, limit, _posicion(cursor)
+        )
 
     @staticmethod
     def get_reservas_by_articulo(
-        db: Session, articulo_id: int, skip: int = 0, limit: int = 100
+        db: Session,
+        articulo_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Reserva]:
         """
         Obtener reservas de un artículo específico.
@@ -273,13 +730,16 @@ class ReservaService:
         Args:
             db: Sesión de base de datos
             articulo_id: ID del artículo
-            skip: Registros a omitir (paginación)
+            skip: Registros a omitir (paginación por desplazamiento)
             limit: Máximo número de registros
+            cursor: Cursor de la página anterior (paginación por cursor)
 
         Returns:
             Lista de reservas del artículo
         """
-        return ReservaRepository.get_by_articulo(db, articulo_id, skip, limit)
+        return ReservaRepository.get_by_articulo(
+            db, articulo_id, skip, limit, _posicion(cursor)
+        )
 
     @staticmethod
     def get_reservas_by_fecha_range(
@@ -288,6 +748,7 @@ class ReservaService:
         fecha_fin: Optional[datetime] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Reserva]:
         """
         Obtener reservas en un rango de fechas.
@@ -296,19 +757,36 @@ class ReservaService:
             db: Sesión de base de datos
             fecha_inicio: Fecha de inicio del rango
             fecha_fin: Fecha de fin del rango (opcional)
-            skip: Registros a omitir (paginación)
+            skip: Registros a omitir (paginación por desplazamiento)
             limit: Máximo número de registros
+            cursor: Cursor de la página anterior (paginación por cursor)
 
         Returns:
             Lista de reservas en el rango
         """
         return ReservaRepository.get_by_fecha_range(
-            db, fecha_inicio, fecha_fin, skip, limit
+            db, fecha_inicio, fecha_fin, skip, limit, _posicion(cursor)
         )
 
+    @staticmethod
+    def siguiente_cursor(reservas: List[Reserva], limit: int) -> Optional[str]:
+        """
+        Obtener el cursor de la página siguiente de un listado.
+
+        Returns:
+            Cursor que apunta después de la última reserva, o None si la
+            página vino incompleta (no hay más resultados)
+        """
+        if not reservas or len(reservas) < limit:
+            return None
+        return codificar_cursor(reservas[-1])
+
     @staticmethod
     def update_reserva(
-        db: Session, reserva_id: int, reserva_data: ReservaUpdate
+        db: Session,
+        reserva_id: int,
+        reserva_data: ReservaUpdate,
+        validar_java: bool = True,
     ) -> Optional[Reserva]:
         """
         Actualizar una reserva existente con validaciones.
@@ -317,6 +795,8 @@ class ReservaService:
             db: Sesión de base de datos
             reserva_id: ID de la reserva a actualizar
             reserva_data: Nuevos datos de la reserva
+            validar_java: Consultar al servicio Java por el artículo o la sala
+                nuevos (False si update_reserva_async ya lo hizo)
 
         Returns:
             Reserva actualizada o None si no existe
@@ -379,7 +859,7 @@ class ReservaService:
                 id_articulo=reserva_data.id_articulo,
                 id_sala=None,
             )
-            ReservaService._validate_articulo_reservation(db, temp_data)
+            ReservaService._validate_articulo_reservation(db, temp_data, validar_java)
 
         # Si se está cambiando la sala, validar conflictos
         if (
@@ -398,7 +878,7 @@ class ReservaService:
                 id_articulo=None,
                 id_sala=reserva_data.id_sala,
             )
-            ReservaService._validate_sala_reservation(db, temp_data)
+            ReservaService._validate_sala_reservation(db, temp_data, validar_java)
 
         # Si se están cambiando las fechas de una reserva de artículo, validar
         if current_reserva.id_articulo and (
@@ -463,7 +943,60 @@ class ReservaService:
                         f"Total: {articulo.cantidad}, Ya reservado: {total_reservado}"
                     )
 
-        return ReservaRepository.update(db, reserva_id, reserva_data)
+        with conflicto_sala_como_error():
+            return ReservaRepository.update(db, reserva_id, reserva_data)
+
+    @staticmethod
+    async def update_reserva_async(
+        db: Session, reserva_id: int, reserva_data: ReservaUpdate
+    ) -> Optional[Reserva]:
+        """
+        Variante asíncrona de update_reserva para endpoints async.
+
+        Si cambian el artículo o la sala, las consultas al servicio Java se
+        hacen en paralelo sobre el event loop; el resto de las validaciones y
+        la actualización se ejecutan en un hilo.
+
+        Args:
+            db: Sesión de base de datos
+            reserva_id: ID de la reserva a actualizar
+            reserva_data: Nuevos datos de la reserva
+
+        Returns:
+            Reserva actualizada o None si no existe
+
+        Raises:
+            ValueError: Si hay errores de validación o conflictos
+        """
+        current_reserva = await asyncio.to_thread(
+            ReservaRepository.get_by_id, db, reserva_id
+        )
+        if not current_reserva:
+            return None
+
+        validaciones = []
+        if (
+            reserva_data.id_articulo is not None
+            and reserva_data.id_articulo != current_reserva.id_articulo
+        ):
+            validaciones.append(
+                ReservaService._validar_articulo_en_java_async(reserva_data.id_articulo)
+            )
+        if (
+            reserva_data.id_sala is not None
+            and reserva_data.id_sala != current_reserva.id_sala
+        ):
+            validaciones.append(
+                ReservaService._validar_sala_en_java_async(reserva_data.id_sala)
+            )
+        # Esperar todas las validaciones antes de informar el primer rechazo
+        for resultado in await asyncio.gather(*validaciones, return_exceptions=True):
+            if isinstance(resultado, BaseException):
+                raise resultado
+
+        return await asyncio.to_thread(
+            ReservaService.update_reserva, db, reserva_id, reserva_data, False
+        )
 
     @staticmethod
     def delete_reserva(db: Session, reserva_id: int) -> bool:
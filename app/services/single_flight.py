@@ -0,0 +1,69 @@
+"""
+Coalescencia de consultas idénticas concurrentes (single-flight).
+
+Cuando varias solicitudes piden al mismo tiempo el mismo recurso del
+servicio Java (por ejemplo, la misma sala durante una ráfaga de reservas),
+solo la primera hace la consulta HTTP; las demás esperan ese mismo
+resultado. Terminada la consulta, la clave se libera y la siguiente
+llamada vuelve a consultar.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Comparte una consulta en curso entre los llamadores de la misma clave."""
+
+    def __init__(self):
+        # Consultas en curso por (event loop, clave): una tarea no puede
+        # esperarse desde otro loop (asyncio.run en código sincrónico)
+        self._en_curso: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+        self.consultas = 0
+        self.compartidas = 0
+
+    async def ejecutar(
+        self, clave: Hashable, consultar: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Ejecutar la consulta o sumarse a la que ya está en curso.
+
+        Args:
+            clave: Identificador del recurso consultado
+            consultar: Función que realiza la consulta
+
+        Returns:
+            Resultado de la consulta (el mismo objeto para todos los llamadores).
+            Si la consulta falla, la excepción se propaga a todos.
+        """
+        loop = asyncio.get_running_loop()
+        clave_loop = (id(loop), clave)
+        tarea = self._en_curso.get(clave_loop)
+        if tarea is not None and not tarea.done():
+            self.compartidas += 1
+        else:
+            self.consultas += 1
+            tarea = loop.create_task(consultar())
+            self._en_curso[clave_loop] = tarea
+            tarea.add_done_callback(lambda t: self._liberar(clave_loop, t))
+        # shield: si un llamador se cancela, la consulta sigue para los demás
+        return await asyncio.shield(tarea)
+
+    def stats(self) -> Dict[str, Any]:
+        """Obtener la cantidad de consultas realizadas y compartidas."""
+        return {
+            "en_curso": len(self._en_curso),
+            "consultas": self.consultas,
+            "compartidas": self.compartidas,
+        }
+
+    def _liberar(self, clave_loop: Tuple[int, Hashable], tarea: asyncio.Task) -> None:
+        if self._en_curso.get(clave_loop) is tarea:
+            del self._en_curso[clave_loop]
+        # Marcar la excepción como consultada si ningún llamador la esperó
+        if not tarea.cancelled():
+            tarea.exception()
@@ -15,20 +15,17 @@ from zoneinfo import ZoneInfo
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
 
 # Local imports
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.auth.jwt_handler import extract_email_from_token
 from app.models.persona import Persona
-from app.models.reserva import Reserva
-from app.models.sala import Sala
-from app.models.articulo import Articulo
+from app.repositories.articulo_repository import ArticuloRepository
 from app.repositories.persona_repository import PersonaRepository
 from app.repositories.reserva_repository import ReservaRepository
 from app.repositories.sala_repository import SalaRepository
-from app.services.persona_service import PersonaService
-from app.services.articulo_service import ArticuloService
 
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
@@ -55,23 +52,16 @@ templates.env.globals['static_version'] = STATIC_VERSION
 
 # Endpoint API para reservas activas (dashboard.js)
 @router.get("/api/v1/stats/reservas")
-async def api_reservas_activas(request: Request, db: Session = Depends(get_db)):
-    current_user = get_user_from_request(request, db)
+async def api_reservas_activas(request: Request, db: AsyncSession = Depends(get_async_db)):
+    current_user = await get_user_from_request(request, db)
     if not current_user:
         return JSONResponse(status_code=401, content={"error": "No autorizado"})
 
     ahora_local = datetime.now(ZoneInfo("America/Argentina/Buenos_Aires"))
-    reservas = ReservaRepository.get_all(db)
-    reservas_activas = []
-    for r in reservas:
-        fin = r.fecha_hora_fin
-        if fin.tzinfo is None:
-            if fin >= ahora_local.replace(tzinfo=None):
-                reservas_activas.append(r)
-        else:
-            if fin.astimezone(ZoneInfo("America/Argentina/Buenos_Aires")) >= ahora_local:
-                reservas_activas.append(r)
-    return {"reservasActivas": len(reservas_activas)}
+    reservas_activas = await ReservaRepository.count_vigentes_async(
+        db, ahora_local.replace(tzinfo=None)
+    )
+    return {"reservasActivas": reservas_activas}
 
 
 def handle_auth_error(request: Request):
@@ -87,7 +77,7 @@ def handle_auth_error(request: Request):
     return RedirectResponse(url="/login", status_code=302)
 
 
-def get_user_from_request(request: Request, db: Session):
+async def get_user_from_request(request: Request, db: AsyncSession):
     """Extraer usuario desde el token en el header Authorization o cookies."""
     token = None
 
@@ -115,7 +105,7 @@ def get_user_from_request(request: Request, db: Session):
         if not email:
             return None
 
-        user = PersonaRepository.get_by_email(db, email)
+        user = await PersonaRepository.get_by_email_async(db, email)
         if not user or not user.is_active:
             return None
 
@@ -144,10 +134,10 @@ async def debug_auth(request: Request):
 
 
 @router.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request, db: Session = Depends(get_db)):
+async def dashboard(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Dashboard principal (solo administradores)"""
     # Verificar autenticación
-    current_user = get_user_from_request(request, db)
+    current_user = await get_user_from_request(request, db)
     if not current_user:
         return handle_auth_error(request)
     # Verificar permisos de admin
@@ -157,44 +147,36 @@ async def dashboard(request: Request, db: Session = Depends(get_db)):
 
 
     try:
-        # Obtener estadísticas básicas para el dashboard
-        personas = PersonaRepository.get_all(db)
-        salas = SalaRepository.get_all(db)
-        reservas = ReservaRepository.get_all(db)
-
-        total_articulos = ArticuloService.count_articulos(db)
-        articulos_disponibles = ArticuloService.count_articulos(db, disponible=True)
-        articulos_no_disponibles = total_articulos - articulos_disponibles
+        # Obtener estadísticas básicas para el dashboard (conteos en la base)
+        total_articulos = await ArticuloRepository.count_async(db)
+        articulos_disponibles = await ArticuloRepository.count_async(
+            db, disponible=True
+        )
+        total_salas = await SalaRepository.count_async(db)
+        salas_grandes = await SalaRepository.count_async(db, min_capacidad=21)
 
-        # Reservas activas: fecha_hora_fin >= ahora (local time)
+        # Reservas activas: fecha_hora_fin >= ahora (hora local, naive en la base)
         ahora_local = datetime.now(ZoneInfo("America/Argentina/Buenos_Aires"))
-        reservas_activas = []
-        for r in reservas:
-            fin = r.fecha_hora_fin
-            # Si el datetime es naive (sin tzinfo), asumir local
-            if fin.tzinfo is None:
-                if fin >= ahora_local.replace(tzinfo=None):
-                    reservas_activas.append(r)
-            else:
-                if fin.astimezone(ZoneInfo("America/Argentina/Buenos_Aires")) >= ahora_local:
-                    reservas_activas.append(r)
+        reservas_activas = await ReservaRepository.count_vigentes_async(
+            db, ahora_local.replace(tzinfo=None)
+        )
 
         stats = {
-            "total_personas": len(personas),
+            "total_personas": await PersonaRepository.count_async(db),
             "total_articulos": total_articulos,
             "articulos_disponibles": articulos_disponibles,
-            "articulos_no_disponibles": articulos_no_disponibles,
-            "total_salas": len(salas),
-            "salas_pequenas": len([s for s in salas if s.capacidad <= 20]),
-            "salas_grandes": len([s for s in salas if s.capacidad > 20]),
-            "total_reservas": len(reservas),
-            "reservasActivas": len(reservas_activas),
+            "articulos_no_disponibles": total_articulos - articulos_disponibles,
+            "total_salas": total_salas,
+            "salas_pequenas": total_salas - salas_grandes,
+            "salas_grandes": salas_grandes,
+            "total_reservas": await ReservaRepository.count_async(db),
+            "reservasActivas": reservas_activas,
         }
 
         return templates.TemplateResponse(
             "dashboard.html", {"request": request, "stats": stats, "user": current_user}
         )
-    except (ValueError, KeyError, AttributeError, TypeError) as e:
+    except (SQLAlchemyError, ValueError, KeyError, AttributeError, TypeError) as e:
         # En caso de error al procesar datos, devolver un dashboard básico
         print(f"Error en dashboard: {e}")
         return templates.TemplateResponse(
@@ -218,10 +200,10 @@ async def dashboard(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/personas", response_class=HTMLResponse)
-async def personas_page(request: Request, db: Session = Depends(get_db)):
+async def personas_page(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Página de gestión de personas (solo administradores)."""
     # Verificar autenticación
-    current_user = get_user_from_request(request, db)
+    current_user = await get_user_from_request(request, db)
     if not current_user:
         return handle_auth_error(request)
 
@@ -231,8 +213,8 @@ async def personas_page(request: Request, db: Session = Depends(get_db)):
         return admin_check
 
     try:
-        personas = PersonaService.get_personas(db, limit=50)
-    except (ValueError, RuntimeError):
+        personas = await PersonaRepository.get_all_async(db, limit=50)
+    except (SQLAlchemyError, ValueError, RuntimeError):
         # Error al obtener personas de la base de datos
         personas = []
 
@@ -243,10 +225,10 @@ async def personas_page(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/salas", response_class=HTMLResponse)
-async def salas_page(request: Request, db: Session = Depends(get_db)):
+async def salas_page(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Página de gestión de salas."""
     # Verificar autenticación
-    current_user = get_user_from_request(request, db)
+    current_user = await get_user_from_request(request, db)
     if not current_user:
         return handle_auth_error(request)
 
@@ -256,10 +238,10 @@ async def salas_page(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/reservas", response_class=HTMLResponse)
-async def reservas_page(request: Request, db: Session = Depends(get_db)):
+async def reservas_page(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Página de gestión de reservas."""
     # Verificar autenticación
-    current_user = get_user_from_request(request, db)
+    current_user = await get_user_from_request(request, db)
     if not current_user:
         return handle_auth_error(request)
 
@@ -269,10 +251,10 @@ async def reservas_page(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/inventario", response_class=HTMLResponse)
-async def inventario_page(request: Request, db: Session = Depends(get_db)):
+async def inventario_page(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Página de gestión de inventario (solo administradores)."""
     # Verificar autenticación
-    current_user = get_user_from_request(request, db)
+    current_user = await get_user_from_request(request, db)
     if not current_user:
         return handle_auth_error(request)
 
@@ -287,10 +269,10 @@ async def inventario_page(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/reportes", response_class=HTMLResponse)
-async def reportes_page(request: Request, db: Session = Depends(get_db)):
+async def reportes_page(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Página de reportes y analytics (solo administradores)."""
     # Verificar autenticación
-    current_user = get_user_from_request(request, db)
+    current_user = await get_user_from_request(request, db)
     if not current_user:
         return handle_auth_error(request)
 
@@ -305,10 +287,10 @@ async def reportes_page(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/configuracion", response_class=HTMLResponse)
-async def configuracion_page(request: Request, db: Session = Depends(get_db)):
+async def configuracion_page(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Página de configuración del sistema (solo administradores)."""
     # Verificar autenticación
-    current_user = get_user_from_request(request, db)
+    current_user = await get_user_from_request(request, db)
     if not current_user:
         return handle_auth_error(request)
 
@@ -332,10 +314,10 @@ async def configuracion_page(request: Request, db: Session = Depends(get_db)):
 
 
     stats = {
-        "total_usuarios": db.query(Persona).count(),
-        "total_reservas": db.query(Reserva).count(),
-        "total_salas": db.query(Sala).count(),
-        "total_articulos": db.query(Articulo).count(),
+        "total_usuarios": await PersonaRepository.count_async(db),
+        "total_reservas": await ReservaRepository.count_async(db),
+        "total_salas": await SalaRepository.count_async(db),
+        "total_articulos": await ArticuloRepository.count_async(db),
     }
 
     return templates.TemplateResponse(
@@ -350,10 +332,10 @@ async def configuracion_page(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/documentacion", response_class=HTMLResponse)
-async def documentacion_page(request: Request, db: Session = Depends(get_db)):
+async def documentacion_page(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Página de documentación del proyecto (solo administradores)."""
     # Verificar autenticación
-    current_user = get_user_from_request(request, db)
+    current_user = await get_user_from_request(request, db)
     if not current_user:
         return handle_auth_error(request)
 
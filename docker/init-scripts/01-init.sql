@@ -36,6 +36,20 @@ CREATE TABLE IF NOT EXISTS salas (
     descripcion VARCHAR(255) DEFAULT ''
 );
 
+-- Crear tabla de series de reservas recurrentes
+CREATE TABLE IF NOT EXISTS reserva_series (
+    id SERIAL PRIMARY KEY,
+    id_persona INTEGER NOT NULL REFERENCES personas(id),
+    id_sala INTEGER NOT NULL REFERENCES salas(id),
+    frecuencia VARCHAR(10) NOT NULL,
+    intervalo INTEGER NOT NULL DEFAULT 1,
+    fecha_hora_inicio TIMESTAMP NOT NULL,
+    fecha_hora_fin TIMESTAMP NOT NULL,
+    repeticiones INTEGER,
+    hasta TIMESTAMP,
+    excepciones JSON NOT NULL DEFAULT '[]'
+);
+
 -- Crear tabla reservas
 CREATE TABLE IF NOT EXISTS reservas (
     id SERIAL PRIMARY KEY,
@@ -43,9 +57,36 @@ CREATE TABLE IF NOT EXISTS reservas (
     id_sala INTEGER REFERENCES salas(id),
     id_persona INTEGER NOT NULL REFERENCES personas(id),
     fecha_hora_inicio TIMESTAMP NOT NULL,
-    fecha_hora_fin TIMESTAMP NOT NULL
+    fecha_hora_fin TIMESTAMP NOT NULL,
+    id_serie INTEGER REFERENCES reserva_series(id) ON DELETE SET NULL
 );
 
+CREATE INDEX IF NOT EXISTS ix_reservas_id_serie ON reservas (id_serie);
+
+-- Índices de la paginación por cursor de reservas (ver migración 0003)
+CREATE INDEX IF NOT EXISTS ix_reservas_inicio_id ON reservas (fecha_hora_inicio, id);
+CREATE INDEX IF NOT EXISTS ix_reservas_persona_inicio_id ON reservas (id_persona, fecha_hora_inicio, id);
+CREATE INDEX IF NOT EXISTS ix_reservas_sala_inicio_id ON reservas (id_sala, fecha_hora_inicio, id);
+CREATE INDEX IF NOT EXISTS ix_reservas_articulo_inicio_id ON reservas (id_articulo, fecha_hora_inicio, id);
+
+-- Índice de las consultas por rango horario (ver migraciones 0004 y 0006)
+CREATE INDEX IF NOT EXISTS ix_reservas_fin_inicio ON reservas (fecha_hora_fin, fecha_hora_inicio);
+
+-- Impedir reservas solapadas de una misma sala (ver migración 0002)
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'reservas_sala_sin_solapamiento'
+    ) THEN
+        ALTER TABLE reservas ADD CONSTRAINT reservas_sala_sin_solapamiento
+            EXCLUDE USING gist (
+                id_sala WITH =,
+                tsrange(fecha_hora_inicio, fecha_hora_fin, '[)') WITH &&
+            ) WHERE (id_sala IS NOT NULL);
+    END IF;
+END $$;
+
 -- Crear tabla de relación muchos-a-muchos entre reservas de salas y artículos necesarios
 CREATE TABLE IF NOT EXISTS reserva_articulos (
     reserva_id INTEGER NOT NULL REFERENCES reservas(id) ON DELETE CASCADE,
@@ -54,6 +95,23 @@ CREATE TABLE IF NOT EXISTS reserva_articulos (
     PRIMARY KEY (reserva_id, articulo_id)
 );
 
+CREATE INDEX IF NOT EXISTS ix_reserva_articulos_articulo ON reserva_articulos (articulo_id);
+
+-- Tabla de hechos: reservas agregadas por día, sala, artículo y persona (ver migración 0005)
+CREATE TABLE IF NOT EXISTS reservas_diarias (
+    id SERIAL PRIMARY KEY,
+    fecha DATE NOT NULL,
+    id_sala INTEGER,
+    id_articulo INTEGER,
+    id_persona INTEGER NOT NULL,
+    cantidad INTEGER NOT NULL,
+    horas DOUBLE PRECISION NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_reservas_diarias_fecha ON reservas_diarias (fecha);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_reservas_diarias_clave
+    ON reservas_diarias (fecha, COALESCE(id_sala, 0), COALESCE(id_articulo, 0), id_persona);
+
 -- ============================================================================
 -- DATOS DE EJEMPLO - SOLO PARA DESARROLLO Y TESTING
 -- ============================================================================
@@ -71,7 +129,7 @@ CREATE TABLE IF NOT EXISTS reserva_articulos (
 -- ============================================================================
 
 -- Limpiar datos existentes (solo para desarrollo - garantiza IDs desde 1)
-TRUNCATE TABLE reserva_articulos, reservas, personas, articulos, salas RESTART IDENTITY CASCADE;
+TRUNCATE TABLE reservas_diarias, reserva_articulos, reservas, reserva_series, personas, articulos, salas RESTART IDENTITY CASCADE;
 
 -- Insertar personas
 INSERT INTO personas (nombre, apellido, email, hashed_password, is_active, is_admin) VALUES
@@ -635,4 +693,11 @@ FROM (
     ('2025-11-14 15:00:00'::timestamp, 2, 1, 1), ('2025-11-14 15:00:00'::timestamp, 2, 9, 2), ('2025-11-14 15:00:00'::timestamp, 2, 6, 2)
 ) AS x(fecha_hora_inicio, id_sala, articulo_id, cantidad)
 JOIN reservas r ON r.fecha_hora_inicio = x.fecha_hora_inicio AND r.id_sala = x.id_sala
-ON CONFLICT DO NOTHING;
\ No newline at end of file
+ON CONFLICT DO NOTHING;
+
+-- Llenar la tabla de hechos con las reservas de ejemplo
+INSERT INTO reservas_diarias (fecha, id_sala, id_articulo, id_persona, cantidad, horas)
+SELECT fecha_hora_inicio::date, id_sala, id_articulo, id_persona,
+       COUNT(*), SUM(EXTRACT(EPOCH FROM fecha_hora_fin - fecha_hora_inicio) / 3600)
+FROM reservas
+GROUP BY fecha_hora_inicio::date, id_sala, id_articulo, id_persona;
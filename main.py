@@ -5,11 +5,15 @@ Este módulo contiene la aplicación FastAPI principal con los endpoints
 básicos y la configuración inicial del sistema de reservas.
 """
 
+import asyncio
+import logging
 import os
-from datetime import datetime
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 import uvicorn
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from fastapi import Depends, FastAPI, HTTPException, status
@@ -17,14 +21,23 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import api_router
 from app.core.config import settings
-from app.core.database import Base, engine, get_db
-from app.web import web_router
-from app.services import (
-    ArticuloService,
-    PersonaService,
-    ReservaService,
-    SalaService,
+from app.core.database import (
+    SessionLocal,
+    async_engine,
+    get_async_db,
+    metricas_pool,
+    metricas_pool_async,
 )
+from app.core.migraciones import aplicar_migraciones
+from app.prediction.modelo_demanda import modelo_demanda
+from app.repositories.sala_interval_index import sala_interval_index
+from app.repositories.snapshot_reservas import snapshot_reservas
+from app.services.java_client import JavaServiceClient
+from app.web import web_router
+from app.repositories.articulo_repository import ArticuloRepository
+from app.repositories.persona_repository import PersonaRepository
+from app.repositories.reserva_repository import ReservaRepository
+from app.services import SalaService
 from app.api.v1.endpoints import stats
 
 # Crear aplicación FastAPI
@@ -55,8 +68,157 @@ except ValueError as e:
     print("💡 Tip: Copia .env.example a .env y configura las variables necesarias")
     raise
 
-# Crear todas las tablas
-Base.metadata.create_all(bind=engine)
+
+logger = logging.getLogger(__name__)
+
+
+def _detectar_restriccion_de_sala() -> bool:
+    """Indicar si la base tiene la restricción de exclusión de salas."""
+    db = SessionLocal()
+    try:
+        return ReservaRepository.existe_restriccion_de_sala(db)
+    finally:
+        db.close()
+
+
+def _cargar_indice_salas() -> int:
+    """Cargar o recargar el índice de conflictos de salas con una sesión propia."""
+    db = SessionLocal()
+    try:
+        return sala_interval_index.cargar(db)
+    finally:
+        db.close()
+
+
+async def _reconciliar_indice_salas() -> None:
+    """Recargar periódicamente el índice de salas con lo escrito por otros workers."""
+    while True:
+        await asyncio.sleep(settings.sala_index_reconciliar)
+        try:
+            await asyncio.to_thread(_cargar_indice_salas)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("⚠️ No se pudo recargar el índice de salas")
+
+
+def _cargar_snapshot_reservas() -> int:
+    """Cargar o reconciliar la foto en memoria de reservas con una sesión propia."""
+    db = SessionLocal()
+    try:
+        return snapshot_reservas.cargar(db)
+    finally:
+        db.close()
+
+
+async def _reconciliar_snapshot_reservas() -> None:
+    """Reconciliar periódicamente la foto de reservas con la base de datos."""
+    while True:
+        await asyncio.sleep(settings.snapshot_reservas_reconciliar)
+        try:
+            await asyncio.to_thread(_cargar_snapshot_reservas)
+        except Exception:  # pylint: disable=broad-except
+            # Cualquier error (no solo de BD) mataría la tarea en silencio
+            logger.exception("⚠️ No se pudo reconciliar la foto de reservas")
+
+
+def _cargar_modelo_demanda(reajustar: bool = False):
+    """Cargar (o reajustar) el modelo de demanda con una sesión propia."""
+    db = SessionLocal()
+    try:
+        if reajustar:
+            return modelo_demanda.reajustar(db)
+        return modelo_demanda.cargar(db)
+    finally:
+        db.close()
+
+
+async def _reajustar_modelo_demanda() -> None:
+    """Reajustar el modelo de demanda al comenzar cada día (UTC)."""
+    while True:
+        ahora = datetime.utcnow()
+        manana = datetime.combine(ahora.date() + timedelta(days=1), datetime.min.time())
+        await asyncio.sleep((manana - ahora).total_seconds() + 1)
+        try:
+            await asyncio.to_thread(_cargar_modelo_demanda, True)
+        except Exception:  # pylint: disable=broad-except
+            # Cualquier error (no solo de BD) mataría la tarea en silencio
+            logger.exception("⚠️ No se pudo reajustar el modelo de demanda")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Inicializar recursos compartidos al arrancar y liberarlos al apagar."""
+    # Llevar el esquema a la última migración (tablas, índices y restricciones)
+    if settings.db_migrate_on_startup:
+        await asyncio.to_thread(aplicar_migraciones)
+        print("✅ Migraciones de base de datos aplicadas")
+
+    # Con SALA_EXCLUSION_CONSTRAINT=auto, delegar los conflictos de salas a la
+    # restricción de exclusión si las migraciones la crearon
+    if settings.sala_exclusion_constraint_modo == "auto":
+        try:
+            settings.sala_exclusion_constraint = await asyncio.to_thread(
+                _detectar_restriccion_de_sala
+            )
+        except SQLAlchemyError as e:
+            print(f"⚠️ No se pudo detectar la restricción de solapamiento de salas: {e}")
+        print(
+            "✅ Conflictos de salas: "
+            + ("restricción de exclusión" if settings.sala_exclusion_constraint
+               else "consulta previa")
+        )
+
+    # Precargar el índice de conflictos de salas
+    try:
+        total = await asyncio.to_thread(_cargar_indice_salas)
+        print(f"✅ Índice de salas precargado ({total} reservas)")
+    except SQLAlchemyError as e:
+        print(f"⚠️ No se pudo precargar el índice de salas, se usará la base de datos: {e}")
+    recarga_indice = None
+    if settings.sala_index_reconciliar > 0:
+        recarga_indice = asyncio.create_task(_reconciliar_indice_salas())
+
+    # Foto columnar de reservas para analítica, predicciones y estadísticas
+    try:
+        total = await asyncio.to_thread(_cargar_snapshot_reservas)
+        print(f"✅ Foto de reservas cargada ({total} reservas)")
+    except SQLAlchemyError as e:
+        print(
+            f"⚠️ No se pudo cargar la foto de reservas, se cargará al usarla: {e}"
+        )
+    reconciliacion = None
+    if settings.snapshot_reservas_reconciliar > 0:
+        reconciliacion = asyncio.create_task(_reconciliar_snapshot_reservas())
+
+    # Modelo de pronóstico de demanda: del disco si es del día, si no se ajusta
+    try:
+        modelo = await asyncio.to_thread(_cargar_modelo_demanda)
+        print(
+            f"✅ Modelo de demanda listo para {modelo.fecha} "
+            f"({modelo_demanda.origen})"
+        )
+    except SQLAlchemyError as e:
+        print(f"⚠️ No se pudo ajustar el modelo de demanda, se ajustará al usarlo: {e}")
+    reajuste_diario = asyncio.create_task(_reajustar_modelo_demanda())
+
+    # Cliente HTTP compartido para el Java Service
+    await JavaServiceClient.iniciar()
+
+    yield
+
+    await JavaServiceClient.cerrar()
+    for tarea in (recarga_indice, reconciliacion, reajuste_diario):
+        if tarea is None:
+            continue
+        tarea.cancel()
+        try:
+            await tarea
+        except asyncio.CancelledError:
+            pass
+    sala_interval_index.limpiar()
+    snapshot_reservas.limpiar()
+    modelo_demanda.limpiar()
+    await async_engine.dispose()
+
 
 # Crear aplicación FastAPI
 app = FastAPI(
@@ -64,6 +226,7 @@ app = FastAPI(
     description="API REST para gestión de reservas de salas y artículos con detección de conflictos y validación automática.",
     version="1.0.0",
     debug=settings.debug,
+    lifespan=lifespan,
 )
 
 # Configurar CORS
@@ -73,6 +236,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Reserva-Motivo"],
 )
 
 # Configurar archivos estáticos
@@ -88,23 +252,27 @@ app.include_router(web_router)
     tags=["Sistema"],
     summary="Estadísticas del Sistema",
 )
-async def get_system_stats(db: Session = Depends(get_db)):
+async def get_system_stats(db: AsyncSession = Depends(get_async_db)):
     """Obtener resumen estadístico del sistema."""
     try:
         return {
-            "personas": {"total": PersonaService.count_personas(db)},
+            "personas": {"total": await PersonaRepository.count_async(db)},
             "articulos": {
-                "total": ArticuloService.count_articulos(db),
-                "disponibles": ArticuloService.count_articulos(db, disponible=True),
-                "no_disponibles": ArticuloService.count_articulos(db, disponible=False),
+                "total": await ArticuloRepository.count_async(db),
+                "disponibles": await ArticuloRepository.count_async(
+                    db, disponible=True
+                ),
+                "no_disponibles": await ArticuloRepository.count_async(
+                    db, disponible=False
+                ),
             },
             "salas": {
-                # Asumiendo que count_salas no recibe db, solo min_capacidad
-                "total": SalaService.count_salas(),
-                "pequeñas": SalaService.count_salas(min_capacidad=1),
-                "grandes": SalaService.count_salas(min_capacidad=21),
+                # Las salas viven en el Java Service (catálogo en caché)
+                "total": await SalaService.count_salas(),
+                "pequeñas": await SalaService.count_salas(min_capacidad=1),
+                "grandes": await SalaService.count_salas(min_capacidad=21),
             },
-            "reservas": {"total": ReservaService.count_reservas(db)},
+            "reservas": {"total": await ReservaRepository.count_async(db)},
             "sistema": {
                 "version": "1.0.0",
                 "estado": "operativo",
@@ -139,11 +307,11 @@ async def root():
     tags=["Sistema"],
     summary="Health Check",
 )
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     """Verificar estado del sistema y conectividad de base de datos."""
     try:
         # Verificar conexión a la base de datos
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         return {
             "status": "healthy",
             "database": "connected",
@@ -157,5 +325,29 @@ async def health_check(db: Session = Depends(get_db)):
         ) from e
 
 
+@app.get(
+    "/metrics",
+    tags=["Sistema"],
+    summary="Métricas del Pool de Conexiones",
+)
+async def get_metrics():
+    """
+    Métricas de los pools de conexiones de este worker.
+
+    Informa, para el motor síncrono y el asíncrono, cuántas conexiones se
+    entregaron, cuántas peticiones esperaron por una (y cuánto), cuántas
+    agotaron DB_POOL_TIMEOUT y el máximo de conexiones en uso y de desborde.
+    Cada worker tiene sus propios pools: el pid identifica cuál respondió.
+    """
+    return {
+        "worker_pid": os.getpid(),
+        "pool": {
+            "sync": metricas_pool.stats(),
+            "async": metricas_pool_async.stats(),
+        },
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=settings.debug)
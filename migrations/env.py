@@ -0,0 +1,81 @@
+"""
+Entorno de Alembic para el Sistema de Reservas.
+
+Toma la URL de la base de datos de la configuración centralizada
+(app.core.config) y usa los modelos SQLAlchemy como metadata de
+referencia para autogenerar migraciones.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool, text
+
+import app.models  # noqa: F401  # Registrar todos los modelos en Base.metadata
+from app.core.config import settings
+from app.core.database import Base
+
+config = context.config
+# app.core.migraciones puede indicar otra URL (por ejemplo, la base de pruebas)
+if not config.get_main_option("sqlalchemy.url"):
+    config.set_main_option("sqlalchemy.url", settings.database_url)
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Clave de pg_advisory_lock que serializa las migraciones entre procesos
+# (cada worker de la API ejecuta upgrade head al arrancar)
+CLAVE_LOCK_MIGRACIONES = 0x4D494752  # "MIGR"
+
+
+def run_migrations_offline() -> None:
+    """Generar el SQL de las migraciones sin conectarse a la base."""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Ejecutar las migraciones contra la base configurada."""
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        postgresql = connection.dialect.name == "postgresql"
+        if postgresql:
+            # Lock de sesión: los demás workers esperan acá y, al obtenerlo,
+            # encuentran la base ya en head y no repiten DDL ni backfills
+            connection.execute(
+                text("SELECT pg_advisory_lock(:clave)"),
+                {"clave": CLAVE_LOCK_MIGRACIONES},
+            )
+            connection.commit()
+
+        try:
+            context.configure(connection=connection, target_metadata=target_metadata)
+
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            if postgresql:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:clave)"),
+                    {"clave": CLAVE_LOCK_MIGRACIONES},
+                )
+                connection.commit()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
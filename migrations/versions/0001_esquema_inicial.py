@@ -0,0 +1,111 @@
+"""Esquema inicial del sistema de reservas
+
+Crea las tablas existentes si todavía no están (bases creadas con
+create_all o con docker/init-scripts/01-init.sql quedan sin cambios),
+por lo que puede aplicarse sobre cualquier instalación previa.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-11-20
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS personas (
+            id SERIAL PRIMARY KEY,
+            nombre VARCHAR(255) NOT NULL,
+            apellido VARCHAR(255),
+            email VARCHAR(255) UNIQUE NOT NULL,
+            hashed_password VARCHAR(255),
+            is_active BOOLEAN NOT NULL DEFAULT true,
+            is_admin BOOLEAN NOT NULL DEFAULT false,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP WITH TIME ZONE
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS articulos (
+            id SERIAL PRIMARY KEY,
+            nombre VARCHAR(255) NOT NULL,
+            descripcion VARCHAR(255),
+            cantidad INTEGER NOT NULL DEFAULT 1,
+            categoria VARCHAR(255),
+            disponible BOOLEAN NOT NULL DEFAULT true
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS salas (
+            id SERIAL PRIMARY KEY,
+            nombre VARCHAR(255) NOT NULL,
+            capacidad INTEGER NOT NULL,
+            disponible BOOLEAN NOT NULL DEFAULT true,
+            ubicacion VARCHAR(255) DEFAULT '',
+            descripcion VARCHAR(255) DEFAULT ''
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reserva_series (
+            id SERIAL PRIMARY KEY,
+            id_persona INTEGER NOT NULL REFERENCES personas(id),
+            id_sala INTEGER NOT NULL REFERENCES salas(id),
+            frecuencia VARCHAR(10) NOT NULL,
+            intervalo INTEGER NOT NULL DEFAULT 1,
+            fecha_hora_inicio TIMESTAMP NOT NULL,
+            fecha_hora_fin TIMESTAMP NOT NULL,
+            repeticiones INTEGER,
+            hasta TIMESTAMP,
+            excepciones JSON NOT NULL DEFAULT '[]'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reservas (
+            id SERIAL PRIMARY KEY,
+            id_articulo INTEGER REFERENCES articulos(id),
+            id_sala INTEGER REFERENCES salas(id),
+            id_persona INTEGER NOT NULL REFERENCES personas(id),
+            fecha_hora_inicio TIMESTAMP NOT NULL,
+            fecha_hora_fin TIMESTAMP NOT NULL
+        )
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE reservas ADD COLUMN IF NOT EXISTS id_serie INTEGER
+            REFERENCES reserva_series(id) ON DELETE SET NULL
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_reservas_id_serie ON reservas (id_serie)")
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reserva_articulos (
+            reserva_id INTEGER NOT NULL REFERENCES reservas(id) ON DELETE CASCADE,
+            articulo_id INTEGER NOT NULL REFERENCES articulos(id) ON DELETE CASCADE,
+            cantidad INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY (reserva_id, articulo_id)
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    # El esquema inicial no se elimina: contiene todos los datos del sistema
+    pass
@@ -0,0 +1,74 @@
+"""Restricción de exclusión para reservas de sala solapadas
+
+Agrega la restricción reservas_sala_sin_solapamiento: dos reservas de la
+misma sala no pueden tener rangos [inicio, fin) que se superpongan. La
+base de datos rechaza el alta en conflicto aunque dos workers validen al
+mismo tiempo, y el índice GiST que crea la restricción resuelve la
+búsqueda de solapamientos.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-11-20
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RESTRICCION = "reservas_sala_sin_solapamiento"
+
+
+def _verificar_sin_solapamientos() -> None:
+    """Informar las reservas superpuestas que impedirían crear la restricción."""
+    solapadas = op.get_bind().execute(
+        sa.text(
+            """
+            SELECT a.id, b.id
+            FROM reservas a
+            JOIN reservas b ON a.id_sala = b.id_sala AND a.id < b.id
+            WHERE a.fecha_hora_inicio < b.fecha_hora_fin
+            AND a.fecha_hora_fin > b.fecha_hora_inicio
+            LIMIT 10
+            """
+        )
+    ).fetchall()
+    if solapadas:
+        pares = ", ".join(f"{a}-{b}" for a, b in solapadas)
+        raise RuntimeError(
+            "No se puede crear la restricción de solapamiento: hay reservas de "
+            f"sala superpuestas (IDs {pares}). Resolverlas antes de migrar."
+        )
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode():
+        _verificar_sin_solapamientos()
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    # Idempotente: las bases creadas con 01-init.sql ya tienen la restricción
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint WHERE conname = '{RESTRICCION}'
+            ) THEN
+                ALTER TABLE reservas ADD CONSTRAINT {RESTRICCION}
+                    EXCLUDE USING gist (
+                        id_sala WITH =,
+                        tsrange(fecha_hora_inicio, fecha_hora_fin, '[)') WITH &&
+                    ) WHERE (id_sala IS NOT NULL);
+            END IF;
+        END $$
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(f"ALTER TABLE reservas DROP CONSTRAINT IF EXISTS {RESTRICCION}")
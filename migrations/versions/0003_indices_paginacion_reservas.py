@@ -0,0 +1,39 @@
+"""Índices compuestos para la paginación por cursor de reservas
+
+Los listados de reservas se ordenan por (fecha_hora_inicio, id) y la
+página siguiente se pide con WHERE (fecha_hora_inicio, id) < (cursor).
+Con estos índices cada página es un recorrido acotado del índice, sin
+importar cuán profunda sea, en lugar de ordenar y saltear filas con OFFSET.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-11-27
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Nombre del índice -> columnas (el filtro del listado va primero)
+INDICES = {
+    "ix_reservas_inicio_id": "fecha_hora_inicio, id",
+    "ix_reservas_persona_inicio_id": "id_persona, fecha_hora_inicio, id",
+    "ix_reservas_sala_inicio_id": "id_sala, fecha_hora_inicio, id",
+    "ix_reservas_articulo_inicio_id": "id_articulo, fecha_hora_inicio, id",
+}
+
+
+def upgrade() -> None:
+    # Idempotente: create_all y 01-init.sql ya pueden haberlos creado
+    for nombre, columnas in INDICES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON reservas ({columnas})")
+
+
+def downgrade() -> None:
+    for nombre in INDICES:
+        op.execute(f"DROP INDEX IF EXISTS {nombre}")
@@ -0,0 +1,51 @@
+"""Índices para las consultas frecuentes de reservas y artículos
+
+Sin índices secundarios, cada filtro de reservas por sala, artículo o
+rango horario y cada cruce con reserva_articulos por artículo recorre la
+tabla completa. Estos índices cubren:
+
+- ocupación actual y disponibilidad por período: fecha_hora_fin >= ?
+  AND fecha_hora_inicio <= ? sobre todas las reservas
+- artículos asignados a reservas de sala: reserva_articulos.articulo_id
+  (la clave primaria empieza por reserva_id y no sirve para este filtro)
+
+Los listados por persona ya usan ix_reservas_persona_inicio_id (0003),
+que también sirve para ordenar por fecha_hora_inicio descendente. Los
+conflictos de sala (id_sala = ? AND rango horario) y el uso de un artículo
+(id_articulo = ? AND rango horario) usan ix_reservas_sala_inicio_id e
+ix_reservas_articulo_inicio_id (0003), que empiezan por las mismas
+columnas; la migración 0006 elimina los duplicados que creaba esta.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-11-27
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Nombre del índice -> (tabla, columnas)
+INDICES = {
+    "ix_reservas_fin_inicio": ("reservas", "fecha_hora_fin, fecha_hora_inicio"),
+    "ix_reserva_articulos_articulo": ("reserva_articulos", "articulo_id"),
+}
+
+
+def upgrade() -> None:
+    # Idempotente: create_all y 01-init.sql ya pueden haberlos creado
+    for nombre, (tabla, columnas) in INDICES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({columnas})")
+    # Estadísticas al día para que el planificador considere los índices nuevos
+    op.execute("ANALYZE reservas")
+    op.execute("ANALYZE reserva_articulos")
+
+
+def downgrade() -> None:
+    for nombre in INDICES:
+        op.execute(f"DROP INDEX IF EXISTS {nombre}")
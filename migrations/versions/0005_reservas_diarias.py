@@ -0,0 +1,66 @@
+"""Tabla de hechos reservas_diarias
+
+Crea reservas_diarias (reservas agregadas por día de inicio, sala,
+artículo y persona, con la cantidad y las horas reservadas) y la llena a
+partir de las reservas existentes. La aplicación la mantiene en cada
+alta, cambio o baja de reservas; scripts/reconstruir_reservas_diarias.py
+la vuelve a calcular si las reservas se modificaron por fuera de la API.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-12-04
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reservas_diarias (
+            id SERIAL PRIMARY KEY,
+            fecha DATE NOT NULL,
+            id_sala INTEGER,
+            id_articulo INTEGER,
+            id_persona INTEGER NOT NULL,
+            cantidad INTEGER NOT NULL,
+            horas DOUBLE PRECISION NOT NULL
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_reservas_diarias_fecha "
+        "ON reservas_diarias (fecha)"
+    )
+    # Idempotente: recalcula todo aunque 01-init.sql ya la haya llenado
+    op.execute("DELETE FROM reservas_diarias")
+    op.execute(
+        """
+        INSERT INTO reservas_diarias
+            (fecha, id_sala, id_articulo, id_persona, cantidad, horas)
+        SELECT fecha_hora_inicio::date, id_sala, id_articulo, id_persona,
+               COUNT(*),
+               SUM(EXTRACT(EPOCH FROM fecha_hora_fin - fecha_hora_inicio) / 3600)
+        FROM reservas
+        GROUP BY fecha_hora_inicio::date, id_sala, id_articulo, id_persona
+        """
+    )
+    # Un hecho por combinación: un duplicado (p. ej. dos recálculos
+    # concurrentes del mismo día) falla en lugar de contar dos veces
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_reservas_diarias_clave "
+        "ON reservas_diarias "
+        "(fecha, COALESCE(id_sala, 0), COALESCE(id_articulo, 0), id_persona)"
+    )
+    op.execute("ANALYZE reservas_diarias")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS reservas_diarias")
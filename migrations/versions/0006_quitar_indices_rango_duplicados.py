@@ -0,0 +1,36 @@
+"""Quitar los índices de rango duplicados de reservas
+
+ix_reservas_sala_rango e ix_reservas_articulo_rango (creados por la
+versión anterior de 0004) repiten el prefijo (id_sala | id_articulo,
+fecha_hora_inicio) de ix_reservas_sala_inicio_id e
+ix_reservas_articulo_inicio_id (0003), que ya resuelven los conflictos de
+sala y el uso de artículos; el de sala además se superpone con el índice
+GiST de reservas_sala_sin_solapamiento (0002). Eran dos B-trees más que
+actualizar en cada alta de reserva sin mejorar los planes.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-12-11
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDICES = ("ix_reservas_sala_rango", "ix_reservas_articulo_rango")
+
+
+def upgrade() -> None:
+    # Idempotente: las bases creadas con la 0004 actual no los tienen
+    for nombre in INDICES:
+        op.execute(f"DROP INDEX IF EXISTS {nombre}")
+
+
+def downgrade() -> None:
+    # Nada que restaurar: 0004 ya no crea estos índices
+    pass
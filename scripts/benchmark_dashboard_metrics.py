@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Benchmark de GET /analytics/dashboard-metrics: bucles vs. agregación NumPy.
+
+Arma una base SQLite en memoria con el esquema de la aplicación y mide la
+agregación del dashboard con el camino anterior (todas las reservas como
+objetos ORM, una pasada por sala, una por día de la tendencia y una
+consulta por persona del top) y con el actual (una consulta de columnas,
+np.bincount/np.unique y las personas del top en una consulta). Verifica
+además que ambos caminos den el mismo resultado.
+
+Uso:
+    python scripts/benchmark_dashboard_metrics.py
+    python scripts/benchmark_dashboard_metrics.py --reservas 10000 100000 --dias 90
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Persona, Reserva, Sala
+from app.repositories.persona_repository import PersonaRepository
+from app.repositories.reserva_repository import ReservaRepository
+from app.repositories.sala_repository import SalaRepository
+from app.services.metricas_dashboard import (
+    agregar_reservas,
+    ocupacion_promedio,
+    top_usuarios,
+)
+
+CANTIDAD_SALAS = 20
+CANTIDAD_PERSONAS = 500
+
+
+def _crear_base(cantidad_reservas, ahora, dias):
+    """Crear una base en memoria con reservas repartidas en los últimos `dias`."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Persona),
+            [
+                {"nombre": f"Persona {i}", "email": f"persona{i}@example.com"}
+                for i in range(1, CANTIDAD_PERSONAS + 1)
+            ],
+        )
+        conn.execute(
+            insert(Sala),
+            [
+                {"nombre": f"Sala {i}", "capacidad": 20}
+                for i in range(1, CANTIDAD_SALAS + 1)
+            ],
+        )
+        paso = timedelta(days=dias) / cantidad_reservas
+        desde = ahora - timedelta(days=dias)
+        conn.execute(
+            insert(Reserva),
+            [
+                {
+                    "id_persona": (i * 7) % CANTIDAD_PERSONAS + 1,
+                    "id_sala": i % (CANTIDAD_SALAS + 1) or None,
+                    "id_articulo": None if i % (CANTIDAD_SALAS + 1) else 1,
+                    "fecha_hora_inicio": desde + paso * i,
+                    "fecha_hora_fin": desde + paso * i + timedelta(hours=1 + i % 3),
+                }
+                for i in range(cantidad_reservas)
+            ],
+        )
+    return sessionmaker(bind=engine)
+
+
+def _metricas_anterior(db, ahora, days):
+    """Camino anterior: objetos ORM y una pasada por sala y por día."""
+    fecha_inicio = ahora - timedelta(days=days)
+    reservas = db.query(Reserva).filter(
+        Reserva.fecha_hora_inicio >= fecha_inicio
+    ).all()
+    salas = SalaRepository.get_all(db)
+    ocupacion_salas = []
+    for sala in salas:
+        reservas_sala = [r for r in reservas if r.id_sala == sala.id]
+        horas_promedio = 0
+        if reservas_sala:
+            total_horas = sum(
+                (r.fecha_hora_fin - r.fecha_hora_inicio).total_seconds() / 3600
+                for r in reservas_sala
+            )
+            horas_promedio = round(total_horas / len(reservas_sala), 1)
+        ocupacion_salas.append({
+            "sala": sala.nombre,
+            "reservas": len(reservas_sala),
+            "horas_promedio": horas_promedio,
+        })
+
+    labels, values = [], []
+    for i in range(min(days, 30), -1, -1):
+        dia = ahora - timedelta(days=i)
+        labels.append(dia.strftime("%d/%m"))
+        values.append(
+            sum(1 for r in reservas if r.fecha_hora_inicio.date() == dia.date())
+        )
+
+    top = []
+    for persona_id, count in Counter(r.id_persona for r in reservas).most_common(5):
+        persona = PersonaRepository.get_by_id(db, persona_id)
+        top.append({"nombre": persona.nombre, "reservas": count})
+
+    horas = sum(
+        (r.fecha_hora_fin - r.fecha_hora_inicio).total_seconds() / 3600
+        for r in reservas
+    )
+    return {
+        "ocupacion_salas": ocupacion_salas,
+        "tendencia_reservas": {"labels": labels, "values": values},
+        "top_usuarios": top,
+        "ocupacion_promedio": ocupacion_promedio(horas, len(salas), days),
+    }
+
+
+def _metricas_actual(db, ahora, days):
+    """Camino actual: una consulta de columnas y agregación con NumPy."""
+    filas = ReservaRepository.get_columnas_dashboard(db, ahora - timedelta(days=days))
+    salas = SalaRepository.get_all(db)
+    agregado = agregar_reservas(filas, salas, ahora, days)
+    personas = PersonaRepository.get_by_ids(
+        db, [persona_id for persona_id, _ in agregado["top_personas"]]
+    )
+    return {
+        "ocupacion_salas": agregado["ocupacion_salas"],
+        "tendencia_reservas": agregado["tendencia_reservas"],
+        "top_usuarios": top_usuarios(agregado["top_personas"], personas),
+        "ocupacion_promedio": ocupacion_promedio(
+            agregado["horas_reservadas"], len(salas), days
+        ),
+    }
+
+
+def _medir(funcion, session_factory, ahora, days):
+    """Ejecutar una agregación con una sesión nueva y medir su duración."""
+    db = session_factory()
+    try:
+        inicio = time.perf_counter()
+        resultado = funcion(db, ahora, days)
+        return time.perf_counter() - inicio, resultado
+    finally:
+        db.close()
+
+
+def main():
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reservas", type=int, nargs="+",
+                        default=[10_000, 100_000],
+                        help="Cantidades de reservas a medir")
+    parser.add_argument("--dias", type=int, default=30,
+                        help="Período del dashboard (parámetro days)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("⏱️  BENCHMARK DE MÉTRICAS DEL DASHBOARD")
+    print("=" * 80)
+
+    ahora = datetime.now().replace(microsecond=0)
+    for cantidad in args.reservas:
+        session_factory = _crear_base(cantidad, ahora, args.dias)
+        anterior, esperado = _medir(
+            _metricas_anterior, session_factory, ahora, args.dias
+        )
+        actual, obtenido = _medir(_metricas_actual, session_factory, ahora, args.dias)
+        iguales = all(
+            esperado[clave] == obtenido[clave]
+            for clave in ("ocupacion_salas", "tendencia_reservas")
+        ) and [u["reservas"] for u in esperado["top_usuarios"]] == [
+            u["reservas"] for u in obtenido["top_usuarios"]
+        ]
+        print(
+            f"📌 {cantidad:>7} reservas | bucles {anterior:6.2f} s | "
+            f"NumPy {actual:6.2f} s | x{anterior / actual:5.1f} | "
+            f"{'✅ mismo resultado' if iguales else '❌ resultados distintos'}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
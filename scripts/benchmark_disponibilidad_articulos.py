@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Benchmark de disponibilidad de artículos: consulta por artículo vs. agrupada.
+
+Arma una base SQLite en memoria con el esquema de la aplicación, carga
+artículos y reservas (directas y con artículos asignados a reservas de
+sala) y mide GET /articulos/disponibilidad con el cálculo anterior (dos
+consultas por artículo) y con la consulta agrupada de ReservaRepository.
+Verifica además que ambos caminos devuelven lo mismo.
+
+Uso:
+    python scripts/benchmark_disponibilidad_articulos.py
+    python scripts/benchmark_disponibilidad_articulos.py --reservas 1000 10000
+    python scripts/benchmark_disponibilidad_articulos.py --articulos 500
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Articulo, Persona, Reserva, Sala
+from app.services.articulo_service import ArticuloService
+
+DESDE = datetime(2025, 1, 1, 8, 0)
+
+# Cálculo anterior: una consulta por artículo más otra para lo asignado
+CONSULTA_POR_ARTICULO = text(
+    """
+    SELECT COALESCE(SUM(cantidad_usada), 0) as total_reservado
+    FROM (
+        SELECT 1 as cantidad_usada
+        FROM reservas r
+        WHERE r.id_articulo = :articulo_id
+        AND (:reserva_id IS NULL OR r.id != :reserva_id)
+        AND r.fecha_hora_fin >= :fecha_inicio
+        AND r.fecha_hora_inicio <= :fecha_fin
+
+        UNION ALL
+
+        SELECT ra.cantidad as cantidad_usada
+        FROM reserva_articulos ra
+        JOIN reservas r ON ra.reserva_id = r.id
+        WHERE ra.articulo_id = :articulo_id
+        AND (:reserva_id IS NULL OR ra.reserva_id != :reserva_id)
+        AND r.fecha_hora_fin >= :fecha_inicio
+        AND r.fecha_hora_inicio <= :fecha_fin
+    ) as reservas_activas
+    """
+)
+ASIGNADO_POR_ARTICULO = text(
+    """
+    SELECT COALESCE(SUM(ra.cantidad), 0) as total
+    FROM reserva_articulos ra
+    WHERE ra.articulo_id = :articulo_id
+    AND ra.reserva_id = :reserva_id
+    """
+)
+
+
+def _crear_base(cantidad_articulos, cantidad_reservas, dias):
+    """Crear una base en memoria con datos aleatorios reproducibles."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    aleatorio = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                CREATE TABLE reserva_articulos (
+                    id INTEGER PRIMARY KEY,
+                    reserva_id INTEGER NOT NULL REFERENCES reservas(id),
+                    articulo_id INTEGER NOT NULL REFERENCES articulos(id),
+                    cantidad INTEGER NOT NULL
+                )
+                """
+            )
+        )
+        conn.execute(
+            insert(Persona),
+            [{"nombre": "Benchmark", "email": "benchmark@example.com"}],
+        )
+        conn.execute(
+            insert(Sala),
+            [{"nombre": f"Sala {i}", "capacidad": 20} for i in range(1, 21)],
+        )
+        conn.execute(
+            insert(Articulo),
+            [
+                {
+                    "nombre": f"Artículo {i}",
+                    "cantidad": aleatorio.randint(1, 50),
+                    "disponible": aleatorio.random() > 0.1,
+                }
+                for i in range(1, cantidad_articulos + 1)
+            ],
+        )
+
+        reservas, asignaciones = [], []
+        for reserva_id in range(1, cantidad_reservas + 1):
+            inicio = DESDE + timedelta(
+                days=aleatorio.randrange(dias), hours=aleatorio.randrange(10)
+            )
+            fila = {
+                "id": reserva_id,
+                "id_persona": 1,
+                "id_articulo": None,
+                "id_sala": None,
+                "fecha_hora_inicio": inicio,
+                "fecha_hora_fin": inicio + timedelta(hours=aleatorio.randint(1, 3)),
+            }
+            if aleatorio.random() < 0.5:
+                fila["id_articulo"] = aleatorio.randint(1, cantidad_articulos)
+            else:
+                fila["id_sala"] = aleatorio.randint(1, 20)
+                asignaciones.extend(
+                    {
+                        "reserva_id": reserva_id,
+                        "articulo_id": articulo_id,
+                        "cantidad": aleatorio.randint(1, 3),
+                    }
+                    for articulo_id in aleatorio.sample(
+                        range(1, cantidad_articulos + 1), 2
+                    )
+                )
+            reservas.append(fila)
+        conn.execute(insert(Reserva), reservas)
+        conn.execute(
+            text(
+                "INSERT INTO reserva_articulos (reserva_id, articulo_id, cantidad) "
+                "VALUES (:reserva_id, :articulo_id, :cantidad)"
+            ),
+            asignaciones,
+        )
+    return sessionmaker(bind=engine)()
+
+
+def _disponibilidad_por_articulo(db, fecha_inicio, fecha_fin, reserva_id):
+    """Cálculo anterior del endpoint, con dos consultas por artículo."""
+    resultado = []
+    for articulo in db.query(Articulo).limit(1000).all():
+        if not articulo.disponible:
+            continue
+        parametros = {
+            "articulo_id": articulo.id,
+            "reserva_id": reserva_id,
+            "fecha_inicio": fecha_inicio,
+            "fecha_fin": fecha_fin,
+        }
+        reservado = db.execute(CONSULTA_POR_ARTICULO, parametros).scalar() or 0
+        asignado = 0
+        if reserva_id is not None:
+            asignado = db.execute(ASIGNADO_POR_ARTICULO, parametros).scalar() or 0
+        resultado.append(
+            (
+                articulo.id,
+                reservado,
+                asignado,
+                max(0, articulo.cantidad - reservado),
+                max(0, articulo.cantidad - reservado - asignado),
+            )
+        )
+    return resultado
+
+
+def _disponibilidad_agrupada(db, fecha_inicio, fecha_fin, reserva_id):
+    return [
+        (
+            item["id"],
+            item["cantidad_reservada_otros"],
+            item["cantidad_asignada_en_reserva"],
+            item["cantidad_disponible"],
+            item["cantidad_disponible_para_agregar"],
+        )
+        for item in ArticuloService.get_disponibilidad_periodo(
+            db, fecha_inicio, fecha_fin, reserva_id
+        )
+    ]
+
+
+def _medir(funcion, repeticiones, *args):
+    """Mejor tiempo (en segundos) de varias repeticiones."""
+    mejor, resultado = float("inf"), None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def main():
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articulos", type=int, default=200,
+                        help="Cantidad de artículos en el inventario")
+    parser.add_argument("--reservas", type=int, nargs="+",
+                        default=[1_000, 10_000, 100_000],
+                        help="Cantidades de reservas a medir")
+    parser.add_argument("--dias", type=int, default=90,
+                        help="Días sobre los que se reparten las reservas")
+    parser.add_argument("--repeticiones", type=int, default=3,
+                        help="Repeticiones por medición (se informa la mejor)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("⏱️  BENCHMARK DE DISPONIBILIDAD DE ARTÍCULOS")
+    print("=" * 80)
+    print(f"📦 {args.articulos} artículos, reservas repartidas en {args.dias} días")
+
+    fecha_inicio = DESDE + timedelta(days=args.dias // 2)
+    fecha_fin = fecha_inicio + timedelta(days=1)
+    for cantidad in args.reservas:
+        db = _crear_base(args.articulos, cantidad, args.dias)
+        reserva_id = cantidad // 2
+        try:
+            for excluir in (None, reserva_id):
+                duracion_anterior, anterior = _medir(
+                    _disponibilidad_por_articulo, args.repeticiones,
+                    db, fecha_inicio, fecha_fin, excluir,
+                )
+                duracion_agrupada, agrupada = _medir(
+                    _disponibilidad_agrupada, args.repeticiones,
+                    db, fecha_inicio, fecha_fin, excluir,
+                )
+                if anterior != agrupada:
+                    print(f"❌ Resultados distintos con {cantidad} reservas")
+                    return 1
+                modo = "con reserva_id" if excluir else "sin reserva_id"
+                print(
+                    f"📌 {cantidad:>7} reservas ({modo}): "
+                    f"por artículo {duracion_anterior * 1000:8.1f} ms | "
+                    f"agrupada {duracion_agrupada * 1000:7.1f} ms | "
+                    f"x{duracion_anterior / duracion_agrupada:.1f}"
+                )
+        finally:
+            db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
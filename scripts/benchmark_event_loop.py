@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark de bloqueo del event loop: sesión síncrona vs. asíncrona.
+
+Levanta en proceso una aplicación FastAPI mínima con un endpoint de
+analítica lento (una consulta pesada sobre SQLite) escrito de dos formas:
+`async def` con la sesión síncrona (como estaban los endpoints antes de
+get_async_db) y `async def` con la sesión asíncrona. Mientras corren varias
+consultas lentas, otra tarea pide un endpoint trivial cada pocos
+milisegundos y mide su demora: con la sesión síncrona esas peticiones
+quedan esperando a que termine cada consulta; con la asíncrona no.
+
+Uso:
+    python scripts/benchmark_event_loop.py
+    python scripts/benchmark_event_loop.py --lentas 8 --filas 3000000
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+# Consulta de CPU pura que tarda proporcional a :filas
+CONSULTA_LENTA = text(
+    """
+    WITH RECURSIVE serie(x) AS (
+        SELECT 1 UNION ALL SELECT x + 1 FROM serie WHERE x < :filas
+    )
+    SELECT count(*) FROM serie
+    """
+)
+
+
+def _crear_app(ruta_base: str, filas: int) -> FastAPI:
+    """Aplicación con el mismo endpoint lento en versión síncrona y asíncrona."""
+    engine = create_engine(f"sqlite:///{ruta_base}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{ruta_base}")
+    session_local = sessionmaker(bind=engine)
+    async_session_local = async_sessionmaker(async_engine)
+
+    def get_db():
+        db = session_local()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with async_session_local() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/lento-sync")
+    async def lento_sync(db: Session = Depends(get_db)):
+        return {"filas": db.execute(CONSULTA_LENTA, {"filas": filas}).scalar()}
+
+    @app.get("/lento-async")
+    async def lento_async(db: AsyncSession = Depends(get_async_db)):
+        resultado = await db.execute(CONSULTA_LENTA, {"filas": filas})
+        return {"filas": resultado.scalar()}
+
+    @app.get("/rapido")
+    async def rapido():
+        return {"ok": True}
+
+    return app
+
+
+async def _medir(app: FastAPI, ruta_lenta: str, lentas: int, intervalo: float):
+    """
+    Demoras (ms) de /rapido mientras corren `lentas` consultas lentas.
+
+    La demora de cada sondeo es cuánto tardó en volver a estar listo para
+    el siguiente, descontando la pausa entre sondeos: incluye el tiempo en
+    que el event loop no pudo atenderlo.
+    """
+    transport = httpx.ASGITransport(app=app)
+    cliente = httpx.AsyncClient(transport=transport, base_url="http://test")
+    async with cliente:
+        demoras = []
+
+        async def _sondear(terminado: asyncio.Event):
+            while not terminado.is_set():
+                inicio = time.perf_counter()
+                await cliente.get("/rapido")
+                await asyncio.sleep(intervalo)
+                demoras.append((time.perf_counter() - inicio - intervalo) * 1000)
+
+        terminado = asyncio.Event()
+        sonda = asyncio.create_task(_sondear(terminado))
+        inicio = time.perf_counter()
+        await asyncio.gather(*(cliente.get(ruta_lenta) for _ in range(lentas)))
+        duracion = time.perf_counter() - inicio
+        terminado.set()
+        await sonda
+    return demoras, duracion
+
+
+def main():
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lentas", type=int, default=4,
+                        help="Consultas lentas simultáneas")
+    parser.add_argument("--filas", type=int, default=2_000_000,
+                        help="Tamaño de la consulta lenta (más filas, más lenta)")
+    parser.add_argument("--intervalo", type=float, default=0.01,
+                        help="Segundos entre peticiones al endpoint rápido")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("⏱️  BENCHMARK DE BLOQUEO DEL EVENT LOOP")
+    print("=" * 80)
+    print(f"🐢 {args.lentas} consultas lentas simultáneas ({args.filas} filas)")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        app = _crear_app(str(Path(directorio) / "benchmark.db"), args.filas)
+        for nombre, ruta in (
+            ("sesión síncrona ", "/lento-sync"),
+            ("sesión asíncrona", "/lento-async"),
+        ):
+            demoras, duracion = asyncio.run(
+                _medir(app, ruta, args.lentas, args.intervalo)
+            )
+            print(
+                f"📌 {nombre} | lentas en {duracion:5.2f} s | "
+                f"/rapido: {len(demoras):4} respuestas, "
+                f"demora mediana {statistics.median(demoras):7.1f} ms, "
+                f"máx {max(demoras):7.1f} ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
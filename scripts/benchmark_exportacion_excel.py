@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark del reporte Excel: pandas/openpyxl en memoria vs. xlsxwriter.
+
+Arma una base SQLite en memoria con el esquema de la aplicación y mide el
+Excel de GET /analytics/export-report con el camino anterior (todas las
+reservas con .all(), DataFrames y openpyxl sobre un BytesIO) y con el
+actual (cursor por lotes y xlsxwriter en modo constant_memory sobre un
+archivo temporal). Informa tiempo y pico de memoria de Python (tracemalloc)
+de cada camino; la memoria se mide en una corrida aparte porque tracemalloc
+hace más lento el código que observa.
+
+Uso:
+    python scripts/benchmark_exportacion_excel.py
+    python scripts/benchmark_exportacion_excel.py --reservas 10000 100000
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pandas as pd
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Persona, Reserva, Sala
+from app.services.exportacion_reservas import (
+    MENSAJE_SIN_RESERVAS,
+    generar_excel,
+    lotes_reporte,
+)
+
+DESDE = datetime(2025, 1, 1, 8, 0)
+METADATA = {"fecha_generacion": DESDE.isoformat(), "periodo_dias": 365}
+METRICAS = {"metricas_principales": {"total_reservas": 0, "reservas_hoy": 0}}
+
+
+def _crear_base(cantidad_reservas):
+    """Crear una base en memoria con reservas repartidas a lo largo de un año."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Persona),
+            [{"nombre": "Benchmark", "email": "benchmark@example.com"}],
+        )
+        conn.execute(
+            insert(Sala),
+            [{"nombre": f"Sala {i}", "capacidad": 20} for i in range(1, 21)],
+        )
+        paso = timedelta(days=365) / cantidad_reservas
+        conn.execute(
+            insert(Reserva),
+            [
+                {
+                    "id_persona": 1,
+                    "id_sala": i % 20 + 1,
+                    "fecha_hora_inicio": DESDE + paso * i,
+                    "fecha_hora_fin": DESDE + paso * i + timedelta(hours=1),
+                }
+                for i in range(cantidad_reservas)
+            ],
+        )
+    return sessionmaker(bind=engine)
+
+
+def _excel_anterior(session_factory):
+    """Camino anterior: todo en memoria con pandas y openpyxl."""
+    db = session_factory()
+    try:
+        ahora = datetime.now()
+        reservas = [
+            {
+                "id": r.id,
+                "fecha_inicio": r.fecha_hora_inicio.isoformat(),
+                "fecha_fin": r.fecha_hora_fin.isoformat(),
+                "id_persona": r.id_persona,
+                "id_sala": r.id_sala,
+                "id_articulo": r.id_articulo,
+                "tipo": "sala" if r.id_sala else "articulo",
+                "estado": "completada" if ahora > r.fecha_hora_fin else "pendiente",
+                "duracion_horas": round(
+                    (r.fecha_hora_fin - r.fecha_hora_inicio).total_seconds() / 3600,
+                    2,
+                ),
+            }
+            for r in db.query(Reserva).filter(
+                Reserva.fecha_hora_inicio >= DESDE
+            ).all()
+        ]
+        output = BytesIO()
+        with pd.ExcelWriter(output, engine="openpyxl") as writer:
+            metricas_df = pd.DataFrame([METRICAS])
+            metricas_df.to_excel(writer, sheet_name="Métricas", index=False)
+            reservas_df = pd.DataFrame(reservas)
+            if reservas_df.empty:
+                reservas_df = pd.DataFrame([{"mensaje": MENSAJE_SIN_RESERVAS}])
+            reservas_df.to_excel(writer, sheet_name="Reservas", index=False)
+            pd.DataFrame([METADATA]).to_excel(writer, sheet_name="Info", index=False)
+        return len(output.getvalue())
+    finally:
+        db.close()
+
+
+def _excel_streaming(session_factory):
+    """Camino actual: cursor por lotes y xlsxwriter en modo constant_memory."""
+    db = session_factory()
+    try:
+        return sum(
+            len(fragmento)
+            for fragmento in generar_excel(
+                lotes_reporte(db, DESDE), METRICAS, METADATA
+            )
+        )
+    finally:
+        db.close()
+
+
+def _medir(funcion, session_factory):
+    """Tiempo (s) de una corrida y pico de memoria (MB) de otra."""
+    inicio = time.perf_counter()
+    tamano = funcion(session_factory)
+    duracion = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    try:
+        funcion(session_factory)
+        pico = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+    return duracion, pico, tamano
+
+
+def main():
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reservas", type=int, nargs="+",
+                        default=[10_000, 50_000],
+                        help="Cantidades de reservas a medir")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("⏱️  BENCHMARK DEL REPORTE EXCEL")
+    print("=" * 80)
+
+    for cantidad in args.reservas:
+        session_factory = _crear_base(cantidad)
+        for nombre, funcion in (
+            ("pandas/openpyxl", _excel_anterior),
+            ("xlsxwriter    ", _excel_streaming),
+        ):
+            duracion, pico, tamano = _medir(funcion, session_factory)
+            print(
+                f"📌 {cantidad:>7} reservas | {nombre} | "
+                f"{duracion:6.2f} s | pico {pico:7.1f} MB | "
+                f"archivo {tamano / 1024:8.1f} KB"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark de las agregaciones de PredictionService: bucles vs. NumPy.
+
+Genera inicios de reservas sintéticos repartidos en los últimos 60 días y
+mide las agregaciones de las predicciones con el camino anterior (recorrer
+cada reserva como datetime con defaultdicts: conteos por día y por día de
+la semana, horas pico, varianza a mano para las anomalías) y con el actual
+(app.prediction.agregados sobre el array de inicios de snapshot_reservas:
+np.bincount, sumas acumuladas y puntaje z). Verifica además que ambos
+caminos den el mismo resultado.
+
+Uso:
+    python scripts/benchmark_predicciones.py
+    python scripts/benchmark_predicciones.py --reservas 10000 100000 1000000
+"""
+import argparse
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from app.prediction.agregados import (
+    conteos_por_dia,
+    histograma_semana_hora,
+    patron_semanal,
+    puntaje_z,
+    tendencia,
+)
+from app.repositories.snapshot_reservas import EPOCA, a_segundos
+
+DIAS = 60
+
+
+def _inicios(cantidad, primer_dia):
+    """Inicios pseudoaleatorios (hora entre 8 y 20) en los DIAS desde primer_dia."""
+    generador = np.random.default_rng(42)
+    dias = generador.integers(0, DIAS, cantidad)
+    # Más reservas en la segunda mitad, para que haya tendencia
+    dias = np.maximum(dias, generador.integers(0, DIAS, cantidad) // 2)
+    horas = generador.integers(8, 21, cantidad)
+    minutos = generador.integers(0, 4, cantidad) * 15
+    desde = datetime.combine(primer_dia, datetime.min.time())
+    return [
+        desde + timedelta(days=int(d), hours=int(h), minutes=int(m))
+        for d, h, m in zip(dias, horas, minutos)
+    ]
+
+
+def _agregados_anterior(inicios, primer_dia):
+    """Camino anterior: una pasada por reserva y estadísticas a mano."""
+    por_dia = defaultdict(int)
+    horarios = defaultdict(lambda: defaultdict(int))
+    for inicio in inicios:
+        por_dia[inicio.date()] += 1
+        horarios[inicio.weekday()][inicio.hour] += 1
+
+    dias = [primer_dia + timedelta(days=i) for i in range(DIAS)]
+    conteos = [por_dia.get(dia, 0) for dia in dias]
+
+    por_dia_semana = defaultdict(list)
+    for dia, cantidad in zip(dias, conteos):
+        por_dia_semana[dia.weekday()].append(cantidad)
+    patron = {
+        dia: sum(cantidades) / len(cantidades)
+        for dia, cantidades in por_dia_semana.items()
+    }
+
+    ventana = DIAS // 2
+    primera = sum(conteos[:ventana]) / ventana
+    ultima = sum(conteos[-ventana:]) / ventana
+    cambio = (ultima - primera) / primera if primera > 0 else 0.0
+
+    picos = {}
+    for dia in range(7):
+        top = sorted(horarios[dia].items(), key=lambda x: (-x[1], x[0]))[:3]
+        picos[dia] = [hora for hora, _ in top]
+
+    promedio = sum(conteos) / len(conteos)
+    desviacion = (sum((x - promedio) ** 2 for x in conteos) / len(conteos)) ** 0.5
+    anomalias = [
+        i for i, x in enumerate(conteos)
+        if x > promedio + 2 * desviacion or x < max(0, promedio - 2 * desviacion)
+    ]
+    return patron, cambio, picos, anomalias
+
+
+def _agregados_actual(inicios, primer_dia):
+    """Camino actual: agregados NumPy sobre el array de inicios."""
+    primer_dia_epoca = (primer_dia - EPOCA.date()).days
+    conteos = conteos_por_dia(inicios, primer_dia_epoca, DIAS)
+    patron = patron_semanal(conteos, primer_dia_epoca)
+    cambio = tendencia(conteos)
+
+    horarios = histograma_semana_hora(inicios)
+    top = np.argsort(-horarios, axis=1, kind="stable")[:, :3]
+    picos = {
+        dia: [hora for hora in top[dia].tolist() if horarios[dia, hora]]
+        for dia in range(7)
+    }
+
+    puntajes, _, _ = puntaje_z(conteos)
+    anomalias = np.flatnonzero(np.abs(puntajes) > 2).tolist()
+    return patron, cambio, picos, anomalias
+
+
+def _iguales(esperado, obtenido):
+    """Comparar ambos resultados (los promedios con tolerancia de redondeo)."""
+    patron_a, cambio_a, picos_a, anomalias_a = esperado
+    patron_b, cambio_b, picos_b, anomalias_b = obtenido
+    return (
+        all(np.isclose(patron_a[dia], patron_b[dia]) for dia in range(7))
+        and np.isclose(cambio_a, cambio_b)
+        and picos_a == picos_b
+        and anomalias_a == anomalias_b
+    )
+
+
+def main():
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reservas", type=int, nargs="+",
+                        default=[10_000, 100_000, 1_000_000],
+                        help="Cantidades de reservas a medir")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("⏱️  BENCHMARK DE AGREGACIONES DE PREDICCIÓN")
+    print("=" * 80)
+
+    primer_dia = datetime.now().date() - timedelta(days=DIAS)
+    for cantidad in args.reservas:
+        fechas = _inicios(cantidad, primer_dia)
+        # La foto ya guarda los inicios como segundos: no se mide la conversión
+        inicios = a_segundos(fechas, cantidad)
+
+        inicio = time.perf_counter()
+        esperado = _agregados_anterior(fechas, primer_dia)
+        anterior = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        obtenido = _agregados_actual(inicios, primer_dia)
+        actual = time.perf_counter() - inicio
+
+        print(
+            f"📌 {cantidad:>7} reservas | bucles {anterior * 1000:8.1f} ms | "
+            f"NumPy {actual * 1000:6.1f} ms | x{anterior / actual:6.1f} | "
+            f"{'✅ mismo resultado' if _iguales(esperado, obtenido) else '❌ resultados distintos'}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
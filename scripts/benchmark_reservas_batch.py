@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark de creación de reservas: alta individual vs. lote.
+
+Crea N reservas de sala con ReservaService.create_reserva (una por una)
+y otras N con ReservaService.create_reservas_bulk, e informa reservas por
+segundo de cada camino. Las reservas se generan un año hacia adelante en
+horarios sin solapamiento y se eliminan al terminar.
+
+Uso:
+    python scripts/benchmark_reservas_batch.py --cantidad 200 --sala 1
+    python scripts/benchmark_reservas_batch.py --cantidad 200 --sin-java
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Agregar el directorio raíz al path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.database import get_db
+from app.models.persona import Persona
+from app.models.reserva import Reserva
+from app.schemas.reserva import ReservaCreate
+from app.services.java_client import JavaServiceClient
+from app.services.reserva_service import ReservaService
+
+
+async def _java_ok(*_args, **_kwargs):
+    return True
+
+
+async def _sala_disponible(*_args, **_kwargs):
+    return {"disponible": True}
+
+
+def _generar_reservas(id_persona, id_sala, cantidad, desde):
+    """Generar reservas de una hora, consecutivas y sin solapamiento."""
+    return [
+        ReservaCreate(
+            id_persona=id_persona,
+            id_sala=id_sala,
+            fecha_hora_inicio=desde + timedelta(hours=i),
+            fecha_hora_fin=desde + timedelta(hours=i, minutes=59),
+        )
+        for i in range(cantidad)
+    ]
+
+
+def _medir_individual(db, reservas):
+    inicio = time.perf_counter()
+    creadas = [ReservaService.create_reserva(db, reserva).id for reserva in reservas]
+    return time.perf_counter() - inicio, creadas
+
+
+def _medir_lote(db, reservas):
+    inicio = time.perf_counter()
+    resultados = ReservaService.create_reservas_bulk(db, reservas)
+    duracion = time.perf_counter() - inicio
+    errores = [r["error"] for r in resultados if r["error"] is not None]
+    if errores:
+        print(f"⚠️ {len(errores)} reservas rechazadas en el lote: {errores[0]}")
+    return duracion, [r["reserva"].id for r in resultados if r["reserva"] is not None]
+
+
+def main():
+    """Función principal del benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cantidad", type=int, default=200,
+                        help="Reservas a crear por cada camino")
+    parser.add_argument("--sala", type=int, default=1, help="ID de la sala a reservar")
+    parser.add_argument("--sin-java", action="store_true",
+                        help="Simular el servicio Java para medir solo la API y la BD")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("⏱️  BENCHMARK DE CREACIÓN DE RESERVAS")
+    print("=" * 80)
+
+    db = next(get_db())
+    persona = db.query(Persona).first()
+    if persona is None:
+        print("❌ No hay personas en la base de datos")
+        return 1
+
+    desde = datetime.now().replace(minute=0, second=0, microsecond=0)
+    desde += timedelta(days=365)
+    individuales = _generar_reservas(persona.id, args.sala, args.cantidad, desde)
+    lote = _generar_reservas(
+        persona.id, args.sala, args.cantidad, desde + timedelta(hours=args.cantidad)
+    )
+
+    parches = []
+    if args.sin_java:
+        parches = [
+            patch.object(JavaServiceClient, "check_service_health", _java_ok),
+            patch.object(JavaServiceClient, "validate_sala_exists", _java_ok),
+            patch.object(JavaServiceClient, "check_sala_disponible", _java_ok),
+            patch.object(JavaServiceClient, "get_sala_details", _sala_disponible),
+        ]
+    for parche in parches:
+        parche.start()
+
+    ids_creados = []
+    try:
+        duracion_individual, ids = _medir_individual(db, individuales)
+        ids_creados.extend(ids)
+        duracion_lote, ids = _medir_lote(db, lote)
+        ids_creados.extend(ids)
+    except ValueError as e:
+        print(f"❌ Error de validación: {e}")
+        return 1
+    finally:
+        for parche in parches:
+            parche.stop()
+        if ids_creados:
+            db.query(Reserva).filter(Reserva.id.in_(ids_creados)).delete(
+                synchronize_session=False
+            )
+            db.commit()
+            print(f"🧹 {len(ids_creados)} reservas de prueba eliminadas")
+        db.close()
+
+    por_segundo_individual = args.cantidad / duracion_individual
+    por_segundo_lote = args.cantidad / duracion_lote
+    print(
+        f"📌 Individual: {duracion_individual:.2f}s "
+        f"({por_segundo_individual:.1f} reservas/s)"
+    )
+    print(f"📦 Lote:       {duracion_lote:.2f}s ({por_segundo_lote:.1f} reservas/s)")
+    print(f"🚀 Mejora:     x{por_segundo_lote / por_segundo_individual:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
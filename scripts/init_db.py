@@ -5,16 +5,17 @@ Script para inicializar la base de datos con los datos de ejemplo de la consigna
 from datetime import datetime, timezone
 from sqlalchemy.exc import SQLAlchemyError
 from app.auth.jwt_handler import get_password_hash
-from app.core.database import Base, SessionLocal
+from app.core.database import SessionLocal
+from app.core.migraciones import aplicar_migraciones
 from app.models import Articulo, Persona, Reserva, Sala
-from app.core.database import engine
+from app.repositories.reserva_diaria_repository import ReservaDiariaRepository
 
 
 def init_database():
     """Crear las tablas y cargar datos de ejemplo"""
 
-    # Crear todas las tablas
-    Base.metadata.create_all(bind=engine)
+    # Crear las tablas e índices (alembic upgrade head)
+    aplicar_migraciones()
 
     # Crear sesión
     db = SessionLocal()
@@ -148,6 +149,8 @@ def init_database():
 
         # Guardar cambios
         db.commit()
+        # Las reservas de ejemplo no pasan por el repositorio: llenar los hechos
+        ReservaDiariaRepository.reconstruir(db)
         print("Base de datos inicializada exitosamente con los datos de ejemplo.")
     except SQLAlchemyError as e:
         db.rollback()
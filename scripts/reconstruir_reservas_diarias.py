@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Reconstruir la tabla de hechos reservas_diarias desde las reservas.
+
+La API mantiene reservas_diarias en cada alta, cambio o baja de reservas y
+la migración 0005 la llena al crearla. Este script la recalcula completa,
+por lotes de días, para cuando las reservas se cargaron o modificaron por
+fuera de la aplicación (SQL manual, restauración de un backup, etc.).
+
+Uso:
+    python scripts/reconstruir_reservas_diarias.py
+    python scripts/reconstruir_reservas_diarias.py --dias-por-lote 7
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.database import SessionLocal
+from app.repositories.reserva_diaria_repository import ReservaDiariaRepository
+
+
+def main():
+    """Función principal del script."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dias-por-lote", type=int, default=31,
+                        help="Días recalculados por transacción")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print("🔄 Reconstruyendo reservas_diarias...")
+        inicio = time.perf_counter()
+        dias = ReservaDiariaRepository.reconstruir(db, args.dias_por_lote)
+        duracion = time.perf_counter() - inicio
+        print(f"✅ {dias} días recalculados en {duracion:.2f} s")
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        db.rollback()
+        print(f"❌ Error al reconstruir reservas_diarias: {e}")
+        return 1
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""
+Fixtures compartidas por las pruebas.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+
+
+@pytest.fixture
+def sesion_sqlite():
+    """Sesión sobre una base SQLite en memoria con todas las tablas creadas."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
@@ -0,0 +1,3 @@
+"""
+Paquete de pruebas de integración contra una base PostgreSQL real.
+"""
@@ -0,0 +1,101 @@
+"""
+Pruebas unitarias para la caché de resultados de analítica.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.services.analytics_cache import AnalyticsCache
+
+
+def _contador(resultado="ok"):
+    """Función de cálculo que registra cuántas veces se llamó."""
+    llamadas = []
+
+    def _calcular():
+        llamadas.append(1)
+        return resultado
+
+    return _calcular, llamadas
+
+
+class TestAnalyticsCache:
+    """Pruebas para AnalyticsCache."""
+
+    def test_acierto_y_invalidacion(self):
+        """Verifica que se reutiliza el resultado hasta que cambian las reservas."""
+        cache = AnalyticsCache(ttl=60, max_entradas=10)
+        calcular, llamadas = _contador()
+
+        cache.obtener("dashboard-metrics", {"days": 30}, calcular)
+        cache.obtener("dashboard-metrics", {"days": 30}, calcular)
+        cache.obtener("dashboard-metrics", {"days": 7}, calcular)
+        cache.invalidar()
+        cache.obtener("dashboard-metrics", {"days": 30}, calcular)
+
+        assert len(llamadas) == 3
+        stats = cache.stats()
+        assert stats["version"] == 1
+        assert stats["endpoints"]["dashboard-metrics"] == {
+            "hits": 1, "misses": 3, "coalescidas": 0, "tasa_aciertos": 0.25,
+        }
+
+    def test_expulsa_la_menos_usada(self):
+        """Verifica el límite de entradas descartando la usada hace más tiempo."""
+        cache = AnalyticsCache(ttl=60, max_entradas=2)
+        calcular, llamadas = _contador()
+
+        cache.obtener("anomalies", {"dias": 7}, calcular)
+        cache.obtener("anomalies", {"dias": 14}, calcular)
+        cache.obtener("anomalies", {"dias": 7}, calcular)   # Acierto: pasa al final
+        cache.obtener("anomalies", {"dias": 30}, calcular)  # Expulsa dias=14
+        cache.obtener("anomalies", {"dias": 7}, calcular)
+        cache.obtener("anomalies", {"dias": 14}, calcular)
+
+        assert len(llamadas) == 4
+        assert cache.stats()["expulsiones"] == 2
+
+    def test_consultas_concurrentes_calculan_una_vez(self):
+        """Verifica que las consultas idénticas simultáneas comparten el cálculo."""
+        cache = AnalyticsCache(ttl=60, max_entradas=10)
+        liberar, llamadas = threading.Event(), []
+
+        def _calcular_lento():
+            llamadas.append(1)
+            liberar.wait(timeout=5)
+            return {"ok": True}
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futuros = [
+                executor.submit(
+                    cache.obtener, "peak-hours", {"dias": 30}, _calcular_lento
+                )
+                for _ in range(4)
+            ]
+            while cache.stats()["coalescidas"] < 3:
+                threading.Event().wait(0.001)
+            liberar.set()
+            resultados = [futuro.result() for futuro in futuros]
+
+        assert len(llamadas) == 1
+        assert all(resultado is resultados[0] for resultado in resultados)
+        assert cache.stats()["en_curso"] == 0
+
+    def test_error_y_resultado_viejo_no_se_guardan(self):
+        """Verifica que no se guardan errores ni resultados previos a una escritura."""
+        cache = AnalyticsCache(ttl=60, max_entradas=10)
+
+        def _fallar():
+            raise ValueError("sin datos")
+
+        with pytest.raises(ValueError):
+            cache.obtener("weekly-demand", {"dias": 7}, _fallar)
+
+        def _calcular_durante_escritura():
+            cache.invalidar()
+            return "viejo"
+
+        assert cache.obtener(
+            "weekly-demand", {"dias": 7}, _calcular_durante_escritura
+        ) == "viejo"
+        assert cache.stats()["entradas"] == 0
+        assert cache.stats()["en_curso"] == 0
@@ -0,0 +1,106 @@
+"""
+Pruebas unitarias para la caché de catálogos del servicio Java.
+"""
+import asyncio
+from unittest.mock import AsyncMock
+import pytest
+from app.services.catalog_cache import CatalogCache
+
+SALAS = [{"id": 1, "nombre": "Sala A"}]
+SALAS_NUEVAS = [{"id": 1, "nombre": "Sala A"}, {"id": 2, "nombre": "Sala B"}]
+
+
+def _vencer(cache, segundos):
+    """Simula que la copia tiene la antigüedad indicada."""
+    cache._cargado_en -= segundos
+
+
+class TestCatalogCache:
+    """Pruebas para CatalogCache."""
+
+    @pytest.mark.asyncio
+    async def test_copia_vigente_no_consulta_java(self):
+        """Verifica que dentro del TTL las lecturas no llaman al cargador."""
+        cargar = AsyncMock(return_value=SALAS)
+        cache = CatalogCache("salas", cargar, ttl=30, stale=300)
+
+        await cache.obtener()
+        resultado = await cache.obtener()
+
+        assert resultado == SALAS
+        assert cargar.await_count == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_copia_vencida_se_sirve_y_refresca(self):
+        """Verifica que la copia vencida se devuelve mientras se refresca."""
+        cargar = AsyncMock(side_effect=[SALAS, SALAS_NUEVAS])
+        cache = CatalogCache("salas", cargar, ttl=30, stale=300)
+        await cache.obtener()
+        _vencer(cache, 60)
+
+        resultado = await cache.obtener()
+        await cache._carga
+
+        assert resultado == SALAS
+        assert await cache.obtener() == SALAS_NUEVAS
+        assert cache.stats()["hits_vencidos"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lecturas_concurrentes_comparten_carga(self):
+        """Verifica que varios fallos simultáneos hacen una sola consulta."""
+        cargar = AsyncMock(return_value=SALAS)
+        cache = CatalogCache("salas", cargar, ttl=30, stale=300)
+
+        resultados = await asyncio.gather(*(cache.obtener() for _ in range(5)))
+
+        assert all(resultado == SALAS for resultado in resultados)
+        assert cargar.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidar_descarta_carga_en_curso(self):
+        """Verifica que una carga iniciada antes de invalidar no se guarda."""
+        liberar = asyncio.Event()
+
+        async def cargar_lento():
+            await liberar.wait()
+            return SALAS
+
+        cache = CatalogCache("salas", cargar_lento, ttl=30, stale=300)
+        lectura = asyncio.create_task(cache.obtener())
+        await asyncio.sleep(0)
+        cache.invalidar()
+        liberar.set()
+        await lectura
+
+        assert cache.stats()["elementos"] is None
+
+    @pytest.mark.asyncio
+    async def test_error_de_java_no_se_guarda(self):
+        """Verifica que una falla de Java no reemplaza la copia por una vacía."""
+        cargar = AsyncMock(side_effect=[SALAS, None])
+        cache = CatalogCache("salas", cargar, ttl=30, stale=0)
+        await cache.obtener()
+        _vencer(cache, 60)
+
+        resultado = await cache.obtener()
+
+        assert resultado == SALAS
+        assert cache.stats()["errores"] == 1
+
+    @pytest.mark.asyncio
+    async def test_modificar_resultado_no_altera_la_cache(self):
+        """Verifica que cada lectura devuelve una copia independiente."""
+        cargar = AsyncMock(return_value=[{"id": 1, "nombre": "Sala A"}])
+        cache = CatalogCache("salas", cargar, ttl=30, stale=300)
+
+        primera = await cache.obtener()
+        primera[0]["nombre"] = "Modificada"
+        primera.append({"id": 2})
+        vigente = await cache.obtener()
+        vigente[0]["nombre"] = "Otra"
+        _vencer(cache, 60)
+        vencida = await cache.obtener()
+
+        assert vencida == SALAS
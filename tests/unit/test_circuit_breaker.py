@@ -0,0 +1,96 @@
+"""
+Pruebas unitarias para el circuit breaker del servicio Java.
+"""
+from unittest.mock import AsyncMock, patch
+import pytest
+from app.services.circuit_breaker import (
+    ABIERTO,
+    CERRADO,
+    SEMIABIERTO,
+    CircuitBreaker,
+)
+from app.services.java_client import JavaServiceClient, java_circuit_breaker
+
+CLIENTE = "app.services.java_client"
+
+
+def _abrir(breaker):
+    for _ in range(breaker.umbral_fallos):
+        breaker.registrar_fallo()
+
+
+def _vencer_apertura(breaker):
+    """Simula que pasó el tiempo de apertura."""
+    breaker._abierto_desde -= breaker.tiempo_apertura
+
+
+@pytest.fixture
+def breaker_java():
+    java_circuit_breaker.reiniciar()
+    yield java_circuit_breaker
+    java_circuit_breaker.reiniciar()
+
+
+class TestCircuitBreaker:
+    """Pruebas para CircuitBreaker y su uso en JavaServiceClient."""
+
+    def test_abre_al_alcanzar_el_umbral(self):
+        """Verifica que las fallas consecutivas abren el circuito."""
+        breaker = CircuitBreaker("java", umbral_fallos=3, tiempo_apertura=30)
+        breaker.registrar_fallo()
+        breaker.registrar_fallo()
+        assert breaker.permitir() is True
+
+        breaker.registrar_fallo()
+
+        assert breaker.estado == ABIERTO
+        assert breaker.permitir() is False
+        assert breaker.stats()["rechazadas"] == 1
+
+    def test_semiabierto_permite_una_prueba(self):
+        """Verifica que tras la apertura pasa una sola llamada de prueba."""
+        breaker = CircuitBreaker("java", umbral_fallos=1, tiempo_apertura=30)
+        _abrir(breaker)
+        _vencer_apertura(breaker)
+
+        assert breaker.estado == SEMIABIERTO
+        assert breaker.permitir() is True
+        assert breaker.permitir() is False
+
+        breaker.registrar_exito()
+        assert breaker.estado == CERRADO
+
+    def test_prueba_fallida_reabre(self):
+        """Verifica que una falla en semiabierto vuelve a abrir el circuito."""
+        breaker = CircuitBreaker("java", umbral_fallos=5, tiempo_apertura=30)
+        _abrir(breaker)
+        _vencer_apertura(breaker)
+        breaker.permitir()
+
+        breaker.registrar_fallo()
+
+        assert breaker.estado == ABIERTO
+        assert breaker.stats()["aperturas"] == 2
+
+    @pytest.mark.asyncio
+    async def test_salud_usa_estado_del_circuito(self, breaker_java):
+        """Verifica que el chequeo de salud no consulta a Java si hay estado."""
+        with patch.object(JavaServiceClient, "_consultar_salud",
+                          AsyncMock(return_value=True)) as consultar:
+            breaker_java.registrar_exito()
+            assert await JavaServiceClient.check_service_health() is True
+
+            _abrir(breaker_java)
+            assert await JavaServiceClient.check_service_health() is False
+
+        consultar.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_circuito_abierto_falla_sin_conectar(self, breaker_java):
+        """Verifica que con el circuito abierto no se crea ningún cliente HTTP."""
+        _abrir(breaker_java)
+
+        with patch(f"{CLIENTE}.httpx.AsyncClient") as async_client:
+            assert await JavaServiceClient.validate_sala_exists(1) is False
+
+        async_client.assert_not_called()
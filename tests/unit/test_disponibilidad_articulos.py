@@ -0,0 +1,118 @@
+"""
+Pruebas unitarias para el cálculo agrupado de disponibilidad de artículos.
+"""
+from datetime import datetime
+from unittest.mock import patch
+import pytest
+from sqlalchemy import event, text
+from app.models import Articulo, Persona, Reserva
+from app.services.articulo_service import ArticuloService
+from app.services.ocupacion_actual import ocupacion_actual
+
+INICIO = datetime(2025, 10, 20, 9, 0)
+FIN = datetime(2025, 10, 20, 12, 0)
+
+
+@pytest.fixture
+def db(sesion_sqlite):
+    """Base SQLite en memoria con artículos y reservas en el período."""
+    session = sesion_sqlite
+    session.execute(
+        text(
+            "CREATE TABLE reserva_articulos (id INTEGER PRIMARY KEY, "
+            "reserva_id INTEGER, articulo_id INTEGER, cantidad INTEGER)"
+        )
+    )
+    session.add_all(
+        [
+            Persona(id=1, nombre="Ana", email="ana@example.com"),
+            Articulo(id=1, nombre="Proyector", cantidad=5, disponible=True),
+            Articulo(id=2, nombre="Notebook", cantidad=2, disponible=True),
+            Articulo(id=3, nombre="Cámara", cantidad=1, disponible=False),
+            # Reserva directa del proyector dentro del período
+            Reserva(id=1, id_persona=1, id_articulo=1,
+                    fecha_hora_inicio=INICIO, fecha_hora_fin=FIN),
+            # Reserva de sala con artículos, termina justo al inicio (inclusivo)
+            Reserva(id=2, id_persona=1, fecha_hora_inicio=datetime(2025, 10, 20, 8),
+                    fecha_hora_fin=INICIO),
+            # Reserva de sala con artículos, fuera del período
+            Reserva(id=3, id_persona=1, fecha_hora_inicio=datetime(2025, 10, 21, 9),
+                    fecha_hora_fin=datetime(2025, 10, 21, 10)),
+        ]
+    )
+    session.flush()
+    session.execute(
+        text(
+            "INSERT INTO reserva_articulos (reserva_id, articulo_id, cantidad) "
+            "VALUES (2, 1, 2), (2, 2, 3), (3, 1, 4)"
+        )
+    )
+    session.commit()
+    yield session
+
+
+def _por_id(disponibilidad):
+    return {item["id"]: item for item in disponibilidad}
+
+
+class TestDisponibilidadArticulos:
+    """Pruebas para ArticuloService.get_disponibilidad_periodo y _actual."""
+
+    def test_suma_reservas_directas_y_de_sala(self, db):
+        """Verifica lo reservado por artículo y que se omiten los no disponibles."""
+        resultado = _por_id(ArticuloService.get_disponibilidad_periodo(db, INICIO, FIN))
+
+        assert sorted(resultado) == [1, 2]
+        assert resultado[1]["cantidad_reservada_otros"] == 3
+        assert resultado[1]["cantidad_disponible"] == 2
+        # Más unidades asignadas que stock: no baja de cero
+        assert resultado[2]["cantidad_reservada_otros"] == 3
+        assert resultado[2]["cantidad_disponible"] == 0
+
+    def test_excluye_la_reserva_editada(self, db):
+        """Verifica que lo asignado a la reserva editada se informa aparte."""
+        resultado = _por_id(
+            ArticuloService.get_disponibilidad_periodo(db, INICIO, FIN, reserva_id=2)
+        )
+
+        assert resultado[1]["cantidad_reservada_otros"] == 1
+        assert resultado[1]["cantidad_asignada_en_reserva"] == 2
+        assert resultado[1]["cantidad_disponible"] == 4
+        assert resultado[1]["cantidad_disponible_para_agregar"] == 2
+        assert resultado[2]["cantidad_disponible_para_agregar"] == 0
+
+    def test_una_consulta_sin_importar_los_articulos(self, db):
+        """Verifica que la cantidad de consultas no crece con los artículos."""
+        db.add_all(
+            Articulo(nombre=f"Extra {i}", cantidad=1, disponible=True)
+            for i in range(50)
+        )
+        db.commit()
+        consultas = []
+        event.listen(
+            db.get_bind(), "before_cursor_execute",
+            lambda *args: consultas.append(args[2]),
+        )
+
+        resultado = ArticuloService.get_disponibilidad_periodo(
+            db, INICIO, FIN, reserva_id=2
+        )
+
+        assert len(resultado) == 52
+        assert len(consultas) == 3
+
+    def test_disponibilidad_actual(self, db):
+        """Verifica el formato {id: {total, reservadas, disponibles}}."""
+        ahora = datetime(2025, 10, 20, 10, 0)
+        ocupacion_actual.invalidar()
+
+        with patch(
+            "app.services.ocupacion_actual.ReservaService.obtener_hora_actual",
+            return_value=ahora,
+        ):
+            resultado = ArticuloService.get_disponibilidad_actual(db)
+        ocupacion_actual.invalidar()
+
+        assert resultado[1] == {"total": 5, "reservadas": 1, "disponibles": 4}
+        assert resultado[2] == {"total": 2, "reservadas": 0, "disponibles": 2}
+        assert resultado[3]["reservadas"] == 0
@@ -0,0 +1,173 @@
+"""
+Pruebas unitarias para la exportación en streaming de reservas.
+"""
+import csv
+import json
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+from io import BytesIO, StringIO
+import pytest
+from openpyxl import load_workbook
+from app.models import Persona, Reserva
+from app.services.exportacion_reservas import (
+    MENSAJE_SIN_RESERVAS,
+    escribir_excel,
+    fila_reporte,
+    generar_csv,
+    generar_excel,
+    generar_ndjson,
+    lotes_reporte,
+)
+
+DESDE = datetime(2025, 10, 1, 0, 0)
+AHORA = datetime(2025, 10, 3, 10, 30)
+
+
+def _lotes_sinteticos(cantidad, tamano_lote=100):
+    """Lotes de filas del reporte sin pasar por la base."""
+    for desde in range(0, cantidad, tamano_lote):
+        yield [
+            fila_reporte(
+                (i, DESDE + timedelta(hours=i), DESDE + timedelta(hours=i + 1),
+                 1, 2, None),
+                AHORA,
+            )
+            for i in range(desde, min(cantidad, desde + tamano_lote))
+        ]
+
+
+def _pico_memoria_excel(cantidad):
+    """Pico de memoria (bytes) al escribir un Excel de `cantidad` reservas."""
+    with tempfile.TemporaryFile() as archivo:
+        tracemalloc.start()
+        try:
+            escribir_excel(archivo, _lotes_sinteticos(cantidad), {}, {})
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+
+@pytest.fixture
+def db(sesion_sqlite):
+    """Base SQLite en memoria con una reserva por día desde DESDE."""
+    session = sesion_sqlite
+    session.add(Persona(id=1, nombre="Ana", email="ana@example.com"))
+    # Se insertan desordenadas: el export sale ordenado por inicio
+    for dia in (4, 0, 2, 1, 3):
+        inicio = DESDE + timedelta(days=dia, hours=10)
+        session.add(
+            Reserva(
+                id=dia + 1,
+                id_persona=1,
+                id_sala=1 if dia % 2 == 0 else None,
+                id_articulo=None if dia % 2 == 0 else 7,
+                fecha_hora_inicio=inicio,
+                fecha_hora_fin=inicio + timedelta(hours=1, minutes=30),
+            )
+        )
+    # Anterior al período: no se exporta
+    session.add(
+        Reserva(id=99, id_persona=1, id_sala=1,
+                fecha_hora_inicio=DESDE - timedelta(days=1),
+                fecha_hora_fin=DESDE - timedelta(hours=23))
+    )
+    session.commit()
+    yield session
+
+
+class TestExportacionReservas:
+    """Pruebas para lotes_reporte, generar_csv y generar_ndjson."""
+
+    def test_csv_por_lotes(self, db):
+        """Verifica el CSV completo, generado de a un fragmento por lote."""
+        fragmentos = list(
+            generar_csv(lotes_reporte(db, DESDE, ahora=AHORA, tamano_lote=2))
+        )
+
+        filas = list(csv.DictReader(StringIO("".join(fragmentos))))
+        assert len(fragmentos) == 3
+        assert [fila["id"] for fila in filas] == ["1", "2", "3", "4", "5"]
+        assert [fila["estado"] for fila in filas] == [
+            "completada", "completada", "activa", "pendiente", "pendiente"
+        ]
+        assert filas[0]["tipo"] == "sala" and filas[0]["id_articulo"] == ""
+        assert filas[1]["tipo"] == "articulo" and filas[1]["id_articulo"] == "7"
+        assert filas[0]["duracion_horas"] == "1.5"
+
+    def test_csv_sin_reservas(self, db):
+        """Verifica el mensaje cuando el período no tiene reservas."""
+        contenido = "".join(
+            generar_csv(lotes_reporte(db, DESDE + timedelta(days=30), ahora=AHORA))
+        )
+
+        assert contenido == f"mensaje\n{MENSAJE_SIN_RESERVAS}\n"
+
+    def test_ndjson(self, db):
+        """Verifica una reserva JSON por línea."""
+        contenido = "".join(
+            generar_ndjson(lotes_reporte(db, DESDE, ahora=AHORA, tamano_lote=3))
+        )
+
+        reservas = [json.loads(linea) for linea in contenido.splitlines()]
+        assert [r["id"] for r in reservas] == [1, 2, 3, 4, 5]
+        assert reservas[1]["id_sala"] is None
+        assert reservas[0]["fecha_inicio"] == "2025-10-01T10:00:00"
+
+    def test_no_lee_mas_lotes_que_los_enviados(self):
+        """Verifica que cada fragmento solo consume el lote que necesita."""
+        leidos = []
+
+        def _lotes():
+            for numero in range(1, 1001):
+                leidos.append(numero)
+                yield [{"id": numero}]
+
+        fragmentos = generar_ndjson(_lotes())
+        primero = next(fragmentos)
+
+        assert json.loads(primero) == {"id": 1}
+        assert leidos == [1]
+
+    def test_excel_hojas(self, db):
+        """Verifica las hojas Métricas, Reservas e Info del Excel."""
+        metricas = {"metricas_principales": {"total_reservas": 5},
+                    "top_usuarios": [{"nombre": "Ana", "reservas": 5}]}
+        contenido = b"".join(
+            generar_excel(
+                lotes_reporte(db, DESDE, ahora=AHORA, tamano_lote=2),
+                metricas,
+                {"periodo_dias": 30},
+            )
+        )
+
+        libro = load_workbook(BytesIO(contenido), read_only=True)
+        assert libro.sheetnames == ["Métricas", "Reservas", "Info"]
+        reservas = list(libro["Reservas"].values)
+        assert reservas[0][:3] == ("id", "fecha_inicio", "fecha_fin")
+        assert [fila[0] for fila in reservas[1:]] == [1, 2, 3, 4, 5]
+        assert list(libro["Métricas"].values)[1:] == [
+            ("metricas_principales.total_reservas", 5),
+            ("top_usuarios", '[{"nombre": "Ana", "reservas": 5}]'),
+        ]
+        assert list(libro["Info"].values)[1] == ("periodo_dias", 30)
+
+    def test_excel_sin_reservas(self, db):
+        """Verifica el mensaje en la hoja Reservas de un período vacío."""
+        contenido = b"".join(
+            generar_excel(
+                lotes_reporte(db, DESDE + timedelta(days=30), ahora=AHORA), {}, {}
+            )
+        )
+
+        hoja = load_workbook(BytesIO(contenido), read_only=True)["Reservas"]
+        assert list(hoja.values) == [("mensaje",), (MENSAJE_SIN_RESERVAS,)]
+
+    def test_excel_memoria_constante(self):
+        """Verifica que la memoria del Excel no crece con la cantidad de filas."""
+        pico_chico = _pico_memoria_excel(300)
+        pico_grande = _pico_memoria_excel(3000)
+
+        # Diez veces más filas: el pico queda acotado por un lote
+        assert pico_grande < pico_chico * 1.5
+        assert pico_grande < 2 * 1024 * 1024
@@ -0,0 +1,71 @@
+"""
+Pruebas unitarias para el cliente HTTP compartido del Java Service.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+import pytest
+from app.core.config import settings
+from app.services.java_client import JavaServiceClient
+
+
+@pytest.fixture(autouse=True)
+def sin_sonda(monkeypatch):
+    """Evita que la sonda de salud consulte al servicio Java real."""
+    monkeypatch.setattr(settings, "java_health_interval", 0)
+
+
+async def _cliente_usado():
+    async with JavaServiceClient._cliente() as client:
+        return client
+
+
+class TestJavaClientPool:
+    """Pruebas para iniciar, cerrar y reutilizar el cliente compartido."""
+
+    @pytest.mark.asyncio
+    async def test_reutiliza_cliente_en_el_mismo_loop(self):
+        """Verifica que las llamadas del loop del servidor comparten el cliente."""
+        await JavaServiceClient.iniciar()
+        try:
+            primero = await _cliente_usado()
+            segundo = await _cliente_usado()
+            assert primero is segundo is JavaServiceClient._http_client
+            assert JavaServiceClient.pool_stats()["activo"] is True
+        finally:
+            await JavaServiceClient.cerrar()
+
+        assert JavaServiceClient._http_client is None
+        assert primero.is_closed
+
+    @pytest.mark.asyncio
+    async def test_otro_loop_usa_cliente_temporal(self):
+        """Verifica que asyncio.run desde código sincrónico no usa el pool."""
+        await JavaServiceClient.iniciar()
+        try:
+            compartido = JavaServiceClient._http_client
+            temporal = await asyncio.to_thread(asyncio.run, _cliente_usado())
+        finally:
+            await JavaServiceClient.cerrar()
+
+        assert temporal is not compartido
+        assert temporal.is_closed
+
+    def test_estadisticas_sin_cliente(self):
+        """Verifica que las estadísticas funcionan antes del arranque."""
+        stats = JavaServiceClient.pool_stats()
+
+        assert stats["activo"] is False
+        assert stats["conexiones"] == 0
+        assert stats["utilizacion"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_sonda_sobrevive_a_errores_inesperados(self):
+        """Verifica que un error inesperado no detiene la sonda de salud."""
+        consultas = AsyncMock(
+            side_effect=[RuntimeError("respuesta rara"), True, asyncio.CancelledError]
+        )
+        with patch.object(JavaServiceClient, "_consultar_salud", consultas):
+            with pytest.raises(asyncio.CancelledError):
+                await JavaServiceClient._sondear()
+
+        assert consultas.await_count == 3
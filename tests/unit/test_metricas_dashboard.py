@@ -0,0 +1,91 @@
+"""
+Pruebas unitarias para la agregación de métricas del dashboard.
+"""
+from datetime import datetime, timedelta
+import pytest
+from app.models import Persona, Reserva, Sala
+from app.repositories.reserva_repository import ReservaRepository
+from app.services.metricas_dashboard import (
+    agregar_reservas,
+    ocupacion_promedio,
+    top_usuarios,
+)
+
+AHORA = datetime(2025, 10, 20, 15, 0)
+SALAS = [Sala(id=7, nombre="Grande"), Sala(id=3, nombre="Chica")]
+
+
+def _fila(id_sala, id_persona, dias_atras, horas=1.0):
+    """Fila (id_sala, id_persona, inicio, fin) que empieza hace `dias_atras` días."""
+    inicio = AHORA - timedelta(days=dias_atras, hours=2)
+    return (id_sala, id_persona, inicio, inicio + timedelta(hours=horas))
+
+
+class TestMetricasDashboard:
+    """Pruebas para agregar_reservas, top_usuarios y ocupacion_promedio."""
+
+    def test_ocupacion_por_sala(self):
+        """Verifica reservas y horas promedio por sala, en el orden de `salas`."""
+        filas = [
+            _fila(3, 1, 0, horas=1),
+            _fila(3, 1, 1, horas=2),
+            _fila(7, 2, 2, horas=0.5),
+            _fila(0, 2, 2),   # Reserva de artículo
+            _fila(99, 2, 2),  # Sala que no está en la lista
+        ]
+
+        agregado = agregar_reservas(filas, SALAS, AHORA, 30)
+
+        assert agregado["ocupacion_salas"] == [
+            {"sala": "Grande", "reservas": 1, "horas_promedio": 0.5},
+            {"sala": "Chica", "reservas": 2, "horas_promedio": 1.5},
+        ]
+        assert agregado["horas_reservadas"] == pytest.approx(5.5)
+        assert agregado["reservas_hoy"] == 1
+
+    def test_tendencia_y_top(self):
+        """Verifica la tendencia diaria y el desempate de top_personas."""
+        filas = [_fila(3, 5, 0), _fila(3, 5, 2), _fila(3, 2, 2), _fila(3, 2, 3),
+                 _fila(3, 9, 3), _fila(3, 1, 10)]
+
+        agregado = agregar_reservas(filas, SALAS, AHORA, 3)
+
+        assert agregado["tendencia_reservas"] == {
+            "labels": ["17/10", "18/10", "19/10", "20/10"],
+            "values": [2, 2, 0, 1],
+        }
+        assert agregado["top_personas"] == [(2, 2), (5, 2), (1, 1), (9, 1)]
+
+    def test_sin_reservas_ni_salas(self):
+        """Verifica el resultado vacío y la ocupación sin horas disponibles."""
+        agregado = agregar_reservas([], [], AHORA, 7)
+
+        assert agregado["ocupacion_salas"] == []
+        assert agregado["tendencia_reservas"]["values"] == [0] * 8
+        assert agregado["top_personas"] == []
+        assert agregado["horas_reservadas"] == 0
+        assert ocupacion_promedio(0, 0, 7) == 0
+        assert ocupacion_promedio(12, 2, 1) == 25.0
+
+    def test_columnas_y_nombres(self, sesion_sqlite):
+        """Verifica la consulta de columnas y el armado de top_usuarios."""
+        db = sesion_sqlite
+        db.add_all(
+            [
+                Persona(id=1, nombre="Ana", apellido="Paz", email="ana@example.com"),
+                Reserva(id_persona=1, id_articulo=4,
+                        fecha_hora_inicio=AHORA, fecha_hora_fin=AHORA),
+                Reserva(id_persona=1, id_sala=3,
+                        fecha_hora_inicio=AHORA - timedelta(days=9),
+                        fecha_hora_fin=AHORA),
+            ]
+        )
+        db.commit()
+
+        filas = ReservaRepository.get_columnas_dashboard(db, AHORA - timedelta(days=1))
+        personas = {1: db.get(Persona, 1)}
+
+        assert [tuple(fila) for fila in filas] == [(0, 1, AHORA, AHORA)]
+        assert top_usuarios([(1, 4), (8, 1)], personas) == [
+            {"nombre": "Ana Paz", "reservas": 4}
+        ]
@@ -0,0 +1,95 @@
+"""
+Pruebas unitarias para las métricas del pool de conexiones.
+"""
+import threading
+import time
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.core.metricas_pool import (
+    MetricasPool,
+    QueuePoolConMetricas,
+    instrumentar_pool,
+)
+
+
+@pytest.fixture
+def motor(tmp_path):
+    """Motor SQLite en archivo con un pool chico: 1 conexión + 1 de desborde."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=QueuePoolConMetricas,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    instrumentar_pool(engine, MetricasPool("prueba"))
+    yield engine
+    engine.dispose()
+
+
+class TestMetricasPool:
+    """Pruebas para QueuePoolConMetricas e instrumentar_pool."""
+
+    def test_checkout_y_checkin(self, motor):
+        """Verifica los contadores de conexiones entregadas y en uso."""
+        with motor.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            durante = motor.pool.metricas.stats()
+        despues = motor.pool.metricas.stats()
+
+        assert durante["en_uso"] == 1
+        assert despues["checkouts"] == 1
+        assert despues["en_uso"] == 0
+        assert despues["en_uso_maximo"] == 1
+        assert despues["tamano"] == 1
+        assert despues["conexiones_libres"] == 1
+
+    def test_desborde_y_timeout(self, motor):
+        """Verifica el desborde máximo y las peticiones sin conexión a tiempo."""
+        with motor.connect(), motor.connect():
+            with pytest.raises(exc.TimeoutError):
+                motor.connect()
+            stats = motor.pool.metricas.stats()
+
+        assert stats["desborde"] == 1
+        assert stats["desborde_maximo"] == 1
+        assert stats["en_uso_maximo"] == 2
+        assert stats["timeouts"] == 1
+
+    def test_espera_en_cola(self, tmp_path):
+        """Verifica que se mide la espera por una conexión ocupada."""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'cola.db'}",
+            poolclass=QueuePoolConMetricas,
+            pool_size=1,
+            max_overflow=0,
+        )
+        metricas = instrumentar_pool(engine, MetricasPool("cola"))
+        ocupada = threading.Event()
+
+        def _retener():
+            with engine.connect():
+                ocupada.set()
+                time.sleep(0.1)
+
+        hilo = threading.Thread(target=_retener)
+        hilo.start()
+        ocupada.wait()
+        with engine.connect():
+            pass
+        hilo.join()
+        engine.dispose()
+
+        stats = metricas.stats()
+        assert stats["esperas_en_cola"] == 1
+        assert stats["espera_maxima_ms"] >= 50
+
+    def test_dispose_conserva_metricas(self, motor):
+        """Verifica que el pool recreado por dispose() sigue midiendo."""
+        with motor.connect():
+            pass
+        motor.dispose()
+        with motor.connect():
+            pass
+
+        assert motor.pool.metricas.stats()["checkouts"] == 2
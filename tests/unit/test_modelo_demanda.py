@@ -0,0 +1,138 @@
+"""
+Pruebas unitarias para el modelo de pronóstico de demanda.
+"""
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+import numpy as np
+import pytest
+from sqlalchemy import insert
+from app.models import Persona, Reserva, Sala
+from app.prediction.modelo_demanda import (
+    GestorModeloDemanda,
+    ModeloDemanda,
+)
+from app.prediction.prediction_service import PredictionService
+from app.repositories.reserva_diaria_repository import ReservaDiariaRepository
+from app.repositories.snapshot_reservas import SnapshotReservas
+from app.services.analytics_service import AnalyticsService
+
+LUNES = date(2030, 3, 4)
+
+
+@pytest.fixture
+def db(sesion_sqlite):
+    """Base SQLite en memoria con dos reservas cada lunes de los 60 días previos."""
+    session = sesion_sqlite
+    session.add_all(
+        [
+            Persona(id=1, nombre="Ana", email="ana@example.com"),
+            Sala(id=1, nombre="Chica", capacidad=10),
+            Sala(id=2, nombre="Grande", capacidad=40),
+        ]
+    )
+    inicios = [
+        datetime.combine(LUNES - timedelta(weeks=semana), datetime.min.time())
+        + timedelta(hours=hora)
+        for semana in range(9)  # El lunes de LUNES no es histórico
+        for hora in (9, 14)
+    ]
+    session.execute(
+        insert(Reserva),
+        [
+            {"id_persona": 1, "id_sala": 1, "fecha_hora_inicio": inicio,
+             "fecha_hora_fin": inicio + timedelta(hours=1)}
+            for inicio in inicios
+        ],
+    )
+    ReservaDiariaRepository.recalcular_dias(session, [i.date() for i in inicios])
+    session.commit()
+    with patch(
+        "app.prediction.modelo_demanda.snapshot_reservas", SnapshotReservas()
+    ):
+        yield session
+
+
+def _modelo(fecha):
+    """Modelo fijo para probar el gestor sin base de datos."""
+    return ModeloDemanda(fecha, np.ones(7), 0.0, 7, np.ones(7))
+
+
+class TestModeloDemanda:
+    """Pruebas para ModeloDemanda y GestorModeloDemanda."""
+
+    def test_ajuste_y_pronostico(self, db):
+        """Verifica los parámetros ajustados y el pronóstico precalculado."""
+        modelo = ModeloDemanda.ajustar(db, LUNES)
+
+        # 8 lunes en los 60 días previos, con 2 reservas cada uno
+        assert modelo.patron.tolist() == [2.0, 0, 0, 0, 0, 0, 0]
+        assert modelo.tendencia == 0.0
+        assert modelo.total_historicas == 16
+        # Los hechos diarios incluyen el día del ajuste
+        assert modelo.totales_dia_semana.tolist() == [18, 0, 0, 0, 0, 0, 0]
+        assert modelo.fechas[0] == LUNES + timedelta(days=1)
+        assert modelo.dias_semana[:7].tolist() == [1, 2, 3, 4, 5, 6, 0]
+        assert modelo.reservas[:7].tolist() == [0, 0, 0, 0, 0, 0, 2]
+        assert modelo.confianza[6] == pytest.approx(0.58)
+        assert modelo.confianza[0] == pytest.approx(0.29)
+        assert len(modelo.reservas) == 30
+
+    def test_guardar_y_cargar(self, db, tmp_path):
+        """Verifica la ida y vuelta por .npz y los archivos ausentes o dañados."""
+        ruta = str(tmp_path / "modelos" / "demanda.npz")
+        modelo = ModeloDemanda.ajustar(db, LUNES)
+
+        modelo.guardar(ruta)
+        cargado = ModeloDemanda.cargar(ruta)
+
+        assert cargado.fecha == LUNES
+        assert cargado.reservas.tolist() == modelo.reservas.tolist()
+        assert cargado.confianza.tolist() == modelo.confianza.tolist()
+        assert cargado.totales_dia_semana.tolist() == modelo.totales_dia_semana.tolist()
+        assert ModeloDemanda.cargar(str(tmp_path / "no_existe.npz")) is None
+        (tmp_path / "danado.npz").write_bytes(b"no es un npz")
+        assert ModeloDemanda.cargar(str(tmp_path / "danado.npz")) is None
+
+    def test_gestor_reajusta_por_dia_y_escrituras(self, tmp_path):
+        """Verifica el reajuste al cambiar el día, tras N escrituras y desde disco."""
+        ruta = str(tmp_path / "demanda.npz")
+        hoy = [LUNES]
+        with patch("app.prediction.modelo_demanda._hoy", lambda: hoy[0]), patch.object(
+            ModeloDemanda, "ajustar", side_effect=lambda _db, fecha: _modelo(fecha)
+        ) as ajustar:
+            gestor = GestorModeloDemanda(ruta, reajuste_cambios=2)
+            gestor.obtener(None)
+            gestor.obtener(None)
+            gestor.registrar_cambio()
+            gestor.obtener(None)        # Una escritura: sigue vigente
+            gestor.registrar_cambio()
+            gestor.obtener(None)        # Dos escrituras: se reajusta
+            hoy[0] = LUNES + timedelta(days=1)
+            modelo = gestor.obtener(None)  # Otro día: se reajusta
+
+            assert ajustar.call_count == 3
+            assert modelo.fecha == hoy[0]
+            assert gestor.stats()["cambios_desde_ajuste"] == 0
+
+            otro_worker = GestorModeloDemanda(ruta, reajuste_cambios=2)
+            assert otro_worker.cargar(None).fecha == hoy[0]
+            assert otro_worker.origen == "disco"
+            assert ajustar.call_count == 3
+
+    def test_predicciones_comparten_un_ajuste(self, db):
+        """Verifica que demanda, capacidad y ocupación salen del mismo ajuste."""
+        gestor = GestorModeloDemanda(ruta="", reajuste_cambios=0)
+        with patch(
+            "app.prediction.prediction_service.modelo_demanda", gestor
+        ), patch("app.services.analytics_service.modelo_demanda", gestor):
+            demanda = PredictionService(db).predict_weekly_demand(7)
+            capacidad = PredictionService(db).recommend_capacity(7)
+            ocupacion = AnalyticsService(db).get_prediccion_ocupacion(7)
+
+        assert gestor.ajustes == 1
+        fechas = [p["fecha"] for p in demanda["predicciones"]]
+        assert [r["fecha"] for r in capacidad["recomendaciones"]] == fechas
+        assert [p["fecha"] for p in ocupacion["predicciones"]] == fechas
+        assert capacidad["capacidad_total"] == 2
+        lunes = [p for p in ocupacion["predicciones"] if p["dia_semana"] == "Lun"]
+        assert lunes[0]["prediccion_reservas"] == 18
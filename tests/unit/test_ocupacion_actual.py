@@ -0,0 +1,85 @@
+"""
+Pruebas unitarias para la foto compartida de ocupación actual.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import Mock, patch
+from app.repositories.reserva_repository import ReservaRepository
+from app.services.ocupacion_actual import OcupacionActual, ocupacion_actual
+
+MODULO = "app.services.ocupacion_actual"
+AHORA = datetime(2025, 10, 20, 10, 0)
+
+
+def _patch_consulta(consulta):
+    return patch(f"{MODULO}.ReservaRepository.get_ocupacion", consulta)
+
+
+class TestOcupacionActual:
+    """Pruebas para OcupacionActual."""
+
+    def test_reutiliza_la_foto_dentro_del_ttl(self):
+        """Verifica que lecturas seguidas hacen una sola consulta."""
+        foto = OcupacionActual(ttl=60)
+        consulta = Mock(return_value=({1: 2}, {7}))
+
+        with patch(f"{MODULO}.ReservaService.obtener_hora_actual",
+                   return_value=AHORA), _patch_consulta(consulta):
+            primera = foto.obtener(Mock())
+            segunda = foto.obtener(Mock())
+
+        assert primera is segunda
+        assert primera["articulos"] == {1: 2}
+        assert primera["salas_ocupadas"] == frozenset({7})
+        consulta.assert_called_once()
+        assert foto.stats()["hits"] == 1
+
+    def test_cambio_de_reservas_invalida_la_foto(self):
+        """Verifica que notificar_cambio descarta la foto compartida."""
+        consulta = Mock(return_value=({}, set()))
+        ocupacion_actual.invalidar()
+
+        with patch(f"{MODULO}.ReservaService.obtener_hora_actual",
+                   return_value=AHORA), _patch_consulta(consulta), \
+                patch.object(ocupacion_actual, "ttl", 60):
+            ocupacion_actual.obtener(Mock())
+            ReservaRepository.notificar_cambio()
+            ocupacion_actual.obtener(Mock())
+        ocupacion_actual.invalidar()
+
+        assert consulta.call_count == 2
+
+    def test_descarta_foto_tomada_antes_de_un_cambio(self):
+        """Verifica que una consulta en curso durante un cambio no se guarda."""
+        foto = OcupacionActual(ttl=60)
+
+        def _consulta_con_cambio(*_args):
+            foto.invalidar()
+            return {}, set()
+
+        with patch(f"{MODULO}.ReservaService.obtener_hora_actual",
+                   return_value=AHORA), _patch_consulta(_consulta_con_cambio):
+            foto.obtener(Mock())
+
+        assert foto.stats()["edad_segundos"] is None
+
+    def test_lecturas_concurrentes_comparten_consulta(self):
+        """Verifica que varios hilos que piden a la vez hacen una sola consulta."""
+        foto = OcupacionActual(ttl=60)
+        llamadas = []
+        lock = threading.Lock()
+
+        def _consulta_lenta(*_args):
+            with lock:
+                llamadas.append(1)
+            time.sleep(0.05)
+            return {}, set()
+
+        with patch(f"{MODULO}.ReservaService.obtener_hora_actual",
+                   return_value=AHORA), _patch_consulta(_consulta_lenta):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(lambda _: foto.obtener(Mock()), range(4)))
+
+        assert len(llamadas) == 1
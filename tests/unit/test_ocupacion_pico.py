@@ -0,0 +1,93 @@
+"""
+Pruebas unitarias para el cálculo de ocupación simultánea de artículos.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from app.models.articulo import Articulo
+from app.services.articulo_service import METODO_PICO, ArticuloService
+from app.services.ocupacion_pico import articulos_agotados, pico_por_articulo
+
+SERVICIO = "app.services.articulo_service"
+BASE = datetime(2025, 10, 20, 8, 0)
+
+
+def _uso(articulo_id, desde_horas, hasta_horas, cantidad):
+    return (
+        articulo_id,
+        BASE + timedelta(hours=desde_horas),
+        BASE + timedelta(hours=hasta_horas),
+        cantidad,
+    )
+
+
+class TestOcupacionPico:
+    """Pruebas para pico_por_articulo y su uso en ArticuloService."""
+
+    def test_pico_solo_suma_lo_simultaneo(self):
+        """Verifica que reservas que no se pisan no se suman."""
+        usos = [_uso(1, 0, 2, 3), _uso(1, 3, 5, 4), _uso(1, 4, 6, 2), _uso(2, 0, 1, 1)]
+
+        assert pico_por_articulo(usos) == {1: 6, 2: 1}
+
+    def test_extremos_que_se_tocan_son_simultaneos(self):
+        """Verifica el solapamiento inclusivo: fin == inicio cuenta a la vez."""
+        usos = [_uso(1, 0, 2, 1), _uso(1, 2, 4, 1)]
+
+        assert pico_por_articulo(usos) == {1: 2}
+
+    def test_ventana_recorta_los_usos(self):
+        """Verifica que solo cuenta la ocupación dentro de la ventana."""
+        usos = [_uso(1, 0, 2, 5), _uso(1, 3, 5, 1), _uso(1, 4, 6, 1)]
+
+        picos = pico_por_articulo(
+            usos, BASE + timedelta(hours=3), BASE + timedelta(hours=8)
+        )
+
+        assert picos == {1: 2}
+
+    def test_articulos_agotados(self):
+        """Verifica que se informan los artículos con pico igual o mayor al stock."""
+        assert articulos_agotados({1: 2, 2: 5, 3: 1}, {1: 2, 2: 4, 4: 9}) == [1]
+
+    def test_disponibilidad_por_pico(self):
+        """Verifica que metodo=pico descuenta el máximo simultáneo."""
+        articulos = [Articulo(id=1, nombre="Proyector", cantidad=5, disponible=True)]
+        usos = [_uso(1, 0, 1, 2), _uso(1, 2, 3, 2)]
+
+        with patch(f"{SERVICIO}.ArticuloRepository.get_all", return_value=articulos), \
+                patch(f"{SERVICIO}.ReservaRepository.get_uso_en_periodo",
+                      return_value=usos):
+            resultado = ArticuloService.get_disponibilidad_periodo(
+                None, BASE, BASE + timedelta(hours=4), metodo=METODO_PICO
+            )
+
+        assert resultado[0]["cantidad_reservada_otros"] == 2
+        assert resultado[0]["cantidad_disponible"] == 3
+
+    def test_estadisticas_inventario(self):
+        """Verifica los totales y los artículos sin stock del día."""
+        articulos = [
+            Articulo(id=1, nombre="Proyector", cantidad=2, disponible=True),
+            Articulo(id=2, nombre="Notebook", cantidad=3, disponible=True),
+            Articulo(id=3, nombre="Cámara", cantidad=4, disponible=False),
+        ]
+        usos = [_uso(1, 1, 3, 1), _uso(1, 2, 4, 1), _uso(2, 1, 2, 1)]
+
+        foto = {"hora": BASE + timedelta(hours=1), "articulos": {1: 1},
+                "salas_ocupadas": frozenset()}
+
+        with patch(f"{SERVICIO}.ArticuloRepository.get_all", return_value=articulos), \
+                patch(f"{SERVICIO}.ocupacion_actual.obtener", return_value=foto), \
+                patch(f"{SERVICIO}.ReservaRepository.get_uso_en_periodo",
+                      return_value=usos):
+            stats = ArticuloService.get_estadisticas_inventario(None)
+
+        assert stats == {
+            "total_articulos": 3,
+            "articulos_disponibles": 2,
+            "articulos_no_disponibles": 1,
+            "articulos_sin_stock_ahora": 1,
+            "total_unidades": 9,
+            "unidades_reservadas": 1,
+            "unidades_disponibles": 4,
+        }
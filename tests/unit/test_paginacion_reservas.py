@@ -0,0 +1,83 @@
+"""
+Pruebas unitarias para la paginación por cursor de los listados de reservas.
+"""
+from datetime import datetime, timedelta
+import pytest
+from app.models import Persona, Reserva
+from app.repositories.paginacion import codificar_cursor, decodificar_cursor
+from app.services.reserva_service import ReservaService
+
+BASE = datetime(2025, 10, 20, 9, 0)
+
+
+@pytest.fixture
+def db(sesion_sqlite):
+    """Base SQLite en memoria con reservas que comparten horario de inicio."""
+    session = sesion_sqlite
+    session.add(Persona(id=1, nombre="Ana", email="ana@example.com"))
+    for reserva_id in range(1, 11):
+        # De a pares con el mismo inicio: el id desempata el orden
+        inicio = BASE + timedelta(hours=reserva_id // 2)
+        session.add(
+            Reserva(
+                id=reserva_id,
+                id_persona=1,
+                id_sala=1 if reserva_id % 3 else None,
+                id_articulo=None if reserva_id % 3 else 1,
+                fecha_hora_inicio=inicio,
+                fecha_hora_fin=inicio + timedelta(minutes=30),
+            )
+        )
+    session.commit()
+    yield session
+
+
+def _recorrer(listar, limit):
+    """Pedir páginas siguiendo el cursor hasta agotar el listado."""
+    ids, cursor = [], None
+    while True:
+        pagina = listar(limit, cursor)
+        ids.extend(reserva.id for reserva in pagina)
+        cursor = ReservaService.siguiente_cursor(pagina, limit)
+        if cursor is None:
+            return ids
+
+
+class TestPaginacionReservas:
+    """Pruebas para la paginación por (fecha_hora_inicio, id)."""
+
+    def test_cursor_ida_y_vuelta(self):
+        """Verifica que el cursor codifica la posición de la reserva."""
+        reserva = Reserva(id=42, fecha_hora_inicio=BASE)
+
+        assert decodificar_cursor(codificar_cursor(reserva)) == (BASE, 42)
+        with pytest.raises(ValueError):
+            decodificar_cursor("no-es-un-cursor")
+
+    def test_recorre_todo_sin_repetir_ni_saltear(self, db):
+        """Verifica que las páginas por cursor coinciden con el orden completo."""
+        completo = [r.id for r in ReservaService.get_reservas(db, 0, 100)]
+
+        paginado = _recorrer(
+            lambda limit, cursor: ReservaService.get_reservas(db, 0, limit, cursor), 3
+        )
+
+        assert completo == [10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
+        assert paginado == completo
+
+    def test_cursor_respeta_el_filtro(self, db):
+        """Verifica la paginación por cursor de un listado filtrado."""
+        paginado = _recorrer(
+            lambda limit, cursor: ReservaService.get_reservas_by_sala(
+                db, 1, 0, limit, cursor
+            ),
+            2,
+        )
+
+        assert paginado == [10, 8, 7, 5, 4, 2, 1]
+
+    def test_skip_sigue_funcionando(self, db):
+        """Verifica el modo compatible con skip/limit."""
+        pagina = ReservaService.get_reservas(db, skip=4, limit=3)
+
+        assert [r.id for r in pagina] == [6, 5, 4]
@@ -0,0 +1,78 @@
+"""
+Pruebas unitarias para los agregados vectorizados de PredictionService.
+"""
+from datetime import datetime, timedelta
+import numpy as np
+from app.prediction.agregados import (
+    conteos_por_dia,
+    histograma_semana_hora,
+    patron_semanal,
+    promedio_movil,
+    puntaje_z,
+    tendencia,
+)
+from app.repositories.snapshot_reservas import EPOCA, a_segundo
+
+LUNES = datetime(2030, 3, 4)
+DIA_LUNES = (LUNES - EPOCA).days
+
+
+def _inicios(*fechas):
+    """Array de inicios en segundos desde EPOCA."""
+    return np.array([a_segundo(fecha) for fecha in fechas], dtype=np.float64)
+
+
+class TestPrediccionAgregados:
+    """Pruebas para app.prediction.agregados."""
+
+    def test_conteos_y_patron_semanal(self):
+        """Verifica los conteos por día y el promedio por día de la semana."""
+        inicios = _inicios(
+            LUNES + timedelta(hours=9),
+            LUNES + timedelta(hours=15),
+            LUNES + timedelta(days=7, hours=10),
+            LUNES + timedelta(days=8, hours=10),
+            LUNES + timedelta(days=14),  # Fuera del período
+            LUNES - timedelta(seconds=1),  # Fuera del período
+        )
+
+        conteos = conteos_por_dia(inicios, DIA_LUNES, 14)
+        patron = patron_semanal(conteos, DIA_LUNES)
+
+        assert conteos.tolist() == [2, 0, 0, 0, 0, 0, 0, 1, 1] + [0] * 5
+        # Cada día de la semana aparece dos veces en 14 días
+        assert patron == {0: 1.5, 1: 0.5, 2: 0.0, 3: 0.0, 4: 0.0, 5: 0.0, 6: 0.0}
+
+    def test_promedio_movil_y_tendencia(self):
+        """Verifica el promedio móvil y la tendencia por fecha."""
+        assert promedio_movil(np.array([1, 2, 3, 4]), 2).tolist() == [1.5, 2.5, 3.5]
+        assert promedio_movil(np.array([1, 2]), 3).tolist() == []
+
+        creciente = np.array([2] * 30 + [3] * 30)
+        assert tendencia(creciente) == 0.5
+        assert tendencia(np.array([0] * 30 + [5] * 30)) == 0.0
+        assert tendencia(np.array([4])) == 0.0
+
+    def test_histograma_semana_hora(self):
+        """Verifica el histograma día de la semana × hora de inicio."""
+        inicios = _inicios(
+            LUNES + timedelta(hours=9),
+            LUNES + timedelta(hours=9, minutes=45),
+            LUNES + timedelta(days=6, hours=23, minutes=59),
+        )
+
+        histograma = histograma_semana_hora(inicios)
+
+        assert histograma.shape == (7, 24)
+        assert histograma[0, 9] == 2
+        assert histograma[6, 23] == 1
+        assert histograma.sum() == 3
+
+    def test_puntaje_z(self):
+        """Verifica el puntaje z y el caso sin variación."""
+        puntajes, promedio, desviacion = puntaje_z(np.array([2, 4, 4, 4, 5, 5, 7, 9]))
+
+        assert (promedio, desviacion) == (5.0, 2.0)
+        assert puntajes.tolist() == [-1.5, -0.5, -0.5, -0.5, 0.0, 0.0, 1.0, 2.0]
+        assert puntaje_z(np.array([3, 3]))[0].tolist() == [0.0, 0.0]
+        assert puntaje_z(np.array([]))[1:] == (0.0, 0.0)
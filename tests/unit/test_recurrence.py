@@ -0,0 +1,90 @@
+"""
+Pruebas unitarias para la expansión de series recurrentes.
+"""
+from datetime import date, datetime, timedelta
+import numpy as np
+import pytest
+from app.services.recurrence import (
+    a_arreglo,
+    a_datetimes,
+    detectar_conflictos,
+    expandir_ocurrencias,
+)
+
+INICIO = datetime(2025, 10, 20, 9, 0)
+FIN = datetime(2025, 10, 20, 11, 0)
+
+
+class TestRecurrence:
+    """Pruebas para expandir_ocurrencias y detectar_conflictos."""
+
+    def test_expansion_semanal_con_repeticiones(self):
+        """Verifica que una serie semanal conserva el horario en cada ocurrencia."""
+        inicios, fines = expandir_ocurrencias(INICIO, FIN, "semanal", repeticiones=4)
+
+        assert a_datetimes(inicios) == [INICIO + timedelta(weeks=i) for i in range(4)]
+        assert a_datetimes(fines) == [FIN + timedelta(weeks=i) for i in range(4)]
+
+    def test_expansion_con_fecha_limite_intervalo_y_excepciones(self):
+        """Verifica el uso de hasta, intervalo y fechas excluidas."""
+        inicios, _ = expandir_ocurrencias(
+            INICIO,
+            FIN,
+            "diaria",
+            intervalo=2,
+            hasta=datetime(2025, 10, 28, 23, 59),
+            excepciones=[date(2025, 10, 24)],
+        )
+
+        assert [d.day for d in a_datetimes(inicios)] == [20, 22, 26, 28]
+
+    def test_regla_invalida(self):
+        """Verifica que se rechazan reglas inconsistentes."""
+        with pytest.raises(ValueError):
+            expandir_ocurrencias(
+                INICIO, INICIO + timedelta(days=2), "diaria", repeticiones=3
+            )
+        with pytest.raises(ValueError):
+            expandir_ocurrencias(INICIO, FIN, "semanal", repeticiones=3, hasta=FIN)
+        with pytest.raises(ValueError):
+            expandir_ocurrencias(INICIO, FIN, "diaria", repeticiones=1000)
+
+    def test_conflictos_con_intervalos_existentes(self):
+        """Verifica la detección de solapamientos, incluidos intervalos largos."""
+        inicios, fines = expandir_ocurrencias(INICIO, FIN, "diaria", repeticiones=5)
+        existentes = [
+            (datetime(2025, 10, 20, 11, 0), datetime(2025, 10, 20, 12, 0)),  # contiguo
+            (datetime(2025, 10, 21, 10, 0), datetime(2025, 10, 21, 10, 30)),
+            (datetime(2025, 10, 22, 0, 0), datetime(2025, 10, 23, 9, 30)),  # largo
+        ]
+
+        conflictos = detectar_conflictos(
+            inicios,
+            fines,
+            a_arreglo(e[0] for e in existentes),
+            a_arreglo(e[1] for e in existentes),
+        )
+
+        assert conflictos.tolist() == [False, True, True, True, False]
+
+    def test_conflictos_coinciden_con_comparacion_directa(self):
+        """Verifica el resultado vectorizado contra la comparación par a par."""
+        rng = np.random.default_rng(7)
+        base = np.datetime64(INICIO, "s")
+        inicios, fines = expandir_ocurrencias(INICIO, FIN, "diaria", repeticiones=60)
+        existentes_inicio = base + rng.integers(
+            0, 60 * 86400, 300
+        ).astype("timedelta64[s]")
+        existentes_fin = existentes_inicio + rng.integers(
+            600, 3 * 86400, 300
+        ).astype("timedelta64[s]")
+
+        esperado = [
+            bool(np.any((existentes_inicio < fin) & (existentes_fin > inicio)))
+            for inicio, fin in zip(inicios, fines)
+        ]
+
+        resultado = detectar_conflictos(
+            inicios, fines, existentes_inicio, existentes_fin
+        )
+        assert resultado.tolist() == esperado
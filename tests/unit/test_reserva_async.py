@@ -0,0 +1,94 @@
+"""
+Pruebas unitarias para las variantes asíncronas de ReservaService.
+"""
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+import pytest
+from app.models.reserva import Reserva
+from app.schemas.reserva import ReservaCreate, ReservaUpdate
+from app.services.reserva_service import (
+    MOTIVO_SALA_NO_DISPONIBLE,
+    ReservaRechazadaError,
+    ReservaService,
+)
+
+SERVICIO = "app.services.reserva_service"
+INICIO = datetime(2025, 10, 20, 9, 0)
+FIN = datetime(2025, 10, 20, 10, 0)
+
+
+def _java_lento(resultado, en_curso, maximo):
+    """Simula una llamada al servicio Java que registra la concurrencia."""
+
+    async def _llamada(*_args):
+        en_curso.append(1)
+        maximo.append(len(en_curso))
+        await asyncio.sleep(0.01)
+        en_curso.pop()
+        return resultado
+
+    return _llamada
+
+
+class TestReservaAsync:
+    """Pruebas para create_reserva_async y update_reserva_async."""
+
+    @pytest.mark.asyncio
+    async def test_validaciones_java_en_paralelo(self):
+        """Verifica que el chequeo de salud y la sala se consultan a la vez."""
+        en_curso, maximo = [], []
+        reserva = Reserva(id=1, id_persona=1, id_sala=3)
+        datos = ReservaCreate(
+            id_persona=1, fecha_hora_inicio=INICIO, fecha_hora_fin=FIN, id_sala=3
+        )
+
+        with patch(f"{SERVICIO}.JavaServiceClient.check_service_health",
+                   _java_lento(True, en_curso, maximo)), \
+                patch(f"{SERVICIO}.JavaServiceClient.get_sala_snapshot",
+                      _java_lento({"existe": True, "disponible": True},
+                                  en_curso, maximo)), \
+                patch.object(ReservaService, "_insertar_validada",
+                             return_value=reserva) as insertar:
+            creada = await ReservaService.create_reserva_async(Mock(), datos)
+
+        assert creada is reserva
+        assert max(maximo) == 2
+        insertar.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_sala_no_disponible_no_inserta(self):
+        """Verifica que una sala no disponible se rechaza sin tocar la base."""
+        datos = ReservaCreate(
+            id_persona=1, fecha_hora_inicio=INICIO, fecha_hora_fin=FIN, id_sala=3
+        )
+
+        with patch(f"{SERVICIO}.JavaServiceClient.check_service_health",
+                   AsyncMock(return_value=True)), \
+                patch(f"{SERVICIO}.JavaServiceClient.get_sala_snapshot",
+                      AsyncMock(return_value={"existe": True,
+                                              "disponible": False})), \
+                patch.object(ReservaService, "_insertar_validada") as insertar:
+            with pytest.raises(ReservaRechazadaError) as error:
+                await ReservaService.create_reserva_async(Mock(), datos)
+
+        assert error.value.codigo == MOTIVO_SALA_NO_DISPONIBLE
+        insertar.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_valida_java_una_sola_vez(self):
+        """Verifica que la actualización no repite la consulta a Java en el hilo."""
+        actual = Reserva(id=5, id_persona=1, id_sala=2)
+        validar_sala = AsyncMock()
+
+        with patch(f"{SERVICIO}.ReservaRepository.get_by_id", return_value=actual), \
+                patch.object(ReservaService, "_validar_sala_en_java_async",
+                             validar_sala), \
+                patch.object(ReservaService, "update_reserva",
+                             return_value=actual) as update:
+            await ReservaService.update_reserva_async(
+                Mock(), 5, ReservaUpdate(id_sala=3)
+            )
+
+        validar_sala.assert_awaited_once_with(3)
+        assert update.call_args.args[-1] is False
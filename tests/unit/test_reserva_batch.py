@@ -0,0 +1,129 @@
+"""
+Pruebas unitarias para la creación de reservas en lote.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+from app.models.articulo import Articulo
+from app.schemas.reserva import ReservaCreate
+from app.services.reserva_service import (
+    MSG_CONFLICTO_SALA,
+    MSG_SALAS_NO_DISPONIBLE,
+    ReservaService,
+)
+
+AHORA = datetime(2025, 10, 16, 8, 0)
+SERVICIO = "app.services.reserva_service"
+JAVA = f"{SERVICIO}.JavaServiceClient"
+
+
+def _reserva(hora_inicio, horas=1, id_sala=None, id_articulo=None, id_persona=1):
+    inicio = AHORA.replace(hour=hora_inicio)
+    return ReservaCreate(
+        id_persona=id_persona,
+        fecha_hora_inicio=inicio,
+        fecha_hora_fin=inicio + timedelta(hours=horas),
+        id_sala=id_sala,
+        id_articulo=id_articulo,
+    )
+
+
+def _crear_lote(reservas, intervalos=(), uso=(), articulos=None, java=None):
+    """Ejecuta create_reservas_bulk con repositorios y Java simulados."""
+    java = java or (True, {1: {"disponible": True}}, {1: True})
+    with patch(f"{SERVICIO}.PersonaRepository.get_existing_ids", return_value={1}), \
+            patch.object(ReservaService, "obtener_hora_actual", return_value=AHORA), \
+            patch.object(ReservaService, "_validar_java_lote", Mock()), \
+            patch(f"{SERVICIO}.asyncio.run", return_value=java), \
+            patch(f"{SERVICIO}.ArticuloRepository.get_by_ids",
+                  return_value=articulos or {}), \
+            patch(f"{SERVICIO}.ReservaRepository.get_intervalos_salas",
+                  return_value=list(intervalos)), \
+            patch(f"{SERVICIO}.ReservaRepository.get_uso_articulos",
+                  return_value=list(uso)), \
+            patch(f"{SERVICIO}.ReservaRepository.create_many",
+                  side_effect=lambda db, datos: list(datos)) as create_many:
+        resultados = ReservaService.create_reservas_bulk(Mock(), reservas)
+    return resultados, create_many
+
+
+class TestReservaBatch:
+    """Pruebas para ReservaService.create_reservas_bulk."""
+
+    def test_conflicto_dentro_del_lote(self):
+        """Verifica que se rechaza una reserva que choca con otra del mismo lote."""
+        reservas = [
+            _reserva(9, 2, id_sala=1),
+            _reserva(10, 1, id_sala=1),
+            _reserva(11, 1, id_sala=1),
+        ]
+
+        resultados, create_many = _crear_lote(reservas)
+
+        assert [r["error"] for r in resultados] == [None, MSG_CONFLICTO_SALA, None]
+        create_many.assert_called_once()
+        assert create_many.call_args[0][1] == [reservas[0], reservas[2]]
+
+    def test_conflicto_con_reserva_existente(self):
+        """Verifica que se detectan conflictos con reservas ya guardadas."""
+        existente = (10, 1, AHORA.replace(hour=9), AHORA.replace(hour=10))
+
+        resultados, _ = _crear_lote(
+            [_reserva(9, 1, id_sala=1), _reserva(10, 1, id_sala=1)],
+            intervalos=[existente],
+        )
+
+        assert resultados[0]["error"] == MSG_CONFLICTO_SALA
+        assert resultados[1]["error"] is None
+
+    def test_stock_de_articulo_compartido_en_el_lote(self):
+        """Verifica que el stock se descuenta con las reservas previas del lote."""
+        articulo = Articulo(id=1, nombre="Proyector", cantidad=2)
+        uso = [(1, AHORA.replace(hour=9), AHORA.replace(hour=12), 1)]
+
+        resultados, _ = _crear_lote(
+            [_reserva(9, 1, id_articulo=1), _reserva(10, 1, id_articulo=1)],
+            uso=uso,
+            articulos={1: articulo},
+        )
+
+        assert resultados[0]["error"] is None
+        assert "No hay unidades disponibles" in resultados[1]["error"]
+
+    def test_errores_individuales_no_afectan_al_resto(self):
+        """Verifica que persona inexistente y Java caído solo rechazan su ítem."""
+        reservas = [
+            _reserva(9, 1, id_sala=1, id_persona=99),
+            _reserva(9, 1, id_sala=1),
+        ]
+
+        resultados, create_many = _crear_lote(reservas, java=(False, {}, {}))
+
+        assert resultados[0]["error"] == "No existe una persona con ID 99"
+        assert resultados[1]["error"] == MSG_SALAS_NO_DISPONIBLE
+        create_many.assert_not_called()
+
+    def test_salas_y_articulos_se_consultan_a_la_vez(self):
+        """Verifica que las consultas de salas y artículos a Java se solapan."""
+        articulo_consultado = asyncio.Event()
+
+        async def sala(sala_id):
+            # Solo responde si el artículo ya se está consultando en paralelo
+            await asyncio.wait_for(articulo_consultado.wait(), timeout=1)
+            return {"id": sala_id}
+
+        async def articulo(articulo_id):
+            articulo_consultado.set()
+            return articulo_id == 1
+
+        async def salud():
+            return True
+
+        with patch(f"{JAVA}.check_service_health", side_effect=salud), \
+                patch(f"{JAVA}.get_sala_details", side_effect=sala), \
+                patch(f"{JAVA}.validate_articulo_exists", side_effect=articulo):
+            resultado = asyncio.run(ReservaService._validar_java_lote([1, 2], [1, 3]))
+
+        assert resultado == (
+            True, {1: {"id": 1}, 2: {"id": 2}}, {1: True, 3: False}
+        )
@@ -0,0 +1,76 @@
+"""
+Pruebas unitarias para la restricción de solapamiento de salas.
+"""
+from datetime import datetime
+from unittest.mock import Mock, patch
+import pytest
+from sqlalchemy.exc import IntegrityError
+from app.repositories.reserva_repository import (
+    RESTRICCION_SOLAPAMIENTO_SALA,
+    ReservaRepository,
+)
+from app.schemas.reserva import ReservaCreate
+from app.services.reserva_service import (
+    MSG_CONFLICTO_SALA,
+    ReservaService,
+    conflicto_sala_como_error,
+)
+
+
+def _integrity_error(constraint_name):
+    orig = Mock()
+    orig.diag.constraint_name = constraint_name
+    return IntegrityError("INSERT INTO reservas", {}, orig)
+
+
+def _java_disponible(coroutine):
+    coroutine.close()
+    return True
+
+
+class TestReservaConflictos:
+    """Pruebas para la traducción de violaciones de la restricción."""
+
+    def test_violacion_de_restriccion_se_traduce_a_value_error(self):
+        """Verifica que la violación produce el mensaje de conflicto habitual."""
+        with pytest.raises(ValueError, match=MSG_CONFLICTO_SALA):
+            with conflicto_sala_como_error():
+                raise _integrity_error(RESTRICCION_SOLAPAMIENTO_SALA)
+
+    def test_otros_errores_de_integridad_se_propagan(self):
+        """Verifica que otras violaciones no se confunden con un conflicto."""
+        error = _integrity_error("reservas_id_persona_fkey")
+
+        assert ReservaRepository.es_conflicto_de_sala(error) is False
+        with pytest.raises(IntegrityError):
+            with conflicto_sala_como_error():
+                raise error
+
+    def test_restriccion_activa_omite_consulta_previa(self):
+        """Verifica que con la restricción activa no se consulta antes de insertar."""
+        reserva = ReservaCreate(
+            id_persona=1,
+            fecha_hora_inicio=datetime(2025, 10, 20, 9, 0),
+            fecha_hora_fin=datetime(2025, 10, 20, 10, 0),
+            id_sala=1,
+        )
+        with patch("app.services.reserva_service.settings") as settings, \
+                patch("app.services.reserva_service.asyncio.run",
+                      side_effect=_java_disponible), \
+                patch.object(ReservaRepository, "check_conflicts") as check_conflicts:
+            settings.sala_exclusion_constraint = True
+            ReservaService._validate_sala_reservation(Mock(), reserva)
+
+        check_conflicts.assert_not_called()
+
+    def test_deteccion_de_la_restriccion(self):
+        """Verifica la detección de la restricción según el motor de base."""
+        postgres = Mock(**{
+            "get_bind.return_value.dialect.name": "postgresql",
+            "execute.return_value.first.return_value": (1,),
+        })
+        sqlite = Mock(**{"get_bind.return_value.dialect.name": "sqlite"})
+
+        assert ReservaRepository.existe_restriccion_de_sala(postgres) is True
+        assert ReservaRepository.existe_restriccion_de_sala(sqlite) is False
+        sqlite.execute.assert_not_called()
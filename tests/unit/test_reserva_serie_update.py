@@ -0,0 +1,125 @@
+"""
+Pruebas unitarias para la modificación de series de reservas recurrentes.
+"""
+from datetime import datetime, time, timedelta
+from unittest.mock import patch
+import pytest
+from sqlalchemy import event
+from app.models import Persona, Sala
+from app.repositories.reserva_serie_repository import ReservaSerieRepository
+from app.repositories.sala_interval_index import SalaIntervalIndex
+from app.repositories.snapshot_reservas import SnapshotReservas
+from app.schemas.reserva_serie import ReservaSerieCreate, ReservaSerieUpdate
+from app.services.recurrence import a_datetimes, expandir_ocurrencias
+from app.services.reserva_serie_service import ReservaSerieService
+from app.services.reserva_service import ReservaService
+
+INICIO = datetime(2030, 3, 4, 9, 0)
+# Hora actual simulada: una hora antes de la segunda ocurrencia diaria
+AHORA = INICIO + timedelta(days=1, hours=-1)
+
+
+@pytest.fixture
+def db(sesion_sqlite):
+    """Base SQLite en memoria con una serie diaria de 5 ocurrencias de 9 a 10."""
+    session = sesion_sqlite
+    session.add_all(
+        [
+            Persona(id=1, nombre="Ana", email="ana@example.com"),
+            Sala(id=1, nombre="Chica", capacidad=10),
+        ]
+    )
+    session.commit()
+    modulo = "app.repositories.reserva_serie_repository"
+    with patch(f"{modulo}.sala_interval_index", SalaIntervalIndex()), patch(
+        f"{modulo}.snapshot_reservas", SnapshotReservas()
+    ), patch.object(ReservaService, "obtener_hora_actual", return_value=AHORA):
+        datos = ReservaSerieCreate(
+            id_persona=1,
+            id_sala=1,
+            fecha_hora_inicio=INICIO,
+            fecha_hora_fin=INICIO + timedelta(hours=1),
+            frecuencia="diaria",
+            repeticiones=5,
+        )
+        inicios, fines = expandir_ocurrencias(
+            datos.fecha_hora_inicio, datos.fecha_hora_fin, "diaria", repeticiones=5
+        )
+        session.serie = ReservaSerieRepository.create(
+            session, datos, a_datetimes(inicios), a_datetimes(fines), []
+        )
+        yield session
+
+
+def _inicios(db):
+    """Inicios de las ocurrencias de la serie, en orden."""
+    return [
+        o.fecha_hora_inicio
+        for o in ReservaSerieRepository.get_ocurrencias(db, db.serie.id)
+    ]
+
+
+class TestReservaSerieUpdate:
+    """Pruebas para ReservaSerieService.update_serie."""
+
+    def test_reprogramar_conserva_ocurrencias_pasadas(self, db):
+        """Verifica que sin `desde` solo se reprograman las ocurrencias futuras."""
+        ReservaSerieService.update_serie(
+            db,
+            db.serie.id,
+            ReservaSerieUpdate(hora_inicio=time(16, 0), hora_fin=time(17, 30)),
+        )
+
+        assert _inicios(db) == [
+            INICIO,
+            INICIO + timedelta(days=1, hours=7),
+            INICIO + timedelta(days=2, hours=7),
+            INICIO + timedelta(days=3, hours=7),
+            INICIO + timedelta(days=4, hours=7),
+        ]
+        # La regla de la serie describe las ocurrencias originales
+        assert db.serie.fecha_hora_inicio == INICIO
+
+    def test_reprogramar_en_una_sentencia(self, db):
+        """Verifica que el horario y la persona cambian con un único UPDATE."""
+        sentencias = []
+        event.listen(
+            db.get_bind(), "before_cursor_execute",
+            # (conexión, cursor, sentencia, parámetros, contexto, executemany)
+            lambda *args: sentencias.append((args[2], args[5])),
+        )
+        ReservaSerieService.update_serie(
+            db,
+            db.serie.id,
+            ReservaSerieUpdate(
+                id_persona=1, hora_inicio=time(18, 0), hora_fin=time(19, 0)
+            ),
+        )
+
+        updates = [
+            muchas for sql, muchas in sentencias if sql.startswith("UPDATE reservas ")
+        ]
+        assert updates == [False]
+        assert _inicios(db)[1:] == [
+            INICIO + timedelta(days=dia, hours=9) for dia in range(1, 5)
+        ]
+
+    def test_rechaza_reprogramar_el_pasado(self, db):
+        """Verifica que no se acepta un `desde` pasado ni un horario ya transcurrido."""
+        with pytest.raises(ValueError, match="pasadas"):
+            ReservaSerieService.update_serie(
+                db,
+                db.serie.id,
+                ReservaSerieUpdate(
+                    hora_inicio=time(16, 0), hora_fin=time(17, 0), desde=INICIO
+                ),
+            )
+        # La ocurrencia de hoy a las 9 es futura, pero a las 7 ya pasó
+        with pytest.raises(ValueError, match="en el pasado"):
+            ReservaSerieService.update_serie(
+                db,
+                db.serie.id,
+                ReservaSerieUpdate(hora_inicio=time(7, 0), hora_fin=time(8, 0)),
+            )
+
+        assert _inicios(db) == [INICIO + timedelta(days=i) for i in range(5)]
@@ -0,0 +1,93 @@
+"""
+Pruebas unitarias para la creación de reservas validada en la base de datos.
+"""
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+import pytest
+from app.models.reserva import Reserva
+from app.repositories.reserva_repository import (
+    MOTIVO_FECHA_PASADA,
+    MOTIVO_SIN_STOCK,
+)
+from app.schemas.reserva import ReservaCreate
+from app.services.reserva_service import (
+    MOTIVO_SERVICIO_NO_DISPONIBLE,
+    MSG_ARTICULOS_NO_DISPONIBLE,
+    ReservaRechazadaError,
+    ReservaService,
+)
+
+SERVICIO = "app.services.reserva_service"
+AHORA = datetime(2025, 10, 20, 12, 0)
+
+
+def _reserva_articulo(hora_inicio=13):
+    return ReservaCreate(
+        id_persona=1,
+        fecha_hora_inicio=AHORA.replace(hour=hora_inicio),
+        fecha_hora_fin=AHORA.replace(hour=hora_inicio + 1),
+        id_articulo=5,
+    )
+
+
+def _detalle(codigo=None, reserva_id=None):
+    return {
+        "codigo": codigo,
+        "id": reserva_id,
+        "ahora": AHORA,
+        "articulo_cantidad": 2,
+        "articulo_nombre": "Proyector",
+        "total_reservado": 2,
+    }
+
+
+def _crear(reserva_data, resultado, java_up=True):
+    """Ejecuta create_reserva con el servicio Java y el repositorio simulados."""
+    with patch(f"{SERVICIO}.JavaServiceClient.check_service_health",
+               AsyncMock(return_value=java_up)), \
+            patch(f"{SERVICIO}.JavaServiceClient.validate_articulo_exists",
+                  AsyncMock(return_value=True)), \
+            patch(f"{SERVICIO}.ReservaRepository.create_validada",
+                  return_value=resultado) as create_validada:
+        return ReservaService.create_reserva(Mock(), reserva_data), create_validada
+
+
+class TestReservaValidada:
+    """Pruebas para ReservaService.create_reserva con validación en SQL."""
+
+    def test_reserva_valida_se_devuelve(self):
+        """Verifica que sin motivo de rechazo se devuelve la reserva insertada."""
+        reserva = Reserva(id=10, id_persona=1, id_articulo=5)
+
+        creada, create_validada = _crear(
+            _reserva_articulo(), (reserva, _detalle(reserva_id=10))
+        )
+
+        assert creada is reserva
+        create_validada.assert_called_once()
+
+    def test_sin_stock_informa_motivo_y_mensaje(self):
+        """Verifica que el rechazo por stock conserva el mensaje habitual."""
+        with pytest.raises(ReservaRechazadaError) as error:
+            _crear(_reserva_articulo(), (None, _detalle(MOTIVO_SIN_STOCK)))
+
+        assert error.value.codigo == MOTIVO_SIN_STOCK
+        mensaje = str(error.value)
+        assert "No hay unidades disponibles del artículo 'Proyector'" in mensaje
+        assert "Ya reservado: 2" in mensaje
+
+    def test_fecha_pasada_informa_hora_de_la_base(self):
+        """Verifica que el mensaje de fecha pasada usa la hora devuelta por la base."""
+        with pytest.raises(ReservaRechazadaError) as error:
+            _crear(_reserva_articulo(8), (None, _detalle(MOTIVO_FECHA_PASADA)))
+
+        assert error.value.codigo == MOTIVO_FECHA_PASADA
+        assert f"Hora actual: {AHORA}" in str(error.value)
+
+    def test_java_caido_no_consulta_la_base(self):
+        """Verifica que sin servicio Java se informa el motivo correspondiente."""
+        with pytest.raises(ReservaRechazadaError) as error:
+            _crear(_reserva_articulo(), (None, _detalle()), java_up=False)
+
+        assert str(error.value) == MSG_ARTICULOS_NO_DISPONIBLE
+        assert error.value.codigo == MOTIVO_SERVICIO_NO_DISPONIBLE
@@ -0,0 +1,196 @@
+"""
+Pruebas unitarias para la tabla de hechos reservas_diarias.
+"""
+from datetime import date, datetime, time, timedelta
+from unittest.mock import patch
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from app.models import Persona, Reserva, ReservaDiaria, Sala
+from app.prediction.modelo_demanda import GestorModeloDemanda
+from app.repositories.reserva_diaria_repository import ReservaDiariaRepository
+from app.repositories.reserva_repository import ReservaRepository
+from app.repositories.reserva_serie_repository import ReservaSerieRepository
+from app.repositories.snapshot_reservas import SnapshotReservas
+from app.schemas.reserva import ReservaCreate, ReservaUpdate
+from app.schemas.reserva_serie import ReservaSerieCreate
+from app.services.analytics_service import AnalyticsService
+
+LUNES = datetime(2030, 3, 4, 9, 0)
+
+
+@pytest.fixture
+def db(sesion_sqlite):
+    """Base SQLite en memoria con dos personas y dos salas."""
+    session = sesion_sqlite
+    session.add_all(
+        [
+            Persona(id=1, nombre="Ana", email="ana@example.com"),
+            Persona(id=2, nombre="Beto", email="beto@example.com"),
+            Sala(id=1, nombre="Chica", capacidad=10),
+            Sala(id=2, nombre="Grande", capacidad=40),
+        ]
+    )
+    session.commit()
+    with patch("app.repositories.reserva_repository.sala_interval_index"):
+        yield session
+
+
+def _datos(id_persona, id_sala, inicio, horas=1):
+    """Datos de una reserva de sala de `horas` horas."""
+    return ReservaCreate(
+        id_persona=id_persona,
+        id_sala=id_sala,
+        fecha_hora_inicio=inicio,
+        fecha_hora_fin=inicio + timedelta(hours=horas),
+    )
+
+
+def _hechos(db):
+    """Hechos como {(fecha, sala, persona): (cantidad, horas)}."""
+    return {
+        (h.fecha, h.id_sala, h.id_persona): (h.cantidad, h.horas)
+        for h in db.scalars(select(ReservaDiaria))
+    }
+
+
+class TestReservasDiarias:
+    """Pruebas para el mantenimiento y las consultas de reservas_diarias."""
+
+    def test_alta_y_lote(self, db):
+        """Verifica que las altas suman cantidad y horas a su día."""
+        ReservaRepository.create(db, _datos(1, 1, LUNES, horas=2))
+        ReservaRepository.create_many(
+            db,
+            [
+                _datos(1, 1, LUNES + timedelta(hours=3)),
+                _datos(2, 2, LUNES + timedelta(days=1)),
+            ],
+        )
+
+        assert _hechos(db) == {
+            (LUNES.date(), 1, 1): (2, 3.0),
+            (LUNES.date() + timedelta(days=1), 2, 2): (1, 1.0),
+        }
+
+    def test_cambio_de_dia_y_baja(self, db):
+        """Verifica que un cambio resta del día anterior y suma al nuevo."""
+        reserva = ReservaRepository.create(db, _datos(1, 1, LUNES))
+        martes = LUNES + timedelta(days=1)
+
+        ReservaRepository.update(
+            db,
+            reserva.id,
+            ReservaUpdate(
+                fecha_hora_inicio=martes, fecha_hora_fin=martes + timedelta(hours=4)
+            ),
+        )
+        assert _hechos(db) == {(martes.date(), 1, 1): (1, 4.0)}
+
+        ReservaRepository.delete(db, reserva.id)
+        assert _hechos(db) == {}
+
+    def test_altas_no_releen_el_dia(self, db):
+        """Verifica que una alta suma su aporte sin recontar las reservas del día."""
+        # Reservas sin hecho (como antes de un backfill): no se recuentan
+        db.add(Reserva(id_persona=1, id_sala=1, fecha_hora_inicio=LUNES,
+                       fecha_hora_fin=LUNES + timedelta(hours=1)))
+        db.commit()
+
+        ReservaRepository.create(db, _datos(1, 1, LUNES + timedelta(hours=2)))
+        ReservaRepository.create(db, _datos(1, 1, LUNES + timedelta(hours=4), 2))
+
+        assert _hechos(db) == {(LUNES.date(), 1, 1): (2, 3.0)}
+
+    def test_series_mantienen_los_hechos(self, db):
+        """Verifica que alta, cambio y baja de series coinciden con reconstruir."""
+        modulo = "app.repositories.reserva_serie_repository"
+        with patch(f"{modulo}.sala_interval_index"), \
+                patch(f"{modulo}.snapshot_reservas"):
+            inicios = [LUNES + timedelta(days=dia) for dia in range(4)]
+            serie = ReservaSerieRepository.create(
+                db,
+                ReservaSerieCreate(
+                    id_persona=1, id_sala=1, fecha_hora_inicio=LUNES,
+                    fecha_hora_fin=LUNES + timedelta(hours=1), frecuencia="diaria",
+                    repeticiones=4,
+                ),
+                inicios,
+                [inicio + timedelta(hours=1) for inicio in inicios],
+                [],
+            )
+            ReservaSerieRepository.update_ocurrencias(
+                db, serie, id_persona=2, hora_inicio=time(14, 0),
+                hora_fin=time(16, 30), desde=inicios[1],
+            )
+            ReservaSerieRepository.update_ocurrencias(db, serie, id_persona=1)
+            ReservaSerieRepository.delete(db, serie, desde=inicios[3])
+
+        incrementales = _hechos(db)
+        ReservaDiariaRepository.reconstruir(db)
+
+        assert incrementales == _hechos(db) == {
+            (LUNES.date(), 1, 1): (1, 1.0),
+            (inicios[1].date(), 1, 1): (1, 2.5),
+            (inicios[2].date(), 1, 1): (1, 2.5),
+        }
+
+    def test_reconstruir(self, db):
+        """Verifica la reconstrucción por lotes y la limpieza de días viejos."""
+        db.add_all(
+            [
+                Reserva(id_persona=1, id_sala=1,
+                        fecha_hora_inicio=LUNES + timedelta(days=dia),
+                        fecha_hora_fin=LUNES + timedelta(days=dia, hours=1))
+                for dia in (0, 0, 5, 40)
+            ]
+        )
+        db.add(ReservaDiaria(fecha=date(2020, 1, 1), id_persona=1,
+                             cantidad=9, horas=9.0))
+        db.commit()
+
+        dias = ReservaDiariaRepository.reconstruir(db, dias_por_lote=7)
+        por_dia = ReservaDiariaRepository.get_por_dia(db)
+
+        assert dias == 41
+        assert [(fila.fecha, fila.cantidad) for fila in por_dia] == [
+            (LUNES.date(), 2),
+            (LUNES.date() + timedelta(days=5), 1),
+            (LUNES.date() + timedelta(days=40), 1),
+        ]
+        with pytest.raises(ValueError):
+            ReservaDiariaRepository.reconstruir(db, dias_por_lote=0)
+
+    def test_prediccion_por_dia_de_semana(self, db):
+        """Verifica que la predicción suma los hechos por día de la semana."""
+        for semana in range(3):
+            ReservaRepository.create(db, _datos(1, 1, LUNES + timedelta(weeks=semana)))
+
+        with patch(
+            "app.services.analytics_service.modelo_demanda",
+            GestorModeloDemanda(ruta="", reajuste_cambios=0),
+        ), patch("app.prediction.modelo_demanda.snapshot_reservas", SnapshotReservas()):
+            servicio = AnalyticsService(db)
+            predicciones = servicio.get_prediccion_ocupacion(7)["predicciones"]
+
+        lunes = [p for p in predicciones if p["dia_semana"] == "Lun"]
+        otros = [p for p in predicciones if p["dia_semana"] != "Lun"]
+        assert lunes[0]["prediccion_reservas"] == 3
+        assert all(p["prediccion_reservas"] == 0 for p in otros)
+
+    def test_hecho_duplicado_falla(self, db):
+        """Verifica que la clave única rechaza un hecho repetido (también sin sala)."""
+        ReservaRepository.create(db, _datos(1, 1, LUNES))
+        hecho = {
+            "fecha": LUNES.date(), "id_sala": 1, "id_articulo": None,
+            "id_persona": 1, "cantidad": 1, "horas": 1.0,
+        }
+
+        with pytest.raises(IntegrityError):
+            db.execute(insert(ReservaDiaria), [hecho])
+        db.rollback()
+
+        sin_sala = {**hecho, "id_sala": None, "id_articulo": 5}
+        db.execute(insert(ReservaDiaria), [sin_sala])
+        with pytest.raises(IntegrityError):
+            db.execute(insert(ReservaDiaria), [sin_sala])
@@ -0,0 +1,169 @@
+"""
+Pruebas unitarias para el índice en memoria de conflictos de salas.
+"""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+from app.models.reserva import Reserva
+from app.repositories.reserva_repository import ReservaRepository
+from app.repositories.sala_interval_index import SalaIntervalIndex
+
+BASE = datetime(2025, 10, 16, 9, 0)
+
+
+def _reserva(reserva_id, sala_id, desde_horas, duracion_horas):
+    inicio = BASE + timedelta(hours=desde_horas)
+    return Reserva(
+        id=reserva_id,
+        id_persona=1,
+        id_sala=sala_id,
+        fecha_hora_inicio=inicio,
+        fecha_hora_fin=inicio + timedelta(hours=duracion_horas),
+    )
+
+
+def _db(**consulta):
+    """Sesión simulada cuya consulta de reservas de salas devuelve `consulta`."""
+    return Mock(**{
+        f"query.return_value.filter.return_value.all.{clave}": valor
+        for clave, valor in consulta.items()
+    })
+
+
+class TestSalaIntervalIndex:
+    """Pruebas para SalaIntervalIndex."""
+
+    def test_detecta_solapamiento(self):
+        """Verifica que se detectan reservas que se solapan."""
+        index = SalaIntervalIndex()
+        index.registrar(_reserva(1, 10, 0, 2))
+        index.registrar(_reserva(2, 10, 4, 1))
+
+        conflictos = index.buscar_conflictos(
+            10, BASE + timedelta(hours=1), BASE + timedelta(hours=5)
+        )
+
+        assert sorted(conflictos) == [1, 2]
+
+    def test_intervalos_contiguos_no_son_conflicto(self):
+        """Verifica que terminar justo cuando empieza otra no es conflicto."""
+        index = SalaIntervalIndex()
+        index.registrar(_reserva(1, 10, 0, 2))
+
+        conflictos = index.buscar_conflictos(
+            10, BASE + timedelta(hours=2), BASE + timedelta(hours=3)
+        )
+
+        assert conflictos == []
+
+    def test_fechas_con_zona(self):
+        """Verifica que las fechas con zona se comparan en hora local sin zona."""
+        index = SalaIntervalIndex()
+        index.registrar(_reserva(1, 10, 0, 2))  # 9 a 11 hora local (UTC-3)
+        utc = BASE.replace(tzinfo=timezone.utc)
+
+        # 12:30Z es 9:30 hora local
+        assert index.buscar_conflictos(
+            10, utc + timedelta(hours=3, minutes=30), utc + timedelta(hours=4)
+        ) == [1]
+        assert index.buscar_conflictos(
+            10, utc + timedelta(hours=5), utc + timedelta(hours=6)
+        ) == []
+
+    def test_reserva_larga_anterior_se_detecta(self):
+        """Verifica que una reserva larga que empezó antes se detecta."""
+        index = SalaIntervalIndex()
+        index.registrar(_reserva(1, 10, 0, 24))
+        index.registrar(_reserva(2, 10, 30, 1))
+
+        conflictos = index.buscar_conflictos(
+            10, BASE + timedelta(hours=20), BASE + timedelta(hours=21)
+        )
+
+        assert conflictos == [1]
+
+    def test_excluye_reserva_y_otras_salas(self):
+        """Verifica la exclusión por ID y el aislamiento entre salas."""
+        index = SalaIntervalIndex()
+        index.registrar(_reserva(1, 10, 0, 2))
+        index.registrar(_reserva(2, 20, 0, 2))
+
+        conflictos = index.buscar_conflictos(
+            10, BASE, BASE + timedelta(hours=1), exclude_reserva_id=1
+        )
+
+        assert conflictos == []
+
+    def test_actualizar_y_quitar(self):
+        """Verifica que mover o eliminar una reserva actualiza el índice."""
+        index = SalaIntervalIndex()
+        reserva = _reserva(1, 10, 0, 2)
+        index.registrar(reserva)
+
+        reserva.fecha_hora_inicio = BASE + timedelta(hours=5)
+        reserva.fecha_hora_fin = BASE + timedelta(hours=6)
+        index.registrar(reserva)
+        assert index.buscar_conflictos(10, BASE, BASE + timedelta(hours=1)) == []
+        assert index.buscar_conflictos(
+            10, BASE + timedelta(hours=5), BASE + timedelta(hours=7)
+        ) == [1]
+
+        index.quitar(1)
+        assert index.buscar_conflictos(
+            10, BASE + timedelta(hours=5), BASE + timedelta(hours=7)
+        ) == []
+
+    def test_recarga_conserva_escrituras_concurrentes(self):
+        """Verifica que la recarga incorpora la base sin perder altas simultáneas."""
+        index = SalaIntervalIndex()
+        index.registrar(_reserva(1, 10, 0, 1))  # Ya no está en la base
+
+        def _leer_base():
+            index.registrar(_reserva(3, 10, 4, 1))  # Confirmada durante la lectura
+            return [(2, 10, BASE + timedelta(hours=2), BASE + timedelta(hours=3))]
+
+        index.cargar(_db(side_effect=_leer_base))
+        index.cargar(_db(return_value=[
+            (2, 10, BASE + timedelta(hours=2), BASE + timedelta(hours=3)),
+            (3, 10, BASE + timedelta(hours=4), BASE + timedelta(hours=5)),
+        ]))
+
+        conflictos = index.buscar_conflictos(10, BASE, BASE + timedelta(days=1))
+        assert sorted(conflictos) == [2, 3]
+        assert index.reconciliaciones == 1
+
+
+class TestCheckConflictsConIndice:
+    """Pruebas de ReservaRepository.check_conflicts usando el índice."""
+
+    def test_sin_candidatos_no_consulta_la_base(self):
+        """Verifica que sin candidatos no se consulta la base de datos."""
+        index = SalaIntervalIndex()
+        index.cargar(_db(return_value=[]))
+
+        with patch(
+            "app.repositories.reserva_repository.sala_interval_index", index
+        ), patch.object(ReservaRepository, "_query_conflicts") as query_mock:
+            result = ReservaRepository.check_conflicts(
+                Mock(), 10, BASE, BASE + timedelta(hours=1)
+            )
+
+        assert result == []
+        query_mock.assert_not_called()
+
+    def test_candidatos_se_confirman_en_la_base(self):
+        """Verifica que los candidatos del índice se confirman en la base."""
+        index = SalaIntervalIndex()
+        index.cargar(_db(return_value=[(1, 10, BASE, BASE + timedelta(hours=2))]))
+        confirmada = _reserva(1, 10, 0, 2)
+
+        with patch(
+            "app.repositories.reserva_repository.sala_interval_index", index
+        ), patch.object(
+            ReservaRepository, "_query_conflicts", return_value=[confirmada]
+        ) as query_mock:
+            result = ReservaRepository.check_conflicts(
+                Mock(), 10, BASE, BASE + timedelta(hours=1)
+            )
+
+        assert result == [confirmada]
+        query_mock.assert_called_once()
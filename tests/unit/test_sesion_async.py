@@ -0,0 +1,102 @@
+"""
+Pruebas unitarias para las consultas con sesión asíncrona.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.database import Base
+from app.models import Articulo, Persona, Reserva, Sala
+from app.repositories.articulo_repository import ArticuloRepository
+from app.repositories.persona_repository import PersonaRepository
+from app.repositories.reserva_repository import ReservaRepository
+from app.repositories.sala_repository import SalaRepository
+from app.web.routes import get_user_from_request
+
+AHORA = datetime(2025, 10, 20, 10, 0)
+
+
+@pytest_asyncio.fixture
+async def db():
+    """Base SQLite en memoria (aiosqlite) con salas, artículos y reservas."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        session.add_all(
+            [
+                Persona(id=1, nombre="Ana", email="ana@example.com"),
+                Persona(id=2, nombre="Beto", email="beto@example.com",
+                        is_active=False),
+                Sala(id=1, nombre="Chica", capacidad=10),
+                Sala(id=2, nombre="Grande", capacidad=40),
+                Articulo(id=1, nombre="Proyector", cantidad=2, disponible=True),
+                Articulo(id=2, nombre="Cámara", cantidad=1, disponible=False),
+                # Terminada
+                Reserva(id=1, id_persona=1, id_sala=1,
+                        fecha_hora_inicio=AHORA - timedelta(hours=3),
+                        fecha_hora_fin=AHORA - timedelta(hours=2)),
+                # En curso: ocupa la sala 2
+                Reserva(id=2, id_persona=1, id_sala=2,
+                        fecha_hora_inicio=AHORA - timedelta(hours=1),
+                        fecha_hora_fin=AHORA + timedelta(hours=1)),
+                # Futura, de artículo
+                Reserva(id=3, id_persona=2, id_articulo=1,
+                        fecha_hora_inicio=AHORA + timedelta(days=1),
+                        fecha_hora_fin=AHORA + timedelta(days=1, hours=1)),
+            ]
+        )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+class TestSesionAsync:
+    """Pruebas para los métodos *_async de los repositorios."""
+
+    @pytest.mark.asyncio
+    async def test_conteos(self, db):
+        """Verifica los conteos usados por el dashboard y /stats."""
+        assert await PersonaRepository.count_async(db) == 2
+        assert await SalaRepository.count_async(db) == 2
+        assert await SalaRepository.count_async(db, min_capacidad=21) == 1
+        assert await ArticuloRepository.count_async(db, disponible=True) == 1
+        assert await ReservaRepository.count_async(db) == 3
+        assert await ReservaRepository.count_vigentes_async(db, AHORA) == 2
+        assert await ReservaRepository.count_salas_ocupadas_async(db, AHORA) == 1
+
+    @pytest.mark.asyncio
+    async def test_reservas_en_rango(self, db):
+        """Verifica el filtro por inicio y el orden cronológico."""
+        desde = AHORA - timedelta(hours=2)
+
+        todas = await ReservaRepository.get_en_rango_async(db, desde)
+        hasta_hoy = await ReservaRepository.get_en_rango_async(
+            db, desde, AHORA.replace(hour=23)
+        )
+
+        assert [r.id for r in todas] == [2, 3]
+        assert [r.id for r in hasta_hoy] == [2]
+
+    @pytest.mark.asyncio
+    async def test_personas_por_ids(self, db):
+        """Verifica la búsqueda de varias personas en una consulta."""
+        personas = await PersonaRepository.get_by_ids_async(db, [1, 2, 99])
+
+        assert sorted(personas) == [1, 2]
+        assert personas[1].nombre == "Ana"
+        assert await PersonaRepository.get_by_ids_async(db, []) == {}
+
+    @pytest.mark.asyncio
+    async def test_usuario_desde_cookie(self, db):
+        """Verifica que las páginas web resuelven el usuario con la sesión async."""
+        request = Mock(headers={}, cookies={"token": "jwt"})
+
+        with patch("app.web.routes.extract_email_from_token",
+                   side_effect=["ana@example.com", "beto@example.com"]):
+            activo = await get_user_from_request(request, db)
+            inactivo = await get_user_from_request(request, db)
+
+        assert activo.id == 1
+        assert inactivo is None
@@ -0,0 +1,86 @@
+"""
+Pruebas unitarias para la coalescencia de consultas al servicio Java.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, Mock, patch
+import httpx
+import pytest
+from app.services.java_client import JavaServiceClient
+from app.services.single_flight import SingleFlight
+
+
+def _consulta_lenta(resultado, llamadas):
+    async def _consultar():
+        llamadas.append(1)
+        await asyncio.sleep(0.01)
+        return resultado
+
+    return _consultar
+
+
+class TestSingleFlight:
+    """Pruebas para SingleFlight y su uso en JavaServiceClient."""
+
+    @pytest.mark.asyncio
+    async def test_llamadas_concurrentes_comparten_consulta(self):
+        """Verifica que varias llamadas simultáneas hacen una sola consulta."""
+        grupo, llamadas = SingleFlight(), []
+
+        consultar = _consulta_lenta("ok", llamadas)
+
+        resultados = await asyncio.gather(
+            *(grupo.ejecutar("sala:1", consultar) for _ in range(4))
+        )
+
+        assert resultados == ["ok"] * 4
+        assert len(llamadas) == 1
+        assert grupo.stats() == {"en_curso": 0, "consultas": 1, "compartidas": 3}
+
+    @pytest.mark.asyncio
+    async def test_llamadas_sucesivas_vuelven_a_consultar(self):
+        """Verifica que una vez terminada la consulta la clave se libera."""
+        grupo, llamadas = SingleFlight(), []
+
+        await grupo.ejecutar("sala:1", _consulta_lenta("a", llamadas))
+        await grupo.ejecutar("sala:1", _consulta_lenta("b", llamadas))
+
+        assert len(llamadas) == 2
+
+    @pytest.mark.asyncio
+    async def test_error_se_propaga_a_todos(self):
+        """Verifica que si la consulta falla todos reciben la excepción."""
+        grupo = SingleFlight()
+
+        async def _fallar():
+            await asyncio.sleep(0.01)
+            raise httpx.ConnectError("sin conexión")
+
+        resultados = await asyncio.gather(
+            grupo.ejecutar("sala:1", _fallar),
+            grupo.ejecutar("sala:1", _fallar),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, httpx.ConnectError) for r in resultados)
+
+    @pytest.mark.asyncio
+    async def test_snapshot_y_validacion_comparten_get(self):
+        """Verifica que snapshot y validación de la misma sala hacen un solo GET."""
+        respuesta = httpx.Response(200, json={"id": 3, "disponible": True})
+        client = Mock(get=AsyncMock(return_value=respuesta))
+
+        @asynccontextmanager
+        async def _cliente(sonda=False):
+            await asyncio.sleep(0.01)
+            yield client
+
+        with patch.object(JavaServiceClient, "_cliente", _cliente):
+            snapshot, existe = await asyncio.gather(
+                JavaServiceClient.get_sala_snapshot(3),
+                JavaServiceClient.validate_sala_exists(3),
+            )
+
+        assert snapshot["existe"] and snapshot["disponible"]
+        assert existe is True
+        client.get.assert_awaited_once()
@@ -0,0 +1,150 @@
+"""
+Pruebas unitarias para la foto columnar en memoria de reservas.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import pytest
+from sqlalchemy import insert
+from app.models import Persona, Reserva, Sala
+from app.repositories.reserva_repository import ReservaRepository
+from app.repositories.snapshot_reservas import (
+    CAPACIDAD_MINIMA,
+    SnapshotReservas,
+    a_segundo,
+    dias_semana,
+    horas_del_dia,
+)
+from app.schemas.reserva import ReservaCreate, ReservaUpdate
+
+LUNES = datetime(2030, 3, 4, 9, 0)
+
+
+@pytest.fixture
+def db(sesion_sqlite):
+    """Base SQLite en memoria con una persona, dos salas y una foto propia."""
+    session = sesion_sqlite
+    session.add_all(
+        [
+            Persona(id=1, nombre="Ana", email="ana@example.com"),
+            Sala(id=1, nombre="Chica", capacidad=10),
+            Sala(id=2, nombre="Grande", capacidad=40),
+        ]
+    )
+    session.commit()
+    with patch("app.repositories.reserva_repository.sala_interval_index"), patch(
+        "app.repositories.reserva_repository.snapshot_reservas", SnapshotReservas()
+    ) as snapshot:
+        session.snapshot = snapshot
+        yield session
+
+
+def _datos(id_sala, inicio, horas=1):
+    """Datos de una reserva de sala de `horas` horas."""
+    return ReservaCreate(
+        id_persona=1,
+        id_sala=id_sala,
+        fecha_hora_inicio=inicio,
+        fecha_hora_fin=inicio + timedelta(hours=horas),
+    )
+
+
+class TestSnapshotReservas:
+    """Pruebas para SnapshotReservas y su mantenimiento desde ReservaRepository."""
+
+    def test_carga_perezosa_y_filtro_por_inicio(self, db):
+        """Verifica la carga en la primera lectura y el filtro [desde, hasta]."""
+        db.execute(
+            insert(Reserva),
+            [
+                {"id_persona": 1, "id_sala": 1, "fecha_hora_inicio": LUNES,
+                 "fecha_hora_fin": LUNES + timedelta(hours=2)},
+                {"id_persona": 1, "id_articulo": 5,
+                 "fecha_hora_inicio": LUNES + timedelta(days=1),
+                 "fecha_hora_fin": LUNES + timedelta(days=1, hours=1)},
+            ],
+        )
+        db.commit()
+
+        assert not db.snapshot.listo
+        todas = db.snapshot.columnas(db)
+        desde_martes = db.snapshot.columnas(db, LUNES + timedelta(hours=1))
+
+        assert db.snapshot.listo
+        assert todas["id_sala"].tolist() == [1, 0]
+        assert todas["id_articulo"].tolist() == [0, 5]
+        assert todas["fin"][0] - todas["inicio"][0] == 7200
+        assert desde_martes["id"].tolist() == [2]
+        assert dias_semana(todas["inicio"]).tolist() == [0, 1]
+        assert horas_del_dia(todas["inicio"]).tolist() == [9, 9]
+
+    def test_altas_cambios_y_bajas(self, db):
+        """Verifica que las escrituras del repositorio actualizan la foto."""
+        db.snapshot.cargar(db)
+        primera = ReservaRepository.create(db, _datos(1, LUNES))
+        ReservaRepository.create_many(
+            db, [_datos(2, LUNES + timedelta(days=i)) for i in range(1, 4)]
+        )
+        ReservaRepository.update(
+            db,
+            primera.id,
+            ReservaUpdate(id_sala=2, fecha_hora_fin=LUNES + timedelta(hours=3)),
+        )
+        ReservaRepository.delete(db, primera.id + 1)
+
+        columnas = db.snapshot.columnas(db)
+        assert sorted(columnas["id"].tolist()) == [1, 3, 4]
+        actualizada = columnas["id"] == primera.id
+        assert columnas["id_sala"][actualizada].tolist() == [2]
+        assert columnas["fin"][actualizada].tolist() == [
+            a_segundo(LUNES + timedelta(hours=3))
+        ]
+        assert db.snapshot.stats()["reservas"] == 3
+
+    def test_escrituras_durante_la_carga(self, db):
+        """Verifica que una escritura confirmada mientras se carga no se pierde."""
+        snapshot = db.snapshot
+        reserva = Reserva(
+            id=99, id_persona=1, id_sala=1, id_serie=None,
+            fecha_hora_inicio=LUNES, fecha_hora_fin=LUNES + timedelta(hours=1),
+        )
+        ejecutar = db.execute
+
+        def _leer_y_escribir(*args, **kwargs):
+            filas = ejecutar(*args, **kwargs)
+            snapshot.registrar(reserva)  # Confirmada después de la lectura
+            return filas
+
+        with patch.object(db, "execute", _leer_y_escribir):
+            assert snapshot.cargar(db) == 1
+
+        assert snapshot.columnas(db)["id"].tolist() == [99]
+
+    def test_compacta_y_quita_series(self):
+        """Verifica la compactación de bajas y la baja de ocurrencias de una serie."""
+        snapshot = SnapshotReservas()
+        snapshot._listo = True  # pylint: disable=protected-access
+        cantidad = 3 * CAPACIDAD_MINIMA
+        for reserva_id in range(1, cantidad + 1):
+            snapshot.registrar(
+                Reserva(
+                    id=reserva_id, id_persona=1, id_sala=1,
+                    id_serie=7 if reserva_id % 2 else None,
+                    fecha_hora_inicio=LUNES + timedelta(hours=reserva_id),
+                    fecha_hora_fin=LUNES + timedelta(hours=reserva_id + 1),
+                )
+            )
+
+        snapshot.quitar_serie(7, desde=LUNES + timedelta(hours=11))
+        for reserva_id in range(2, 2 * CAPACIDAD_MINIMA, 2):
+            snapshot.quitar(reserva_id)
+
+        ids = snapshot.columnas(None)["id"]
+        esperados = [
+            i for i in range(1, cantidad + 1)
+            if (i % 2 and i < 11) or (not i % 2 and i >= 2 * CAPACIDAD_MINIMA)
+        ]
+        assert ids.tolist() == esperados
+        stats = snapshot.stats()
+        assert stats["reservas"] == len(esperados)
+        # Compactada al superar la mitad de filas dadas de baja
+        assert stats["filas"] < cantidad